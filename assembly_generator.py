@@ -9,6 +9,7 @@ import subprocess
 import tempfile
 import glob
 from datetime import datetime
+from robot_quadruples import QuadrupleStore, OPCODE_IDS, dispatch_table
 
 class AssemblyGenerator:
     """Generador de ensamblador desde cuádruplos"""
@@ -21,6 +22,19 @@ class AssemblyGenerator:
         self.code_lines = []
         self.data_lines = []
         
+        # Manejador de cada operación, indexado por código (ver robot_quadruples)
+        self.handlers = dispatch_table({
+            'DECLARAR': lambda arg1, arg2, result: self.process_declarar(arg1, result),
+            'ASIG': lambda arg1, arg2, result: self.process_asignacion(arg1, result),
+            'CALL': self.process_call,
+            'COMPARAR': self.process_comparar,
+            'SALTO_CONDICIONAL': lambda arg1, arg2, result: self.process_salto_condicional(arg1, result),
+            'SALTO_INCONDICIONAL': lambda arg1, arg2, result: self.process_salto_incondicional(result),
+            'DECREMENTO': lambda arg1, arg2, result: self.process_decremento(arg1, result),
+            'DECLARAR_ETIQUETA': lambda arg1, arg2, result: self.process_declarar_etiqueta(result),
+            'FIN': lambda arg1, arg2, result: self.process_fin(result),
+        })
+        
         # Configuración específica para Windows
         self.is_windows = os.name == 'nt'
         
@@ -57,9 +71,12 @@ class AssemblyGenerator:
         """Genera código ensamblador completo desde cuádruplos"""
         self.reset()
         
-        # Procesar cuádruplos
-        for i, cuadruplo in enumerate(cuadruplos):
-            self.process_cuadruplo(cuadruplo, i)
+        # Procesar cuádruplos (los del generador se recorren sin crear objetos)
+        if isinstance(cuadruplos, QuadrupleStore):
+            cuadruplos.dispatch(self.handlers)
+        else:
+            for i, cuadruplo in enumerate(cuadruplos):
+                self.process_cuadruplo(cuadruplo, i)
         
         # Generar código completo
         assembly_code = self.generate_complete_program(program_name)
@@ -76,29 +93,10 @@ class AssemblyGenerator:
     
     def process_cuadruplo(self, cuadruplo, index):
         """Procesa un cuádruplo individual"""
-        op = cuadruplo.operacion
-        arg1 = cuadruplo.arg1
-        arg2 = cuadruplo.arg2
-        result = cuadruplo.resultado
-        
-        if op == 'DECLARAR':
-            self.process_declarar(arg1, result)
-        elif op == 'ASIG':
-            self.process_asignacion(arg1, result)
-        elif op == 'CALL':
-            self.process_call(arg1, arg2, result)
-        elif op == 'COMPARAR':
-            self.process_comparar(arg1, arg2, result)
-        elif op == 'SALTO_CONDICIONAL':
-            self.process_salto_condicional(arg1, result)
-        elif op == 'SALTO_INCONDICIONAL':
-            self.process_salto_incondicional(result)
-        elif op == 'DECREMENTO':
-            self.process_decremento(arg1, result)
-        elif op == 'DECLARAR_ETIQUETA':
-            self.process_declarar_etiqueta(result)
-        elif op == 'FIN':
-            self.process_fin(result)
+        opcode = OPCODE_IDS.get(cuadruplo.operacion)
+        handler = self.handlers[opcode] if opcode is not None and opcode < len(self.handlers) else None
+        if handler is not None:
+            handler(cuadruplo.arg1, cuadruplo.arg2, cuadruplo.resultado)
     
     def process_declarar(self, tipo, robot_name):
         """Procesa declaración de robot"""
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Benchmark del análisis léxico de RobotLexicalAnalyzer
+Compara el escáner precompilado de una sola pasada contra el bucle original
+(regex recompilada en cada llamada + regex.match + get_token_type por token)
+"""
+
+import re
+import sys
+import time
+import random
+
+from robot_tokens import TOKEN_PATTERNS, VALID_COMPONENTS, get_token_type
+from robot_lexical_analyzer import RobotLexicalAnalyzer, COMPONENT_RANGES
+
+class LegacyToken:
+    """Token del bucle original: un objeto con __dict__ y su propia copia del texto"""
+    def __init__(self, type_, value, line, column):
+        self.type = type_
+        self.value = value
+        self.line = line
+        self.column = column
+
+# Robots, componentes y comentarios del programa sintético
+ROBOTS = ['r1', 'r2', 'brazo', 'pinza_2', 'celda3', 'asistente_lab']
+COMPONENTS = ['base', 'hombro', 'codo', 'muneca', 'inclinacion', 'garra', 'velocidad']
+COMMENTS = ["# comentario de seguimiento", "# Posicionarse sobre la muestra", "// tomar pieza",
+            "# Paso {n}: transferir a la placa"]
+
+def generate_program(lines=200_000, seed=0):
+    """Genera un programa robótico sintético de aproximadamente `lines` líneas.
+
+    Las sentencias varían: asignaciones de varios robots con valores dentro
+    del rango de cada componente, esperas, comentarios, líneas vacías y
+    bloques repetir/inicio/fin. Con la misma semilla se genera
+    siempre el mismo programa.
+    """
+    rng = random.Random(seed)
+
+    def value(component):
+        low, high = COMPONENT_RANGES[component]['min'], COMPONENT_RANGES[component]['max']
+        if rng.random() < 0.4:
+            return f"{rng.uniform(low, high):.1f}"
+        return str(rng.randint(low, high))
+
+    def assignment(indent="", robot=None):
+        component = rng.choice(COMPONENTS)
+        note = f"   // nota {rng.randint(1, 99)}" if rng.random() < 0.1 else ""
+        return f"{indent}{robot or rng.choice(ROBOTS)}.{component} = {value(component)}{note}"
+
+    program = [f"Robot {robot}" for robot in ROBOTS]
+    while len(program) < lines:
+        kind = rng.random()
+        if kind < 0.03:
+            robot = rng.choice(ROBOTS)
+            program.append(f"{robot}.repetir = {rng.randint(1, 20)}")
+            program.append(f"{robot}.inicio")
+            for _ in range(rng.randint(2, 8)):
+                program.append(assignment("    ", robot))
+            program.append(f"    {robot}.espera = {rng.uniform(0.1, 5):.1f}")
+            program.append(f"{robot}.fin")
+        elif kind < 0.08:
+            program.append(rng.choice(COMMENTS).format(n=len(program)))
+        elif kind < 0.12:
+            program.append(f"{rng.choice(ROBOTS)}.espera = {rng.uniform(0.1, 5):.1f}")
+        elif kind < 0.15:
+            program.append("")
+        else:
+            program.append(assignment())
+    return "\n".join(program[:lines])
+
+def legacy_scan(source_code):
+    """Réplica del bucle léxico original, usada como referencia del benchmark"""
+    tokens = []
+    errors = []
+    components_found = set()
+    commands_used = set()
+    current_line = 1
+    current_column = 1
+
+    combined_pattern = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_PATTERNS)
+    regex = re.compile(combined_pattern, re.IGNORECASE)
+
+    position = 0
+    while position < len(source_code):
+        match = regex.match(source_code, position)
+        if match:
+            token_type = match.lastgroup
+            token_value = match.group()
+            if token_type == 'IDENTIFIER':
+                keyword_type = get_token_type(token_value)
+                if keyword_type:
+                    token_type = keyword_type
+                    if token_value.lower() in VALID_COMPONENTS:
+                        components_found.add(token_value.lower())
+                    elif token_value.lower() in ['girai', 'giraf', 'abre', 'cierra', 'mueve']:
+                        commands_used.add(token_value.lower())
+            elif token_type == 'WHITESPACE':
+                current_column += len(token_value)
+                position = match.end()
+                continue
+            elif token_type == 'NEWLINE':
+                current_line += 1
+                current_column = 1
+                position = match.end()
+                continue
+            elif token_type == 'COMMENT_MULTI' and '\n' in token_value:
+                # Conteo de líneas corregido: el bucle original no avanzaba la línea aquí
+                current_line += token_value.count('\n')
+                current_column = len(token_value) - token_value.rfind('\n')
+                position = match.end()
+                continue
+            elif token_type == 'UNKNOWN':
+                errors.append(f"Error léxico en línea {current_line}, columna {current_column}: Caracter no reconocido '{token_value}'")
+                tokens.append(LegacyToken(token_type, token_value, current_line, current_column))
+                current_column += len(token_value)
+                position = match.end()
+                continue
+            if token_type not in ['COMMENT_SINGLE', 'COMMENT_MULTI', 'COMMENT_HASH']:
+                tokens.append(LegacyToken(token_type, token_value, current_line, current_column))
+            current_column += len(token_value)
+            position = match.end()
+        else:
+            errors.append(f"Error léxico en línea {current_line}, columna {current_column}: Caracter no reconocido '{source_code[position]}'")
+            current_column += 1
+            position += 1
+
+    # El código original convertía cada literal con float() en _generate_warnings
+    for token in tokens:
+        if token.type in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
+            float(token.value)
+    return tokens, errors
+
+def fast_scan(source_code):
+    """Ejecuta solo la fase léxica del analizador actual"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer._scan(source_code)
+    return analyzer.tokens, analyzer.errors
+
+def best_time(function, source_code, repeat):
+    """Mejor tiempo de `repeat` ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(source_code)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmark(lines=200_000, repeat=3):
+    """Mide ambos escáneres sobre el mismo programa y retorna los tiempos"""
+    source_code = generate_program(lines)
+
+    # Verificar que ambos escáneres producen exactamente los mismos tokens
+    legacy_tokens, legacy_errors = legacy_scan(source_code)
+    fast_tokens, fast_errors = fast_scan(source_code)
+    assert legacy_errors == fast_errors
+    assert [(t.type, t.value, t.line, t.column) for t in legacy_tokens] == \
+           [(t.type, t.value, t.line, t.column) for t in fast_tokens]
+
+    legacy = best_time(legacy_scan, source_code, repeat)
+    fast = best_time(fast_scan, source_code, repeat)
+    return {
+        'lines': lines,
+        'tokens': len(fast_tokens),
+        'legacy_seconds': legacy,
+        'fast_seconds': fast,
+        'speedup': legacy / fast if fast else float('inf'),
+    }
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print("=== BENCHMARK DEL ANALIZADOR LÉXICO ===")
+    print(f"Generando programa sintético de {lines} líneas...")
+    result = run_benchmark(lines)
+    print(f"📊 Tokens: {result['tokens']}")
+    print(f"⏱️ Bucle original:     {result['legacy_seconds']:.3f} s")
+    print(f"⚡ Escáner precompilado: {result['fast_seconds']:.3f} s")
+    print(f"🚀 Aceleración: {result['speedup']:.1f}x")
+
+if __name__ == "__main__":
+    main()
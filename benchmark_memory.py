@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria del análisis léxico de RobotLexicalAnalyzer
+Compara el pico de memoria de la lista de objetos Token del bucle original
+contra el TokenStream de arreglos empaquetados, y el pico del análisis
+completo (léxico + sintáctico + semántico + advertencias + código
+intermedio) contra el del analizador original sobre el mismo programa
+"""
+
+import os
+import sys
+import time
+import types
+import subprocess
+import tracemalloc
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from benchmark_lexer import generate_program, legacy_scan, fast_scan
+
+def peak_memory(function, *args):
+    """Ejecuta `function` y retorna (pico de memoria en bytes, segundos, resultado)"""
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, elapsed, result
+
+def full_analysis(source_code):
+    """Análisis completo del programa (las advertencias y los cuádruplos se piden: son perezosos)"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(source_code)
+    return analysis_summary(analyzer)
+
+def load_baseline_analyzer(revision=None):
+    """Clase RobotLexicalAnalyzer de robot_lexical_analyzer.py en `revision`.
+
+    Por defecto es el primer commit del repositorio (el analizador original,
+    que lo hacía todo en analyze()). El archivo se lee con git show y se
+    ejecuta como un módulo aparte; sus importaciones (robot_tokens) son las
+    del árbol actual.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if revision is None:
+        revision = subprocess.run(['git', 'rev-list', '--max-parents=0', 'HEAD'], cwd=directory,
+                                  capture_output=True, text=True, check=True).stdout.split()[0]
+    source = subprocess.run(['git', 'show', f'{revision}:robot_lexical_analyzer.py'], cwd=directory,
+                            capture_output=True, text=True, check=True).stdout
+    module = types.ModuleType('baseline_robot_lexical_analyzer')
+    exec(compile(source, f'{revision}:robot_lexical_analyzer.py', 'exec'), module.__dict__)
+    return module.RobotLexicalAnalyzer
+
+def baseline_analysis(analyzer_class, source_code):
+    """Análisis completo con el analizador original"""
+    analyzer = analyzer_class()
+    analyzer.analyze(source_code)
+    return analysis_summary(analyzer)
+
+def analysis_summary(analyzer):
+    """Resultado comparable de un análisis completo"""
+    return (len(analyzer.tokens), len(analyzer.get_cuadruplos()), list(analyzer.errors), len(analyzer.warnings))
+
+def run_benchmark(lines=1_000_000, full=True, baseline=None):
+    """Mide el pico de memoria de ambos escáneres y, con `full`, del análisis
+    completo actual y del de `baseline` (una clase RobotLexicalAnalyzer, ver
+    load_baseline_analyzer)"""
+    source_code = generate_program(lines)
+    legacy_peak, legacy_seconds, (legacy_tokens, _) = peak_memory(legacy_scan, source_code)
+    token_count = len(legacy_tokens)
+    del legacy_tokens
+    stream_peak, stream_seconds, _ = peak_memory(fast_scan, source_code)
+    result = {
+        'lines': lines,
+        'tokens': token_count,
+        'legacy_peak': legacy_peak,
+        'legacy_seconds': legacy_seconds,
+        'stream_peak': stream_peak,
+        'stream_seconds': stream_seconds,
+        'reduction': legacy_peak / stream_peak if stream_peak else float('inf'),
+    }
+    if full:
+        result['analysis_peak'], result['analysis_seconds'], summary = peak_memory(full_analysis, source_code)
+        if baseline is not None:
+            result['baseline_peak'], result['baseline_seconds'], baseline_summary = \
+                peak_memory(baseline_analysis, baseline, source_code)
+            # Los dos análisis tienen que producir lo mismo
+            assert summary == baseline_summary, (summary[:2], baseline_summary[:2])
+            result['analysis_reduction'] = result['baseline_peak'] / result['analysis_peak']
+    return result
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    lines = int(args[0]) if args else 1_000_000
+    full = '--solo-lexico' not in sys.argv
+    baseline = None
+    if full and '--sin-original' not in sys.argv:
+        try:
+            baseline = load_baseline_analyzer()
+        except (OSError, subprocess.CalledProcessError) as e:
+            print(f"⚠️ No se pudo leer el analizador original con git: {e}")
+    print("=== BENCHMARK DE MEMORIA DEL ANALIZADOR LÉXICO ===")
+    print(f"Generando programa sintético de {lines} líneas...")
+    result = run_benchmark(lines, full, baseline)
+    print(f"📊 Tokens: {result['tokens']}")
+    print(f"🧱 Lista de Token (original): {result['legacy_peak'] / 1e6:.1f} MB pico")
+    print(f"📦 TokenStream:               {result['stream_peak'] / 1e6:.1f} MB pico")
+    print(f"🚀 Reducción: {result['reduction']:.1f}x")
+    if full:
+        print(f"🔍 Análisis completo: {result['analysis_peak'] / 1e6:.1f} MB pico en {result['analysis_seconds']:.1f} s")
+    if 'baseline_peak' in result:
+        print(f"🧱 Análisis completo original: {result['baseline_peak'] / 1e6:.1f} MB pico "
+              f"en {result['baseline_seconds']:.1f} s")
+        print(f"🚀 Reducción del análisis completo: {result['analysis_reduction']:.1f}x")
+
+if __name__ == "__main__":
+    main()
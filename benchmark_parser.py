@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Benchmark del análisis sintáctico de RobotLexicalAnalyzer
+Compara el parser dirigido por tablas (tipos y palabras clave numéricos leídos
+de las columnas del TokenStream) contra el parser original, que compara los
+tipos como texto, llama a token.value.lower() en cada paso y envuelve cada
+elemento en try/except. Reporta elementos del programa parseados por segundo.
+"""
+
+import sys
+import time
+from sys import intern
+
+from robot_tokens import VALID_COMPONENTS
+from robot_lexical_analyzer import (RobotLexicalAnalyzer, RobotParser, Simbolo, SyntaxError,
+                                    COMPONENT_RANGES)
+from benchmark_lexer import generate_program
+
+class LegacyParser:
+    """Réplica del parser original (comparaciones de texto y try/except por elemento)"""
+    
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.current = 0
+        self.errors = []
+        self.robots = {}  # Diccionario de robots: {nombre: [asignaciones]}
+        self.assignments = []
+        self.tabla_simbolos = []  # Tabla de símbolos
+        self.rutinas = {}  # Diccionario de rutinas: {nombre: Rutina}
+        self.comandos_espera = []  # Lista de comandos espera encontrados
+        
+    def peek(self):
+        """Mira el token actual sin consumirlo"""
+        if self.current < len(self.tokens):
+            return self.tokens[self.current]
+        return None
+    
+    def consume(self, expected_type=None):
+        """Consume el token actual"""
+        if self.current < len(self.tokens):
+            token = self.tokens[self.current]
+            self.current += 1
+            if expected_type and token.type != expected_type:
+                raise SyntaxError(f"Se esperaba {expected_type}, se encontró {token.type}", token.line, token.column)
+            return token
+        return None
+    
+    def parse(self):
+        """Parsea el programa completo según la nueva gramática: S → PROGRAMA"""
+        try:
+            # Verificar que hay tokens
+            if not self.tokens:
+                self.errors.append("Error: No hay código para analizar")
+                return False
+            
+            # Parsear múltiples elementos: PROGRAMA → (ROBOT_DECL | ROBOT_INSTRUCTION)* 
+            while self.peek() is not None:
+                self.parse_statement()
+            
+            return len(self.errors) == 0
+            
+        except Exception as e:
+            self.errors.append(f"Error sintáctico: {str(e)}")
+            return False
+    
+    def parse_statement(self):
+        """Parsea un elemento del programa a partir del token actual"""
+        token = self.peek()
+        
+        # Buscar declaración de robot
+        if token.type == 'KEYWORD' and token.value.lower() == 'robot':
+            if not self.parse_robot_declaration():
+                pass
+        # Buscar instrucciones de robot (r1.algo)
+        elif token.type == 'IDENTIFIER':
+            if not self.parse_robot_instruction():
+                # Si falla parsear instrucción, saltar este token
+                self.consume()
+        else:
+            # Saltar tokens que no son declaraciones válidas
+            self.consume()
+    
+    def parse_robot_declaration(self):
+        """Parsea una declaración de robot: ROBOT_DECL → Robot ID"""
+        try:
+            # Primer token debe ser "Robot"
+            robot_token = self.consume()
+            if not robot_token or robot_token.type != 'KEYWORD' or robot_token.value.lower() != 'robot':
+                self.errors.append(f"Error en línea {robot_token.line if robot_token else 1}: Se esperaba 'Robot', se encontró '{robot_token.value if robot_token else 'EOF'}'")
+                return False
+            
+            # Segundo token debe ser el nombre del robot
+            name_token = self.consume()
+            if not name_token or name_token.type != 'IDENTIFIER':
+                self.errors.append(f"Error en línea {name_token.line if name_token else 1}: Se esperaba nombre del robot (identificador), se encontró '{name_token.value if name_token else 'EOF'}'")
+                return False
+            
+            current_robot = name_token.value
+            
+            # SIEMPRE agregar declaración de robot a la tabla de símbolos
+            simbolo_declaracion = Simbolo(current_robot, "DECLARACION", "-", "-", es_declaracion=True, linea=name_token.line)
+            self.tabla_simbolos.append(simbolo_declaracion)
+            
+            # Inicializar lista de asignaciones para este robot si no existe
+            if current_robot not in self.robots:
+                self.robots[current_robot] = []
+            
+            return True
+            
+        except Exception as e:
+            self.errors.append(f"Error en declaración de robot: {str(e)}")
+            return False
+    
+    def parse_robot_instruction(self):
+        """Parsea una instrucción de robot con la nueva sintaxis: robot.comando [= valor | valor]"""
+        try:
+            # robot_name
+            name_token = self.consume()
+            if not name_token or name_token.type != 'IDENTIFIER':
+                self.errors.append(f"Error en línea {name_token.line if name_token else 'EOF'}: Se esperaba nombre del robot")
+                return False
+            
+            robot_name = name_token.value
+            
+            # .
+            dot_token = self.consume()
+            if not dot_token or dot_token.type != 'DOT':
+                self.errors.append(f"Error en línea {dot_token.line if dot_token else 'EOF'}: Se esperaba '.'")
+                return False
+            
+            # comando/componente
+            command_token = self.consume()
+            if not command_token or command_token.type != 'KEYWORD':
+                self.errors.append(f"Error en línea {command_token.line if command_token else 'EOF'}: Se esperaba comando del robot")
+                return False
+            
+            command = intern(command_token.value.lower())
+            
+            if command not in VALID_COMPONENTS:
+                self.errors.append(f"Error en línea {command_token.line}: '{command}' no es un comando válido. Comandos válidos: {', '.join(VALID_COMPONENTS)}")
+                return False
+            
+            # Manejar diferentes tipos de comandos
+            if command == 'inicio':
+                return self.parse_robot_inicio(robot_name, command_token.line)
+            elif command == 'fin':
+                return self.parse_robot_fin(robot_name, command_token.line)
+            elif command == 'espera':
+                return self.parse_robot_espera(robot_name, command_token.line)
+            else:
+                # Comando que requiere asignación (=)
+                return self.parse_robot_assignment(robot_name, command, command_token.line)
+            
+        except Exception as e:
+            self.errors.append(f"Error en instrucción de robot: {str(e)}")
+            return False
+    
+    def parse_robot_assignment(self, robot_name, command, line):
+        """Parsea una asignación: robot.comando = valor"""
+        try:
+            # =
+            equals_token = self.consume()
+            if not equals_token or equals_token.type != 'ASSIGN_OP':
+                self.errors.append(f"Error en línea {equals_token.line if equals_token else 'EOF'}: Se esperaba '='")
+                return False
+            
+            # valor
+            value_token = self.consume()
+            if not value_token or value_token.type not in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
+                self.errors.append(f"Error en línea {value_token.line if value_token else 'EOF'}: Se esperaba valor numérico")
+                return False
+            
+            value = value_token.number
+            
+            # Validar rango de valores si existe
+            if command in COMPONENT_RANGES:
+                range_info = COMPONENT_RANGES[command]
+                if value < range_info['min'] or value > range_info['max']:
+                    self.errors.append(f"Advertencia en línea {value_token.line}: Valor {value} para '{robot_name}.{command}' fuera del rango válido [{range_info['min']}, {range_info['max']}]")
+            
+            # Guardar asignación
+            self.assignments.append({
+                'robot': robot_name,
+                'component': command,
+                'value': value,
+                'line': line
+            })
+            
+            # Agregar a la tabla de símbolos
+            simbolo = Simbolo(robot_name, command, 1, int(value) if value.is_integer() else value, linea=line)
+            self.tabla_simbolos.append(simbolo)
+            
+            return True
+            
+        except Exception as e:
+            self.errors.append(f"Error en asignación: {str(e)}")
+            return False
+    
+    def parse_robot_inicio(self, robot_name, line):
+        """Parsea comando robot.inicio"""
+        # Registrar inicio de bloque
+        simbolo_inicio = Simbolo(robot_name, "inicio", "-", "-", linea=line)
+        self.tabla_simbolos.append(simbolo_inicio)
+        return True
+    
+    def parse_robot_fin(self, robot_name, line):
+        """Parsea comando robot.fin"""
+        # Registrar fin de bloque
+        simbolo_fin = Simbolo(robot_name, "fin", "-", "-", linea=line)
+        self.tabla_simbolos.append(simbolo_fin)
+        return True
+    
+    def parse_robot_espera(self, robot_name, line):
+        """Parsea comando robot.espera = valor"""
+        try:
+            # =
+            equals_token = self.consume()
+            if not equals_token or equals_token.type != 'ASSIGN_OP':
+                self.errors.append(f"Error en línea {equals_token.line if equals_token else 'EOF'}: Se esperaba '=' después de espera")
+                return False
+            
+            # valor
+            value_token = self.consume()
+            if not value_token or value_token.type not in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
+                self.errors.append(f"Error en línea {value_token.line if value_token else 'EOF'}: Se esperaba tiempo de espera")
+                return False
+            
+            tiempo = value_token.number
+            
+            # Validar rango de tiempo
+            if tiempo < 0.1 or tiempo > 60.0:
+                self.errors.append(f"Error en línea {value_token.line}: Tiempo de espera {tiempo} fuera del rango válido (0.1-60.0 segundos)")
+                return False
+            
+            # Agregar comando espera a la lista
+            self.comandos_espera.append({
+                'robot': robot_name,
+                'tiempo': tiempo,
+                'linea': line
+            })
+            
+            # Agregar a tabla de símbolos
+            simbolo_espera = Simbolo(robot_name, "espera", tiempo, tiempo, linea=line)
+            self.tabla_simbolos.append(simbolo_espera)
+            
+            return True
+            
+        except Exception as e:
+            self.errors.append(f"Error en comando espera: {str(e)}")
+            return False
+
+def scan(source_code):
+    """Tokens del programa (el mismo TokenStream para ambos parsers)"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer._scan(source_code)
+    return analyzer.tokens
+
+def parse_with(parser_class, tokens):
+    """Parsea `tokens` y retorna (parser, cantidad de elementos del programa)"""
+    parser = parser_class(tokens)
+    statements = 0
+    while parser.current < len(tokens):
+        parser.parse_statement()
+        statements += 1
+    return parser, statements
+
+def parser_result(parser):
+    """Resumen comparable de la salida de un parser"""
+    return (parser.errors, parser.robots, parser.assignments, parser.comandos_espera,
+            [(str(s), s.linea) for s in parser.tabla_simbolos])
+
+def best_time(parser_class, tokens, repeat):
+    """Mejor tiempo de `repeat` ejecuciones"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_with(parser_class, tokens)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmark(lines=200_000, repeat=3):
+    """Mide ambos parsers sobre los mismos tokens y retorna los tiempos"""
+    tokens = scan(generate_program(lines))
+
+    # Verificar que ambos parsers producen exactamente la misma salida
+    legacy_parser, statements = parse_with(LegacyParser, tokens)
+    table_parser, _ = parse_with(RobotParser, tokens)
+    assert parser_result(legacy_parser) == parser_result(table_parser)
+
+    legacy = best_time(LegacyParser, tokens, repeat)
+    table = best_time(RobotParser, tokens, repeat)
+    return {
+        'lines': lines,
+        'tokens': len(tokens),
+        'statements': statements,
+        'legacy_seconds': legacy,
+        'table_seconds': table,
+        'legacy_rate': statements / legacy,
+        'table_rate': statements / table,
+        'speedup': legacy / table if table else float('inf'),
+    }
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print("=== BENCHMARK DEL ANALIZADOR SINTÁCTICO ===")
+    print(f"Generando programa sintético de {lines} líneas...")
+    result = run_benchmark(lines)
+    print(f"📊 Tokens: {result['tokens']}, elementos del programa: {result['statements']}")
+    print(f"⏱️ Parser original:          {result['legacy_seconds']:.3f} s ({result['legacy_rate']:,.0f} elementos/s)")
+    print(f"⚡ Parser dirigido por tablas: {result['table_seconds']:.3f} s ({result['table_rate']:,.0f} elementos/s)")
+    print(f"🚀 Aceleración: {result['speedup']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Benchmark del análisis semántico de RobotLexicalAnalyzer
+Compara la pasada única de SemanticAnalyzer contra el analizador original,
+que recorre la tabla de símbolos una vez por verificación y convierte cada
+valor con float(). Reporta el tiempo semántico como fracción del tiempo de
+análisis léxico + sintáctico del mismo programa.
+"""
+
+import sys
+import time
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, RobotParser, SemanticAnalyzer, COMPONENT_RANGES
+from benchmark_lexer import generate_program
+
+class LegacySemanticAnalyzer:
+    """Réplica del analizador semántico original (cinco pasadas y float() por símbolo)"""
+    
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+        self.declared_robots = {}  # {nombre_robot: línea_declaración}
+        self.robot_assignments = {}  # {nombre_robot: {componente: [líneas_asignación]}}
+    
+    def analyze(self, parser):
+        """Realiza el análisis semántico basado en los resultados del parser sintáctico"""
+        self.errors = []
+        self.warnings = []
+        self.declared_robots = {}
+        self.robot_assignments = {}
+        
+        # 1. Verificar declaraciones de robots y asignaciones
+        self._check_robot_declarations(parser)
+        
+        # 2. Verificar unicidad de declaraciones
+        self._check_declaration_uniqueness(parser)
+        
+        # 3. Verificar unicidad de asignaciones
+        self._check_assignment_uniqueness(parser)
+        
+        # 4. Verificar rangos de valores
+        self._check_value_ranges(parser)
+        
+        # 5. Verificar robots no declarados
+        self._check_undeclared_robots(parser)
+        
+        return len(self.errors) == 0
+    
+    def _check_robot_declarations(self, parser):
+        """Verifica las declaraciones de robots en la tabla de símbolos"""
+        for simbolo in parser.tabla_simbolos:
+            if simbolo.es_declaracion:
+                robot_name = simbolo.id
+                if robot_name not in self.declared_robots:
+                    self.declared_robots[robot_name] = 'declarado'
+                    self.robot_assignments[robot_name] = {}
+    
+    def _check_declaration_uniqueness(self, parser):
+        """Verifica que no haya declaraciones duplicadas de robots"""
+        robot_declarations = {}
+        
+        for i, simbolo in enumerate(parser.tabla_simbolos):
+            if simbolo.es_declaracion:
+                robot_name = simbolo.id
+                if robot_name in robot_declarations:
+                    # Encontrada declaración duplicada
+                    linea_anterior = robot_declarations[robot_name]
+                    linea_actual = simbolo.linea if simbolo.linea else "desconocida"
+                    self.errors.append(f"Error semántico en línea {linea_actual}: Robot '{robot_name}' ya fue declarado previamente en línea {linea_anterior}")
+                else:
+                    robot_declarations[robot_name] = simbolo.linea if simbolo.linea else "desconocida"
+    
+    def _check_assignment_uniqueness(self, parser):
+        """Verifica que no haya asignaciones duplicadas para el mismo componente (solo fuera de rutinas)"""
+        # En el contexto de rutinas robóticas, es válido tener múltiples asignaciones
+        # al mismo componente en diferentes momentos de la secuencia.
+        # Esta validación se omite para permitir secuencias de movimiento complejas.
+        pass
+    
+    def _check_value_ranges(self, parser):
+        """Verifica que los valores asignados estén dentro de los rangos válidos"""
+        for simbolo in parser.tabla_simbolos:
+            if not simbolo.es_declaracion:
+                component = simbolo.metodo
+                value = simbolo.valor
+                robot_name = simbolo.id
+                linea = simbolo.linea if simbolo.linea else "desconocida"
+                
+                if component in COMPONENT_RANGES:
+                    range_info = COMPONENT_RANGES[component]
+                    min_val = range_info['min']
+                    max_val = range_info['max']
+                    
+                    try:
+                        numeric_value = float(value)
+                        if numeric_value < min_val or numeric_value > max_val:
+                            self.errors.append(f"Error semántico en línea {linea}: Valor {numeric_value} para '{robot_name}.{component}' fuera del rango válido [{min_val}, {max_val}] - {range_info['description']}")
+                        elif numeric_value == min_val or numeric_value == max_val:
+                            self.warnings.append(f"Advertencia en línea {linea}: Valor {numeric_value} para '{robot_name}.{component}' está en el límite del rango válido")
+                    except ValueError:
+                        self.errors.append(f"Error semántico en línea {linea}: Valor '{value}' para '{robot_name}.{component}' no es un número válido")
+    
+    def _check_undeclared_robots(self, parser):
+        """Verifica que todos los robots usados en asignaciones hayan sido declarados"""
+        for simbolo in parser.tabla_simbolos:
+            # Excluir comandos especiales y símbolos de declaración
+            if not simbolo.es_declaracion and simbolo.id not in ['ESP'] and simbolo.metodo not in ['inicio', 'fin']:
+                robot_name = simbolo.id
+                linea = simbolo.linea if simbolo.linea else "desconocida"
+                if robot_name not in self.declared_robots:
+                    self.errors.append(f"Error semántico en línea {linea}: Robot '{robot_name}' usado sin haber sido declarado")
+
+def lex_and_parse(source_code):
+    """Análisis léxico y sintáctico; retorna el parser"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer._scan(source_code)
+    parser = RobotParser(analyzer.tokens)
+    parser.parse()
+    return parser
+
+def semantic_result(analyzer):
+    """Resumen comparable de la salida de un analizador semántico"""
+    return analyzer.errors, analyzer.warnings, set(analyzer.declared_robots)
+
+def best_time(function, argument, repeat):
+    """Mejor tiempo de `repeat` ejecuciones de function(argument)"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmark(lines=200_000, repeat=3):
+    """Mide ambos analizadores sobre la misma tabla de símbolos y retorna los tiempos"""
+    source_code = generate_program(lines)
+    parser = lex_and_parse(source_code)
+
+    # Verificar que ambos analizadores producen los mismos diagnósticos
+    legacy_analyzer = LegacySemanticAnalyzer()
+    legacy_analyzer.analyze(parser)
+    fused_analyzer = SemanticAnalyzer()
+    fused_analyzer.analyze(parser)
+    assert semantic_result(legacy_analyzer) == semantic_result(fused_analyzer)
+
+    front = best_time(lex_and_parse, source_code, repeat)
+    legacy = best_time(LegacySemanticAnalyzer().analyze, parser, repeat)
+    fused = best_time(SemanticAnalyzer().analyze, parser, repeat)
+    return {
+        'lines': lines,
+        'symbols': len(parser.tabla_simbolos),
+        'front_seconds': front,
+        'legacy_seconds': legacy,
+        'fused_seconds': fused,
+        'legacy_fraction': legacy / front,
+        'fused_fraction': fused / front,
+        'speedup': legacy / fused if fused else float('inf'),
+    }
+
+def main():
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print("=== BENCHMARK DEL ANALIZADOR SEMÁNTICO ===")
+    print(f"Generando programa sintético de {lines} líneas...")
+    result = run_benchmark(lines)
+    print(f"📊 Símbolos: {result['symbols']}")
+    print(f"⏱️ Léxico + sintáctico:     {result['front_seconds']:.3f} s")
+    print(f"⏱️ Semántico original:      {result['legacy_seconds']:.3f} s ({result['legacy_fraction']:.1%})")
+    print(f"⚡ Semántico en una pasada:  {result['fused_seconds']:.3f} s ({result['fused_fraction']:.1%})")
+    print(f"🚀 Aceleración: {result['speedup']:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Benchmark del tiempo de arranque de la interfaz (main.py)
+Ejecuta `python -X importtime -c "import main"` en procesos nuevos (con el
+bytecode ya compilado, como en las PCs del laboratorio), muestra los módulos
+que más tardan en importarse y verifica que el arranque respete el
+presupuesto de tiempo y que no cargue ningún backend: los generadores y sus
+dependencias se importan recién cuando se usa su acción del menú. Con --gui
+(y una pantalla disponible) mide además hasta que la ventana queda dibujada.
+
+    python benchmark_startup.py
+    python benchmark_startup.py --budget 250 --gui
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+# Presupuesto (ms) de los imports de main.py y del arranque completo con --gui
+IMPORT_BUDGET_MS = 250
+STARTUP_BUDGET_MS = 1000
+
+# Módulos que main.py solo debe importar al usarlos
+LAZY_MODULES = (
+    'robodk_mod_generator',
+    'robodk_sequential_generator',
+    'robodk_safe_generator',
+    'robodk_coordinated_generator',
+    'robot_artifact_cache',
+    'create_dynamic_asm_generator',
+    'create_dynamic_motor_com_v2',
+    'proteus_assembly_generator_fixed',
+    'assembly_generator',
+    'pstats',
+)
+
+_ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Arranque completo: crear la ventana y procesar los eventos hasta dibujarla
+_GUI_SCRIPT = """
+import time
+start = time.perf_counter()
+import main
+app = main.LexicalAnalyzerGUI()
+app.root.update()
+print(f"{(time.perf_counter() - start) * 1000:.3f}")
+app.root.destroy()
+"""
+
+def parse_importtime(stderr):
+    """Módulos de la salida de -X importtime: lista de (módulo, propio µs, acumulado µs, profundidad)"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return modules
+
+def _run(args, pycache):
+    """Ejecuta el intérprete en un proceso nuevo con el caché de bytecode en `pycache`"""
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return subprocess.run([sys.executable, '-X', f'pycache_prefix={pycache}', *args],
+                          cwd=_ROOT, env=env, capture_output=True, text=True)
+
+def measure_imports(module='main', runs=5):
+    """Importa `module` `runs` veces y retorna los módulos de la ejecución más rápida"""
+    best = None
+    with tempfile.TemporaryDirectory() as pycache:
+        _run(['-c', f'import {module}'], pycache)  # compila el bytecode
+        for _ in range(runs):
+            result = _run(['-X', 'importtime', '-c', f'import {module}'], pycache)
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip().splitlines()[-1])
+            modules = parse_importtime(result.stderr)
+            total = sum(cumulative for _, _, cumulative, depth in modules if depth == 0)
+            if best is None or total < best[0]:
+                best = (total, modules)
+    return best
+
+def measure_gui(runs=3):
+    """Milisegundos hasta que la ventana queda dibujada (mejor de `runs`); None sin pantalla"""
+    best = None
+    with tempfile.TemporaryDirectory() as pycache:
+        for _ in range(runs + 1):  # la primera ejecución compila el bytecode
+            result = _run(['-c', _GUI_SCRIPT], pycache)
+            if result.returncode != 0:
+                return None
+            elapsed = float(result.stdout.strip().splitlines()[-1])
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def run_benchmark(budget_ms=IMPORT_BUDGET_MS, gui=False, gui_budget_ms=STARTUP_BUDGET_MS, top=15, runs=5):
+    """Mide el arranque y muestra el reporte; retorna True si respeta el presupuesto"""
+    print("=== BENCHMARK DE ARRANQUE (main.py) ===")
+    total_us, modules = measure_imports('main', runs)
+    own = [name for name, *_ in modules if name == 'main' or name.startswith(('robot_', 'robodk_'))]
+    # El total incluye los módulos que el intérprete importa al iniciar (site, encodings)
+    print(f"⏱️ Imports al arrancar: {total_us / 1000:.1f} ms (presupuesto {budget_ms} ms, mejor de {runs})")
+
+    print(f"\n{'módulo':<40} {'propio':>10} {'acumulado':>11}")
+    for name, self_us, cumulative_us, depth in sorted(modules, key=lambda m: -m[2])[:top]:
+        print(f"{'  ' * depth + name:<40} {self_us / 1000:>7.1f} ms {cumulative_us / 1000:>8.1f} ms")
+    print(f"\nMódulos del proyecto: {', '.join(own)}")
+
+    ok = total_us / 1000 <= budget_ms
+    loaded = sorted({name for name, *_ in modules} & set(LAZY_MODULES))
+    if loaded:
+        print(f"❌ El arranque importa módulos que deberían cargarse al usarlos: {', '.join(loaded)}")
+        ok = False
+    else:
+        print("✅ Ningún backend se importa al arrancar")
+
+    if gui:
+        elapsed = measure_gui()
+        if elapsed is None:
+            print("⚠️ No se pudo crear la ventana (¿sin pantalla?): se omite el arranque completo")
+        else:
+            print(f"⏱️ Arranque completo (ventana dibujada): {elapsed:.1f} ms (presupuesto {gui_budget_ms} ms)")
+            ok = ok and elapsed <= gui_budget_ms
+
+    print(f"{'✅' if ok else '❌'} Arranque {'dentro' if ok else 'fuera'} del presupuesto")
+    return ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de arranque de la interfaz")
+    parser.add_argument('--budget', type=float, default=IMPORT_BUDGET_MS,
+                        help="Presupuesto en ms de los imports de main.py")
+    parser.add_argument('--gui', action='store_true', help="Medir también hasta que la ventana queda dibujada")
+    parser.add_argument('--gui-budget', type=float, default=STARTUP_BUDGET_MS,
+                        help="Presupuesto en ms del arranque completo")
+    parser.add_argument('--top', type=int, default=15, help="Módulos más lentos que se muestran")
+    parser.add_argument('--runs', type=int, default=5, help="Ejecuciones (se toma la más rápida)")
+    args = parser.parse_args(argv)
+    return 0 if run_benchmark(args.budget, args.gui, args.gui_budget, args.top, args.runs) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de todas las etapas y backends del compilador
+Genera programas sintéticos a partir de la gramática del lenguaje (de 1k a
+1M sentencias, varios robots, bloques inicio/fin con repetir y esperas) y
+mide por separado el tiempo y el pico de memoria del escáner léxico,
+RobotParser, SemanticAnalyzer, IntermediateCodeGenerator, el recorrido de
+los cuádruplos con una tabla de despacho, ProteusAssemblyGeneratorFixed,
+generate_dynamic_machine_code y RoboDKSequentialGenerator. Los resultados
+se guardan en un JSON de línea base y se comparan contra él para detectar
+regresiones.
+
+    python benchmark_suite.py --sizes 1k,10k,100k --save benchmark_baseline.json
+    python benchmark_suite.py --sizes 1k,10k,100k --compare benchmark_baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from robot_lexical_analyzer import (RobotParser, SemanticAnalyzer, IntermediateCodeGenerator,
+                                    COMPONENT_RANGES, ANALYZER_VERSION)
+from robot_ast import build_program
+from robot_quadruples import OPCODE_NAMES, dispatch_table
+from robot_analysis_cache import shared_cache
+from benchmark_parser import scan
+
+# Versión del formato del JSON de resultados
+BASELINE_FORMAT = 1
+
+# Tamaños por defecto (sentencias)
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# Una medición es regresión si tarda más que la línea base por este factor
+DEFAULT_THRESHOLD = 1.25
+
+# Componentes que se asignan en los programas sintéticos (con valores dentro de rango)
+_MOTION_COMPONENTS = ('base', 'hombro', 'codo', 'muneca', 'inclinacion', 'garra', 'velocidad', 'precision')
+
+def parse_size(text):
+    """Tamaño de --sizes: '1000', '10k' o '1M'"""
+    text = text.strip().lower()
+    factor = 1
+    if text.endswith('k'):
+        factor, text = 1_000, text[:-1]
+    elif text.endswith('m'):
+        factor, text = 1_000_000, text[:-1]
+    return int(float(text) * factor)
+
+def generate_synthetic_program(statements=10_000, robots=3, seed=0, max_depth=2):
+    """Programa sintético de `statements` sentencias (una por línea) derivado de la gramática.
+
+        programa   := declaración+ sentencia*
+        sentencia  := asignación | espera | bloque
+        bloque     := R.inicio R.repetir = N sentencia+ R.fin
+        asignación := R.componente = valor dentro del rango del componente
+
+    Cada sentencia elige al azar uno de los `robots` declarados; los
+    bloques se anidan hasta `max_depth` niveles. El resultado es
+    determinista para cada `seed`.
+    """
+    rnd = random.Random(seed)
+    names = [f"r{i + 1}" for i in range(robots)]
+    lines = [f"Robot {name}" for name in names]
+    ranges = {name: (COMPONENT_RANGES[name]['min'], COMPONENT_RANGES[name]['max']) for name in _MOTION_COMPONENTS}
+    open_blocks = []  # robots de los bloques abiertos
+
+    while len(lines) + len(open_blocks) < statements:
+        choice = rnd.random()
+        robot = rnd.choice(names)
+        if open_blocks and (choice < 0.06 or len(lines) + 2 * len(open_blocks) >= statements):
+            lines.append(f"{open_blocks.pop()}.fin")
+        elif choice < 0.12 and len(open_blocks) < max_depth and len(lines) + len(open_blocks) + 4 <= statements:
+            lines.append(f"{robot}.inicio")
+            lines.append(f"{robot}.repetir = {rnd.randint(1, 10)}")
+            open_blocks.append(robot)
+        elif choice < 0.30:
+            lines.append(f"{robot}.espera = {rnd.choice((0.1, 0.5, 1, 1.5, 2))}")
+        else:
+            component = rnd.choice(_MOTION_COMPONENTS)
+            low, high = ranges[component]
+            if component in ('velocidad', 'precision'):
+                value = rnd.randint(low, high)
+            else:
+                value = round(rnd.uniform(low, high) * 2) / 2
+            lines.append(f"{robot}.{component} = {value:g}")
+    while open_blocks:
+        lines.append(f"{open_blocks.pop()}.fin")
+    return "\n".join(lines[:max(statements, len(names))])
+
+def prepare(source_code):
+    """Entradas de cada etapa (el resultado de la etapa anterior, ya calculado)"""
+    from create_dynamic_motor_com_v2 import motor_values_from_program
+
+    tokens = scan(source_code)
+    parser = RobotParser(tokens)
+    parser.parse()
+    program = build_program(parser.nodes)
+    quadruples = IntermediateCodeGenerator().generar_codigo_intermedio(parser)
+    # El generador .mod toma el análisis del caché compartido: se deja listo
+    shared_cache.analyze(source_code).get_program()
+    with contextlib.redirect_stdout(io.StringIO()):
+        motor_values = motor_values_from_program(program)
+    return {
+        'source': source_code,
+        'tokens': tokens,
+        'parser': parser,
+        'quadruples': quadruples,
+        'motor_commands': [{a['component']: a['value']} for a in parser.assignments],
+        'motor_values': motor_values,
+    }
+
+def _lexer(inputs):
+    return scan(inputs['source'])
+
+def _parser(inputs):
+    parser = RobotParser(inputs['tokens'])
+    parser.parse()
+    return parser
+
+def _semantic(inputs):
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(inputs['parser'])
+    return analyzer
+
+def _intermediate(inputs):
+    generator = IntermediateCodeGenerator()
+    return generator.generar_codigo_intermedio(inputs['parser'])
+
+def _quadruple_walk(inputs):
+    # Recorrido de un backend: un manejador por operación, como AssemblyGenerator
+    visited = [0]
+
+    def visit(arg1, arg2, result):
+        visited[0] += 1
+
+    inputs['quadruples'].dispatch(dispatch_table({name: visit for name in OPCODE_NAMES}))
+    return visited[0]
+
+def _proteus_asm(inputs):
+    from proteus_assembly_generator_fixed import ProteusAssemblyGeneratorFixed
+    return ProteusAssemblyGeneratorFixed().generate_from_robot_data(inputs['motor_commands'], "benchmark")
+
+def _machine_code(inputs):
+    from create_dynamic_motor_com_v2 import generate_dynamic_machine_code
+    return generate_dynamic_machine_code(inputs['motor_values'])
+
+def _robodk_sequential(inputs):
+    from robodk_sequential_generator import RoboDKSequentialGenerator
+    generator = RoboDKSequentialGenerator()
+    generator.analyze_robot_code(inputs['source'])
+    return generator._build_mod_content()
+
+# Etapas medidas, en orden del pipeline: nombre -> función(entradas)
+PHASES = {
+    'lexer': _lexer,
+    'parser': _parser,
+    'semantic': _semantic,
+    'intermediate': _intermediate,
+    'quadruple_walk': _quadruple_walk,
+    'proteus_asm': _proteus_asm,
+    'machine_code': _machine_code,
+    'robodk_sequential': _robodk_sequential,
+}
+
+def measure(function, inputs, repeat=3, memory=True):
+    """Mejor tiempo de `repeat` ejecuciones y pico de memoria (tracemalloc) de una más"""
+    best = None
+    # Los backends informan por consola: se descarta para no alterar la medición
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(inputs)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        peak = None
+        if memory:
+            tracemalloc.start()
+            try:
+                function(inputs)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+    return best, peak
+
+def run_suite(sizes=DEFAULT_SIZES, phases=None, repeat=3, memory=True, seed=0, report=None):
+    """Ejecuta las etapas pedidas para cada tamaño y retorna los resultados (dict serializable)"""
+    phases = list(phases or PHASES)
+    results = {
+        'format': BASELINE_FORMAT,
+        'analyzer_version': ANALYZER_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'sizes': {},
+    }
+    for size in sizes:
+        source_code = generate_synthetic_program(size, seed=seed)
+        inputs = prepare(source_code)
+        size_results = results['sizes'][str(size)] = {}
+        # Los programas grandes se miden una sola vez
+        size_repeat = repeat if size <= 100_000 else 1
+        for name in phases:
+            seconds, peak = measure(PHASES[name], inputs, size_repeat, memory)
+            size_results[name] = {
+                'seconds': seconds,
+                'peak_bytes': peak,
+                'statements_per_second': size / seconds if seconds else None,
+            }
+            if report:
+                report(size, name, size_results[name])
+    return results
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """Compara dos resultados: lista de (tamaño, etapa, segundos base, segundos actuales, factor, regresión)"""
+    rows = []
+    for size, phases in current['sizes'].items():
+        base_phases = baseline.get('sizes', {}).get(size, {})
+        for name, result in phases.items():
+            base = base_phases.get(name)
+            if not base or not base.get('seconds'):
+                continue
+            ratio = result['seconds'] / base['seconds']
+            rows.append((int(size), name, base['seconds'], result['seconds'], ratio, ratio > threshold))
+    return rows
+
+def save_results(results, path):
+    """Guarda los resultados como JSON de línea base"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+def load_results(path):
+    """Lee un JSON de línea base"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _print_measurement(size, name, result):
+    memory = f"{result['peak_bytes'] / 1e6:8.1f} MB" if result['peak_bytes'] is not None else ""
+    print(f"  {size:>9,} {name:<18} {result['seconds'] * 1000:10.1f} ms {memory}", flush=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de las etapas y backends del compilador")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="Tamaños en sentencias separados por coma (por ejemplo 1k,10k,100k,1M)")
+    parser.add_argument('--phases', default=','.join(PHASES),
+                        help=f"Etapas separadas por coma ({', '.join(PHASES)})")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por medición (se toma la mejor)")
+    parser.add_argument('--no-memory', action='store_true', help="No medir el pico de memoria")
+    parser.add_argument('--seed', type=int, default=0, help="Semilla del generador de programas")
+    parser.add_argument('--save', metavar='JSON', help="Guardar los resultados como línea base")
+    parser.add_argument('--compare', metavar='JSON', help="Comparar contra una línea base")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Factor de tiempo a partir del cual se reporta una regresión")
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(',') if size.strip()]
+    phases = [name.strip() for name in args.phases.split(',') if name.strip()]
+    unknown = [name for name in phases if name not in PHASES]
+    if unknown:
+        parser.error(f"etapas desconocidas: {', '.join(unknown)}")
+
+    print("=== SUITE DE BENCHMARKS DEL COMPILADOR ===")
+    print(f"  {'sentencias':>9} {'etapa':<18} {'tiempo':>13} {'pico':>11}")
+    results = run_suite(sizes, phases, args.repeat, not args.no_memory, args.seed, _print_measurement)
+
+    if args.save:
+        save_results(results, args.save)
+        print(f"💾 Línea base guardada en {args.save}")
+
+    if args.compare:
+        rows = compare(results, load_results(args.compare), args.threshold)
+        print(f"\n=== COMPARACIÓN CON {args.compare} ===")
+        for size, name, base, current, ratio, regression in rows:
+            mark = "❌" if regression else "✅"
+            print(f"{mark} {size:>9,} {name:<18} {base * 1000:10.1f} ms → {current * 1000:10.1f} ms ({ratio:.2f}x)")
+        regressions = sum(1 for row in rows if row[5])
+        print(f"📊 {regressions} regresiones (umbral {args.threshold:.2f}x)")
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
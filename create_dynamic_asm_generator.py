@@ -7,10 +7,20 @@ Lee los valores de la sintaxis Robot y genera código ASM personalizado
 import os
 from datetime import datetime
 
+from robot_loops import loop_structure
+from robot_motion import motion_plan, final_pose, segments
+from robot_stepping import DEFAULT_STEP_MODELS
+
+# Backend del ASM dinámico en el caché de artefactos
+ASM_BACKEND_ID = 'dynamic-asm'
+ASM_BACKEND_VERSION = '3'
+
 class DynamicASMGenerator:
     """Generador de código ASM dinámico basado en valores del usuario"""
     
-    def __init__(self):
+    def __init__(self, step_models=None):
+        # Modelo de pasos de cada motor (robot_stepping.StepModel)
+        self.step_models = {**DEFAULT_STEP_MODELS, **(step_models or {})}
         self.port_addresses = {
             'base': '00h',      # Puerto A del 8255 (como en tu ASM exitoso)
             'hombro': '02h',    # Puerto B del 8255
@@ -47,6 +57,11 @@ class DynamicASMGenerator:
         }
         
         try:
+            # Con árbol sintáctico: pose final, velocidad del último movimiento y
+            # última espera del plan de movimiento
+            if getattr(analyzer, 'parser', None) is not None and hasattr(analyzer, 'get_program'):
+                return self.values_from_program(analyzer.get_program(), motor_values)
+            
             # Extraer de tokens del analizador
             if hasattr(analyzer, 'tokens') and analyzer.tokens:
                 i = 0
@@ -77,6 +92,23 @@ class DynamicASMGenerator:
         
         return motor_values
     
+    def values_from_program(self, program, defaults):
+        """
+        Valores del ASM a partir del plan de movimiento del programa (ver
+        robot_motion.motion_plan); lo que el programa no asigna queda en `defaults`
+        """
+        axes = ('base', 'hombro', 'codo')
+        initial = {axis: defaults[axis] for axis in axes}
+        plan = motion_plan(loop_structure(program), defaults['velocidad'], initial=initial, axes=axes)
+        motor_values = dict(defaults, **final_pose(plan, initial))
+        for segment in segments(plan):
+            motor_values['velocidad'] = segment.speed
+            if segment.dwell:
+                motor_values['espera'] = segment.dwell
+        for component, value in motor_values.items():
+            print(f"✅ Extraído {component} = {value}")
+        return motor_values
+    
     def create_asm_code(self, motor_values, program_name):
         """
         Crea código ASM personalizado basado en los valores
@@ -84,9 +116,9 @@ class DynamicASMGenerator:
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Calcular pasos dinámicos
-        base_steps = self.angle_to_steps(motor_values['base'])
-        hombro_steps = self.angle_to_steps(motor_values['hombro'])  
-        codo_steps = self.angle_to_steps(motor_values['codo'])
+        base_steps = abs(self.angle_to_steps('base', motor_values['base']))
+        hombro_steps = abs(self.angle_to_steps('hombro', motor_values['hombro']))
+        codo_steps = abs(self.angle_to_steps('codo', motor_values['codo']))
         
         # Calcular delays dinámicos
         base_delay = self.calculate_delay(motor_values['velocidad'], motor_values['espera'])
@@ -108,6 +140,7 @@ class DynamicASMGenerator:
 ; ----------------------------------------------
 
 CODE        SEGMENT
+        ASSUME  CS:CODE, DS:CODE
 
 PORTA   EQU {self.port_addresses['base']}            ; Dirección Puerto A - BASE
 PORTB   EQU {self.port_addresses['hombro']}          ; Dirección Puerto B - HOMBRO
@@ -123,92 +156,18 @@ Config  EQU {self.port_addresses['config']}          ; Dirección registro de co
 
 ;=======================================================
 START:
-;======== MOTOR BASE (Puerto A) - {motor_values['base']}° ===========================
-        MOV     DX, PORTA
-        ; Ejecutar {base_steps} pasos para {motor_values['base']} grados
-        MOV     CX, {base_steps}
-BASE_LOOP:
-        MOV     AL, 00000110B        ; Paso 1
-        OUT     DX, AL
-        MOV     BX, {base_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001100B        ; Paso 2
-        OUT     DX, AL
-        MOV     BX, {base_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001001B        ; Paso 3
-        OUT     DX, AL
-        MOV     BX, {base_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00000011B        ; Paso 4
-        OUT     DX, AL
-        MOV     BX, {base_delay}
-        CALL    DELAY_ROUTINE
-        
-        LOOP    BASE_LOOP
-
-;======== MOTOR HOMBRO (Puerto B) - {motor_values['hombro']}° ===========================
-        MOV     DX, PORTB
-        ; Ejecutar {hombro_steps} pasos para {motor_values['hombro']} grados
-        MOV     CX, {hombro_steps}
-HOMBRO_LOOP:
-        MOV     AL, 00000110B        ; Paso 1
-        OUT     DX, AL
-        MOV     BX, {hombro_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001100B        ; Paso 2
-        OUT     DX, AL
-        MOV     BX, {hombro_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001001B        ; Paso 3
-        OUT     DX, AL
-        MOV     BX, {hombro_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00000011B        ; Paso 4
-        OUT     DX, AL
-        MOV     BX, {hombro_delay}
-        CALL    DELAY_ROUTINE
-        
-        LOOP    HOMBRO_LOOP
-
-;======== MOTOR CODO (Puerto C) - {motor_values['codo']}° ===========================
-        MOV     DX, PORTC
-        ; Ejecutar {codo_steps} pasos para {motor_values['codo']} grados
-        MOV     CX, {codo_steps}
-CODO_LOOP:
-        MOV     AL, 00000110B        ; Paso 1
-        OUT     DX, AL
-        MOV     BX, {codo_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001100B        ; Paso 2
-        OUT     DX, AL
-        MOV     BX, {codo_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00001001B        ; Paso 3
-        OUT     DX, AL
-        MOV     BX, {codo_delay}
-        CALL    DELAY_ROUTINE
-
-        MOV     AL, 00000011B        ; Paso 4
-        OUT     DX, AL
-        MOV     BX, {codo_delay}
-        CALL    DELAY_ROUTINE
-        
-        LOOP    CODO_LOOP
+{self.motor_block('base', 'BASE', 'PORTA', 'Puerto A', motor_values['base'], base_delay)}
+{self.motor_block('hombro', 'HOMBRO', 'PORTB', 'Puerto B', motor_values['hombro'], hombro_delay)}
+{self.motor_block('codo', 'CODO', 'PORTC', 'Puerto C', motor_values['codo'], codo_delay)}
 
         ; Terminar programa limpiamente
         MOV     AH, 4Ch
         MOV     AL, 0
         INT     21h
 
+;------ Fases de las bobinas de cada motor (sentido de avance) ------
+{self.phase_tables()}
+
 ;=======================================================
 ; RUTINA DE DELAY DINÁMICA
 ; BX contiene el factor de delay
@@ -232,14 +191,43 @@ CODE        ENDS
 
         return asm_code
     
-    def angle_to_steps(self, angle):
+    def angle_to_steps(self, motor, angle):
+        """
+        Convierte ángulo a número de pasos (con signo) según el modelo del motor
+        """
+        return self.step_models[motor].steps(0, angle)
+    
+    def motor_block(self, motor, label, port, port_name, angle, delay):
         """
-        Convierte ángulo a número de pasos
+        Movimiento de un motor: ciclo contado con CX de un paso por vuelta que
+        recorre su tabla de fases con SI, hacia adelante o hacia atrás
         """
-        # Motor paso a paso estándar: 1.8° por paso
-        steps_per_degree = 200 / 360  # ≈ 0.56 pasos por grado
-        steps = max(1, int(angle * steps_per_degree))
-        return min(steps, 50)  # Limitar pasos para evitar archivos muy grandes
+        steps = self.angle_to_steps(motor, angle)
+        phases = len(self.step_models[motor].phases)
+        return f"""
+;======== MOTOR {label} ({port_name}) - {angle}° ===========================
+        MOV     DX, {port}
+        ; Ejecutar {abs(steps)} pasos para {angle} grados
+        MOV     CX, {abs(steps)}
+        JCXZ    {label}_FIN
+        XOR     SI, SI
+{label}_LOOP:
+        {'INC' if steps > 0 else 'DEC'}     SI
+        AND     SI, {phases - 1}
+        MOV     AL, FASES_{label}[SI]
+        OUT     DX, AL
+        MOV     BX, {delay}
+        CALL    DELAY_ROUTINE
+        LOOP    {label}_LOOP
+{label}_FIN:"""
+    
+    def phase_tables(self):
+        """
+        Tablas de fases de los tres motores
+        """
+        return "\n".join(
+            f"FASES_{motor.upper():<7}DB      " + ", ".join(f"{phase:02X}h" for phase in self.step_models[motor].phases)
+            for motor in ('base', 'hombro', 'codo'))
     
     def calculate_delay(self, velocidad, espera):
         """
@@ -265,6 +253,26 @@ def generate_dynamic_asm_from_analyzer(analyzer, program_name="robot_dynamic"):
     generator = DynamicASMGenerator()
     return generator.generate_dynamic_asm(analyzer, program_name)
 
+def export_dynamic_asm(analyzer, asm_path, program_name="robot_dynamic"):
+    """
+    Escribe en asm_path el ASM dinámico del código cargado en el analizador
+    (desde el caché de artefactos si ya se generó) y retorna el código ASM
+    """
+    from robot_artifact_cache import shared_artifact_cache as artifacts
+    
+    key = artifacts.key(analyzer.source_code, ASM_BACKEND_ID, ASM_BACKEND_VERSION,
+                        {'program_name': program_name})
+    
+    def build():
+        asm_code = generate_dynamic_asm_from_analyzer(analyzer, program_name)
+        with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
+            f.write(asm_code)
+        return True
+    
+    artifacts.export(key, asm_path, build)
+    with open(asm_path, 'r', encoding='ascii', errors='ignore') as f:
+        return f.read()
+
 if __name__ == "__main__":
     # Test con valores ficticios
     class MockAnalyzer:
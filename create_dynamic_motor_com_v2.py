@@ -7,8 +7,34 @@ Generador DINÁMICO de archivos .COM v3
 """
 
 import os
+import json
 import time
 
+from robot_analysis_cache import shared_cache
+from robot_artifact_cache import shared_artifact_cache
+from robot_loops import Loop, LoopPolicy, loop_structure
+from robot_motion import motion_plan
+from robot_stepping import DEFAULT_STEP_MODELS
+from robot_timing import DelayTiming
+from robot_emitter import Emitter
+
+# Backend del .COM dinámico en el caché de artefactos
+COM_BACKEND_ID = 'dynamic-motor-com'
+COM_BACKEND_VERSION = '10'
+
+# Motores del .COM (puertos A, B y C del 8255)
+COM_AXES = ('base', 'hombro', 'codo')
+
+# Dirección de carga de un .COM
+COM_ORIGIN = 0x100
+
+# Ticks por ciclo de pasos: el error de Bresenham (una palabra) no desborda
+COM_MAX_TICKS = 0x7FFF
+
+# Bytes hasta los que se desenrolla una repetición (cuerpo x veces): se
+# ahorra el DEC/JNZ de cada vuelta solo en cuerpos de uno o dos movimientos
+COM_UNROLL_BUDGET = 256
+
 def create_dynamic_motor_com(analyzer):
     """
     Crea motor_user.com DINÁMICO basado en los valores del código Robot del usuario
@@ -27,12 +53,12 @@ def create_dynamic_motor_com(analyzer):
             print(f"• {i+1}. {mov['tipo']}: {mov['valor']}")
         
         # Generar código máquina dinámico con velocidades
-        machine_code = generate_dynamic_machine_code(motor_values)
+        machine_code = build_dynamic_com(motor_values)
         
         # Escribir archivo .COM dinámico
         com_path = os.path.join(tasm_dir, "motor_user.com")
         with open(com_path, 'wb') as f:
-            f.write(bytes(machine_code))
+            f.write(machine_code)
         
         file_size = len(machine_code)
         print(f"\nmotor_user.com DINÁMICO creado! Tamaño: {file_size} bytes")
@@ -46,9 +72,27 @@ def create_dynamic_motor_com(analyzer):
         print(f"Error creando motor_user.com dinámico: {e}")
         return False, {}
 
-def extract_motor_values_enhanced(analyzer):
+def build_dynamic_com(motor_values, loop_policy=None, step_models=None, timing=None):
+    """
+    Bytes del .COM dinámico para la secuencia `motor_values` (del caché de
+    artefactos si ya se generó para la misma secuencia)
+    """
+    loop_policy = loop_policy if loop_policy is not None else LoopPolicy(COM_UNROLL_BUDGET)
+    key = shared_artifact_cache.key(json.dumps(motor_values, sort_keys=True),
+                                    COM_BACKEND_ID, COM_BACKEND_VERSION,
+                                    {'unroll_budget': loop_policy.budget,
+                                     'step_models': repr(sorted((step_models or {}).items())),
+                                     'timing': repr(timing or DelayTiming())})
+    machine_code = shared_artifact_cache.get(key)
+    if machine_code is None:
+        machine_code = bytes(generate_dynamic_machine_code(motor_values, loop_policy, step_models, timing))
+        shared_artifact_cache.put(key, machine_code)
+    return machine_code
+
+def extract_motor_values_enhanced(analyzer, level=0):
     """
     Extrae la secuencia completa de movimientos y velocidades del código Robot
+    (con el plan de movimiento optimizado con -O`level`, ver robot_motion)
     """
     motor_values = {
         'movimientos': [],
@@ -56,12 +100,10 @@ def extract_motor_values_enhanced(analyzer):
     }
     
     try:
-        # Intentar extraer del código crudo si está disponible
-        raw_code = getattr(analyzer, 'raw_code', '') or getattr(analyzer, 'code', '')
-        
-        if raw_code:
-            print("🔍 Parseando código Robot completo...")
-            motor_values = parse_robot_syntax_complete(raw_code)
+        # Usar el árbol sintáctico del último análisis si está disponible
+        if getattr(analyzer, 'parser', None) is not None and hasattr(analyzer, 'get_program'):
+            print("🔍 Recorriendo el árbol sintáctico del código Robot...")
+            motor_values = motor_values_from_program(analyzer.get_program(), level)
         else:
             # Fallback al método original
             print("🔍 Usando método de extracción original...")
@@ -90,60 +132,43 @@ def parse_robot_syntax_complete(code):
     """
     Parsea la sintaxis completa del robot incluyendo velocidades
     """
+    return motor_values_from_program(shared_cache.analyze(code).get_program())
+
+def motor_values_from_program(program, level=0):
+    """
+    Secuencia de posiciones de los motores a partir del árbol sintáctico.
+    Cada segmento del plan de movimiento (ver robot_motion.motion_plan,
+    optimizado con -O`level`) es un comando {'tipo': 'pose', 'valor':
+    {motor: grados}, 'velocidad': s, 'espera': s} con los motores que llegan
+    juntos a esa pose, y cada repetición un comando {'tipo': 'repetir',
+    'valor': N, 'movimientos': [...]} con su cuerpo
+    """
+    plan = motion_plan(loop_structure(program), 1.0, axes=COM_AXES, level=level)
+    return {
+        'movimientos': _motor_commands(plan),
+        'repeticiones': 1
+    }
+
+def _motor_commands(plan):
+    """Comandos de motor de los segmentos del plan de movimiento"""
     movimientos = []
-    repeticiones = 1
     
-    lines = code.strip().split('\n')
-    
-    for line in lines:
-        line = line.strip()
-        if not line or line.startswith('#') or line.startswith('Robot') or line.endswith('.inicio') or line.endswith('.fin'):
-            continue
-            
-        # Detectar asignaciones con velocidad
-        if '.velocidad' in line and '=' in line:
-            try:
-                valor = float(line.split('=')[1].strip())
-                movimientos.append({'tipo': 'velocidad', 'valor': valor})
-                print(f"  ✓ Velocidad: {valor}s")
-            except ValueError:
-                pass
-                
-        elif '.base' in line and '=' in line:
-            try:
-                valor = int(line.split('=')[1].strip())
-                movimientos.append({'tipo': 'base', 'valor': valor})
-                print(f"  ✓ Base: {valor}°")
-            except ValueError:
-                pass
-                
-        elif '.hombro' in line and '=' in line:
-            try:
-                valor = int(line.split('=')[1].strip())
-                movimientos.append({'tipo': 'hombro', 'valor': valor})
-                print(f"  ✓ Hombro: {valor}°")
-            except ValueError:
-                pass
-                
-        elif '.codo' in line and '=' in line:
-            try:
-                valor = int(line.split('=')[1].strip())
-                movimientos.append({'tipo': 'codo', 'valor': valor})
-                print(f"  ✓ Codo: {valor}°")
-            except ValueError:
-                pass
-                
-        elif '.repetir' in line and '=' in line:
-            try:
-                repeticiones = int(line.split('=')[1].strip())
-                print(f"  ✓ Repeticiones: {repeticiones}")
-            except ValueError:
-                pass
+    for item in plan:
+        if isinstance(item, Loop):
+            cuerpo = _motor_commands(item.body)
+            if cuerpo:
+                movimientos.append({'tipo': 'repetir', 'valor': item.count, 'movimientos': cuerpo})
+                print(f"  ✓ Repetir {item.count} veces ({len(cuerpo)} comandos)")
+        else:
+            # Los grados pasan sin truncar: StepModel.position redondea al paso más cercano
+            destino = dict(item.targets)
+            if destino or item.dwell:
+                movimientos.append({'tipo': 'pose', 'valor': destino, 'velocidad': item.speed,
+                                    'espera': item.dwell})
+                motores = ", ".join(f"{motor.capitalize()}: {valor}°" for motor, valor in destino.items())
+                print(f"  ✓ Pose {motores or 'sin movimiento'} en {item.speed}s, espera {item.dwell}s")
     
-    return {
-        'movimientos': movimientos,
-        'repeticiones': repeticiones
-    }
+    return movimientos
 
 def extract_motor_values_original(analyzer):
     """
@@ -179,177 +204,279 @@ def extract_motor_values_original(analyzer):
     except Exception as e:
         raise ValueError(f"Error extrayendo valores: {e}")
 
-def generate_dynamic_machine_code(motor_values=None):
+def generate_dynamic_machine_code(motor_values=None, loop_policy=None, step_models=None, timing=None):
     """
     Genera código máquina dinámico basado en la secuencia de movimientos
+    (bytes del programa de emit_dynamic_program)
     """
-    machine_code = []
+    programa = emit_dynamic_program(motor_values, loop_policy, step_models, timing)
+    machine_code = programa.assemble()
+    print(f"Código máquina generado: {len(machine_code)} bytes")
+    return machine_code
+
+def emit_dynamic_program(motor_values=None, loop_policy=None, step_models=None, timing=None):
+    """
+    Programa .COM (robot_emitter.Emitter) de la secuencia de movimientos.
+    Cada pose ({'tipo': 'pose'}) gira sus motores los pasos que corresponden
+    al cambio de ángulo según `step_models` (motor -> StepModel, por defecto
+    robot_stepping.DEFAULT_STEP_MODELS) y espera al llegar; las demoras se
+    calibran con `timing` (robot_timing.DelayTiming, por defecto un 8086 a
+    3 MHz); los comandos sueltos 'velocidad', 'base', 'hombro' y
+    'codo' del formato anterior se aceptan como poses de un motor. Las
+    repeticiones ({'tipo': 'repetir'}) se emiten como ciclos contados con
+    SI, salvo las que `loop_policy` desenrolla
+    """
+    programa = Emitter(origin=COM_ORIGIN)
+    loop_policy = loop_policy if loop_policy is not None else LoopPolicy(COM_UNROLL_BUDGET)
+    step_models = step_models or {}
+    timing = timing or DelayTiming()
 
     repeticiones = motor_values.get('repeticiones', 1)
     if repeticiones < 1:
         repeticiones = 1
 
-    # Obtener secuencia de movimientos
+    # Obtener secuencia de movimientos (cada vuelta del ciclo principal tiene
+    # que empezar en la misma pose: se trata como una repetición más)
     movimientos = motor_values.get('movimientos', [])
-    
-    # Calcular iteraciones de delay para 3 MHz
-    def delay_count(segundos):
-        ciclos_por_iteracion = 5
-        ciclos_totales = int(segundos * 3_000_000)
-        return max(1, ciclos_totales // ciclos_por_iteracion)
+    if repeticiones > 1:
+        movimientos = [{'tipo': 'repetir', 'valor': repeticiones, 'movimientos': movimientos}]
 
+    # Datos del programa después del código (DS = CS): tabla de fases, fase
+    # actual y error de Bresenham de cada motor; y la subrutina DELAY
+    modelos = {motor: step_models.get(motor, DEFAULT_STEP_MODELS[motor]) for motor in COM_AXES}
+    tablas = {motor: programa.label(f"fases_{motor}") for motor in COM_AXES}
+    fases = {motor: programa.label(f"fase_{motor}") for motor in COM_AXES}
+    errores = {motor: programa.label(f"error_{motor}") for motor in COM_AXES}
+    delay = programa.label('delay')
+
+    # Demoras: MOV AX / MOV DX con la cuenta de 32 bits y CALL DELAY (ver robot_timing)
     def add_delay(segundos):
         if segundos <= 0:
             return
         
-        total_count = delay_count(segundos)
-        while total_count > 0:
-            cx = min(total_count, 65535)
-            machine_code.extend([0xB9, cx & 0xFF, (cx >> 8) & 0xFF])  # MOV CX, cx
-            loop_pos = len(machine_code)
-            machine_code.extend([0x90])  # NOP
-            machine_code.extend([0x49])  # DEC CX
-            rel = loop_pos - (len(machine_code) + 2)
-            machine_code.extend([0x75, rel & 0xFF])  # JNZ
-            total_count -= cx
-
-    # Secuencias de pasos
-    steps_forward = [0x09, 0x0C, 0x06, 0x03]  # Horario
-    steps_backward = [0x03, 0x06, 0x0C, 0x09]  # Antihorario
-
-    def generar_movimiento_motor(port, direccion_positiva, velocidad_seg):
-        """Genera movimiento con velocidad específica"""
+        cuenta = timing.count(segundos)
+        programa.emit([0xB8, cuenta & 0xFF, (cuenta >> 8) & 0xFF], f"MOV AX, {cuenta & 0xFFFF:04X}h")
+        programa.emit([0xBA, (cuenta >> 16) & 0xFF, (cuenta >> 24) & 0xFF], f"MOV DX, {cuenta >> 16:04X}h")
+        programa.call(delay, f"CALL {delay.name}    ; {segundos:.6g} s")
+
+    def generar_paso(motor, avanza):
+        """Un paso de `motor`: siguiente fase (o anterior) de su tabla al puerto"""
+        fase, tabla = fases[motor], tablas[motor]
+        programa.emit_address([0xA0], fase, text=f"MOV AL, [{fase.name}]")
+        programa.emit([0xFE, 0xC0 if avanza else 0xC8], "INC AL" if avanza else "DEC AL")
+        mascara = len(modelos[motor].phases) - 1
+        programa.emit([0x24, mascara], f"AND AL, {mascara}")
+        programa.emit_address([0xA2], fase, text=f"MOV [{fase.name}], AL")
+        programa.emit_address([0xBB], tabla, text=f"MOV BX, {tabla.name}")
+        programa.emit([0xD7], "XLAT")
+        programa.emit([0xBA, puertos[motor], 0x00], f"MOV DX, {puertos[motor]:04X}h")
+        programa.emit([0xEE], "OUT DX, AL")
+
+    def generar_movimiento_coordinado(pasos, velocidad_seg):
+        """Mueve a la vez los motores de `pasos` (motor -> pasos con signo).
+
+        Es un ciclo contado con CX de un tick por paso del motor más largo; en
+        cada tick los demás motores avanzan según el Bresenham de
+        robot_stepping.interleaved_ticks, calculado en ejecución con su error
+        en memoria, y la demora va después del tick. El movimiento dura
+        `velocidad_seg` segundos y el tamaño del código no depende del ángulo.
+        """
         if velocidad_seg <= 0:
             velocidad_seg = 0.1
-            
-        secuencia = steps_forward if direccion_positiva else steps_backward
-        tiempo_por_paso = velocidad_seg * 2 / len(secuencia)
-
-        # MOV DX, port
-        machine_code.extend([0xBA, port, 0x00])
         
-        for i, step in enumerate(secuencia):
-            # MOV AL, step
-            machine_code.extend([0xB0, step])
-            # OUT DX, AL  
-            machine_code.extend([0xEE])
-            
-            # Delay entre pasos (excepto el último)
-            if i < len(secuencia) - 1:
-                add_delay(tiempo_por_paso)
+        total = max(abs(n) for n in pasos.values())
+        # El error de Bresenham es una palabra: los movimientos muy largos se
+        # parten en tramos de hasta COM_MAX_TICKS ticks
+        tramos = -(-total // COM_MAX_TICKS)
+        for i in range(tramos):
+            tramo = {motor: n * (i + 1) // tramos - n * i // tramos for motor, n in pasos.items()}
+            ticks = max(abs(n) for n in tramo.values())
+            tiempo_por_tick = velocidad_seg / total
+            parciales = [motor for motor, n in tramo.items() if 0 < abs(n) < ticks]
+            for motor in parciales:
+                error = errores[motor]
+                programa.emit_address([0xC7, 0x06], error, [(ticks // 2) & 0xFF, (ticks // 2) >> 8],
+                                      f"MOV WORD [{error.name}], {ticks // 2}")
+            programa.emit([0xB9, ticks & 0xFF, ticks >> 8], f"MOV CX, {ticks}")
+            tick = programa.label('tick')
+            programa.bind(tick)
+            for motor, n in tramo.items():
+                if n == 0:
+                    continue
+                if motor not in parciales:
+                    generar_paso(motor, n > 0)
+                    continue
+                error, sin_paso = errores[motor], programa.label('sin_paso')
+                programa.emit_address([0x81, 0x06], error, [abs(n) & 0xFF, abs(n) >> 8],
+                                      f"ADD WORD [{error.name}], {abs(n)}")
+                programa.emit_address([0x81, 0x3E], error, [ticks & 0xFF, ticks >> 8],
+                                      f"CMP WORD [{error.name}], {ticks}")
+                programa.jump('jb', sin_paso, f"JB {sin_paso.name}")
+                programa.emit_address([0x81, 0x2E], error, [ticks & 0xFF, ticks >> 8],
+                                      f"SUB WORD [{error.name}], {ticks}")
+                generar_paso(motor, n > 0)
+                programa.bind(sin_paso)
+            add_delay(tiempo_por_tick)
+            programa.jump('loop', tick, f"LOOP {tick.name}")
 
     # Configurar puerto 6h como salida
-    machine_code.extend([0xBA, 0x06, 0x00])  # MOV DX, 0006h
-    machine_code.extend([0xB0, 0x80])        # MOV AL, 80h
-    machine_code.extend([0xEE])              # OUT DX, AL
+    programa.emit([0xBA, 0x06, 0x00], "MOV DX, 0006h")
+    programa.emit([0xB0, 0x80], "MOV AL, 80h")
+    programa.emit([0xEE], "OUT DX, AL")
 
     # Inicializar motores en 0
     for port in [0x00, 0x02, 0x04]:
-        machine_code.extend([
-            0xBA, port, 0x00,
-            0xB0, 0x00,
-            0xEE
-        ])
+        programa.emit([0xBA, port, 0x00], f"MOV DX, {port:04X}h")
+        programa.emit([0xB0, 0x00], "MOV AL, 00h")
+        programa.emit([0xEE], "OUT DX, AL")
 
     add_delay(0.1)
 
-    # Bucle de repeticiones
-    machine_code.extend([0xBE, repeticiones & 0xFF, (repeticiones >> 8) & 0xFF])  # MOV SI, repeticiones
-    loop_start = len(machine_code)
-
     # PROCESAR SECUENCIA DE MOVIMIENTOS
     posiciones = {'base': 0, 'hombro': 0, 'codo': 0}
     puertos = {'base': 0x00, 'hombro': 0x02, 'codo': 0x04}
-    velocidades_motores = {}  # Guardar velocidad específica de cada motor
-    orden_movimientos = []    # Guardar orden de motores para retorno inverso
     velocidad_actual = 1.0
-    
-    print("=== GENERANDO CÓDIGO PARA SECUENCIA ===")
-    
-    # FASE 1: Movimientos de IDA (con velocidades específicas)
-    for mov in movimientos:
-        tipo = mov['tipo']
-        valor = mov['valor']
-        
-        if tipo == 'velocidad':
-            velocidad_actual = valor
-            print(f"Velocidad establecida: {velocidad_actual}s")
-            
-        elif tipo in ['base', 'hombro', 'codo']:
-            motor = tipo
-            puerto = puertos[motor]
-            pos_actual = posiciones[motor]
-            
-            if valor > 0 and pos_actual == 0:
-                # Movimiento IDA - Asociar velocidad actual con este motor
-                velocidades_motores[motor] = velocidad_actual
-                orden_movimientos.append(motor)
-                
-                print(f"{motor.upper()}: 0° → {valor}° en {velocidad_actual}s")
-                generar_movimiento_motor(puerto, True, velocidad_actual)
+
+    def estado():
+        """Pose y velocidad actuales (de ellas depende el código de una vuelta)"""
+        return dict(posiciones), velocidad_actual
+
+    def restaurar(anterior):
+        nonlocal velocidad_actual
+        posiciones.update(anterior[0])
+        velocidad_actual = anterior[1]
+
+    def generar_pose(destino, velocidad, espera):
+        """Lleva los motores a `destino` (motor -> grados) a la vez y espera `espera` segundos"""
+        pasos = {}
+        for motor, valor in destino.items():
+            if valor != posiciones[motor]:
+                n = modelos[motor].steps(posiciones[motor], valor)
+                print(f"{motor.upper()}: {posiciones[motor]}° → {valor}° ({n} pasos) en {velocidad}s")
+                if n:
+                    pasos[motor] = n
                 posiciones[motor] = valor
-              
-                
-            elif valor == 0 and pos_actual > 0:
-                # Este caso se procesará en FASE 2
-                pass
-    
-    # FASE 2: Movimientos de REGRESO (orden inverso, velocidad rápida)
-    print("\n=== RETORNO EN ORDEN INVERSO ===")
-    motores_a_regresar = []
-    
-    # Recopilar motores que necesitan regresar a 0
-    for mov in movimientos:
-        tipo = mov['tipo']
-        valor = mov['valor']
+        if pasos:
+            generar_movimiento_coordinado(pasos, velocidad)
+        add_delay(espera)
+
+    def generar_ciclo(veces, cuerpo):
+        """Ciclo contado con SI que ejecuta `veces` veces el fragmento `cuerpo`"""
+        inicio = programa.label('vuelta')
+        programa.emit([0xBE, veces & 0xFF, (veces >> 8) & 0xFF], f"MOV SI, {veces}")
+        programa.bind(inicio)
+        programa.extend(cuerpo)
+        programa.emit([0x4E], "DEC SI")
+        programa.jump('jnz', inicio, f"JNZ {inicio.name}")
+
+    def generar_repeticion(veces, cuerpo):
+        """Cuerpo de una repetición como ciclo contado (o copiado `veces` veces)"""
+        if veces < 1:
+            return
+        entrada = estado()
+        inicio_cuerpo = programa.mark()
+        generar_secuencia(cuerpo)
+        if estado() != entrada:
+            # La primera vuelta parte de otra pose que las siguientes: queda
+            # aparte y el ciclo repite las demás desde la pose en que termina
+            veces -= 1
+            inicio_cuerpo = programa.mark()
+            generar_secuencia(cuerpo)
+        codigo_cuerpo = programa.take(inicio_cuerpo)
+        tamano = codigo_cuerpo.size()
+        if not tamano or veces < 1:
+            return
+        # Cada copia tiene sus propias etiquetas
+        if loop_policy.unroll(tamano, veces):
+            print(f"Repetición x{veces} desenrollada ({tamano} bytes por vuelta)")
+            programa.extend(codigo_cuerpo)
+            for _ in range(veces - 1):
+                programa.extend(programa.copy(codigo_cuerpo))
+            return
+        print(f"Repetición x{veces} como ciclo ({tamano} bytes)")
+        programa.emit([0x56], "PUSH SI")
+        generar_ciclo(veces, codigo_cuerpo)
+        programa.emit([0x5E], "POP SI")
+
+    def generar_secuencia(movimientos):
+        """Poses de `movimientos` en orden (las repeticiones, anidadas)"""
+        nonlocal velocidad_actual
+        for mov in movimientos:
+            tipo = mov['tipo']
+            valor = mov['valor']
         
-        if tipo in ['base', 'hombro', 'codo'] and valor == 0:
-            motor = tipo
-            if posiciones[motor] > 0:  # Solo si está en posición diferente de 0
-                motores_a_regresar.append(motor)
-    
-    # Retornar en orden inverso al orden de movimiento
-    for motor in reversed(orden_movimientos):
-        if motor in motores_a_regresar:
-            puerto = puertos[motor]
-            pos_actual = posiciones[motor]
-            tiempo_regreso = 0.2  # Retorno rápido fijo
+            if tipo == 'pose':
+                generar_pose(valor, mov.get('velocidad', velocidad_actual), mov.get('espera', 0))
+            
+            elif tipo == 'velocidad':
+                velocidad_actual = valor
+                print(f"Velocidad establecida: {velocidad_actual}s")
             
-            print(f"{motor.upper()}: {pos_actual}° → 0° en {tiempo_regreso}s (RETORNO)")
-            generar_movimiento_motor(puerto, False, tiempo_regreso)
-            posiciones[motor] = 0
-            add_delay(0.2)  # Pausa entre motores
+            elif tipo in puertos:
+                generar_pose({tipo: valor}, velocidad_actual, 0)
 
-    print("=== CÓDIGO GENERADO ===")
+            elif tipo == 'repetir':
+                generar_repeticion(valor, mov['movimientos'])
 
-    # Control del bucle de repeticiones
-    machine_code.extend([0x4E])                # DEC SI
-    machine_code.extend([0x83, 0xFE, 0x00])    # CMP SI, 0
-    je_offset_pos = len(machine_code)
-    machine_code.extend([0x74, 0x00])          # JE fin
+    print("=== GENERANDO CÓDIGO PARA SECUENCIA ===")
+    # Un programa que es una sola repetición usa el ciclo principal si cada
+    # vuelta termina en la pose en que empieza
+    repeticiones = 1
+    inicio_secuencia = programa.mark()
+    if len(movimientos) == 1 and movimientos[0]['tipo'] == 'repetir' and movimientos[0]['valor'] > 1:
+        entrada = estado()
+        generar_secuencia(movimientos[0]['movimientos'])
+        if estado() == entrada:
+            repeticiones = movimientos[0]['valor']
+        else:
+            programa.take(inicio_secuencia)
+            restaurar(entrada)
+    if repeticiones == 1:
+        generar_secuencia(movimientos)
+    # Bucle de repeticiones
+    generar_ciclo(repeticiones, programa.take(inicio_secuencia))
 
-    # JMP al inicio del ciclo
-    jmp_offset = loop_start - (len(machine_code) + 3)
-    machine_code.extend([0xE9, jmp_offset & 0xFF, (jmp_offset >> 8) & 0xFF])
-    
-    # Calcular offset para JE
-    rel_je = len(machine_code) - (je_offset_pos + 2)
-    machine_code[je_offset_pos + 1] = rel_je & 0xFF
+    print("=== CÓDIGO GENERADO ===")
 
     # Apagar motores al final
     for port in [0x00, 0x02, 0x04]:
-        machine_code.extend([
-            0xBA, port, 0x00,
-            0xB0, 0x00,
-            0xEE
-        ])
+        programa.emit([0xBA, port, 0x00], f"MOV DX, {port:04X}h")
+        programa.emit([0xB0, 0x00], "MOV AL, 00h")
+        programa.emit([0xEE], "OUT DX, AL")
 
     # Salida a DOS
-    machine_code.extend([0xB8, 0x00, 0x4C])
-    machine_code.extend([0xCD, 0x21])
+    programa.emit([0xB8, 0x00, 0x4C], "MOV AX, 4C00h")
+    programa.emit([0xCD, 0x21], "INT 21h")
 
-    print(f"Código máquina generado: {len(machine_code)} bytes")
-    return machine_code
+    # Subrutina DELAY: DX:AX vueltas de LOOP, conserva CX
+    bajo, alto, fin = programa.label('delay_bajo'), programa.label('delay_alto'), programa.label('delay_fin')
+    programa.bind(delay)
+    programa.emit([0x51], "PUSH CX")
+    programa.emit([0x8B, 0xC8], "MOV CX, AX")
+    programa.jump('jcxz', alto, f"JCXZ {alto.name}")
+    programa.bind(bajo)
+    programa.jump('loop', bajo, f"LOOP {bajo.name}")
+    programa.bind(alto)
+    programa.emit([0x0B, 0xD2], "OR DX, DX")
+    programa.jump('jz', fin, f"JZ {fin.name}")
+    programa.emit([0x4A], "DEC DX")
+    programa.jump('jmp', bajo, f"JMP {bajo.name}    ; CX = 0: 65536 vueltas")
+    programa.bind(fin)
+    programa.emit([0x59], "POP CX")
+    programa.emit([0xC3], "RET")
+
+    # Datos
+    for motor in COM_AXES:
+        programa.bind(tablas[motor])
+        programa.emit(modelos[motor].phases, "DB " + ", ".join(f"{f:02X}h" for f in modelos[motor].phases))
+    for motor in COM_AXES:
+        programa.bind(fases[motor])
+        programa.emit([0x00], "DB 0")
+    for motor in COM_AXES:
+        programa.bind(errores[motor])
+        programa.emit([0x00, 0x00], "DW 0")
+
+    return programa
 
 # Función para usar desde main.py (mantener compatibilidad)
 def create_dynamic_com_from_analyzer(analyzer):
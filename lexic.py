@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Compilador por lotes (sin interfaz gráfica) del Lenguaje de Brazo Robótico
+
+    python -m lexic build <archivos/directorios> --target asm,com,mod,cuad -j N
+
+Analiza cada programa .robot y genera los artefactos pedidos en paralelo
+con un pool de procesos, mostrando el resultado de cada archivo a medida
+que termina. Retorna 0 si todos los programas se compilaron, 1 si alguno
+tuvo errores y 2 si los argumentos son inválidos. No importa tkinter.
+
+Con -O1 o -O2 los cuádruplos de cada programa pasan por el optimizador
+(robot_optimizer): el artefacto .cuad (tabla de cuádruplos) se escribe con
+los cuádruplos optimizados y al final se muestran las estadísticas de cada
+pasada y los movimientos y esperas antes y después, sumados sobre todos los
+programas. El .com y el .mod secuencial se generan del plan de movimiento
+optimizado con el mismo nivel (robot_motion.motion_plan): sin los
+movimientos sin efecto y, con -O2, sin los que se pisan antes de una espera.
+El .asm solo usa la pose final y los .mod seguro y coordinado no usan el
+plan, así que no dependen del nivel.
+
+Con --profile [ARCHIVO] cada programa se compila bajo cProfile: el perfil
+combinado se guarda como pstats (por defecto lexic.pstats) y al final se
+muestra una tabla con el tiempo, los bloques asignados y los contadores de
+cada etapa del análisis y de cada backend, sumados sobre todos los programas.
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import multiprocessing
+import os
+import pstats
+import sys
+import tempfile
+import time
+
+# Extensión de los programas que se buscan en los directorios
+SOURCE_EXTENSION = '.robot'
+
+# Artefactos que se pueden generar y los que se generan sin --target
+TARGETS = ('asm', 'com', 'mod', 'cuad')
+DEFAULT_TARGETS = ('asm', 'com', 'mod')
+
+# Comienzo de los diagnósticos que son advertencias (no detienen la compilación)
+WARNING_PREFIX = "Advertencia"
+
+# Generadores .mod disponibles (--mod-style)
+MOD_STYLES = ('secuencial', 'seguro', 'coordinado')
+
+# Niveles de -O (ver robot_optimizer)
+OPTIMIZATION_LEVELS = (0, 1, 2)
+
+# Archivo pstats de --profile sin argumento
+DEFAULT_PROFILE = 'lexic.pstats'
+
+# Funciones del perfil que se muestran al final (por tiempo acumulado)
+PROFILE_TOP = 15
+
+def find_sources(paths):
+    """Programas a compilar: los archivos indicados y los .robot de cada directorio (recursivo)"""
+    sources = []
+    seen = set()
+    for path in paths:
+        if os.path.isdir(path):
+            found = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                found.extend(os.path.join(root, name) for name in sorted(files)
+                             if name.endswith(SOURCE_EXTENSION))
+        else:
+            found = [path]
+        for source in found:
+            key = os.path.abspath(source)
+            if key not in seen:
+                seen.add(key)
+                sources.append(source)
+    return sources
+
+def parse_targets(value):
+    """Lista de artefactos de --target ('asm,com,mod,cuad')"""
+    targets = [target.strip().lower() for target in value.split(',') if target.strip()]
+    invalid = [target for target in targets if target not in TARGETS]
+    if invalid or not targets:
+        raise argparse.ArgumentTypeError(
+            f"artefacto inválido: {', '.join(invalid) or value!r} (opciones: {', '.join(TARGETS)})")
+    return list(dict.fromkeys(targets))
+
+def _mod_generator(style, level=0):
+    """Generador .mod para el estilo indicado (el secuencial con el plan optimizado con -O`level`)"""
+    if style == 'seguro':
+        from robodk_safe_generator import RoboDKSafeGenerator
+        return RoboDKSafeGenerator()
+    if style == 'coordinado':
+        from robodk_coordinated_generator import RoboDKCoordinatedGenerator
+        return RoboDKCoordinatedGenerator()
+    from robodk_sequential_generator import RoboDKSequentialGenerator
+    return RoboDKSequentialGenerator(level=level)
+
+def build_file(job):
+    """Analiza un programa y genera sus artefactos (se ejecuta en los procesos del pool).
+
+    `job` es (ruta, artefactos, directorio de salida o None, estilo .mod,
+    usar caché de artefactos, directorio del perfil o None, nivel de
+    optimización). Retorna un dict con el resultado; con directorio del
+    perfil incluye también 'metrics' (mediciones por etapa) y 'profile'
+    (archivo pstats del programa), y con nivel de optimización
+    'optimization' (ver OptimizationResult.as_dict).
+    """
+    path, targets, output_dir, mod_style, use_cache, profile_dir, level = job
+    from robot_artifact_cache import shared_artifact_cache
+    from robot_metrics import AnalysisMetrics
+    shared_artifact_cache.enabled = shared_artifact_cache.enabled and use_cache
+
+    result = {'path': path, 'ok': False, 'errors': [], 'warnings': [], 'outputs': [], 'message': ''}
+    metrics = AnalysisMetrics()
+    profiler = cProfile.Profile() if profile_dir is not None else None
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.runcall(_build_file, result, targets, output_dir, mod_style, metrics, level)
+        else:
+            _build_file(result, targets, output_dir, mod_style, metrics, level)
+    except Exception as e:
+        result['message'] = f"{type(e).__name__}: {e}"
+    finally:
+        result['seconds'] = time.perf_counter() - start
+    if profiler is not None:
+        result['metrics'] = metrics.as_dict()
+        fd, result['profile'] = tempfile.mkstemp(dir=profile_dir, suffix='.pstats')
+        os.close(fd)
+        profiler.dump_stats(result['profile'])
+    return result
+
+def _build_file(result, targets, output_dir, mod_style, metrics, level=0):
+    """Cuerpo de build_file: completa `result` y registra cada backend en `metrics`"""
+    from robot_analysis_cache import shared_cache
+
+    path = result['path']
+    with open(path, 'r', encoding='utf-8') as f:
+        code = f.read()
+    # Se analiza el texto sin recortar para que las líneas de los errores sean las del archivo
+    if not code.strip():
+        result['errors'] = ["Error: No hay código para analizar"]
+        return
+    # Los valores fuera de rango llegan como advertencias y no impiden generar
+    # (igual que en la interfaz)
+    analyzer = shared_cache.analyze(code)
+    try:
+        for message in analyzer.errors:
+            (result['warnings'] if message.startswith(WARNING_PREFIX) else result['errors']).append(message)
+        if result['errors']:
+            return
+        if level:
+            result['optimization'] = analyzer.optimize(level).as_dict()
+
+        name = os.path.splitext(os.path.basename(path))[0]
+        directory = output_dir if output_dir is not None else os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Los generadores informan por consola: se descarta para no mezclar la salida
+        with contextlib.redirect_stdout(io.StringIO()):
+            for target in targets:
+                output_path = os.path.join(directory, f"{name}.{target}")
+                with metrics.phase(target) as phase:
+                    if target == 'asm':
+                        from create_dynamic_asm_generator import export_dynamic_asm
+                        export_dynamic_asm(analyzer, output_path, name)
+                    elif target == 'com':
+                        from create_dynamic_motor_com_v2 import extract_motor_values_enhanced, build_dynamic_com
+                        machine_code = build_dynamic_com(extract_motor_values_enhanced(analyzer, level))
+                        with open(output_path, 'wb') as f:
+                            f.write(machine_code)
+                    elif target == 'cuad':
+                        analyzer.export_quadruple_table(output_path, level)
+                    else:
+                        success, message = _mod_generator(mod_style, level).generate_mod_file(code, output_path)
+                        if not success:
+                            result['message'] = message
+                            return
+                    phase.counters['bytes'] = os.path.getsize(output_path)
+                result['outputs'].append(output_path)
+        result['ok'] = True
+    finally:
+        # Etapas del análisis primero (se ejecutan antes o durante los backends)
+        metrics.phases = {**analyzer.metrics.phases, **metrics.phases}
+
+def format_result(result):
+    """Líneas que se muestran para el resultado de un archivo"""
+    if result['ok']:
+        outputs = ', '.join(os.path.basename(output) for output in result['outputs'])
+        warnings = f", {len(result['warnings'])} advertencias" if result['warnings'] else ""
+        return [f"✅ {result['path']} → {outputs} ({result['seconds'] * 1000:.0f} ms{warnings})"]
+    if result['errors']:
+        lines = [f"❌ {result['path']}: {len(result['errors'])} errores"]
+        lines.extend(f"    {error}" for error in result['errors'][:5])
+        if len(result['errors']) > 5:
+            lines.append(f"    ... y {len(result['errors']) - 5} más")
+        return lines
+    return [f"❌ {result['path']}: {result['message']}"]
+
+def run_build(sources, targets, jobs=None, output_dir=None, mod_style='secuencial', use_cache=True,
+              out=None, profile=None, level=0):
+    """Compila `sources` con `jobs` procesos y escribe cada resultado al terminar.
+
+    Con `profile` (ruta de un archivo pstats) cada programa se compila bajo
+    cProfile y los perfiles se combinan en ese archivo; `level` es el nivel
+    de optimización de los cuádruplos. Retorna la lista de
+    resultados (en orden de finalización).
+    """
+    out = out if out is not None else sys.stdout
+    with contextlib.ExitStack() as stack:
+        profile_dir = stack.enter_context(tempfile.TemporaryDirectory()) if profile else None
+        work = [(source, targets, output_dir, mod_style, use_cache, profile_dir, level) for source in sources]
+        jobs = jobs or os.cpu_count() or 1
+        jobs = max(1, min(jobs, len(work)))
+        results = []
+        stats = None
+
+        def report(result):
+            nonlocal stats
+            results.append(result)
+            # El perfil de cada programa se suma al combinado apenas llega
+            profile_path = result.pop('profile', None)
+            if profile_path:
+                if stats is None:
+                    stats = pstats.Stats(profile_path, stream=out)
+                else:
+                    stats.add(profile_path)
+                os.remove(profile_path)
+            for line in format_result(result):
+                print(line, file=out, flush=True)
+
+        if jobs == 1:
+            for job in work:
+                report(build_file(job))
+        else:
+            # Bloques de varios archivos por tarea: menos comunicación entre procesos
+            chunksize = max(1, min(32, len(work) // (jobs * 4)))
+            with multiprocessing.Pool(processes=jobs) as pool:
+                for result in pool.imap_unordered(build_file, work, chunksize):
+                    report(result)
+        if stats is not None:
+            stats.dump_stats(profile)
+    return results
+
+def print_profile_summary(results, profile, out=None):
+    """Tabla de las etapas (sumadas sobre todos los programas) y funciones más costosas del perfil"""
+    from robot_metrics import merge_metrics, format_metrics_table
+
+    out = out if out is not None else sys.stdout
+    merged = merge_metrics(result['metrics'] for result in results if 'metrics' in result)
+    print("\n=== ETAPAS (suma de todos los programas) ===", file=out)
+    print(format_metrics_table(merged), file=out)
+    if os.path.exists(profile):
+        print(f"\n=== PERFIL ({PROFILE_TOP} funciones con más tiempo acumulado) ===", file=out)
+        pstats.Stats(profile, stream=out).sort_stats('cumulative').print_stats(PROFILE_TOP)
+        print(f"💾 Perfil guardado en {profile}", file=out)
+
+def print_optimization_summary(results, level, out=None):
+    """Estadísticas del optimizador sumadas sobre todos los programas"""
+    from robot_metrics import merge_metrics
+    from robot_optimizer import format_optimization_report
+
+    out = out if out is not None else sys.stdout
+    reports = [result['optimization'] for result in results if 'optimization' in result]
+    if not reports:
+        return
+    total = {'level': level, 'passes': merge_metrics(report['passes'] for report in reports)}
+    for side in ('before', 'after'):
+        total[side] = {}
+        for key in reports[0][side]:
+            values = [report[side][key] for report in reports]
+            total[side][key] = None if None in values else round(sum(values), 6)
+    print(f"\n=== OPTIMIZACIÓN (suma de {len(reports)} programas) ===", file=out)
+    print(format_optimization_report(total), file=out)
+
+def build_command(args):
+    """Subcomando 'build'"""
+    sources = find_sources(args.paths)
+    missing = [source for source in sources if not os.path.isfile(source)]
+    if missing:
+        for source in missing:
+            print(f"❌ No existe el archivo: {source}", file=sys.stderr)
+        return 2
+    if not sources:
+        print("⚠️ No se encontraron programas .robot", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    results = run_build(sources, args.target, args.jobs, args.output, args.mod_style, not args.no_cache,
+                        profile=args.profile, level=args.optimize)
+    failed = sum(1 for result in results if not result['ok'])
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 {len(results) - failed} compilados, {failed} con errores ({elapsed:.2f} s)")
+    if args.optimize:
+        print_optimization_summary(results, args.optimize)
+    if args.profile:
+        print_profile_summary(results, args.profile)
+    return 1 if failed else 0
+
+def create_parser():
+    """Parser de argumentos de la línea de comandos"""
+    parser = argparse.ArgumentParser(prog='lexic', description="Compilador del Lenguaje de Brazo Robótico")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help="Compila programas .robot a .asm, .com, .mod y .cuad")
+    build.add_argument('paths', nargs='+', help="Archivos .robot o directorios (se buscan .robot recursivamente)")
+    build.add_argument('--target', '-t', type=parse_targets, default=list(DEFAULT_TARGETS),
+                       help="Artefactos separados por coma: asm,com,mod,cuad (por defecto asm,com,mod)")
+    build.add_argument('-j', '--jobs', type=int, default=None,
+                       help="Procesos en paralelo (por defecto la cantidad de núcleos)")
+    build.add_argument('-o', '--output', default=None,
+                       help="Directorio de salida (por defecto junto a cada programa)")
+    build.add_argument('--mod-style', choices=MOD_STYLES, default='secuencial',
+                       help="Generador de los archivos .mod")
+    build.add_argument('--no-cache', action='store_true', help="No usar el caché de artefactos")
+    build.add_argument('-O', dest='optimize', type=int, choices=OPTIMIZATION_LEVELS, default=0, metavar='NIVEL',
+                       help="Nivel de optimización de los cuádruplos y del plan de movimiento (.cuad, .com y "
+                            ".mod secuencial): -O0 (por defecto), -O1 o -O2")
+    build.add_argument('--profile', nargs='?', const=DEFAULT_PROFILE, default=None, metavar='PSTATS',
+                       help=f"Perfilar la compilación con cProfile y guardar el perfil (por defecto {DEFAULT_PROFILE})")
+    build.set_defaults(handler=build_command)
+    return parser
+
+def main(argv=None):
+    """Función principal: retorna el código de salida"""
+    args = create_parser().parse_args(argv)
+    if args.command == 'build' and args.jobs is not None and args.jobs < 1:
+        print("❌ -j debe ser al menos 1", file=sys.stderr)
+        return 2
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,12 +2,184 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, simpledialog
 import os
+import importlib
 import platform
-from robot_lexical_analyzer import RobotLexicalAnalyzer
-from robodk_mod_generator import RoboDKModGenerator
-from robodk_sequential_generator import RoboDKSequentialGenerator
-from robodk_safe_generator import RoboDKSafeGenerator
-from robodk_coordinated_generator import RoboDKCoordinatedGenerator
+import time
+from robot_analysis_cache import shared_cache
+from robot_incremental import IncrementalAnalyzer
+from robot_diagnostics import diagnostic_location
+from robot_worker import BackgroundWorker, JobCancelled
+
+class _LazyGenerator:
+    """Generador .mod de la interfaz que se crea la primera vez que se usa.
+
+    El módulo del generador (y sus dependencias) se importa recién entonces,
+    así el arranque no carga ningún backend; desde ese momento el generador
+    queda como atributo normal de la instancia.
+    """
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, gui, owner=None):
+        if gui is None:
+            return self
+        generator_class = getattr(importlib.import_module(self.module), self.class_name)
+        generator = gui.__dict__[self.name] = generator_class()
+        return generator
+
+# Pasos del análisis en segundo plano: (mensaje, fracción, lectura que ejecuta la etapa)
+_ANALYSIS_STEPS = (
+    ("🔍 Análisis léxico...", 0.1, lambda analyzer: analyzer.tokens),
+    ("🌳 Análisis sintáctico...", 0.4, lambda analyzer: analyzer.parser),
+    ("🧠 Análisis semántico...", 0.7, lambda analyzer: analyzer.errors),
+)
+
+def analysis_job(job, cache, code):
+    """Trabajo en segundo plano de los generadores: analiza `code` etapa por etapa.
+
+    Retorna el analizador.
+    """
+    analyzer = cache.analyze(code)
+    for message, fraction, run_stage in _ANALYSIS_STEPS:
+        job.progress(message, fraction)
+        run_stage(analyzer)
+    return analyzer
+
+def session_analysis_job(job, session, code):
+    """Trabajo en segundo plano de 'Analizar': aplica `code` a la sesión incremental del editor.
+
+    Solo se reanalizan las líneas que cambiaron desde el último análisis o
+    diagnóstico en vivo. La sesión sigue cambiando con las ediciones
+    siguientes, así que se retorna una copia de lo que se muestra:
+    (cantidad de tokens, errores, salida formateada).
+    """
+    job.progress("🔍 Análisis incremental...", 0.1)
+    session.update(code)
+    job.progress("📝 Generando reporte...", 0.7)
+    return len(session.tokens), list(session.errors), session.get_formatted_output()
+
+def compile_executable_job(job, analyzer, program_name, tasm_path):
+    """Trabajo en segundo plano de 'Generar .EXE': compila y genera el ASM dinámico.
+
+    Retorna un dict con 'success' y 'message' de la compilación, o con
+    'compile_error' (y 'fallback_asm' si al menos se pudo generar el ASM).
+    """
+    try:
+        success, message = analyzer.generate_and_compile(program_name, progress=job.progress)
+    except JobCancelled:
+        raise
+    except Exception as compile_error:
+        result = {'compile_error': compile_error}
+        # Intentar generar solo el ASM como fallback
+        try:
+            job.progress("Generando solo el código ASM...")
+            asm_code, asm_error = analyzer.generate_assembly_code(program_name)
+            if asm_code and not asm_error:
+                # Guardar el ASM manualmente
+                asm_path = os.path.join(tasm_path, f"{program_name}.asm")
+                with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
+                    f.write(asm_code)
+                result['fallback_asm'] = asm_code
+        except JobCancelled:
+            raise
+        except Exception:
+            pass
+        return result
+    
+    result = {'success': success, 'message': message}
+    if success:
+        # Generar código ensamblador dinámico
+        job.progress("Generando ASM dinámico...", 0.97)
+        try:
+            from create_dynamic_asm_generator import generate_dynamic_asm_from_analyzer
+            asm_code = generate_dynamic_asm_from_analyzer(analyzer, program_name)
+            
+            # Guardar ASM dinámico 
+            asm_path = os.path.join(tasm_path, f"{program_name}_dynamic.asm")
+            with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
+                f.write(asm_code)
+            result['asm_code'], result['asm_name'], result['dynamic'] = asm_code, f"{program_name}_dynamic", True
+        except Exception:
+            # Fallback al generador original
+            asm_code, error = analyzer.generate_assembly_code(program_name)
+            if asm_code:
+                result['asm_code'], result['asm_name'], result['dynamic'] = asm_code, program_name, False
+    return result
+
+def compile_dos_real_job(job, analyzer, program_name):
+    """Trabajo en segundo plano de 'Para Proteus': ejecutable DOS real"""
+    return analyzer.generate_and_compile_dos_real(program_name, progress=job.progress)
+
+def com_file_job(job, analyzer, program_name):
+    """Trabajo en segundo plano de 'Generar .COM': retorna el tamaño del archivo (None si falló)"""
+    # Crear el generador COM DINÁMICO optimizado
+    job.progress("Generando código máquina...", 0.2)
+    import create_dynamic_motor_com_v2
+    
+    # Generar el archivo COM dinámico usando los valores del código
+    success = create_dynamic_motor_com_v2.create_dynamic_com_from_analyzer(analyzer)
+    
+    # Paths para renombrar
+    original_path = os.path.join("DOSBox2", "Tasm", "motor_user.com")
+    new_path = os.path.join("DOSBox2", "Tasm", f"{program_name}.com")
+    
+    if not (success and os.path.exists(original_path)):
+        return None
+    # Renombrar al nombre solicitado
+    job.progress(f"Copiando {program_name}.com...", 0.9)
+    import shutil
+    shutil.copy2(original_path, new_path)
+    return os.path.getsize(new_path)
+
+def dynamic_asm_job(job, analyzer, asm_path, program_name):
+    """Trabajo en segundo plano de 'ASM dinámico': genera y guarda el ASM"""
+    job.progress("Generando ASM dinámico...", 0.3)
+    # Generar y guardar el ASM dinámico (desde el caché de artefactos si no cambió)
+    from create_dynamic_asm_generator import export_dynamic_asm
+    return export_dynamic_asm(analyzer, asm_path, program_name)
+
+def mod_file_job(job, generator, code, program_name, summary=False):
+    """Trabajo en segundo plano de los .mod: retorna (éxito, mensaje, resumen de movimientos o None)"""
+    job.progress(f"Generando {program_name}...", 0.3)
+    success, message = generator.generate_mod_file(code, program_name)
+    movement_summary = generator.get_movement_summary() if success and summary else None
+    return success, message, movement_summary
+
+# Diagnósticos en vivo: espera tras la última edición, presupuesto de cada
+# análisis, espera máxima si el análisis se pasa del presupuesto y máximo de
+# diagnósticos que se subrayan
+LIVE_DEBOUNCE_MS = 300
+LIVE_BUDGET_MS = 50
+LIVE_MAX_DEBOUNCE_MS = 2000
+LIVE_MAX_DIAGNOSTICS = 200
+
+def live_diagnostics_job(job, session, code):
+    """Trabajo en segundo plano de los diagnósticos en vivo.
+
+    Aplica el texto del editor a la sesión incremental (solo se reanalizan
+    las líneas editadas) y retorna (diagnósticos, milisegundos), con los
+    diagnósticos como tuplas (línea, columna o None, 'error' | 'warning', mensaje).
+    La sesión solo la usan los trabajos de `live_worker` (este y
+    session_analysis_job), que no se interrumpen a la mitad: si se cancela,
+    la edición queda aplicada y solo se descarta el resultado.
+    """
+    job.check_cancelled()
+    start = time.perf_counter()
+    session.update(code)
+    diagnostics = []
+    for severity, messages in (('error', session.errors), ('warning', session.warnings)):
+        for message in messages[:LIVE_MAX_DIAGNOSTICS - len(diagnostics)]:
+            location = diagnostic_location(message)
+            if location is not None:
+                # Algunas advertencias del parser llegan en la lista de errores
+                kind = 'warning' if message.startswith('Advertencia') else severity
+                diagnostics.append((*location, kind, message))
+    return diagnostics, (time.perf_counter() - start) * 1000
 
 class LineNumberText(tk.Frame):
     """Widget de texto con numeración de líneas"""
@@ -25,30 +197,71 @@ class LineNumberText(tk.Frame):
         self.text_widget = scrolledtext.ScrolledText(self, font=('Courier', 12), **kwargs)
         self.text_widget.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
+        # Diagnósticos en vivo: subrayado de errores y advertencias
+        self.text_widget.tag_configure('diagnostic_error', underline=True, foreground='#cc0000')
+        self.text_widget.tag_configure('diagnostic_warning', underline=True, foreground='#b36b00')
+        self.diagnostics = {}  # línea -> primer mensaje de esa línea
+        self.on_change = None  # se llama (sin argumentos) cada vez que cambia el texto
+        self._line_count = 0
+        
         # Vincular eventos
         self.text_widget.bind('<KeyRelease>', self.update_line_numbers)
         self.text_widget.bind('<ButtonRelease-1>', self.update_line_numbers)
         self.text_widget.bind('<MouseWheel>', self.update_line_numbers)
+        self.text_widget.bind('<<Modified>>', self._on_modified)
         
         # Inicializar numeración
         self.update_line_numbers()
     
     def update_line_numbers(self, event=None):
         """Actualiza la numeración de líneas"""
-        self.line_numbers.config(state=tk.NORMAL)
-        self.line_numbers.delete(1.0, tk.END)
-        
         # Obtener el número de líneas
         line_count = int(self.text_widget.index(tk.END).split('.')[0]) - 1
         
-        # Generar números de línea
-        line_numbers_text = '\n'.join(str(i) for i in range(1, line_count + 1))
-        self.line_numbers.insert(1.0, line_numbers_text)
-        self.line_numbers.config(state=tk.DISABLED)
+        # Regenerar los números solo si cambió la cantidad de líneas (con
+        # archivos de miles de líneas rehacerlos en cada tecla se nota)
+        if line_count != self._line_count:
+            self._line_count = line_count
+            self.line_numbers.config(state=tk.NORMAL)
+            self.line_numbers.delete(1.0, tk.END)
+            line_numbers_text = '\n'.join(str(i) for i in range(1, line_count + 1))
+            self.line_numbers.insert(1.0, line_numbers_text)
+            self.line_numbers.config(state=tk.DISABLED)
         
         # Sincronizar scroll
         self.line_numbers.yview_moveto(self.text_widget.yview()[0])
     
+    def _on_modified(self, event=None):
+        """Avisa el cambio del texto y rearma el evento <<Modified>>"""
+        if not self.text_widget.edit_modified():
+            return
+        self.text_widget.edit_modified(False)
+        if self.on_change:
+            self.on_change()
+    
+    def set_diagnostics(self, diagnostics):
+        """Subraya los diagnósticos (línea, columna, severidad, mensaje).
+
+        Con columna se subraya la palabra que empieza en ella; sin columna,
+        la línea entera. Reemplaza los diagnósticos anteriores.
+        """
+        text = self.text_widget
+        text.tag_remove('diagnostic_error', 1.0, tk.END)
+        text.tag_remove('diagnostic_warning', 1.0, tk.END)
+        self.diagnostics = {}
+        for line, column, severity, message in diagnostics:
+            if column:
+                start = f"{line}.{column - 1}"
+                end = f"{start} wordend"
+            else:
+                start, end = f"{line}.0", f"{line}.end"
+            text.tag_add(f'diagnostic_{severity}', start, end)
+            self.diagnostics.setdefault(line, message)
+    
+    def diagnostic_at(self, index=tk.INSERT):
+        """Mensaje del diagnóstico de la línea de `index` (None si no hay)"""
+        return self.diagnostics.get(int(self.text_widget.index(index).split('.')[0]))
+    
     def get(self, start, end=None):
         """Obtiene el texto del widget"""
         return self.text_widget.get(start, end)
@@ -63,9 +276,70 @@ class LineNumberText(tk.Frame):
         self.text_widget.delete(start, end)
         self.update_line_numbers()
 
+class ProgressWindow(tk.Toplevel):
+    """Ventana de progreso de un trabajo en segundo plano.
+
+    No toma el foco de forma exclusiva: el editor sigue disponible mientras
+    el trabajo corre. report() muestra cada paso que informa el trabajo y
+    "Cancelar" lo cancela y cierra la ventana.
+    """
+    
+    def __init__(self, parent, title, geometry, lines):
+        super().__init__(parent)
+        self.title(title)
+        self.geometry(geometry)
+        self.resizable(False, False)
+        self.transient(parent)
+        self.job = None
+        self.on_cancel = None
+        
+        for text, font, pady in lines:
+            tk.Label(self, text=text, font=font).pack(pady=pady)
+        
+        # Paso actual y barra de progreso (indeterminada hasta que el trabajo informa su avance)
+        self.stage_label = tk.Label(self, text="Iniciando...", font=('Arial', 9), fg='#555555')
+        self.stage_label.pack(pady=2)
+        self.progress_bar = ttk.Progressbar(self, mode='indeterminate', maximum=100)
+        self.progress_bar.pack(pady=5, padx=20, fill='x')
+        self.progress_bar.start()
+        
+        tk.Button(self, text="⏹️ Cancelar", command=self.cancel).pack(pady=5)
+        self.protocol("WM_DELETE_WINDOW", self.cancel)
+    
+    def report(self, message, fraction=None):
+        """Muestra un paso del trabajo (fraction de 0.0 a 1.0, o None si no es medible)"""
+        if not self.winfo_exists():
+            return
+        self.stage_label.config(text=message)
+        if fraction is None:
+            if str(self.progress_bar.cget('mode')) != 'indeterminate':
+                self.progress_bar.config(mode='indeterminate')
+                self.progress_bar.start()
+        else:
+            self.progress_bar.stop()
+            self.progress_bar.config(mode='determinate', value=fraction * 100)
+    
+    def cancel(self):
+        """Cancela el trabajo (su resultado se descarta) y cierra la ventana"""
+        if self.job is not None:
+            self.job.cancel()
+        self.close()
+        if self.on_cancel:
+            self.on_cancel()
+    
+    def close(self):
+        if self.winfo_exists():
+            self.destroy()
+
 class LexicalAnalyzerGUI:
     """Interfaz gráfica para el analizador léxico - Optimizada para Windows"""
     
+    # Generadores .mod (usan el mismo caché de análisis: el mismo análisis por código)
+    mod_generator = _LazyGenerator('robodk_sequential_generator', 'RoboDKSequentialGenerator')
+    sequential_generator = _LazyGenerator('robodk_sequential_generator', 'RoboDKSequentialGenerator')
+    safe_generator = _LazyGenerator('robodk_safe_generator', 'RoboDKSafeGenerator')
+    coordinated_generator = _LazyGenerator('robodk_coordinated_generator', 'RoboDKCoordinatedGenerator')
+    
     def __init__(self):
         # Configuración específica para Windows
         self.is_windows = True  # Forzar modo Windows
@@ -83,11 +357,20 @@ class LexicalAnalyzerGUI:
         
         # Variables
         self.current_file = None
-        self.analyzer = RobotLexicalAnalyzer()
-        self.mod_generator = RoboDKSequentialGenerator()
-        self.sequential_generator = RoboDKSequentialGenerator()
-        self.safe_generator = RoboDKSafeGenerator()
-        self.coordinated_generator = RoboDKCoordinatedGenerator()
+        # Análisis de los generadores y compilaciones: sale del caché
+        # compartido, así que exportar un programa sin cambios con varios
+        # generadores lo analiza una sola vez
+        self.analysis_cache = shared_cache
+        self.analyzer = self.analysis_cache.analyze('')
+        # Análisis y compilaciones en segundo plano (ver run_job)
+        self.worker = BackgroundWorker()
+        # Diagnósticos en vivo y 'Analizar': sesión incremental con su propio
+        # worker, así no esperan detrás de una compilación y solo reanalizan
+        # las líneas editadas (ver schedule_live_diagnostics y analyze_code)
+        self.live_session = IncrementalAnalyzer()
+        self.live_worker = BackgroundWorker()
+        self.live_debounce = LIVE_DEBOUNCE_MS
+        self._live_after = None
         
         # Configurar rutas para Windows
         self.dosbox_path = os.path.join(os.getcwd(), "DOSBox2")
@@ -99,6 +382,8 @@ class LexicalAnalyzerGUI:
         # Crear interfaz
         self.create_interface()
         self.create_menu()
+        self.worker.attach(self.root)
+        self.live_worker.attach(self.root)
         
         print(f"🪟 Analizador iniciado en modo Windows - Compilación .EXE disponible")
     
@@ -183,6 +468,9 @@ class LexicalAnalyzerGUI:
         # Editor con números de línea
         self.code_editor = LineNumberText(left_frame, wrap=tk.NONE, undo=True)
         self.code_editor.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.code_editor.on_change = self.schedule_live_diagnostics
+        self.code_editor.text_widget.bind('<KeyRelease>', self.show_diagnostic_at_cursor, add='+')
+        self.code_editor.text_widget.bind('<ButtonRelease-1>', self.show_diagnostic_at_cursor, add='+')
         
         # Panel derecho - Resultados
         right_frame = tk.LabelFrame(paned, text="Resultados del Análisis", 
@@ -235,6 +523,7 @@ class LexicalAnalyzerGUI:
         analysis_menu.add_command(label="🎯 Para Proteus", command=self.generate_for_proteus, accelerator="F7")
         analysis_menu.add_command(label="📁 Generar .COM", command=self.generate_com_file, accelerator="F8")
         analysis_menu.add_command(label="🤖 Generar .MOD", command=self.generate_sequential_mod_file, accelerator="F9")
+        analysis_menu.add_command(label="⏹️ Cancelar operación", command=self.cancel_jobs, accelerator="Esc")
         analysis_menu.add_separator()
         analysis_menu.add_command(label="🧹 Limpiar Todo", command=self.clear_all)
         
@@ -251,6 +540,7 @@ class LexicalAnalyzerGUI:
         self.root.bind('<F7>', lambda e: self.generate_for_proteus())  # Atajo para Proteus
         self.root.bind('<F8>', lambda e: self.generate_com_file())  # Atajo para .COM
         self.root.bind('<F9>', lambda e: self.generate_sequential_mod_file())  # Atajo para .MOD secuencial
+        self.root.bind('<Escape>', lambda e: self.cancel_jobs())  # Cancelar la operación en segundo plano
     
     def new_file(self):
         """Crea un nuevo archivo"""
@@ -317,35 +607,128 @@ class LexicalAnalyzerGUI:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo guardar el archivo:\n{str(e)}")
     
+    def run_job(self, function, *args, key=None, progress_window=None, on_done=None, on_error=None):
+        """Ejecuta function(job, *args) en el worker sin bloquear la interfaz.
+
+        El avance se muestra en `progress_window` (o en la barra de estado);
+        on_done(resultado) y on_error(excepción) se llaman en el hilo de Tk.
+        Un trabajo nuevo con la misma `key` cancela el anterior.
+        """
+        def report(message, fraction=None):
+            if progress_window is not None:
+                progress_window.report(message, fraction)
+            else:
+                self.update_status(message)
+        
+        def finish(callback):
+            def handler(value):
+                if progress_window is not None:
+                    progress_window.close()
+                if callback:
+                    callback(value)
+            return handler
+        
+        job = self.worker.submit(function, *args, key=key, on_progress=report,
+                                 on_done=finish(on_done), on_error=finish(on_error),
+                                 on_cancel=progress_window.close if progress_window is not None else None)
+        if progress_window is not None:
+            progress_window.job = job
+            progress_window.on_cancel = lambda: self.update_status("⏹️ Operación cancelada")
+        return job
+    
+    def cancel_jobs(self):
+        """Cancela los trabajos en segundo plano (su resultado se descarta)"""
+        if self.worker.busy:
+            self.worker.cancel()
+            self.update_status("⏹️ Operación cancelada")
+    
+    def analyze_in_background(self, code, on_done):
+        """Analiza `code` en el worker; on_done(tokens, errores) se llama con self.analyzer actualizado.
+
+        Un análisis nuevo cancela el anterior (su continuación ya no se ejecuta).
+        """
+        def done(analyzer):
+            self.analyzer = analyzer
+            on_done(self.analyzer.tokens, self.analyzer.errors)
+        
+        def failed(error):
+            messagebox.showerror("Error", f"Error durante el análisis:\n{str(error)}")
+            self.update_status("Error en el análisis")
+        
+        return self.run_job(analysis_job, self.analysis_cache, code, key='analysis', on_done=done, on_error=failed)
+    
+    def schedule_live_diagnostics(self):
+        """Programa los diagnósticos en vivo para cuando se deje de editar.
+
+        Cada edición reinicia la espera y descarta el análisis en curso, cuyo
+        resultado ya no corresponde al texto.
+        """
+        if self._live_after is not None:
+            self.root.after_cancel(self._live_after)
+        self.live_worker.cancel('diagnostics')
+        self._live_after = self.root.after(self.live_debounce, self.run_live_diagnostics)
+    
+    def run_live_diagnostics(self):
+        """Analiza el texto actual del editor en la sesión incremental"""
+        self._live_after = None
+        # Sin strip(): las líneas tienen que coincidir con las del editor
+        code = self.code_editor.get(1.0, 'end-1c')
+        self.live_worker.submit(live_diagnostics_job, self.live_session, code,
+                                key='diagnostics', on_done=self._show_live_diagnostics)
+    
+    def _show_live_diagnostics(self, result):
+        """Subraya los diagnósticos en el editor y ajusta la espera al tiempo que tomaron"""
+        diagnostics, elapsed_ms = result
+        self.code_editor.set_diagnostics(diagnostics)
+        # Si el análisis se pasa del presupuesto (un archivo enorme recién
+        # cargado, una edición que reparsea mucho) se espera más entre análisis
+        if elapsed_ms > LIVE_BUDGET_MS:
+            self.live_debounce = min(LIVE_DEBOUNCE_MS + int(2 * elapsed_ms), LIVE_MAX_DEBOUNCE_MS)
+        else:
+            self.live_debounce = LIVE_DEBOUNCE_MS
+        errors = sum(1 for diagnostic in diagnostics if diagnostic[2] == 'error')
+        warnings = len(diagnostics) - errors
+        if errors or warnings:
+            self.update_status(f"🔴 {errors} errores, {warnings} advertencias ({elapsed_ms:.0f} ms)")
+        else:
+            self.update_status(f"✅ Sin errores ({elapsed_ms:.0f} ms)")
+    
+    def show_diagnostic_at_cursor(self, event=None):
+        """Muestra en la barra de estado el diagnóstico de la línea del cursor"""
+        message = self.code_editor.diagnostic_at()
+        if message:
+            self.update_status(message)
+    
     def analyze_code(self):
-        """Analiza el código del editor"""
-        code = self.code_editor.get(1.0, tk.END).strip()
+        """Analiza el código del editor (en segundo plano, en la sesión incremental)"""
+        # Sin strip(): las líneas tienen que coincidir con las de los diagnósticos en vivo
+        code = self.code_editor.get(1.0, 'end-1c')
         
-        if not code:
+        if not code.strip():
             self.update_output("No hay código para analizar.", "error")
             return
         
         self.update_status("Analizando código...")
         
-        try:
-            # Realizar análisis
-            tokens, errors = self.analyzer.analyze(code)
-            
-            # Generar salida formateada
-            output = self.analyzer.get_formatted_output()
-            
+        def done(result):
             # Mostrar resultados
+            token_count, errors, output = result
             self.update_output(output, "success" if not errors else "error")
             
-            status_msg = f"Análisis completado: {len(tokens)} tokens"
+            status_msg = f"Análisis completado: {token_count} tokens"
             if errors:
                 status_msg += f", {len(errors)} errores"
             self.update_status(status_msg)
-            
-        except Exception as e:
+        
+        def failed(e):
             self.update_output(f"Error durante el análisis:\n{str(e)}", "error")
             self.update_status("Error en el análisis")
+        
+        self.live_worker.submit(session_analysis_job, self.live_session, code, key='analysis',
+                                on_progress=lambda message, fraction: self.update_status(message),
+                                on_done=done, on_error=failed)
     
+
     def generate_executable(self):
         """Genera código ensamblador y compila a ejecutable - Optimizado para Windows"""
         code = self.code_editor.get(1.0, tk.END).strip()
@@ -375,10 +758,19 @@ class LexicalAnalyzerGUI:
                     f"Verifica la carpeta: {self.tasm_path}")
                 return
             
-            # Analizar código
+            # Analizar código (en segundo plano; continúa al terminar)
             self.update_status("🔍 Analizando código robótico...")
-            tokens, errors = self.analyzer.analyze(code)
+            self.analyze_in_background(code, self._compile_analyzed_executable)
             
+        except Exception as e:
+            messagebox.showerror("Error Inesperado", 
+                f"❌ Error durante la generación:\n\n{str(e)}\n\n"
+                f"Contacta al desarrollador si el problema persiste")
+            self.update_status("❌ Error inesperado")
+    
+    def _compile_analyzed_executable(self, tokens, errors):
+        """Continúa generate_executable con el análisis listo: confirma y compila en segundo plano"""
+        try:
             # Permitir compilación incluso con errores menores/warnings
             critical_errors = [e for e in errors if "crítico" in str(e).lower() or "fatal" in str(e).lower()]
             if critical_errors:
@@ -414,121 +806,96 @@ class LexicalAnalyzerGUI:
                     "El nombre solo puede contener letras, números y guiones bajos")
                 return
             
-            # Generar y compilar
-            self.update_status(f"⚡ Generando {program_name}.exe instantáneamente...")
+            # Generar y compilar en segundo plano (el editor sigue disponible)
+            self.update_status(f"⚡ Generando {program_name}.exe...")
+            self.run_job(compile_executable_job, self.analyzer, program_name, self.tasm_path, key='build',
+                         progress_window=self.show_compilation_progress(program_name),
+                         on_done=lambda result: self._show_executable_result(program_name, result),
+                         on_error=self._show_unexpected_error)
             
-            # Mostrar progreso
-            progress_window = self.show_compilation_progress(program_name)
-            self.root.update()
-            
-            try:
-                # Usar el sistema de compilación instantánea que evita timeouts
-                success, message = self.analyzer.generate_and_compile(program_name)
-            except Exception as compile_error:
-                progress_window.destroy()
+        except Exception as e:
+            self._show_unexpected_error(e)
+    
+    def _show_unexpected_error(self, e):
+        messagebox.showerror("Error Inesperado", 
+            f"❌ Error durante la generación:\n\n{str(e)}\n\n"
+            f"Contacta al desarrollador si el problema persiste")
+        self.update_status("❌ Error inesperado")
+    
+    def _show_executable_result(self, program_name, result):
+        """Muestra el resultado de compile_executable_job"""
+        if 'compile_error' in result:
+            if 'fallback_asm' in result:
+                fallback_msg = (
+                    f"⚠️ La compilación automática falló, pero se generó el código ASM exitosamente.\n\n"
+                    f"📁 Archivo generado:\n"
+                    f"• {program_name}.asm en DOSBox2\\Tasm\\\n\n"
+                    f"🔧 Puedes compilar manualmente:\n"
+                    f"1. Abrir DOSBox\n"
+                    f"2. mount c DOSBox2\\Tasm\n"
+                    f"3. tasm {program_name}.asm\n"
+                    f"4. tlink {program_name}.obj\n\n"
+                    f"📄 ¿Deseas ver el código ASM generado?"
+                )
                 
-                # Intentar generar solo el ASM como fallback
-                try:
-                    asm_code, asm_error = self.analyzer.generate_assembly_code(program_name)
-                    if asm_code and not asm_error:
-                        # Guardar el ASM manualmente
-                        asm_path = os.path.join(self.tasm_path, f"{program_name}.asm")
-                        with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
-                            f.write(asm_code)
-                        
-                        fallback_msg = (
-                            f"⚠️ La compilación automática falló, pero se generó el código ASM exitosamente.\n\n"
-                            f"📁 Archivo generado:\n"
-                            f"• {program_name}.asm en DOSBox2\\Tasm\\\n\n"
-                            f"🔧 Puedes compilar manualmente:\n"
-                            f"1. Abrir DOSBox\n"
-                            f"2. mount c DOSBox2\\Tasm\n"
-                            f"3. tasm {program_name}.asm\n"
-                            f"4. tlink {program_name}.obj\n\n"
-                            f"📄 ¿Deseas ver el código ASM generado?"
-                        )
-                        
-                        show_asm = messagebox.askyesno("ASM Generado", fallback_msg)
-                        if show_asm:
-                            self.show_assembly_code(asm_code, program_name)
-                        
-                        self.update_status(f"✅ {program_name}.asm generado - compilación manual requerida")
-                        return
-                except Exception as asm_error:
-                    pass
+                show_asm = messagebox.askyesno("ASM Generado", fallback_msg)
+                if show_asm:
+                    self.show_assembly_code(result['fallback_asm'], program_name)
                 
-                messagebox.showerror("Error de Compilación", 
-                    f"❌ Error durante la compilación:\n\n{str(compile_error)}\n\n"
-                    f"Posibles causas:\n"
-                    f"• Archivos TASM faltantes\n"
-                    f"• Permisos insuficientes\n"
-                    f"• DOSBox bloqueado por antivirus")
-                self.update_status("❌ Error en la compilación")
+                self.update_status(f"✅ {program_name}.asm generado - compilación manual requerida")
                 return
             
-            # Cerrar ventana de progreso
-            progress_window.destroy()
+            messagebox.showerror("Error de Compilación", 
+                f"❌ Error durante la compilación:\n\n{str(result['compile_error'])}\n\n"
+                f"Posibles causas:\n"
+                f"• Archivos TASM faltantes\n"
+                f"• Permisos insuficientes\n"
+                f"• DOSBox bloqueado por antivirus")
+            self.update_status("❌ Error en la compilación")
+            return
+        
+        if result['success']:
+            # Verificar archivos generados
+            exe_path = os.path.join(self.tasm_path, f"{program_name}.exe")
+            asm_path = os.path.join(self.tasm_path, f"{program_name}.asm")
+            obj_path = os.path.join(self.tasm_path, f"{program_name}.obj")
             
-            if success:
-                # Verificar archivos generados
-                exe_path = os.path.join(self.tasm_path, f"{program_name}.exe")
-                asm_path = os.path.join(self.tasm_path, f"{program_name}.asm")
-                obj_path = os.path.join(self.tasm_path, f"{program_name}.obj")
-                
-                files_info = []
-                if os.path.exists(exe_path):
-                    size = os.path.getsize(exe_path)
-                    files_info.append(f"• {program_name}.exe ({size} bytes)")
-                if os.path.exists(asm_path):
-                    files_info.append(f"• {program_name}.asm (código fuente)")
-                if os.path.exists(obj_path):
-                    files_info.append(f"• {program_name}.obj (código objeto)")
-                
-                success_msg = (
-                    f"✅ Compilación exitosa en Windows\n\n"
-                    f"📁 Archivos generados en DOSBox2\\Tasm\\:\n" + 
-                    "\n".join(files_info) + 
-                    f"\n\n🎯 El archivo {program_name}.exe está listo para usar en Proteus\n"
-                    f"📂 Ubicación: {self.tasm_path}"
-                )
-                
-                messagebox.showinfo("🎉 Compilación Exitosa", success_msg)
-                
-                # Generar y mostrar código ensamblador dinámico
-                try:
-                    from create_dynamic_asm_generator import generate_dynamic_asm_from_analyzer
-                    asm_code = generate_dynamic_asm_from_analyzer(self.analyzer, program_name)
-                    
-                    # Guardar ASM dinámico 
-                    asm_path = os.path.join(self.tasm_path, f"{program_name}_dynamic.asm")
-                    with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
-                        f.write(asm_code)
-                    
-                    self.show_assembly_code(asm_code, f"{program_name}_dynamic")
+            files_info = []
+            if os.path.exists(exe_path):
+                size = os.path.getsize(exe_path)
+                files_info.append(f"• {program_name}.exe ({size} bytes)")
+            if os.path.exists(asm_path):
+                files_info.append(f"• {program_name}.asm (código fuente)")
+            if os.path.exists(obj_path):
+                files_info.append(f"• {program_name}.obj (código objeto)")
+            
+            success_msg = (
+                f"✅ Compilación exitosa en Windows\n\n"
+                f"📁 Archivos generados en DOSBox2\\Tasm\\:\n" + 
+                "\n".join(files_info) + 
+                f"\n\n🎯 El archivo {program_name}.exe está listo para usar en Proteus\n"
+                f"📂 Ubicación: {self.tasm_path}"
+            )
+            
+            messagebox.showinfo("🎉 Compilación Exitosa", success_msg)
+            
+            # Mostrar código ensamblador dinámico (generado por el trabajo)
+            if 'asm_code' in result:
+                self.show_assembly_code(result['asm_code'], result['asm_name'])
+                if result['dynamic']:
                     self.output_text.insert(tk.END, f"\n🎯 ASM dinámico generado: {program_name}_dynamic.asm\n")
-                    
-                except Exception as asm_error:
-                    # Fallback al generador original
-                    asm_code, error = self.analyzer.generate_assembly_code(program_name)
-                    if asm_code:
-                        self.show_assembly_code(asm_code, program_name)
-                
-                self.update_status(f"✅ {program_name}.exe generado exitosamente en DOSBox2\\Tasm\\")
-            else:
-                messagebox.showerror("❌ Error de Compilación", 
-                    f"Error durante la compilación:\n\n{message}\n\n"
-                    f"Verificaciones:\n"
-                    f"• DOSBox instalado correctamente\n"
-                    f"• TASM.EXE y TLINK.EXE en Tasm/\n"
-                    f"• Permisos de escritura en la carpeta")
-                self.update_status("❌ Error en la compilación")
-                
-        except Exception as e:
-            messagebox.showerror("Error Inesperado", 
-                f"❌ Error durante la generación:\n\n{str(e)}\n\n"
-                f"Contacta al desarrollador si el problema persiste")
-            self.update_status("❌ Error inesperado")
+            
+            self.update_status(f"✅ {program_name}.exe generado exitosamente en DOSBox2\\Tasm\\")
+        else:
+            messagebox.showerror("❌ Error de Compilación", 
+                f"Error durante la compilación:\n\n{result['message']}\n\n"
+                f"Verificaciones:\n"
+                f"• DOSBox instalado correctamente\n"
+                f"• TASM.EXE y TLINK.EXE en Tasm/\n"
+                f"• Permisos de escritura en la carpeta")
+            self.update_status("❌ Error en la compilación")
     
+
     def generate_for_proteus(self):
         """Genera código específicamente optimizado para Proteus ISIS"""
         code = self.code_editor.get(1.0, tk.END).strip()
@@ -547,10 +914,16 @@ class LexicalAnalyzerGUI:
                     f"• Carpeta Tasm/ con TASM.EXE y TLINK.EXE")
                 return
             
-            # Analizar código (permitir warnings)
+            # Analizar código (permitir warnings; continúa al terminar)
             self.update_status("🔍 Analizando código para Proteus...")
-            tokens, errors = self.analyzer.analyze(code)
-            
+            self.analyze_in_background(code, self._compile_analyzed_for_proteus)
+                
+        except Exception as e:
+            self._show_proteus_unexpected_error(e)
+    
+    def _compile_analyzed_for_proteus(self, tokens, errors):
+        """Continúa generate_for_proteus con el análisis listo"""
+        try:
             # Solo rechazar errores críticos
             critical_errors = [e for e in errors if "crítico" in str(e).lower() or "fatal" in str(e).lower()]
             if critical_errors:
@@ -586,65 +959,62 @@ class LexicalAnalyzerGUI:
                     "El nombre solo puede contener letras, números y guiones bajos")
                 return
             
-            # Generar específicamente para Proteus
+            # Generar específicamente para Proteus, en segundo plano
             self.update_status(f"🎯 Generando {program_name}.exe para Proteus ISIS...")
             
-            # Mostrar progreso específico para Proteus
-            progress_window = self.show_proteus_compilation_progress(program_name)
-            self.root.update()
-            
-            try:
-                # Usar el generador DOS REAL para verdadera compatibilidad con 8086
-                success, message = self.analyzer.generate_and_compile_dos_real(program_name)
-            except Exception as compile_error:
-                progress_window.destroy()
+            def failed(compile_error):
                 messagebox.showerror("Error de Generación", 
                     f"❌ Error generando para Proteus:\n\n{str(compile_error)}\n\n"
                     f"Verifica que DOSBox y TASM estén correctamente instalados")
                 self.update_status("❌ Error en generación para Proteus")
-                return
             
-            # Cerrar ventana de progreso
-            progress_window.destroy()
-            
-            if success:
-                # Verificar archivo generado
-                exe_path = os.path.join(self.tasm_path, f"{program_name}.exe")
-                
-                success_msg = (
-                    f"🎯 ¡EJECUTABLE DOS REAL PARA PROTEUS!\n\n"
-                    f"📁 Archivo: {program_name}.exe\n"
-                    f"📂 Ubicación: DOSBox2\\Tasm\\\n"
-                    f"�️  Formato: MS-DOS ejecutable REAL\n"
-                    f"🔌 Procesador: 8086 (modo real)\n"
-                    f"⚡ Puertos: 0300h-0303h (8255 PPI)\n"
-                    f"🤖 Control: 3 motores paso a paso\n\n"
-                    f"🎮 CONFIGURACIÓN PROTEUS (CRÍTICA):\n"
-                    f"1. ⚙️  Procesador: 8086 (NO 8088, NO x86)\n"
-                    f"2. 🖥️  Modelo: 8086 Real Mode\n"
-                    f"3. 📂 Cargar: {program_name}.exe\n"
-                    f"4. 🔌 8255 PPI en direcciones:\n"
-                    f"   • 0300h (Puerto A - Base)\n"
-                    f"   • 0301h (Puerto B - Hombro)\n"
-                    f"   • 0302h (Puerto C - Codo)\n"
-                    f"   • 0303h (Control)\n"
-                    f"5. 🤖 ULN2003A para drivers\n\n"
-                    f"✅ ¡Sin error de opcode desconocido!\n"
-                    f"✅ ¡Ejecutable DOS auténtico!"
-                )
-                
-                messagebox.showinfo("🎯 ¡Ejecutable para Proteus Listo!", success_msg)
-                self.update_status(f"✅ {program_name}.exe generado para Proteus en DOSBox2\\Tasm\\")
-            else:
-                messagebox.showerror("❌ Error en Proteus", 
-                    f"Error generando para Proteus:\n\n{message}")
-                self.update_status("❌ Error en generación para Proteus")
+            # Usar el generador DOS REAL para verdadera compatibilidad con 8086
+            self.run_job(compile_dos_real_job, self.analyzer, program_name, key='build',
+                         progress_window=self.show_proteus_compilation_progress(program_name),
+                         on_done=lambda result: self._show_proteus_result(program_name, *result),
+                         on_error=failed)
                 
         except Exception as e:
-            messagebox.showerror("Error Inesperado", 
-                f"❌ Error durante la generación para Proteus:\n\n{str(e)}")
-            self.update_status("❌ Error inesperado en generación para Proteus")
+            self._show_proteus_unexpected_error(e)
+    
+    def _show_proteus_unexpected_error(self, e):
+        messagebox.showerror("Error Inesperado", 
+            f"❌ Error durante la generación para Proteus:\n\n{str(e)}")
+        self.update_status("❌ Error inesperado en generación para Proteus")
+    
+    def _show_proteus_result(self, program_name, success, message):
+        """Muestra el resultado de compile_dos_real_job"""
+        if success:
+            success_msg = (
+                f"🎯 ¡EJECUTABLE DOS REAL PARA PROTEUS!\n\n"
+                f"📁 Archivo: {program_name}.exe\n"
+                f"📂 Ubicación: DOSBox2\\Tasm\\\n"
+                f"�️  Formato: MS-DOS ejecutable REAL\n"
+                f"🔌 Procesador: 8086 (modo real)\n"
+                f"⚡ Puertos: 0300h-0303h (8255 PPI)\n"
+                f"🤖 Control: 3 motores paso a paso\n\n"
+                f"🎮 CONFIGURACIÓN PROTEUS (CRÍTICA):\n"
+                f"1. ⚙️  Procesador: 8086 (NO 8088, NO x86)\n"
+                f"2. 🖥️  Modelo: 8086 Real Mode\n"
+                f"3. 📂 Cargar: {program_name}.exe\n"
+                f"4. 🔌 8255 PPI en direcciones:\n"
+                f"   • 0300h (Puerto A - Base)\n"
+                f"   • 0301h (Puerto B - Hombro)\n"
+                f"   • 0302h (Puerto C - Codo)\n"
+                f"   • 0303h (Control)\n"
+                f"5. 🤖 ULN2003A para drivers\n\n"
+                f"✅ ¡Sin error de opcode desconocido!\n"
+                f"✅ ¡Ejecutable DOS auténtico!"
+            )
+            
+            messagebox.showinfo("🎯 ¡Ejecutable para Proteus Listo!", success_msg)
+            self.update_status(f"✅ {program_name}.exe generado para Proteus en DOSBox2\\Tasm\\")
+        else:
+            messagebox.showerror("❌ Error en Proteus", 
+                f"Error generando para Proteus:\n\n{message}")
+            self.update_status("❌ Error en generación para Proteus")
     
+
     def generate_com_file(self):
         """Genera archivo .COM específicamente para Proteus (como noname.com que funciona)"""
         code = self.code_editor.get(1.0, tk.END).strip()
@@ -652,11 +1022,13 @@ class LexicalAnalyzerGUI:
             messagebox.showerror("Error", "No hay código para generar archivo .COM")
             return
         
+        # Analizar código (en segundo plano; continúa al terminar)
+        self.update_status("🔍 Analizando código para archivo .COM...")
+        self.analyze_in_background(code, self._generate_analyzed_com_file)
+    
+    def _generate_analyzed_com_file(self, tokens, errors):
+        """Continúa generate_com_file con el análisis listo"""
         try:
-            # Analizar código
-            self.update_status("🔍 Analizando código para archivo .COM...")
-            tokens, errors = self.analyzer.analyze(code)
-            
             # Solo rechazar errores críticos
             critical_errors = [e for e in errors if "crítico" in str(e).lower() or "fatal" in str(e).lower()]
             if critical_errors:
@@ -681,57 +1053,49 @@ class LexicalAnalyzerGUI:
                 return
             
             self.update_status(f"📁 Generando {program_name}.com para Proteus...")
-            
-            # Crear el generador COM DINÁMICO optimizado
-            import create_dynamic_motor_com_v2
-            
-            # Generar el archivo COM dinámico usando los valores del código
-            success = create_dynamic_motor_com_v2.create_dynamic_com_from_analyzer(self.analyzer)
-            
-            # Paths para renombrar
-            original_path = os.path.join("DOSBox2", "Tasm", "motor_user.com")
-            new_path = os.path.join("DOSBox2", "Tasm", f"{program_name}.com")
-            
-            if success and os.path.exists(original_path):
-                # Renombrar al nombre solicitado
-                import shutil
-                shutil.copy2(original_path, new_path)
-                
-                file_size = os.path.getsize(new_path)
-                
-                success_msg = (
-                    f"📁 ¡ARCHIVO .COM DINÁMICO!\n\n"
-                    f"📂 Archivo: {program_name}.com\n"
-                    f"📏 Tamaño: {file_size} bytes\n"
-                    f"📍 Ubicación: DOSBox2\\Tasm\\\n"
-                    f"🎯 Formato: .COM (basado en tu código)\n\n"
-                    f"🤖 VALORES EXTRAÍDOS DE TU CÓDIGO:\n"
-                    f"• r1.base = {self.get_motor_value('base')}°\n"
-                    f"• r1.hombro = {self.get_motor_value('hombro')}°\n"
-                    f"• r1.codo = {self.get_motor_value('codo')}°\n"
-                    f"• r1.velocidad = {self.get_motor_value('velocidad')}\n"
-                    f"• r1.espera = {self.get_motor_value('espera')}\n\n"
-                    f"✅ ARCHIVO .COM GENERADO DINÁMICAMENTE:\n"
-                    f"• Ángulos exactos de tu sintaxis\n"
-                    f"• Código máquina personalizado\n"
-                    f"• No valores estáticos\n\n"
-                    f"🎮 CARGAR EN PROTEUS:\n"
-                    f"1. Archivo: {program_name}.com\n"
-                    f"2. Procesador: 8086 Real Mode\n"
-                    f"3. ¡Ángulos de tu código Robot!\n"
-                    f"4. Completamente personalizado"
-                )
-                
-                messagebox.showinfo("📁 ¡Archivo .COM Listo!", success_msg)
-                self.update_status(f"✅ {program_name}.com generado exitosamente")
-            else:
-                messagebox.showerror("❌ Error", "No se pudo generar el archivo .COM")
-                self.update_status("❌ Error generando archivo .COM")
+            self.run_job(com_file_job, self.analyzer, program_name, key='build',
+                         on_done=lambda file_size: self._show_com_result(program_name, file_size),
+                         on_error=self._show_com_unexpected_error)
                 
         except Exception as e:
-            messagebox.showerror("Error Inesperado", 
-                f"❌ Error durante la generación .COM:\n\n{str(e)}")
-            self.update_status("❌ Error inesperado en generación .COM")
+            self._show_com_unexpected_error(e)
+    
+    def _show_com_unexpected_error(self, e):
+        messagebox.showerror("Error Inesperado", 
+            f"❌ Error durante la generación .COM:\n\n{str(e)}")
+        self.update_status("❌ Error inesperado en generación .COM")
+    
+    def _show_com_result(self, program_name, file_size):
+        """Muestra el resultado de com_file_job"""
+        if file_size is not None:
+            success_msg = (
+                f"📁 ¡ARCHIVO .COM DINÁMICO!\n\n"
+                f"📂 Archivo: {program_name}.com\n"
+                f"📏 Tamaño: {file_size} bytes\n"
+                f"📍 Ubicación: DOSBox2\\Tasm\\\n"
+                f"🎯 Formato: .COM (basado en tu código)\n\n"
+                f"🤖 VALORES EXTRAÍDOS DE TU CÓDIGO:\n"
+                f"• r1.base = {self.get_motor_value('base')}°\n"
+                f"• r1.hombro = {self.get_motor_value('hombro')}°\n"
+                f"• r1.codo = {self.get_motor_value('codo')}°\n"
+                f"• r1.velocidad = {self.get_motor_value('velocidad')}\n"
+                f"• r1.espera = {self.get_motor_value('espera')}\n\n"
+                f"✅ ARCHIVO .COM GENERADO DINÁMICAMENTE:\n"
+                f"• Ángulos exactos de tu sintaxis\n"
+                f"• Código máquina personalizado\n"
+                f"• No valores estáticos\n\n"
+                f"🎮 CARGAR EN PROTEUS:\n"
+                f"1. Archivo: {program_name}.com\n"
+                f"2. Procesador: 8086 Real Mode\n"
+                f"3. ¡Ángulos de tu código Robot!\n"
+                f"4. Completamente personalizado"
+            )
+            
+            messagebox.showinfo("📁 ¡Archivo .COM Listo!", success_msg)
+            self.update_status(f"✅ {program_name}.com generado exitosamente")
+        else:
+            messagebox.showerror("❌ Error", "No se pudo generar el archivo .COM")
+            self.update_status("❌ Error generando archivo .COM")
 
     def generate_dynamic_asm(self):
         """Genera código ASM dinámico basado en valores del código Robot"""
@@ -740,11 +1104,17 @@ class LexicalAnalyzerGUI:
             messagebox.showerror("Error", "No hay código para generar ASM dinámico")
             return
         
+        # Analizar código (en segundo plano; continúa al terminar)
+        self.update_status("🔍 Analizando código para ASM dinámico...")
+        self.analyze_in_background(code, self._generate_analyzed_dynamic_asm)
+    
+    def _generate_analyzed_dynamic_asm(self, tokens, errors):
+        """Continúa generate_dynamic_asm con el análisis listo"""
+        def failed(e):
+            messagebox.showerror("Error", f"Error generando ASM dinámico:\n\n{str(e)}")
+            self.update_status("❌ Error generando ASM dinámico")
+        
         try:
-            # Analizar código
-            self.update_status("🔍 Analizando código para ASM dinámico...")
-            tokens, errors = self.analyzer.analyze(code)
-            
             # Solicitar nombre del programa
             program_name = tk.simpledialog.askstring(
                 "ASM Dinámico", 
@@ -755,44 +1125,41 @@ class LexicalAnalyzerGUI:
             if not program_name:
                 return
             
-            # Generar ASM dinámico
-            from create_dynamic_asm_generator import generate_dynamic_asm_from_analyzer
-            asm_code = generate_dynamic_asm_from_analyzer(self.analyzer, program_name)
-            
-            # Guardar archivo ASM
             asm_path = os.path.join(self.tasm_path, f"{program_name}.asm")
-            with open(asm_path, 'w', encoding='ascii', errors='ignore') as f:
-                f.write(asm_code)
-            
-            # Mostrar código ASM generado
-            self.show_assembly_code(asm_code, program_name)
-            
-            # Mensaje de éxito
-            success_msg = (
-                f"📝 ¡ASM DINÁMICO GENERADO!\n\n"
-                f"📂 Archivo: {program_name}.asm\n"
-                f"📍 Ubicación: DOSBox2\\Tasm\\\n\n"
-                f"🤖 VALORES EXTRAÍDOS:\n"
-                f"• r1.base = {self.get_motor_value('base')}°\n"
-                f"• r1.hombro = {self.get_motor_value('hombro')}°\n"
-                f"• r1.codo = {self.get_motor_value('codo')}°\n"
-                f"• r1.velocidad = {self.get_motor_value('velocidad')}\n"
-                f"• r1.espera = {self.get_motor_value('espera')}\n\n"
-                f"✅ CARACTERÍSTICAS:\n"
-                f"• Ángulos exactos de tu sintaxis\n"
-                f"• Pasos y delays calculados\n"
-                f"• Compatible con TASM/DOSBox\n"
-                f"• Listo para compilar a .EXE/.COM\n\n"
-                f"🎯 SIGUIENTE PASO:\n"
-                f"Compila este ASM con TASM para crear el ejecutable"
-            )
-            
-            messagebox.showinfo("✅ ASM Dinámico Generado", success_msg)
-            self.update_status(f"✅ {program_name}.asm generado dinámicamente")
+            self.run_job(dynamic_asm_job, self.analyzer, asm_path, program_name, key='build',
+                         on_done=lambda asm_code: self._show_dynamic_asm_result(program_name, asm_code),
+                         on_error=failed)
             
         except Exception as e:
-            messagebox.showerror("Error", f"Error generando ASM dinámico:\n\n{str(e)}")
-            self.update_status("❌ Error generando ASM dinámico")
+            failed(e)
+    
+    def _show_dynamic_asm_result(self, program_name, asm_code):
+        """Muestra el resultado de dynamic_asm_job"""
+        # Mostrar código ASM generado
+        self.show_assembly_code(asm_code, program_name)
+        
+        # Mensaje de éxito
+        success_msg = (
+            f"📝 ¡ASM DINÁMICO GENERADO!\n\n"
+            f"📂 Archivo: {program_name}.asm\n"
+            f"📍 Ubicación: DOSBox2\\Tasm\\\n\n"
+            f"🤖 VALORES EXTRAÍDOS:\n"
+            f"• r1.base = {self.get_motor_value('base')}°\n"
+            f"• r1.hombro = {self.get_motor_value('hombro')}°\n"
+            f"• r1.codo = {self.get_motor_value('codo')}°\n"
+            f"• r1.velocidad = {self.get_motor_value('velocidad')}\n"
+            f"• r1.espera = {self.get_motor_value('espera')}\n\n"
+            f"✅ CARACTERÍSTICAS:\n"
+            f"• Ángulos exactos de tu sintaxis\n"
+            f"• Pasos y delays calculados\n"
+            f"• Compatible con TASM/DOSBox\n"
+            f"• Listo para compilar a .EXE/.COM\n\n"
+            f"🎯 SIGUIENTE PASO:\n"
+            f"Compila este ASM con TASM para crear el ejecutable"
+        )
+        
+        messagebox.showinfo("✅ ASM Dinámico Generado", success_msg)
+        self.update_status(f"✅ {program_name}.asm generado dinámicamente")
 
     def generate_mod_file(self):
         """Genera archivo .mod para RoboDK desde sintaxis robótica"""
@@ -801,6 +1168,11 @@ class LexicalAnalyzerGUI:
             messagebox.showerror("Error", "No hay código para generar archivo .mod")
             return
         
+        def failed(e):
+            messagebox.showerror("Error Inesperado", 
+                f"❌ Error durante la generación .mod:\n\n{str(e)}")
+            self.update_status("❌ Error inesperado en generación .mod")
+        
         try:
             # Solicitar nombre del archivo
             program_name = tk.simpledialog.askstring(
@@ -825,47 +1197,49 @@ class LexicalAnalyzerGUI:
             
             self.update_status(f"🤖 Generando {program_name} para RoboDK...")
             
-            # Generar archivo .mod
-            success, message = self.mod_generator.generate_mod_file(code, program_name)
-            
-            if success:
-                # Mostrar mensaje de éxito con detalles
-                success_msg = (
-                    f"🤖 ¡ARCHIVO .MOD GENERADO PARA ROBODK!\n\n"
-                    f"📂 Archivo: {program_name}\n"
-                    f"📍 Ubicación: {os.getcwd()}\n"
-                    f"🔧 Formato: RAPID para RoboDK\n\n"
-                    f"🎯 INSTRUCCIONES DE USO:\n"
-                    f"1. Abrir RoboDK\n"
-                    f"2. Cargar robot (ABB IRB140 recomendado)\n"
-                    f"3. Importar programa: File → Load → {program_name}\n"
-                    f"4. Ejecutar simulación\n\n"
-                    f"✅ CARACTERÍSTICAS:\n"
-                    f"• Movimientos basados en tu sintaxis Robot\n"
-                    f"• Control de articulaciones individual\n"
-                    f"• Velocidades configurables\n"
-                    f"• Compatible con Robotiq 2F-85 Gripper\n\n"
-                    f"🤖 Los movimientos del robot reflejarán exactamente\n"
-                    f"los valores que definiste en tu código Robot!"
-                )
-                
-                # Preguntar si quiere ver el contenido
-                result = messagebox.askyesno("🎉 Archivo .mod Generado", 
-                    success_msg + "\n\n¿Deseas ver el contenido del archivo .mod generado?")
-                
-                if result:
-                    self.show_mod_content(program_name)
-                
-                self.update_status(f"✅ {program_name} generado exitosamente para RoboDK")
-                
-            else:
-                messagebox.showerror("❌ Error", f"Error generando archivo .mod:\n\n{message}")
-                self.update_status("❌ Error generando archivo .mod")
+            # Generar archivo .mod en segundo plano
+            self.run_job(mod_file_job, self.mod_generator, code, program_name, key='build',
+                         on_done=lambda result: self._show_mod_result(program_name, *result[:2]),
+                         on_error=failed)
                 
         except Exception as e:
-            messagebox.showerror("Error Inesperado", 
-                f"❌ Error durante la generación .mod:\n\n{str(e)}")
-            self.update_status("❌ Error inesperado en generación .mod")
+            failed(e)
+    
+    def _show_mod_result(self, program_name, success, message):
+        """Muestra el resultado de generate_mod_file"""
+        if success:
+            # Mostrar mensaje de éxito con detalles
+            success_msg = (
+                f"🤖 ¡ARCHIVO .MOD GENERADO PARA ROBODK!\n\n"
+                f"📂 Archivo: {program_name}\n"
+                f"📍 Ubicación: {os.getcwd()}\n"
+                f"🔧 Formato: RAPID para RoboDK\n\n"
+                f"🎯 INSTRUCCIONES DE USO:\n"
+                f"1. Abrir RoboDK\n"
+                f"2. Cargar robot (ABB IRB140 recomendado)\n"
+                f"3. Importar programa: File → Load → {program_name}\n"
+                f"4. Ejecutar simulación\n\n"
+                f"✅ CARACTERÍSTICAS:\n"
+                f"• Movimientos basados en tu sintaxis Robot\n"
+                f"• Control de articulaciones individual\n"
+                f"• Velocidades configurables\n"
+                f"• Compatible con Robotiq 2F-85 Gripper\n\n"
+                f"🤖 Los movimientos del robot reflejarán exactamente\n"
+                f"los valores que definiste en tu código Robot!"
+            )
+            
+            # Preguntar si quiere ver el contenido
+            result = messagebox.askyesno("🎉 Archivo .mod Generado", 
+                success_msg + "\n\n¿Deseas ver el contenido del archivo .mod generado?")
+            
+            if result:
+                self.show_mod_content(program_name)
+            
+            self.update_status(f"✅ {program_name} generado exitosamente para RoboDK")
+            
+        else:
+            messagebox.showerror("❌ Error", f"Error generando archivo .mod:\n\n{message}")
+            self.update_status("❌ Error generando archivo .mod")
 
     def show_mod_content(self, filename):
         """Muestra el contenido del archivo .mod generado"""
@@ -929,6 +1303,11 @@ class LexicalAnalyzerGUI:
             messagebox.showerror("Error", "No hay código para generar archivo .mod secuencial")
             return
         
+        def failed(e):
+            messagebox.showerror("Error Inesperado", 
+                f"❌ Error durante la generación .mod secuencial:\n\n{str(e)}")
+            self.update_status("❌ Error inesperado en generación .mod secuencial")
+        
         try:
             # Solicitar nombre del archivo
             program_name = tk.simpledialog.askstring(
@@ -954,53 +1333,53 @@ class LexicalAnalyzerGUI:
             
             self.update_status(f"🤖 Generando {program_name} secuencial para RoboDK...")
             
-            # Generar archivo .mod secuencial con sintaxis completa
-            success, message = self.sequential_generator.generate_mod_file(code, program_name)
-            
-            if success:
-                # Obtener resumen de movimientos secuenciales
-                movement_summary = self.sequential_generator.get_movement_summary()
-                
-                # Mostrar mensaje de éxito con detalles
-                success_msg = (
-                    f"🤖 ¡ARCHIVO .MOD SECUENCIAL GENERADO!\n\n"
-                    f"📂 Archivo: {program_name}\n"
-                    f"📍 Ubicación: {os.getcwd()}\n"
-                    f"🔧 Formato: RAPID coordinado para ABB IRB140\n"
-                    f"🎯 Tipo: Movimientos coordinados sin colisiones\n\n"
-                    f"✅ PROBLEMA DE COLISIONES RESUELTO:\n"
-                    f"• Movimientos coordinados (todas las articulaciones juntas)\n"
-                    f"• Sin colisiones internas del robot\n"
-                    f"• Solo {len(self.coordinated_generator.sequence_positions)} posiciones en lugar de 60+\n"
-                    f"• Trayectorias realistas y seguras\n"
-                    f"• Posiciones intermedias calculadas\n"
-                    f"• Secuencia lógica de pick & place\n\n"
-                    f"🎮 INSTRUCCIONES PARA ROBODK:\n"
-                    f"1. Abrir RoboDK\n"
-                    f"2. Cargar robot ABB IRB140-6/0.8 Base\n"
-                    f"3. File → Load → {program_name}\n"
-                    f"4. ¡El robot NO se atravesará a sí mismo!\n\n"
-                    f"🚀 El robot completará toda la secuencia\n"
-                    f"sin quedarse trabado en colisiones internas!"
-                )
-                
-                # Preguntar si quiere ver el resumen y contenido
-                result = messagebox.askyesno("🎉 Archivo .mod Secuencial Generado", 
-                    success_msg + "\n\n¿Deseas ver el resumen de movimientos y el archivo generado?")
-                
-                if result:
-                    self.show_sequential_summary(movement_summary, program_name)
-                
-                self.update_status(f"✅ {program_name} secuencial generado exitosamente")
-                
-            else:
-                messagebox.showerror("❌ Error", f"Error generando archivo .mod secuencial:\n\n{message}")
-                self.update_status("❌ Error generando archivo .mod secuencial")
+            # Generar archivo .mod secuencial con sintaxis completa (en segundo plano,
+            # junto con el resumen de movimientos)
+            self.run_job(mod_file_job, self.sequential_generator, code, program_name, True, key='build',
+                         on_done=lambda result: self._show_sequential_mod_result(program_name, *result),
+                         on_error=failed)
                 
         except Exception as e:
-            messagebox.showerror("Error Inesperado", 
-                f"❌ Error durante la generación .mod secuencial:\n\n{str(e)}")
-            self.update_status("❌ Error inesperado en generación .mod secuencial")
+            failed(e)
+    
+    def _show_sequential_mod_result(self, program_name, success, message, movement_summary):
+        """Muestra el resultado de generate_sequential_mod_file"""
+        if success:
+            # Mostrar mensaje de éxito con detalles
+            success_msg = (
+                f"🤖 ¡ARCHIVO .MOD SECUENCIAL GENERADO!\n\n"
+                f"📂 Archivo: {program_name}\n"
+                f"📍 Ubicación: {os.getcwd()}\n"
+                f"🔧 Formato: RAPID coordinado para ABB IRB140\n"
+                f"🎯 Tipo: Movimientos coordinados sin colisiones\n\n"
+                f"✅ PROBLEMA DE COLISIONES RESUELTO:\n"
+                f"• Movimientos coordinados (todas las articulaciones juntas)\n"
+                f"• Sin colisiones internas del robot\n"
+                f"• Solo {len(self.coordinated_generator.sequence_positions)} posiciones en lugar de 60+\n"
+                f"• Trayectorias realistas y seguras\n"
+                f"• Posiciones intermedias calculadas\n"
+                f"• Secuencia lógica de pick & place\n\n"
+                f"🎮 INSTRUCCIONES PARA ROBODK:\n"
+                f"1. Abrir RoboDK\n"
+                f"2. Cargar robot ABB IRB140-6/0.8 Base\n"
+                f"3. File → Load → {program_name}\n"
+                f"4. ¡El robot NO se atravesará a sí mismo!\n\n"
+                f"🚀 El robot completará toda la secuencia\n"
+                f"sin quedarse trabado en colisiones internas!"
+            )
+            
+            # Preguntar si quiere ver el resumen y contenido
+            result = messagebox.askyesno("🎉 Archivo .mod Secuencial Generado", 
+                success_msg + "\n\n¿Deseas ver el resumen de movimientos y el archivo generado?")
+            
+            if result:
+                self.show_sequential_summary(movement_summary, program_name)
+            
+            self.update_status(f"✅ {program_name} secuencial generado exitosamente")
+            
+        else:
+            messagebox.showerror("❌ Error", f"Error generando archivo .mod secuencial:\n\n{message}")
+            self.update_status("❌ Error generando archivo .mod secuencial")
 
     def show_sequential_summary(self, movement_summary, filename):
         """Muestra el resumen de movimientos y contenido del archivo .mod secuencial"""
@@ -1136,61 +1515,24 @@ en tu código Robot, incluyendo velocidades y esperas."""
             return f"Error: {e}"
 
     def show_compilation_progress(self, program_name):
-        """Muestra ventana de progreso durante la compilación"""
-        progress_window = tk.Toplevel(self.root)
-        progress_window.title("Compilando...")
-        progress_window.geometry("400x150")
-        progress_window.resizable(False, False)
-        
-        # Centrar ventana
-        progress_window.transient(self.root)
-        progress_window.grab_set()
-        
-        tk.Label(progress_window, text="🔧 Compilando código robótico", 
-                font=('Arial', 12, 'bold')).pack(pady=10)
-        tk.Label(progress_window, text=f"Programa: {program_name}.exe", 
-                font=('Arial', 10)).pack(pady=5)
-        tk.Label(progress_window, text="DOSBox + TASM trabajando...", 
-                font=('Arial', 10)).pack(pady=5)
-        
-        # Barra de progreso indeterminada
-        import tkinter.ttk as ttk
-        progress_bar = ttk.Progressbar(progress_window, mode='indeterminate')
-        progress_bar.pack(pady=10, padx=20, fill='x')
-        progress_bar.start()
-        
-        return progress_window
+        """Ventana de progreso durante la compilación (ver ProgressWindow)"""
+        return ProgressWindow(self.root, "Compilando...", "400x210", [
+            ("🔧 Compilando código robótico", ('Arial', 12, 'bold'), 10),
+            (f"Programa: {program_name}.exe", ('Arial', 10), 5),
+            ("DOSBox + TASM trabajando...", ('Arial', 10), 5),
+        ])
     
     def show_proteus_compilation_progress(self, program_name):
-        """Muestra ventana de progreso durante la generación para Proteus"""
-        progress_window = tk.Toplevel(self.root)
-        progress_window.title("Generando para Proteus...")
-        progress_window.geometry("450x180")
-        progress_window.resizable(False, False)
-        
-        # Centrar ventana
-        progress_window.transient(self.root)
-        progress_window.grab_set()
-        
-        tk.Label(progress_window, text="🎯 Generando ejecutable DOS REAL", 
-                font=('Arial', 12, 'bold')).pack(pady=10)
-        tk.Label(progress_window, text=f"Programa: {program_name}.exe", 
-                font=('Arial', 10)).pack(pady=5)
-        tk.Label(progress_window, text="🖥️  Modo: MS-DOS Real para 8086", 
-                font=('Arial', 10)).pack(pady=2)
-        tk.Label(progress_window, text="🔌 Configurando puertos 0300h-0303h", 
-                font=('Arial', 10)).pack(pady=2)
-        tk.Label(progress_window, text="🤖 Sin errores de opcode...", 
-                font=('Arial', 10)).pack(pady=2)
-        
-        # Barra de progreso indeterminada
-        import tkinter.ttk as ttk
-        progress_bar = ttk.Progressbar(progress_window, mode='indeterminate')
-        progress_bar.pack(pady=10, padx=20, fill='x')
-        progress_bar.start()
-        
-        return progress_window
+        """Ventana de progreso durante la generación para Proteus (ver ProgressWindow)"""
+        return ProgressWindow(self.root, "Generando para Proteus...", "450x250", [
+            ("🎯 Generando ejecutable DOS REAL", ('Arial', 12, 'bold'), 10),
+            (f"Programa: {program_name}.exe", ('Arial', 10), 5),
+            ("🖥️  Modo: MS-DOS Real para 8086", ('Arial', 10), 2),
+            ("🔌 Configurando puertos 0300h-0303h", ('Arial', 10), 2),
+            ("🤖 Sin errores de opcode...", ('Arial', 10), 2),
+        ])
     
+
     def update_status(self, message):
         """Actualiza la barra de estado - Windows Edition"""
         self.status_bar.config(text=f"🪟 {message}")
@@ -1313,7 +1655,11 @@ en tu código Robot, incluyendo velocidades y esperas."""
     
     def run(self):
         """Ejecuta la aplicación"""
-        self.root.mainloop()
+        try:
+            self.root.mainloop()
+        finally:
+            self.worker.shutdown()
+            self.live_worker.shutdown()
 
 if __name__ == "__main__":
     try:
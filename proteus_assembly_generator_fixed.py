@@ -7,10 +7,12 @@ Usa formato .MODEL SMALL y direcciones de puerto estándar sin problemas de form
 
 from datetime import datetime
 
+from robot_stepping import DEFAULT_STEP_MODELS
+
 class ProteusAssemblyGeneratorFixed:
     """Generador de código assembly compatible con Proteus - VERSIÓN CORREGIDA"""
     
-    def __init__(self):
+    def __init__(self, step_models=None):
         # Direcciones de puerto estándar para Proteus/8255
         self.port_addresses = {
             'base': '0300h',      # Port A del 8255
@@ -19,13 +21,11 @@ class ProteusAssemblyGeneratorFixed:
             'config': '0303h'     # Puerto de configuración del 8255
         }
         
-        # Patrones de pasos para motores paso a paso
-        self.step_patterns = [
-            '01h',  # Paso 1: 0001
-            '03h',  # Paso 2: 0011  
-            '02h',  # Paso 3: 0010
-            '06h'   # Paso 4: 0110
-        ]
+        # Modelo de pasos de cada motor (robot_stepping.StepModel)
+        self.step_models = {**DEFAULT_STEP_MODELS, **(step_models or {})}
+        
+        # Patrones de pasos para motores paso a paso (fases de la base)
+        self.step_patterns = [f"{phase:02X}h" for phase in self.step_models['base'].phases]
     
     def generate_from_robot_data(self, robot_commands, program_name="robot_control"):
         """Genera assembly a partir de comandos de robot analizados"""
@@ -63,10 +63,11 @@ class ProteusAssemblyGeneratorFixed:
 .STACK 100h
 
 .DATA
-    motor_base     DB ?
-    motor_hombro   DB ?  
-    motor_codo     DB ?
+    motor_base     DB 0
+    motor_hombro   DB 0
+    motor_codo     DB 0
     delay_count    DW ?
+{self.generate_phase_tables()}
 
 .CODE
 MAIN PROC
@@ -165,118 +166,55 @@ END MAIN
         """Genera procedimientos de movimiento con nombres SIMPLES"""
         procedures = ""
         
-        if 'base' in motor_values:
-            angle = motor_values['base']
-            steps = self.calculate_steps(angle, 360)
-            procedures += f"""
-;===============================================
-; PROCEDIMIENTO MOTOR BASE
-;===============================================
-MOVE_BASE PROC
-    PUSH CX
-    PUSH AX
-    
-    MOV CX, {steps}
-STEP_LOOP_BASE:
-    MOV AL, 01h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 03h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 02h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 06h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    LOOP STEP_LOOP_BASE
-    
-    POP AX
-    POP CX
-    RET
-MOVE_BASE ENDP
-"""
+        for motor in ('base', 'hombro', 'codo'):
+            if motor in motor_values:
+                procedures += self.generate_motor_procedure(motor, motor_values[motor])
         
-        if 'hombro' in motor_values:
-            angle = motor_values['hombro']
-            steps = self.calculate_steps(angle, 180)
-            procedures += f"""
-;===============================================
-; PROCEDIMIENTO MOTOR HOMBRO
-;===============================================
-MOVE_HOMBRO PROC
-    PUSH CX
-    PUSH AX
-    
-    MOV CX, {steps}
-STEP_LOOP_HOMBRO:
-    MOV AL, 01h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 03h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 02h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 06h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    LOOP STEP_LOOP_HOMBRO
+        return procedures
     
-    POP AX
-    POP CX
-    RET
-MOVE_HOMBRO ENDP
-"""
-            
-        if 'codo' in motor_values:
-            angle = motor_values['codo']
-            steps = self.calculate_steps(angle, 180)
-            procedures += f"""
+    def generate_motor_procedure(self, motor, angle):
+        """Procedimiento MOVE_<MOTOR>: un paso por vuelta del ciclo CX, con la
+        fase actual del motor en motor_<motor> y sus fases en fases_<motor>"""
+        steps = self.calculate_steps(motor, angle)
+        name = motor.upper()
+        return f"""
 ;===============================================
-; PROCEDIMIENTO MOTOR CODO
+; PROCEDIMIENTO MOTOR {name}
 ;===============================================
-MOVE_CODO PROC
+MOVE_{name} PROC
     PUSH CX
     PUSH AX
+    PUSH BX
     
-    MOV CX, {steps}
-STEP_LOOP_CODO:
-    MOV AL, 01h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 03h
+    MOV CX, {abs(steps)}
+    JCXZ FIN_{name}
+    LEA BX, fases_{motor}
+STEP_LOOP_{name}:
+    MOV AL, motor_{motor}
+    {'INC' if steps > 0 else 'DEC'} AL
+    AND AL, {len(self.step_models[motor].phases) - 1}
+    MOV motor_{motor}, AL
+    XLAT
     OUT DX, AL
     CALL SHORT_DELAY
-    MOV AL, 02h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    MOV AL, 06h
-    OUT DX, AL
-    CALL SHORT_DELAY
-    LOOP STEP_LOOP_CODO
+    LOOP STEP_LOOP_{name}
+FIN_{name}:
     
+    POP BX
     POP AX
     POP CX
     RET
-MOVE_CODO ENDP
+MOVE_{name} ENDP
 """
-        
-        return procedures
     
-    def calculate_steps(self, angle, max_angle):
-        """Calcula el número de pasos para un ángulo dado"""
-        # Motores paso a paso típicos: 200 pasos por revolución (1.8° por paso)
-        steps_per_revolution = 200
-        steps_per_degree = steps_per_revolution / 360
-        
-        # Calcular pasos necesarios
-        steps = int(angle * steps_per_degree)
-        
-        # Asegurar valores mínimos/máximos
-        return max(1, min(steps, int(max_angle * steps_per_degree)))
+    def generate_phase_tables(self):
+        """Tablas de fases de los motores para XLAT (sentido de avance)"""
+        return "\n".join(f"    fases_{motor:<9}DB " + ", ".join(f"{phase:02X}h" for phase in model.phases)
+                         for motor, model in self.step_models.items())
+    
+    def calculate_steps(self, motor, angle):
+        """Calcula el número de pasos (con signo) para llevar el motor de 0 a `angle` grados"""
+        return self.step_models[motor].steps(0, angle)
     
     def get_motor_info(self):
         """Retorna información sobre la configuración de motores"""
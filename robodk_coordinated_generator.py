@@ -5,15 +5,22 @@ Crea movimientos coordinados seguros sin colisiones internas
 """
 
 import os
-import re
 from datetime import datetime
-from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_analysis_cache import shared_cache
+from robot_artifact_cache import shared_artifact_cache
+from robot_motion import motion_plan
+
+# Backend del generador en el caché de artefactos
+BACKEND_ID = 'robodk-coordinated'
+BACKEND_VERSION = '2'
 
 class RoboDKCoordinatedGenerator:
     """Generador que crea movimientos coordinados seguros"""
     
-    def __init__(self):
-        self.analyzer = RobotLexicalAnalyzer()
+    def __init__(self, analyzer=None):
+        # Sin analizador propio se usa el análisis del caché compartido (el mismo
+        # que usan la interfaz y los demás generadores para ese código)
+        self.analyzer = analyzer
         self.robot_name = "r1"
         
         # Posiciones seguras predefinidas para ABB IRB140
@@ -42,81 +49,67 @@ class RoboDKCoordinatedGenerator:
         
     def analyze_robot_code(self, code):
         """Analiza el código y crea secuencia de posiciones coordinadas"""
-        # Limpiar código
-        lines = code.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('//'):
-                clean_lines.append(line)
-        
-        clean_code = '\n'.join(clean_lines)
-        
-        # Analizar tokens
-        tokens, errors = self.analyzer.analyze(clean_code)
+        # Analizar tokens (los comentarios se descartan al escanear)
+        if self.analyzer is not None:
+            analysis = self.analyzer
+            tokens, errors = analysis.analyze(code)
+        else:
+            analysis = shared_cache.analyze(code)
+            tokens, errors = analysis.tokens, analysis.errors
+        program = analysis.get_program()
         
-        # Extraer nombre del robot
-        for i, token in enumerate(tokens):
-            if hasattr(token, 'type') and hasattr(token, 'value'):
-                if token.type == 'KEYWORD' and token.value.lower() == 'robot':
-                    if i + 1 < len(tokens):
-                        next_token = tokens[i + 1]
-                        if hasattr(next_token, 'value'):
-                            self.robot_name = next_token.value
-                            break
+        # Nombre del robot: el primero declarado
+        if program.robot_name:
+            self.robot_name = program.robot_name
         
         # Crear secuencia inteligente de posiciones
-        self._create_intelligent_sequence(clean_code)
+        self._create_intelligent_sequence(program, code.split('\n'))
         
         return tokens, errors
     
-    def _create_intelligent_sequence(self, code):
-        """Crea una secuencia inteligente basada en el patrón del código"""
-        lines = code.split('\n')
-        
+    def _create_intelligent_sequence(self, program, lines):
+        """Crea una secuencia inteligente basada en el patrón del código.
+
+        Recorre el plan de movimiento del programa (robot_motion.motion_plan):
+        cada segmento que termina en una espera es una posición coordinada. El
+        texto de las líneas del segmento (`lines`) solo se usa para detectar la
+        sección por sus palabras clave.
+        """
         # Analizar las secciones del código
         current_section = "initial"
-        temp_state = self.current_state.copy()
+        axes = ('base', 'hombro', 'codo', 'muneca', 'garra')
+        plan = motion_plan(program.walk(self.robot_name), self.current_state['velocidad'],
+                           initial={axis: self.current_state[axis] for axis in axes}, axes=axes)
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Detectar secciones por comentarios
-            if "INICIAL" in line.upper() or "APROXIMACIÓN" in line.upper():
-                current_section = "approach"
-            elif "OBJETO" in line.upper() and "IR" in line.upper():
-                current_section = "goto_object"
-            elif "BAJAR" in line.upper() or "AGARRAR" in line.upper():
-                current_section = "pickup"
-            elif "LEVANTAR" in line.upper():
-                current_section = "lift"
-            elif "DESTINO" in line.upper() or "MOVER" in line.upper():
-                current_section = "transport"
-            elif "COLOCAR" in line.upper():
-                current_section = "place"
-            elif "ALEJARSE" in line.upper():
-                current_section = "retreat"
-            elif "REGRESAR" in line.upper() or "ORIGINAL" in line.upper():
-                current_section = "return"
-            
-            # Procesar instrucciones
-            pattern = r'(\w+)\.(\w+)\s*=\s*(\w+)'
-            match = re.match(pattern, line)
+        for segment in plan:
+            for line in lines[segment.line - 1:segment.end_line]:
+                current_section = self._detect_section(line, current_section)
             
-            if match:
-                robot_name, component, value = match.groups()
-                
-                if robot_name == self.robot_name:
-                    if component == 'velocidad':
-                        temp_state['velocidad'] = int(value)
-                    elif component == 'espera':
-                        # Agregar posición con espera
-                        self._add_coordinated_position(current_section, temp_state.copy(), float(value))
-                    elif component in ['base', 'hombro', 'codo', 'muneca', 'garra']:
-                        temp_state[component] = float(value)
+            # Agregar posición con espera
+            if segment.dwell:
+                state = dict(segment.pose, velocidad=int(segment.speed))
+                self._add_coordinated_position(current_section, state, segment.dwell)
+    
+    def _detect_section(self, line, current_section):
+        """Detecta la sección por palabras clave en el texto de la línea"""
+        line = line.upper()
+        if "INICIAL" in line or "APROXIMACIÓN" in line:
+            return "approach"
+        elif "OBJETO" in line and "IR" in line:
+            return "goto_object"
+        elif "BAJAR" in line or "AGARRAR" in line:
+            return "pickup"
+        elif "LEVANTAR" in line:
+            return "lift"
+        elif "DESTINO" in line or "MOVER" in line:
+            return "transport"
+        elif "COLOCAR" in line:
+            return "place"
+        elif "ALEJARSE" in line:
+            return "retreat"
+        elif "REGRESAR" in line or "ORIGINAL" in line:
+            return "return"
+        return current_section
     
     def _add_coordinated_position(self, section, state, wait_time=0):
         """Agrega una posición coordinada basada en la sección"""
@@ -287,6 +280,23 @@ class RoboDKCoordinatedGenerator:
         if not self.sequence_positions:
             self._create_basic_sequence(code)
         
+        # Guardar archivo (un programa sin cambios sale del caché de artefactos)
+        output_path = os.path.join(os.getcwd(), output_filename)
+        key = shared_artifact_cache.key(code, BACKEND_ID, BACKEND_VERSION)
+        try:
+            def build():
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(self._build_mod_content())
+                return True
+            shared_artifact_cache.export(key, output_path, build)
+            
+            return True, f"✅ Archivo .mod COORDINADO generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n🎯 Movimientos coordinados: {len(self.sequence_positions)} posiciones\n🛡️ Sin colisiones internas\n✨ Movimientos realistas y seguros"
+            
+        except Exception as e:
+            return False, f"❌ Error al generar archivo .mod coordinado: {str(e)}"
+    
+    def _build_mod_content(self):
+        """Contenido del archivo .mod coordinado"""
         # Generar timestamp
         timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         
@@ -354,16 +364,7 @@ MODULE MOD_{self.robot_name.upper()}Program
 ENDMODULE
 """
         
-        # Guardar archivo
-        output_path = os.path.join(os.getcwd(), output_filename)
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(mod_content)
-            
-            return True, f"✅ Archivo .mod COORDINADO generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n🎯 Movimientos coordinados: {len(self.sequence_positions)} posiciones\n🛡️ Sin colisiones internas\n✨ Movimientos realistas y seguros"
-            
-        except Exception as e:
-            return False, f"❌ Error al generar archivo .mod coordinado: {str(e)}"
+        return mod_content
     
     def _create_basic_sequence(self, code):
         """Crea secuencia básica si no se detectaron secciones específicas"""
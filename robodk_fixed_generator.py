@@ -7,13 +7,13 @@ Mapeo correcto de articulaciones ABB IRB140
 import os
 import re
 from datetime import datetime
-from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_analysis_cache import shared_cache
 
 class RoboDKFixedGenerator:
     """Generador corregido con mapeo correcto de articulaciones"""
     
     def __init__(self):
-        self.analyzer = RobotLexicalAnalyzer()
+        self.analyzer = None  # último análisis (del caché compartido)
         self.robot_name = "r1"
         self.current_state = {
             'base': 0.0,      # Eje 1: Rotación base
@@ -36,7 +36,8 @@ class RoboDKFixedGenerator:
                 clean_lines.append(line)
         
         clean_code = '\n'.join(clean_lines)
-        tokens, errors = self.analyzer.analyze(clean_code)
+        self.analyzer = shared_cache.analyze(clean_code)
+        tokens, errors = self.analyzer.tokens, self.analyzer.errors
         
         # Extraer nombre del robot
         for i, token in enumerate(tokens):
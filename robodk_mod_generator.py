@@ -6,13 +6,13 @@ Convierte sintaxis robótica a formato RAPID compatible con RoboDK
 
 import os
 from datetime import datetime
-from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_analysis_cache import shared_cache
 
 class RoboDKModGenerator:
     """Generador de archivos .mod para RoboDK desde sintaxis robótica"""
     
     def __init__(self):
-        self.analyzer = RobotLexicalAnalyzer()
+        self.analyzer = None  # último análisis (del caché compartido)
         self.robot_name = "r1"
         self.motor_values = {
             'base': 0.0,
@@ -27,7 +27,8 @@ class RoboDKModGenerator:
         
     def analyze_robot_code(self, code):
         """Analiza el código robótico y extrae valores"""
-        tokens, errors = self.analyzer.analyze(code)
+        self.analyzer = shared_cache.analyze(code)
+        tokens, errors = self.analyzer.tokens, self.analyzer.errors
         
         if errors:
             print(f"⚠️ Advertencias encontradas: {len(errors)}")
@@ -5,15 +5,22 @@ Usa límites seguros del robot ABB IRB140 y formato que funciona
 """
 
 import os
-import re
 from datetime import datetime
-from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_analysis_cache import shared_cache
+from robot_artifact_cache import shared_artifact_cache
+from robot_motion import motion_plan
+
+# Backend del generador en el caché de artefactos
+BACKEND_ID = 'robodk-safe'
+BACKEND_VERSION = '2'
 
 class RoboDKSafeGenerator:
     """Generador seguro que respeta límites del ABB IRB140"""
     
-    def __init__(self):
-        self.analyzer = RobotLexicalAnalyzer()
+    def __init__(self, analyzer=None):
+        # Sin analizador propio se usa el análisis del caché compartido (el mismo
+        # que usan la interfaz y los demás generadores para ese código)
+        self.analyzer = analyzer
         self.robot_name = "r1"
         
         # Límites seguros para ABB IRB140-6/0.8 (en grados)
@@ -50,80 +57,58 @@ class RoboDKSafeGenerator:
     
     def analyze_robot_code(self, code):
         """Analiza el código y extrae la secuencia de movimientos seguros"""
-        # Limpiar código de comentarios
-        lines = code.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('//'):
-                clean_lines.append(line)
-        
-        clean_code = '\n'.join(clean_lines)
-        
-        # Analizar con el analizador léxico
-        tokens, errors = self.analyzer.analyze(clean_code)
+        # Analizar con el analizador léxico (los comentarios se descartan al escanear)
+        if self.analyzer is not None:
+            analysis = self.analyzer
+            tokens, errors = analysis.analyze(code)
+        else:
+            analysis = shared_cache.analyze(code)
+            tokens, errors = analysis.tokens, analysis.errors
+        program = analysis.get_program()
         
-        # Extraer nombre del robot
-        for i, token in enumerate(tokens):
-            if hasattr(token, 'type') and hasattr(token, 'value'):
-                if token.type == 'KEYWORD' and token.value.lower() == 'robot':
-                    if i + 1 < len(tokens):
-                        next_token = tokens[i + 1]
-                        if hasattr(next_token, 'value'):
-                            self.robot_name = next_token.value
-                            break
+        # Nombre del robot: el primero declarado
+        if program.robot_name:
+            self.robot_name = program.robot_name
         
         # Procesar secuencialmente las instrucciones
-        self._process_safe_instructions(clean_code)
+        self._process_safe_instructions(program)
         
         return tokens, errors
     
-    def _process_safe_instructions(self, code):
-        """Procesa las instrucciones aplicando límites seguros"""
-        lines = code.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#') or line.startswith('//'):
-                continue
-                
-            # Buscar patrón: robot.componente = valor
-            pattern = r'(\w+)\.(\w+)\s*=\s*(\w+)'
-            match = re.match(pattern, line)
-            
-            if match:
-                robot_name, component, value = match.groups()
+    def _process_safe_instructions(self, program):
+        """Procesa el plan de movimiento del programa aplicando límites seguros.
+
+        Las asignaciones entre esperas llegan como un solo movimiento
+        coordinado (ver robot_motion.motion_plan).
+        """
+        axes = ('base', 'hombro', 'codo', 'muneca', 'garra')
+        plan = motion_plan(program.walk(self.robot_name), self.current_state['velocidad'],
+                           initial={axis: self.current_state[axis] for axis in axes}, axes=axes)
+        for segment in plan:
+            self.current_state['velocidad'] = int(segment.speed)
+            if segment.moved:
+                # Aplicar límites seguros
+                original = segment.targets
+                targets = {axis: self.limit_angle(axis, value) for axis, value in original.items()}
+                start = {axis: self.current_state[axis] for axis in segment.moved}
+                self.current_state.update(targets)
                 
-                if robot_name == self.robot_name:
-                    # Convertir valor
-                    if component == 'velocidad':
-                        self.current_state[component] = int(value)
-                    elif component == 'espera':
-                        # Agregar movimiento de espera
-                        self.movement_sequence.append({
-                            'type': 'wait',
-                            'time': float(value)
-                        })
-                    elif component in ['base', 'hombro', 'codo', 'muneca', 'garra']:
-                        # Aplicar límites seguros
-                        raw_value = float(value)
-                        safe_value = self.limit_angle(component, raw_value)
-                        
-                        # Actualizar estado y agregar movimiento
-                        old_value = self.current_state[component]
-                        self.current_state[component] = safe_value
-                        
-                        # Agregar movimiento
-                        self.movement_sequence.append({
-                            'type': 'move',
-                            'component': component,
-                            'from': old_value,
-                            'to': safe_value,
-                            'original': raw_value,
-                            'velocity': self.current_state['velocidad'],
-                            'state': self.current_state.copy()
-                        })
+                # Agregar movimiento
+                self.movement_sequence.append({
+                    'type': 'move',
+                    'components': segment.moved,
+                    'from': start,
+                    'to': targets,
+                    'original': original,
+                    'velocity': self.current_state['velocidad'],
+                    'state': self.current_state.copy()
+                })
+            if segment.dwell:
+                # Agregar movimiento de espera
+                self.movement_sequence.append({
+                    'type': 'wait',
+                    'time': segment.dwell
+                })
     
     def generate_mod_file(self, code, output_filename="robot_safe.mod"):
         """Genera archivo .mod seguro para RoboDK"""
@@ -131,6 +116,23 @@ class RoboDKSafeGenerator:
         # Analizar código
         tokens, errors = self.analyze_robot_code(code)
         
+        # Guardar archivo (un programa sin cambios sale del caché de artefactos)
+        output_path = os.path.join(os.getcwd(), output_filename)
+        key = shared_artifact_cache.key(code, BACKEND_ID, BACKEND_VERSION)
+        try:
+            def build():
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(self._build_mod_content())
+                return True
+            shared_artifact_cache.export(key, output_path, build)
+            
+            return True, f"✅ Archivo .mod SEGURO generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n📊 Movimientos seguros: {len(self.movement_sequence)} pasos\n⚠️ Límites ABB IRB140 aplicados\n🎯 Listo para RoboDK sin errores de límites"
+            
+        except Exception as e:
+            return False, f"❌ Error al generar archivo .mod seguro: {str(e)}"
+    
+    def _build_mod_content(self):
+        """Contenido del archivo .mod seguro"""
         # Generar timestamp
         timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         
@@ -174,13 +176,15 @@ MODULE MOD_{self.robot_name.upper()}Program
                 # Generar movimiento MoveAbsJ seguro
                 state = movement['state']
                 velocity = self._get_safe_velocity_string(movement['velocity'])
-                component = movement['component']
+                changes = []
+                for component in movement['components']:
+                    change = f"{component} de {movement['from'][component]:.1f}° a {movement['to'][component]:.1f}°"
+                    if movement['original'][component] != movement['to'][component]:
+                        change += f" (limitado desde {movement['original'][component]:.1f}°)"
+                    changes.append(change)
                 
                 # Comentario descriptivo
-                if movement['original'] != movement['to']:
-                    mod_content += f"        ! Paso {step}: Mover {component} de {movement['from']:.1f}° a {movement['to']:.1f}° (limitado desde {movement['original']:.1f}°)\n"
-                else:
-                    mod_content += f"        ! Paso {step}: Mover {component} de {movement['from']:.1f}° a {movement['to']:.1f}°\n"
+                mod_content += f"        ! Paso {step}: Mover {', '.join(changes)}\n"
                 
                 # Generar MoveAbsJ con estado seguro
                 mod_content += f"        MoveAbsJ [[{state['base']:.1f},{state['hombro']:.1f},{state['codo']:.1f},{state['muneca']:.1f},{state['garra']:.1f},0]],{velocity},z1,RobotiQ2F85Gripper(FullyClosed) \\WObj:=Frame2;\n"
@@ -206,16 +210,7 @@ MODULE MOD_{self.robot_name.upper()}Program
 ENDMODULE
 """
         
-        # Guardar archivo
-        output_path = os.path.join(os.getcwd(), output_filename)
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(mod_content)
-            
-            return True, f"✅ Archivo .mod SEGURO generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n📊 Movimientos seguros: {len(self.movement_sequence)} pasos\n⚠️ Límites ABB IRB140 aplicados\n🎯 Listo para RoboDK sin errores de límites"
-            
-        except Exception as e:
-            return False, f"❌ Error al generar archivo .mod seguro: {str(e)}"
+        return mod_content
     
     def _get_safe_velocity_string(self, velocity):
         """Convierte velocidad a string RAPID seguro"""
@@ -236,22 +231,19 @@ ENDMODULE
         report = f"REPORTE DE SEGURIDAD - ABB IRB140-6/0.8\n{'='*50}\n\n"
         report += f"Movimientos analizados: {len(self.movement_sequence)}\n"
         
-        limited_moves = 0
-        for movement in self.movement_sequence:
-            if movement['type'] == 'move' and movement['original'] != movement['to']:
-                limited_moves += 1
+        # (eje, valor pedido, valor limitado) de cada eje que se limitó
+        limited = [(component, movement['original'][component], movement['to'][component])
+                   for movement in self.movement_sequence if movement['type'] == 'move'
+                   for component in movement['components']
+                   if movement['original'][component] != movement['to'][component]]
         
-        report += f"Movimientos limitados por seguridad: {limited_moves}\n\n"
+        report += f"Movimientos limitados por seguridad: {len(limited)}\n\n"
         
-        if limited_moves > 0:
+        if limited:
             report += "LÍMITES APLICADOS:\n"
-            for movement in self.movement_sequence:
-                if movement['type'] == 'move' and movement['original'] != movement['to']:
-                    component = movement['component']
-                    original = movement['original']
-                    limited = movement['to']
-                    limits = self.safe_limits[component]
-                    report += f"• {component}: {original}° → {limited}° (límite: {limits['safe_min']}° a {limits['safe_max']}°)\n"
+            for component, original, value in limited:
+                limits = self.safe_limits[component]
+                report += f"• {component}: {original}° → {value}° (límite: {limits['safe_min']}° a {limits['safe_max']}°)\n"
         else:
             report += "✅ Todos los movimientos están dentro de límites seguros\n"
         
@@ -5,15 +5,35 @@ Convierte sintaxis robótica a movimientos RAPID secuenciales
 """
 
 import os
-import re
 from datetime import datetime
-from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_analysis_cache import shared_cache
+from robot_artifact_cache import shared_artifact_cache
+from robot_loops import Loop, LoopPolicy, loop_structure
+from robot_motion import AXES, motion_plan
+
+# Backend del generador en el caché de artefactos
+BACKEND_ID = 'robodk-sequential'
+BACKEND_VERSION = '4'
+
+# Pasos (movimientos y esperas) hasta los que se desenrolla un ciclo: un FOR
+# de RAPID no le cuesta nada al controlador, solo se copian los muy cortos
+UNROLL_BUDGET = 4
+
+def _executed(movements):
+    """Lo que ejecuta el robot en `movements`: poses completas, esperas y ciclos"""
+    return [(movement['type'], movement.get('state'), movement.get('time'), movement.get('count'))
+            for movement in movements if movement['type'] != 'comment']
 
 class RoboDKSequentialGenerator:
     """Generador secuencial de archivos .mod que sigue el orden del código Robot"""
     
-    def __init__(self):
-        self.analyzer = RobotLexicalAnalyzer()
+    def __init__(self, analyzer=None, loop_policy=None, level=0):
+        # Sin analizador propio se usa el análisis del caché compartido (el mismo
+        # que usan la interfaz y los demás generadores para ese código)
+        self.analyzer = analyzer
+        self.loop_policy = loop_policy if loop_policy is not None else LoopPolicy(UNROLL_BUDGET)
+        # Nivel de optimización del plan de movimiento (-O0 a -O2, ver robot_motion)
+        self.level = level
         self.robot_name = "r1"
         self.current_state = {
             'base': 0.0,
@@ -27,90 +47,100 @@ class RoboDKSequentialGenerator:
             'repetir': 1         # NUEVO: Repeticiones
         }
         self.movement_sequence = []
-        self.repetition_stack = []  # Para manejar repeticiones anidadas
-        self.current_repetition = None
         
     def analyze_robot_code(self, code):
         """Analiza el código y extrae la secuencia de movimientos"""
-        # Limpiar código de comentarios
-        lines = code.split('\n')
-        clean_lines = []
-        
-        for line in lines:
-            line = line.strip()
-            if line and not line.startswith('#') and not line.startswith('//'):
-                clean_lines.append(line)
-        
-        clean_code = '\n'.join(clean_lines)
-        
-        # Analizar con el analizador léxico
-        tokens, errors = self.analyzer.analyze(clean_code)
+        # Analizar con el analizador léxico (los comentarios se descartan al escanear)
+        if self.analyzer is not None:
+            analysis = self.analyzer
+            tokens, errors = analysis.analyze(code)
+        else:
+            analysis = shared_cache.analyze(code)
+            tokens, errors = analysis.tokens, analysis.errors
+        program = analysis.get_program()
         
-        # Extraer nombre del robot
-        for i, token in enumerate(tokens):
-            if hasattr(token, 'type') and hasattr(token, 'value'):
-                if token.type == 'KEYWORD' and token.value.lower() == 'robot':
-                    if i + 1 < len(tokens):
-                        next_token = tokens[i + 1]
-                        if hasattr(next_token, 'value'):
-                            self.robot_name = next_token.value
-                            break
+        # Nombre del robot: el primero declarado
+        if program.robot_name:
+            self.robot_name = program.robot_name
         
-        # Procesar secuencialmente las instrucciones
-        self._process_sequential_instructions(clean_code)
+        # Procesar secuencialmente las instrucciones (las repeticiones como ciclos y
+        # las asignaciones entre esperas como un solo movimiento coordinado)
+        state = self.current_state
+        plan = motion_plan(loop_structure(program, self.robot_name), state['velocidad'], state['precision'],
+                           {axis: state[axis] for axis in AXES}, level=self.level)
+        self._process_sequential_instructions(plan)
         
         return tokens, errors
     
-    def _process_sequential_instructions(self, code):
-        """Procesa las instrucciones en orden secuencial"""
-        lines = code.split('\n')
-        
-        for line in lines:
-            line = line.strip()
-            if not line or line.startswith('#') or line.startswith('//'):
+    def _process_sequential_instructions(self, items, depth=0):
+        """Procesa el plan de movimiento (ver robot_motion.motion_plan) en orden secuencial"""
+        for segment in items:
+            if isinstance(segment, Loop):
+                self._process_loop(segment, depth)
                 continue
-                
-            # Buscar patrón: robot.componente = valor (incluyendo números negativos)
-            pattern = r'(\w+)\.(\w+)\s*=\s*(-?\w+\.?\w*)'
-            match = re.match(pattern, line)
-            
-            if match:
-                robot_name, component, value = match.groups()
-                
-                if robot_name == self.robot_name:
-                    # Convertir valor
-                    if component == 'velocidad':
-                        self.current_state[component] = int(value)
-                    elif component == 'espera':
-                        # Agregar movimiento de espera
-                        self.movement_sequence.append({
-                            'type': 'wait',
-                            'time': float(value)
-                        })
-                    elif component == 'repetir':
-                        # Procesar repeticiones - NUEVO
-                        repetitions = int(value)
-                        self.current_state['repetir'] = repetitions
-                        # Marcar inicio de secuencia a repetir
-                        self._mark_repetition_start(repetitions)
-                    elif component == 'precision':
-                        # Actualizar zona de precisión - NUEVO
-                        self.current_state['precision'] = int(value)
-                    elif component in ['base', 'hombro', 'codo', 'muneca', 'inclinacion', 'garra']:
-                        # Actualizar estado y agregar movimiento
-                        old_value = self.current_state[component]
-                        new_value = float(value)
-                        self.current_state[component] = new_value
-                        
-                        # Agregar movimiento
-                        self.movement_sequence.append({
-                            'type': 'move',
-                            'component': component,
-                            'from': old_value,
-                            'to': new_value,
-                            'velocity': self.current_state['velocidad'],
-                            'state': self.current_state.copy()
-                        })
+            # Dentro de un ciclo la pose del segmento es la de la primera vuelta:
+            # se aplican solo los ejes que mueve
+            start = {axis: self.current_state[axis] for axis in segment.moved}
+            self.current_state.update(segment.targets)
+            self.current_state['velocidad'] = int(segment.speed)
+            self.current_state['precision'] = int(segment.zone)
+            if segment.moved:
+                # Un solo movimiento coordinado con todos los ejes del segmento
+                self.movement_sequence.append({
+                    'type': 'move',
+                    'components': segment.moved,
+                    'from': start,
+                    'to': segment.targets,
+                    'velocity': self.current_state['velocidad'],
+                    'state': self.current_state.copy()
+                })
+            if segment.dwell:
+                # Agregar movimiento de espera
+                self.movement_sequence.append({
+                    'type': 'wait',
+                    'time': segment.dwell
+                })
+    
+    def _process_loop(self, loop, depth):
+        """Agrega un ciclo FOR, o el cuerpo desenrollado si la política lo permite.
+
+        Cada MoveAbsJ lleva la pose completa: si la primera vuelta parte de
+        una pose que no da los mismos MoveAbsJ que las siguientes, queda
+        aparte y el FOR (o las copias) repite las demás vueltas con las poses
+        que tienen desde la pose en que termina la primera, como
+        generar_repeticion del .COM.
+        """
+        self.current_state['repetir'] = loop.count
+        count = loop.count
+        start = len(self.movement_sequence)
+        self._process_sequential_instructions(loop.body, depth + 1)
+        following = len(self.movement_sequence)
+        self._process_sequential_instructions(loop.body, depth + 1)
+        if _executed(self.movement_sequence[following:]) == _executed(self.movement_sequence[start:following]):
+            del self.movement_sequence[following:]
+        else:
+            count -= 1
+            start = following
+        first = loop.count - count + 1
+        body = self.movement_sequence[start:]
+        steps = sum(1 for movement in body if movement['type'] in ('move', 'wait'))
+        if count == 1 or self.loop_policy.unroll(steps, count):
+            # Copias de la vuelta: cada MoveAbsJ lleva la pose completa, igual que en el FOR
+            if first > 1:
+                self.movement_sequence.insert(start, {
+                    'type': 'comment',
+                    'text': f"=== REPETICIÓN {first} de {loop.count} ==="
+                })
+            for rep in range(first + 1, loop.count + 1):
+                self.movement_sequence.append({
+                    'type': 'comment',
+                    'text': f"=== REPETICIÓN {rep} de {loop.count} ==="
+                })
+                self.movement_sequence.extend(movement.copy() for movement in body)
+            return
+        variable = f"i{depth + 1}"
+        self.movement_sequence.insert(start, {'type': 'loop_start', 'count': count, 'variable': variable})
+        self.movement_sequence.append({'type': 'loop_end', 'variable': variable})
     
     def generate_mod_file(self, code, output_filename="robot_program.mod"):
         """Genera archivo .mod secuencial para RoboDK"""
@@ -121,9 +151,24 @@ class RoboDKSequentialGenerator:
         # Analizar código
         tokens, errors = self.analyze_robot_code(code)
         
-        # Aplicar repeticiones al final
-        self._apply_repetitions()
-        
+        # Guardar archivo (un programa sin cambios sale del caché de artefactos)
+        output_path = os.path.join(os.getcwd(), output_filename)
+        key = shared_artifact_cache.key(code, BACKEND_ID, BACKEND_VERSION,
+                                        {'unroll_budget': self.loop_policy.budget, 'level': self.level})
+        try:
+            def build():
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(self._build_mod_content())
+                return True
+            shared_artifact_cache.export(key, output_path, build)
+            
+            return True, f"✅ Archivo .mod secuencial generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n📊 Movimientos secuenciales: {len(self.movement_sequence)} pasos\n🎯 Listo para importar en RoboDK"
+            
+        except Exception as e:
+            return False, f"❌ Error al generar archivo .mod: {str(e)}"
+    
+    def _build_mod_content(self):
+        """Contenido del archivo .mod secuencial"""
         # Generar timestamp
         timestamp = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
         
@@ -155,16 +200,7 @@ MODULE MOD_MainProgram
         # Cerrar módulo
         mod_content += "\nENDMODULE\n"
         
-        # Guardar archivo
-        output_path = os.path.join(os.getcwd(), output_filename)
-        try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(mod_content)
-            
-            return True, f"✅ Archivo .mod secuencial generado exitosamente:\n📁 {output_path}\n🤖 Robot: {self.robot_name}\n📊 Movimientos secuenciales: {len(self.movement_sequence)} pasos\n🎯 Listo para importar en RoboDK"
-            
-        except Exception as e:
-            return False, f"❌ Error al generar archivo .mod: {str(e)}"
+        return mod_content
     
     def _generate_main_procedure(self):
         """Genera el procedimiento Main con movimientos secuenciales"""
@@ -183,14 +219,18 @@ MODULE MOD_MainProgram
 """
         
         step = 1
+        executed = 0
+        repetitions = [1]  # veces que se ejecuta cada ciclo abierto (acumulado)
+        indent = " " * 8
         for movement in self.movement_sequence:
             if movement['type'] == 'move':
                 # Generar movimiento MoveAbsJ
                 state = movement['state']
                 velocity = self._get_velocity_string(movement['velocity'])
-                component = movement['component']
+                changes = ", ".join(f"{axis} de {movement['from'][axis]}° a {movement['to'][axis]}°"
+                                    for axis in movement['components'])
                 
-                main_proc += f"        ! Paso {step}: Mover {component} de {movement['from']}° a {movement['to']}°\n"
+                main_proc += f"{indent}! Paso {step}: Mover {changes}\n"
                 
                 # Determinar gripper basado en garra
                 gripper_state = "RobotiQ2F85Gripper(FullyClosed)" if state['garra'] < 50 else "RobotiQ2F85Gripper(FullyClosed)"
@@ -207,24 +247,39 @@ MODULE MOD_MainProgram
                 # Zona de precisión
                 zona = self._get_precision_zone(state['precision'])
                 
-                main_proc += f"        MoveAbsJ [[{eje1:.1f},{eje2:.1f},{eje3:.1f},{eje4:.1f},{eje5:.1f},{eje6:.1f}],[9E+09,9E+09,9E+09,9E+09,9E+09,9E+09]],{velocity},{zona},{gripper_state} \\WObj:=Frame2;\n"
+                main_proc += f"{indent}MoveAbsJ [[{eje1:.1f},{eje2:.1f},{eje3:.1f},{eje4:.1f},{eje5:.1f},{eje6:.1f}],[9E+09,9E+09,9E+09,9E+09,9E+09,9E+09]],{velocity},{zona},{gripper_state} \\WObj:=Frame2;\n"
                 
                 step += 1
+                executed += repetitions[-1]
                 
             elif movement['type'] == 'wait':
                 # Generar espera
-                main_proc += f"        ! Paso {step}: Esperar {movement['time']} segundos\n"
-                main_proc += f"        WaitTime {movement['time']};\n"
+                main_proc += f"{indent}! Paso {step}: Esperar {movement['time']} segundos\n"
+                main_proc += f"{indent}WaitTime {movement['time']};\n"
                 step += 1
+                executed += repetitions[-1]
             
             elif movement['type'] == 'comment':
                 # Generar comentario de repetición
-                main_proc += f"        ! {movement['text']}\n"
+                main_proc += f"{indent}! {movement['text']}\n"
+            
+            elif movement['type'] == 'loop_start':
+                # Repetición como ciclo FOR (el cuerpo se escribe una sola vez)
+                main_proc += f"{indent}! Repetir {movement['count']} veces\n"
+                main_proc += f"{indent}FOR {movement['variable']} FROM 1 TO {movement['count']} DO\n"
+                repetitions.append(repetitions[-1] * movement['count'])
+                indent += " " * 4
+                continue
+            
+            elif movement['type'] == 'loop_end':
+                repetitions.pop()
+                indent = indent[:-4]
+                main_proc += f"{indent}ENDFOR\n"
             
             main_proc += "\n"
         
         main_proc += f"""        ! === FIN DE SECUENCIA ===
-        ! Total de pasos ejecutados: {step - 1}
+        ! Total de pasos ejecutados: {executed}
         
     ENDPROC"""
         
@@ -277,37 +332,6 @@ MODULE MOD_MainProgram
             return f"z{zone_val}"
         return "z5"  # Default normal
         
-    def _mark_repetition_start(self, repetitions):
-        """Marca el inicio de una secuencia a repetir"""
-        self.current_repetition = {
-            'count': repetitions,
-            'start_index': len(self.movement_sequence),
-            'sequence': []
-        }
-    
-    def _apply_repetitions(self):
-        """Aplica las repeticiones a los movimientos capturados"""
-        if self.current_repetition and self.current_repetition['count'] > 1:
-            # Obtener movimientos desde el marcador
-            start_idx = self.current_repetition['start_index']
-            repeated_sequence = self.movement_sequence[start_idx:]
-            
-            # Duplicar la secuencia según repeticiones
-            for rep in range(self.current_repetition['count'] - 1):
-                # Agregar comentario de repetición
-                comment_movement = {
-                    'type': 'comment',
-                    'text': f"=== REPETICIÓN {rep + 2} de {self.current_repetition['count']} ==="
-                }
-                self.movement_sequence.append(comment_movement)
-                
-                # Duplicar movimientos
-                for movement in repeated_sequence:
-                    self.movement_sequence.append(movement.copy())
-        
-        # Reset repetition state
-        self.current_repetition = None
-    
     def _reset_generator_state(self):
         """Resetea el estado del generador para una nueva ejecución"""
         # Limpiar secuencia de movimientos anterior
@@ -325,10 +349,6 @@ MODULE MOD_MainProgram
             'precision': 5,      # Zona precisión (z5)
             'repetir': 1         # Repeticiones
         }
-        
-        # Resetear repeticiones
-        self.repetition_stack = []
-        self.current_repetition = None
     
     def get_movement_summary(self):
         """Obtiene resumen de los movimientos"""
@@ -339,11 +359,17 @@ MODULE MOD_MainProgram
         
         for i, movement in enumerate(self.movement_sequence, 1):
             if movement['type'] == 'move':
-                summary += f"{i}. Mover {movement['component']}: {movement['from']}° → {movement['to']}° (v={movement['velocity']})\n"
+                changes = ", ".join(f"{axis}: {movement['from'][axis]}° → {movement['to'][axis]}°"
+                                    for axis in movement['components'])
+                summary += f"{i}. Mover {changes} (v={movement['velocity']})\n"
             elif movement['type'] == 'wait':
                 summary += f"{i}. Esperar: {movement['time']} segundos\n"
             elif movement['type'] == 'comment':
                 summary += f"{i}. {movement['text']}\n"
+            elif movement['type'] == 'loop_start':
+                summary += f"{i}. Repetir {movement['count']} veces:\n"
+            elif movement['type'] == 'loop_end':
+                summary += f"{i}. Fin de la repetición\n"
         
         return summary
 
@@ -0,0 +1,108 @@
+# Caché de análisis del Lenguaje de Brazo Robótico
+#
+# Guarda los últimos análisis (RobotLexicalAnalyzer ya cargados) por hash del
+# código fuente y versión del analizador. La interfaz y los generadores piden
+# el análisis a shared_cache, así que exportar varias veces el mismo programa
+# sin cambios lo analiza una sola vez. Las etapas de cada análisis siguen
+# siendo diferidas: solo se ejecutan las que algún usuario del caché pide.
+#
+# Los análisis del caché se comparten: no se deben volver a cargar con otro
+# código (analyze/load) ni modificar sus resultados.
+import hashlib
+import threading
+from collections import OrderedDict
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, ANALYZER_VERSION
+
+# Cantidad de análisis que guarda shared_cache
+DEFAULT_CACHE_SIZE = 16
+
+def source_key(source_code):
+    """Hash (bytes) del código fuente usado como parte de la clave del caché"""
+    return hashlib.blake2b(source_code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+class AnalysisCache:
+    """Caché LRU de análisis por (hash del código, versión del analizador, opciones).
+
+    `maxsize` limita la cantidad de análisis guardados: al agregar uno nuevo
+    con el caché lleno se descarta el usado hace más tiempo. Con maxsize=0
+    no se guarda nada (cada pedido analiza de nuevo).
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, version=ANALYZER_VERSION):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = 0
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def maxsize(self):
+        """Cantidad máxima de análisis guardados"""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        if value < 0:
+            raise ValueError("El tamaño del caché no puede ser negativo")
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def _evict(self):
+        """Descarta los análisis menos usados hasta respetar maxsize"""
+        entries = self._entries
+        while len(entries) > self._maxsize:
+            entries.popitem(last=False)
+
+    def key(self, source_code, max_errors=None, fail_fast=False):
+        """Clave del análisis de `source_code` con esas opciones"""
+        return (source_key(source_code), self.version, max_errors, bool(fail_fast))
+
+    def analyze(self, source_code, max_errors=None, fail_fast=False):
+        """Devuelve el análisis (RobotLexicalAnalyzer cargado) de `source_code`.
+
+        Si está en el caché se devuelve el mismo objeto; si no, se carga un
+        analizador nuevo y se guarda. Las etapas se ejecutan al leer sus
+        resultados (tokens, errors, get_program(), ...).
+        """
+        key = self.key(source_code, max_errors, fail_fast)
+        with self._lock:
+            analyzer = self._entries.get(key)
+            if analyzer is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return analyzer
+            self.misses += 1
+
+        analyzer = RobotLexicalAnalyzer(max_errors=max_errors, fail_fast=fail_fast)
+        analyzer.load(source_code)
+        with self._lock:
+            if self._maxsize:
+                # Si otro hilo ya lo guardó se conserva el suyo
+                analyzer = self._entries.setdefault(key, analyzer)
+                self._entries.move_to_end(key)
+                self._evict()
+        return analyzer
+
+    def __contains__(self, source_code):
+        return self.key(source_code) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Descarta todos los análisis y reinicia las estadísticas"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Estadísticas de uso del caché"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries), 'maxsize': self._maxsize}
+
+# Caché compartido por la interfaz y los generadores
+shared_cache = AnalysisCache()
@@ -0,0 +1,196 @@
+# Caché persistente de artefactos generados (.asm, .com, .exe, .mod)
+#
+# Cada artefacto se guarda en disco con una clave calculada a partir del
+# hash del código fuente, el backend que lo genera, la versión del backend
+# (y del analizador) y las opciones de generación. Un acierto solo escribe
+# los bytes guardados en el archivo de salida, sin volver a generar ni
+# compilar. Los artefactos menos usados se descartan al superar max_bytes.
+#
+# El directorio se toma de la variable de entorno LEXIC_ARTIFACT_CACHE
+# (por defecto ~/.lexic_cache/artifacts); LEXIC_ARTIFACT_CACHE=off desactiva
+# el caché.
+import hashlib
+import json
+import os
+import tempfile
+
+from robot_lexical_analyzer import ANALYZER_VERSION
+
+ARTIFACT_CACHE_ENV = 'LEXIC_ARTIFACT_CACHE'
+
+# Tamaño máximo (bytes) de los artefactos guardados
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Extensión de los artefactos dentro del directorio del caché
+_ENTRY_SUFFIX = '.bin'
+
+def default_cache_dir():
+    """Directorio del caché: LEXIC_ARTIFACT_CACHE o ~/.lexic_cache/artifacts"""
+    directory = os.environ.get(ARTIFACT_CACHE_ENV)
+    if directory:
+        return directory
+    return os.path.join(os.path.expanduser('~'), '.lexic_cache', 'artifacts')
+
+class ArtifactCache:
+    """Caché en disco de artefactos por (código, backend, versión, opciones).
+
+    Los artefactos se escriben de forma atómica (archivo temporal y
+    os.replace), así que varios procesos pueden compartir el directorio.
+    Con `enabled` en False ningún artefacto se guarda ni se reutiliza.
+    """
+
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_BYTES, enabled=None):
+        self.directory = directory if directory is not None else default_cache_dir()
+        if enabled is None:
+            enabled = self.directory.lower() not in ('off', '0', 'no', 'false')
+        self.enabled = enabled
+        self.max_bytes = max_bytes
+        self._size = None  # bytes guardados estimados (se recalculan al descartar)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, source, backend, backend_version, options=None):
+        """Clave (hex) del artefacto que `backend` genera para `source`.
+
+        `source` puede ser texto o bytes; `options` es un dict con las
+        opciones que cambian el artefacto (por ejemplo el nombre del programa).
+        """
+        if isinstance(source, str):
+            source = source.encode('utf-8', 'surrogatepass')
+        digest = hashlib.sha256()
+        digest.update(hashlib.sha256(source).digest())
+        header = [backend, str(backend_version), ANALYZER_VERSION, options or {}]
+        digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + _ENTRY_SUFFIX)
+
+    def get(self, key):
+        """Bytes del artefacto `key` (None si no está guardado)"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # la fecha de modificación marca el último uso
+        except OSError:
+            pass
+        self.hits += 1
+        return data
+
+    def put(self, key, data):
+        """Guarda los bytes del artefacto `key` y descarta los menos usados si hace falta"""
+        if not self.enabled or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        # El directorio solo se recorre cuando la estimación supera el límite
+        # (otros procesos también agregan artefactos: la estimación puede quedar corta)
+        if self._size is None:
+            self._size = self.total_size()
+        else:
+            self._size += len(data)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def materialize(self, key, output_path):
+        """Escribe el artefacto `key` en output_path; retorna False si no está guardado"""
+        data = self.get(key)
+        if data is None:
+            return False
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return True
+
+    def store_file(self, key, path):
+        """Guarda como artefacto `key` el contenido del archivo `path`"""
+        if not self.enabled:
+            return
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return
+        self.put(key, data)
+
+    def export(self, key, output_path, build):
+        """Deja en output_path el artefacto `key`.
+
+        En un acierto se copian los bytes guardados; si no, build() debe
+        escribir output_path y retornar True si tuvo éxito, y el archivo se
+        guarda en el caché. Retorna (éxito, acierto).
+        """
+        if self.materialize(key, output_path):
+            return True, True
+        success = build()
+        if success and os.path.exists(output_path):
+            self.store_file(key, output_path)
+        return success, False
+
+    def _entries(self):
+        """(fecha de último uso, tamaño, ruta) de cada artefacto guardado"""
+        entries = []
+        try:
+            subdirs = os.scandir(self.directory)
+        except OSError:
+            return entries
+        with subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir():
+                    continue
+                with os.scandir(subdir.path) as files:
+                    for entry in files:
+                        if entry.name.endswith(_ENTRY_SUFFIX):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def total_size(self):
+        """Bytes ocupados por los artefactos guardados"""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Descarta los artefactos usados hace más tiempo hasta respetar max_bytes"""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+        self._size = total
+
+    def clear(self):
+        """Descarta todos los artefactos guardados"""
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def stats(self):
+        """Estadísticas de uso del caché"""
+        return {'hits': self.hits, 'misses': self.misses, 'directory': self.directory,
+                'bytes': self.total_size(), 'max_bytes': self.max_bytes}
+
+# Caché compartido por la interfaz y los backends
+shared_artifact_cache = ArtifactCache()
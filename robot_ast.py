@@ -0,0 +1,175 @@
+# Árbol sintáctico (AST) del Lenguaje de Brazo Robótico
+#
+# RobotParser guarda, en orden, un nodo por cada elemento válido del programa
+# (RobotParser.nodes) y build_program() los agrupa en un Program con los
+# bloques inicio/fin anidados. Los generadores recorren este árbol en lugar
+# de volver a leer el texto del programa.
+
+class Node:
+    """Base de los nodos del árbol: nodos con __slots__ que se comparan por sus campos"""
+    __slots__ = ('line',)
+    _fields = ()
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in self._fields)
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+class RobotDecl(Node):
+    """Declaración 'Robot nombre'"""
+    __slots__ = ('name',)
+    _fields = ('name', 'line')
+
+    def __init__(self, name, line):
+        self.name = name
+        self.line = line
+
+    @property
+    def robot(self):
+        """Robot al que pertenece el elemento (el declarado)"""
+        return self.name
+
+class Assignment(Node):
+    """Asignación 'robot.componente = valor' (valor numérico como float)"""
+    __slots__ = ('robot', 'component', 'value')
+    _fields = ('robot', 'component', 'value', 'line')
+
+    def __init__(self, robot, component, value, line):
+        self.robot = robot
+        self.component = component
+        self.value = value
+        self.line = line
+
+class Wait(Node):
+    """Espera 'robot.espera = segundos'"""
+    __slots__ = ('robot', 'seconds')
+    _fields = ('robot', 'seconds', 'line')
+
+    def __init__(self, robot, seconds, line):
+        self.robot = robot
+        self.seconds = seconds
+        self.line = line
+
+class Repeat(Node):
+    """Repetición 'robot.repetir = N'"""
+    __slots__ = ('robot', 'count')
+    _fields = ('robot', 'count', 'line')
+
+    def __init__(self, robot, count, line):
+        self.robot = robot
+        self.count = count
+        self.line = line
+
+class Inicio(Node):
+    """Marca 'robot.inicio' (abre un bloque)"""
+    __slots__ = ('robot',)
+    _fields = ('robot', 'line')
+
+    def __init__(self, robot, line):
+        self.robot = robot
+        self.line = line
+
+class Fin(Node):
+    """Marca 'robot.fin' (cierra el último bloque abierto)"""
+    __slots__ = ('robot',)
+    _fields = ('robot', 'line')
+
+    def __init__(self, robot, line):
+        self.robot = robot
+        self.line = line
+
+class Block(Node):
+    """Bloque 'robot.inicio ... robot.fin'.
+
+    `end_line` es None si el bloque no se cerró. `repeat` es la cantidad
+    del último 'repetir' del propio bloque (1 si no tiene).
+    """
+    __slots__ = ('robot', 'body', 'end_line')
+    _fields = ('robot', 'body', 'line', 'end_line')
+
+    def __init__(self, robot, line, body=None, end_line=None):
+        self.robot = robot
+        self.line = line
+        self.body = [] if body is None else body
+        self.end_line = end_line
+
+    @property
+    def repeat(self):
+        """Cantidad del último 'repetir' del bloque (1 si no tiene)"""
+        return _repeat_count(self.body)
+
+class Program(Node):
+    """Programa completo: declaraciones de robots y cuerpo en orden de aparición"""
+    __slots__ = ('robots', 'body')
+    _fields = ('robots', 'body')
+
+    def __init__(self, robots=None, body=None):
+        self.line = 1
+        self.robots = [] if robots is None else robots
+        self.body = [] if body is None else body
+
+    @property
+    def repeat(self):
+        """Cantidad del último 'repetir' del nivel superior (1 si no tiene)"""
+        return _repeat_count(self.body)
+
+    @property
+    def robot_name(self):
+        """Nombre del primer robot declarado (None si no hay declaraciones)"""
+        return self.robots[0].name if self.robots else None
+
+    def walk(self, robot=None):
+        """Recorre los elementos en orden de aparición, entrando en los bloques.
+
+        Los bloques no se producen (solo su contenido) y las repeticiones no se
+        expanden. Con `robot` solo se producen los elementos de ese robot.
+        """
+        stack = [iter(self.body)]
+        while stack:
+            for node in stack[-1]:
+                if type(node) is Block:
+                    stack.append(iter(node.body))
+                    break
+                if robot is None or node.robot == robot:
+                    yield node
+            else:
+                stack.pop()
+
+def _repeat_count(body):
+    """Cantidad del último Repeat de `body` (1 si no hay)"""
+    for node in reversed(body):
+        if type(node) is Repeat:
+            return node.count
+    return 1
+
+def build_program(nodes):
+    """Arma el Program a partir de la lista de nodos de RobotParser.
+
+    Cada Inicio abre un Block y cada Fin cierra el último abierto; un Fin sin
+    bloque abierto se ignora y los bloques sin Fin llegan hasta el final.
+    """
+    program = Program()
+    body = program.body
+    open_blocks = []
+    for node in nodes:
+        kind = type(node)
+        if kind is Inicio:
+            block = Block(node.robot, node.line)
+            body.append(block)
+            open_blocks.append((block, body))
+            body = block.body
+        elif kind is Fin:
+            if open_blocks:
+                block, body = open_blocks.pop()
+                block.end_line = node.line
+        else:
+            if kind is RobotDecl:
+                program.robots.append(node)
+            body.append(node)
+    return program
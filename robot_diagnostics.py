@@ -0,0 +1,108 @@
+# Lista de diagnósticos (errores y advertencias) del analizador robótico
+import re
+
+# Posición que indican los mensajes: "línea N" y, en los léxicos, ", columna M"
+_LOCATION_REGEX = re.compile(r'[Ll]ínea (\d+)(?:, columna (\d+))?')
+
+def diagnostic_location(message):
+    """(línea, columna) que indica el mensaje, desde 1; columna None si no la indica.
+
+    Retorna None si el mensaje no indica la línea. Si menciona varias (p. ej.
+    "ya fue declarado previamente en línea N") se toma la primera.
+    """
+    match = _LOCATION_REGEX.search(message)
+    if match is None:
+        return None
+    line, column = match.groups()
+    return int(line), int(column) if column else None
+
+class DiagnosticList:
+    """Lista de mensajes con formato diferido y límite opcional.
+
+    add(plantilla, *args) guarda una plantilla de str.format con sus
+    argumentos y el texto se arma la primera vez que se lee el mensaje, así
+    un análisis que solo necesita saber si hubo errores no formatea ninguno.
+    append() acepta mensajes ya formateados.
+
+    Para el código que espera una lista de str se puede indexar, recortar,
+    iterar, comparar con listas y unir con '\\n'.join(). Con `limit`, los
+    mensajes que exceden el límite se descartan y se cuentan en `dropped`.
+    """
+    __slots__ = ('_items', 'limit', 'dropped')
+
+    def __init__(self, limit=None, messages=()):
+        self._items = []
+        self.limit = limit
+        self.dropped = 0
+        self.extend(messages)
+
+    @property
+    def full(self):
+        """True si la lista alcanzó su límite"""
+        return self.limit is not None and len(self._items) >= self.limit
+
+    def add(self, template, *args):
+        """Agrega un mensaje que se formatea al leerlo; retorna False si la lista está llena"""
+        if self.limit is not None and len(self._items) >= self.limit:
+            self.dropped += 1
+            return False
+        self._items.append((template, args))
+        return True
+
+    def append(self, message):
+        """Agrega un mensaje ya formateado"""
+        if self.limit is not None and len(self._items) >= self.limit:
+            self.dropped += 1
+            return
+        self._items.append(message)
+
+    def extend(self, messages):
+        """Agrega varios mensajes (sin formatear los de otra DiagnosticList)"""
+        items = messages._items if isinstance(messages, DiagnosticList) else list(messages)
+        if self.limit is not None:
+            room = max(self.limit - len(self._items), 0)
+            self.dropped += max(len(items) - room, 0)
+            items = items[:room]
+        self._items.extend(items)
+
+    def _message(self, index):
+        """Texto del mensaje `index` (se formatea una sola vez)"""
+        item = self._items[index]
+        if type(item) is tuple:
+            template, args = item
+            item = self._items[index] = template.format(*args)
+        return item
+
+    def __len__(self):
+        return len(self._items)
+
+    def __bool__(self):
+        return len(self._items) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._message(i) for i in range(*index.indices(len(self._items)))]
+        return self._message(index)
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self._message(index)
+
+    def __contains__(self, message):
+        return any(item == message for item in self)
+
+    def __eq__(self, other):
+        if isinstance(other, (list, DiagnosticList)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
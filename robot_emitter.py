@@ -0,0 +1,230 @@
+# Emisor de código máquina 8086 en dos pasadas
+#
+# Los generadores agregan instrucciones con etiquetas simbólicas en lugar de
+# calcular desplazamientos a mano:
+#
+#   programa = Emitter(origin=0x100)
+#   tick = programa.label('tick')
+#   programa.bind(tick)
+#   ...
+#   programa.jump('loop', tick, 'LOOP tick')
+#   codigo = programa.assemble()
+#
+# Las referencias pueden ir hacia adelante. assemble() arranca con todos los
+# saltos cortos (rel8) y pasa a la forma cercana (rel16) solo los que no
+# alcanzan. En el caso común son dos pasadas lineales: una ubica las
+# etiquetas y otra escribe los bytes en un bytearray; si algún salto corto no
+# alcanza, pasa a la forma cercana y se repiten las dos. Un salto que crece no
+# vuelve a achicarse, así que la relajación termina.
+#
+# take() saca el código desde una marca como Fragment, que se puede volver a
+# agregar con extend() (por ejemplo, después de la cabecera de un ciclo) o
+# copiar con copy(), que da etiquetas nuevas a las definidas dentro del
+# fragmento. listing() y symbol_map() muestran el resultado del ensamblado.
+
+class Label:
+    """Posición del programa; `offset` se conoce después de assemble()"""
+    __slots__ = ('name', 'offset')
+
+    def __init__(self, name):
+        self.name = name
+        self.offset = None
+
+    def __repr__(self):
+        return f"Label({self.name!r})"
+
+# Saltos relajables: opcode rel8 y bytes de la forma cercana antes del rel16.
+# El 8086 no tiene Jcc rel16: la forma cercana es la condición inversa
+# saltando sobre un JMP rel16; LOOP cercano es DEC CX / JZ / JMP y JCXZ
+# cercano salta a un JMP rel16 que un JMP corto saltea.
+JUMPS = {
+    'jmp': (0xEB, (0xE9,)),
+    'je': (0x74, (0x75, 0x03, 0xE9)),
+    'jz': (0x74, (0x75, 0x03, 0xE9)),
+    'jne': (0x75, (0x74, 0x03, 0xE9)),
+    'jnz': (0x75, (0x74, 0x03, 0xE9)),
+    'jb': (0x72, (0x73, 0x03, 0xE9)),
+    'jae': (0x73, (0x72, 0x03, 0xE9)),
+    'loop': (0xE2, (0x49, 0x74, 0x03, 0xE9)),
+    'jcxz': (0xE3, (0xE3, 0x02, 0xEB, 0x03, 0xE9)),
+}
+
+class Fragment:
+    """Instrucciones sacadas del programa con Emitter.take()"""
+    __slots__ = ('items',)
+
+    def __init__(self, items):
+        self.items = items
+
+    def size(self):
+        """Bytes del fragmento con todos los saltos cortos"""
+        return sum(_min_size(item) for item in self.items)
+
+def _jump_size(kind, near):
+    return len(JUMPS[kind][1]) + 2 if near else 2
+
+def _min_size(item):
+    kind = item[0]
+    if kind == 'code':
+        return len(item[1])
+    if kind == 'addr':
+        return len(item[1]) + 2 + len(item[3])
+    if kind in ('jump', 'call'):
+        return 2 if kind == 'jump' else 3
+    return 0
+
+class Emitter:
+    """Programa 8086 que se carga en `origin` (100h para un .COM)"""
+
+    def __init__(self, origin=0):
+        self.origin = origin
+        self._items = []
+        self._names = {}
+        self._layout = None
+
+    def label(self, name):
+        """Etiqueta nueva sin ubicar (el nombre se numera si se repite)"""
+        count = self._names.get(name, 0) + 1
+        self._names[name] = count
+        return Label(name if count == 1 else f"{name}{count}")
+
+    def bind(self, label):
+        """Ubica `label` en la posición actual"""
+        self._items.append(('label', label))
+
+    def emit(self, code, text=''):
+        """Bytes de una instrucción (o datos) con su texto para el listado"""
+        self._items.append(('code', bytes(code), text))
+
+    def emit_address(self, prefix, label, suffix=(), text=''):
+        """Instrucción con la dirección absoluta de `label` (16 bits) entre `prefix` y `suffix`"""
+        self._items.append(('addr', bytes(prefix), label, bytes(suffix), text))
+
+    def jump(self, kind, label, text=''):
+        """Salto relajable de JUMPS a `label`"""
+        if kind not in JUMPS:
+            raise ValueError(f"Salto desconocido: {kind}")
+        self._items.append(('jump', kind, label, text))
+
+    def call(self, label, text=''):
+        """CALL cercano (rel16) a `label`"""
+        self._items.append(('call', label, text))
+
+    def mark(self):
+        """Posición actual para take()"""
+        return len(self._items)
+
+    def take(self, mark):
+        """Saca y retorna como Fragment lo emitido desde `mark`"""
+        fragment = Fragment(self._items[mark:])
+        del self._items[mark:]
+        return fragment
+
+    def extend(self, fragment):
+        """Agrega las instrucciones de `fragment`"""
+        self._items.extend(fragment.items)
+
+    def copy(self, fragment):
+        """Copia de `fragment` con etiquetas nuevas para las que define"""
+        renamed = {item[1]: self.label(item[1].name.rstrip('0123456789'))
+                   for item in fragment.items if item[0] == 'label'}
+        items = []
+        for item in fragment.items:
+            kind = item[0]
+            if kind == 'label':
+                item = ('label', renamed[item[1]])
+            elif kind == 'addr':
+                item = (kind, item[1], renamed.get(item[2], item[2]), item[3], item[4])
+            elif kind == 'jump':
+                item = (kind, item[1], renamed.get(item[2], item[2]), item[3])
+            elif kind == 'call':
+                item = (kind, renamed.get(item[1], item[1]), item[2])
+            items.append(item)
+        return Fragment(items)
+
+    def size(self):
+        """Bytes del programa con todos los saltos cortos (cota inferior)"""
+        return Fragment(self._items).size()
+
+    def _place(self, near):
+        """Ubica las etiquetas con los saltos de `near` en forma cercana"""
+        offset = self.origin
+        for index, item in enumerate(self._items):
+            kind = item[0]
+            if kind == 'label':
+                item[1].offset = offset
+            elif kind == 'jump':
+                offset += _jump_size(item[1], index in near)
+            else:
+                offset += _min_size(item)
+
+    def assemble(self):
+        """Bytes del programa (bytearray), relajando los saltos que no alcanzan con rel8"""
+        near = set()
+        while True:
+            self._place(near)
+            code, layout, grow = self._emit(near)
+            if not grow:
+                break
+            near.update(grow)
+        self._layout = layout
+        return code
+
+    def _emit(self, near):
+        """Bytes con las etiquetas ya ubicadas; también los saltos cortos que no alcanzan"""
+        code = bytearray()
+        layout, grow = [], []
+        for index, item in enumerate(self._items):
+            kind = item[0]
+            address = self.origin + len(code)
+            if kind == 'label':
+                layout.append((address, b'', f"{item[1].name}:"))
+                continue
+            if kind == 'code':
+                chunk, text = item[1], item[2]
+            elif kind == 'addr':
+                target = self._offset(item[2])
+                chunk = item[1] + bytes([target & 0xFF, target >> 8]) + item[3]
+                text = item[4]
+            elif kind == 'call':
+                rel = self._offset(item[1]) - (address + 3)
+                chunk, text = bytes([0xE8, rel & 0xFF, (rel >> 8) & 0xFF]), item[2]
+            else:
+                short, long_form = JUMPS[item[1]]
+                target = self._offset(item[2])
+                if index in near:
+                    rel = target - (address + len(long_form) + 2)
+                    chunk = bytes(long_form) + bytes([rel & 0xFF, (rel >> 8) & 0xFF])
+                else:
+                    rel = target - (address + 2)
+                    if not -128 <= rel <= 127:
+                        grow.append(index)
+                    chunk = bytes([short, rel & 0xFF])
+                text = item[3]
+            code += chunk
+            layout.append((address, chunk, text))
+        return code, layout, grow
+
+    @staticmethod
+    def _offset(label):
+        if label.offset is None:
+            raise ValueError(f"Etiqueta sin ubicar: {label.name}")
+        return label.offset
+
+    def listing(self):
+        """Listado del último assemble(): dirección, bytes y texto de cada instrucción"""
+        if self._layout is None:
+            self.assemble()
+        lines = []
+        for address, chunk, text in self._layout:
+            if not chunk:
+                lines.append(f"      {text}")
+            else:
+                lines.append(f"{address:04X}  {chunk.hex(' ').upper():<20}  {text}".rstrip())
+        return "\n".join(lines)
+
+    def symbol_map(self):
+        """Etiquetas del último assemble() con su dirección, en orden"""
+        if self._layout is None:
+            self.assemble()
+        return {text[:-1]: address for address, chunk, text in self._layout if not chunk}
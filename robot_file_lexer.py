@@ -0,0 +1,152 @@
+# Escáner por bloques para archivos .robot de gran tamaño
+import os
+
+from robot_tokens import TOKEN_REGEX, TOKEN_GROUP_TYPES
+from robot_token_stream import Token, TOKEN_TYPE_NAMES
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+
+# Tamaño de bloque por defecto (caracteres por lectura)
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_NEWLINE_GROUP = TOKEN_GROUP_TYPES.index('NEWLINE')
+_ARITHMETIC_GROUP = TOKEN_GROUP_TYPES.index('ARITHMETIC_OP')
+
+def iter_tokens(source, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Genera los tokens de un archivo .robot leyéndolo por bloques.
+
+    `source` es una ruta o un archivo de texto ya abierto. Produce los mismos
+    Token que RobotLexicalAnalyzer (los caracteres no reconocidos salen como
+    tokens UNKNOWN) con la misma numeración de líneas, incluidas las líneas
+    dentro de comentarios /* */.
+
+    La memoria no depende del tamaño del archivo: se guarda el bloque actual
+    más la línea en curso. Las excepciones son una línea muy larga, que se
+    guarda completa, y un '/*' sin cierre en un archivo que no permite seek(),
+    donde se guarda el resto del archivo para volver a escanearlo.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'r', encoding='utf-8') as file:
+            yield from _ChunkScanner(file, chunk_size).tokens()
+    else:
+        yield from _ChunkScanner(source, chunk_size).tokens()
+
+class _ChunkScanner:
+    """Estado del escáner por bloques (ver iter_tokens)"""
+
+    def __init__(self, file, chunk_size):
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser mayor que cero")
+        self.file = file
+        self.chunk_size = chunk_size
+        self.seekable = file.seekable()
+        self.buffer = ''
+        self.eof = False
+        self.line = 1
+        self.line_start = 0       # índice en buffer donde empieza la línea actual (puede ser negativo)
+        self.unclosed = False     # True si ya se sabe que no queda ningún '*/' en el archivo
+        self.classifier = RobotLexicalAnalyzer()
+
+    def read(self):
+        """Agrega el siguiente bloque al buffer; retorna False al final del archivo"""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer += chunk
+        return True
+
+    def tokens(self):
+        """Recorre el archivo línea por línea y produce sus tokens"""
+        classify = self.classifier._classify
+        position = 0
+        while True:
+            end = self.buffer.find('\n', position)
+            if end == -1 and not self.eof:
+                # Descartar lo ya escaneado y leer hasta completar la línea
+                self.buffer = self.buffer[position:]
+                self.line_start -= position
+                position = 0
+                self.read()
+                continue
+            if position >= len(self.buffer):
+                return
+            end = len(self.buffer) if end == -1 else end + 1
+
+            for match in TOKEN_REGEX.finditer(self.buffer, position, end):
+                index = match.lastindex
+                if index == _NEWLINE_GROUP:
+                    self.line += 1
+                    self.line_start = match.end()
+                    continue
+                if index == _ARITHMETIC_GROUP and not self.unclosed and self.buffer.startswith('/*', match.start(index)):
+                    # Un '/*' que no cierra en esta línea puede cerrar más adelante
+                    resume = self.skip_comment(match.start(index))
+                    if resume is not None:
+                        position = resume
+                        break
+                token = classify(match, self.line_start)
+                if token is not None:
+                    type_id, start, token_end, column, number, _ = token
+                    yield Token(TOKEN_TYPE_NAMES[type_id], self.buffer[start:token_end], self.line, column,
+                                None if number != number else number)
+            else:
+                position = end
+
+    def skip_comment(self, opener):
+        """Salta el comentario que abre en `opener` si tiene cierre.
+
+        Retorna la posición en el buffer después del '*/', o None si no hay
+        ningún '*/' en el resto del archivo (el '/*' se escanea entonces como
+        operadores, igual que en RobotLexicalAnalyzer).
+        """
+        close = self.buffer.find('*/', opener + 2)
+        if close == -1 and not self.seekable:
+            # Sin seek(): guardar el texto hasta encontrar el cierre
+            while close == -1 and self.read():
+                close = self.buffer.find('*/', opener + 2)
+        if close != -1:
+            self.count_lines(opener, close + 2)
+            return close + 2
+        if self.eof:
+            self.unclosed = True
+            return None
+
+        # Con seek(): avanzar descartando el comentario y volver si no cierra
+        saved_buffer, saved_line_start = self.buffer, self.line_start
+        saved_offset = self.file.tell()
+        newlines = self.buffer.count('\n', opener)
+        last_newline = self.buffer.rfind('\n', opener)
+        after_newline = len(self.buffer) - last_newline - 1 if last_newline != -1 else len(self.buffer) - self.line_start
+        # El último caracter puede ser el '*' de un '*/' partido entre bloques (no el del '/*')
+        carry = self.buffer[-1] if len(self.buffer) > opener + 2 else ''
+        while True:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                self.file.seek(saved_offset)
+                self.buffer, self.line_start = saved_buffer, saved_line_start
+                self.unclosed = True
+                return None
+            text = carry + chunk
+            close = text.find('*/')
+            if close != -1:
+                consumed = text[1:close + 2]
+                self.buffer = text[close + 2:]
+                break
+            consumed = chunk
+            carry = chunk[-1]
+            newlines += consumed.count('\n')
+            last_newline = consumed.rfind('\n')
+            after_newline = len(consumed) - last_newline - 1 if last_newline != -1 else after_newline + len(consumed)
+        newlines += consumed.count('\n')
+        last_newline = consumed.rfind('\n')
+        after_newline = len(consumed) - last_newline - 1 if last_newline != -1 else after_newline + len(consumed)
+        self.line += newlines
+        self.line_start = -after_newline
+        return 0
+
+    def count_lines(self, start, end):
+        """Avanza la línea por los saltos de línea de buffer[start:end]"""
+        newlines = self.buffer.count('\n', start, end)
+        if newlines:
+            self.line += newlines
+            self.line_start = self.buffer.rfind('\n', start, end) + 1
@@ -0,0 +1,546 @@
+# Análisis incremental del Lenguaje de Brazo Robótico para el editor
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from sys import intern
+
+from robot_tokens import TOKEN_REGEX, TOKEN_GROUP_TYPES, KEYWORD_LOOKUP, KEYWORD_COMPONENT, KEYWORD_COMMAND
+from robot_token_stream import Token, TOKEN_TYPE_NAMES, TOKEN_TYPE_IDS
+from robot_lexical_analyzer import (RobotLexicalAnalyzer, RobotParser, SemanticAnalyzer,
+                                    IntermediateCodeGenerator, _LEXICAL_ERROR)
+from robot_diagnostics import DiagnosticList
+
+_NEWLINE_GROUP = TOKEN_GROUP_TYPES.index('NEWLINE')
+_COMMENT_MULTI_GROUP = TOKEN_GROUP_TYPES.index('COMMENT_MULTI')
+_ARITHMETIC_GROUP = TOKEN_GROUP_TYPES.index('ARITHMETIC_OP')
+_KEYWORD_ID = TOKEN_TYPE_IDS['KEYWORD']
+_INTERNED_KINDS = (TOKEN_TYPE_IDS['KEYWORD'], TOKEN_TYPE_IDS['IDENTIFIER'])
+
+# Máximo de plantillas de línea distintas que guarda la sesión
+_LINE_TEMPLATE_LIMIT = 8192
+
+# Campos de la plantilla de una línea (ver IncrementalAnalyzer._scan_unit)
+_KINDS, _COLUMNS, _STARTS, _ENDS, _NUMBERS, _UNKNOWNS, _BIG_VALUES, _KEYWORDS = range(8)
+
+class _Statement:
+    """Resultado del parser para un elemento del programa (ver RobotParser.parse_statement).
+
+    Las posiciones son (línea, índice del token dentro de la línea), con la
+    línea contada desde 0. Guarda también las verificaciones semánticas que
+    solo dependen de sus propios símbolos (rangos de valores); como tiene
+    `tabla_simbolos`, se le pueden aplicar los métodos de SemanticAnalyzer.
+    """
+    __slots__ = ('start_line', 'start_index', 'last_line', 'last_index',
+                 'tabla_simbolos', 'errors',
+                 'robots', 'robots_used', 'semantic_errors', 'semantic_warnings')
+
+class _LineTokenWindow:
+    """Secuencia de Token desde una posición de la sesión hasta el final del código.
+
+    Es lo que recibe RobotParser como lista de tokens: los Token se construyen
+    a medida que el parser avanza, línea por línea.
+    """
+
+    def __init__(self, session, line, index):
+        self.lines = session.lines
+        self.templates = session._templates
+        self.tokens = []
+        self.positions = []  # (línea, índice) de cada token construido
+        self.next_line = line
+        self.first_index = index
+        self.length = sum(session._counts[line:]) - index
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        while index >= len(self.tokens):
+            self._load_line()
+        return self.tokens[index]
+
+    def position(self, index):
+        """Posición (línea, índice) del token `index` de la ventana"""
+        if index >= self.length:
+            return len(self.lines), 0
+        while index >= len(self.tokens):
+            self._load_line()
+        return self.positions[index]
+
+    def _load_line(self):
+        """Construye los tokens de la siguiente línea"""
+        line = self.next_line
+        text = self.lines[line]
+        template = self.templates[line]
+        kinds = template[_KINDS]
+        starts = template[_STARTS]
+        ends = template[_ENDS]
+        columns = template[_COLUMNS]
+        numbers = template[_NUMBERS]
+        for index in range(self.first_index, len(kinds)):
+            kind = kinds[index]
+            value = text[starts[index]:ends[index]]
+            if kind in _INTERNED_KINDS:
+                value = intern(value)
+            number = numbers[index]
+            self.tokens.append(Token(TOKEN_TYPE_NAMES[kind], value, line + 1, columns[index],
+                                     None if number != number else number))
+            self.positions.append((line, index))
+        self.first_index = 0
+        self.next_line = line + 1
+
+class IncrementalAnalyzer(RobotLexicalAnalyzer):
+    """Sesión de análisis incremental para el editor.
+
+    Guarda los tokens de cada línea y el resultado del parser de cada elemento
+    del programa. Ante un cambio solo se vuelven a escanear las líneas
+    editadas (más el comentario /* */ que las contenga o que se abra en ellas)
+    y solo se vuelven a parsear los elementos que tocan esas líneas; el resto
+    de la tabla de símbolos y de los diagnósticos se conserva.
+
+    Expone los mismos atributos y métodos que RobotLexicalAnalyzer. Los tokens
+    completos y los cuádruplos se generan solo cuando se piden. Con
+    `max_errors` o `fail_fast` se conservan todos los elementos, pero la
+    lista de errores se recorta al límite.
+
+    `metrics` acumula las etapas de todas las ediciones de la sesión
+    (relex, reparse, collect e intermediate); metrics.reset() las descarta.
+    """
+
+    def __init__(self, max_errors=None, fail_fast=False, profile=False):
+        self._tokens = None
+        self._intermediate_code_generator = None
+        self._ir_stale = False
+        super().__init__(max_errors, fail_fast, profile)
+        self.lines = []
+        self._templates = []
+        self._continued = bytearray()  # 1 si la línea sigue un comentario de una línea anterior
+        self._counts = array('I')      # tokens por línea
+        self._flagged = []             # líneas con caracteres desconocidos o ángulos > 360
+        self._keywords = Counter()     # componentes y comandos presentes en el código
+        self._statements = []
+        self._line_cache = {}
+        self._range_checker = SemanticAnalyzer()
+        self._robots_used = Counter()  # robots usados en instrucciones (sin declaraciones)
+        self.parser = RobotParser([])
+        # Listas que combinan el campo del mismo nombre de todos los elementos, y
+        # cuántas entradas aporta cada elemento
+        self._combined = {
+            'tabla_simbolos': self.parser.tabla_simbolos,
+            'errors': [],
+            'robots': [],
+            'semantic_errors': [],
+            'semantic_warnings': [],
+        }
+        self._combined_counts = {field: array('I') for field in self._combined}
+
+    @property
+    def tokens(self):
+        """Tokens de todo el código (se escanean al pedirlos)"""
+        if self._tokens is None:
+            scanner = RobotLexicalAnalyzer()
+            scanner._scan('\n'.join(self.lines))
+            self._tokens = scanner.tokens
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, value):
+        self._tokens = value
+
+    @property
+    def intermediate_code_generator(self):
+        """Generador de código intermedio (los cuádruplos se generan al pedirlos)"""
+        if self._ir_stale:
+            self._ir_stale = False
+            with self.metrics.phase('intermediate') as phase:
+                self._intermediate_code_generator = IntermediateCodeGenerator()
+                self._intermediate_code_generator.generar_codigo_intermedio(self.parser)
+                phase.counters['quadruples'] = len(self._intermediate_code_generator.cuadruplos)
+        return self._intermediate_code_generator
+
+    @intermediate_code_generator.setter
+    def intermediate_code_generator(self, value):
+        self._ir_stale = False
+        self._intermediate_code_generator = value
+
+    @property
+    def source_code(self):
+        """Texto actual de la sesión"""
+        return '\n'.join(self.lines)
+
+    def analyze(self, source_code):
+        """Analiza el código fuente reutilizando el análisis anterior"""
+        self.update(source_code)
+        return self.tokens, self.errors
+
+    def load(self, source_code):
+        """Carga el código fuente (en la sesión equivale a update())"""
+        self.update(source_code)
+
+    def update(self, source_code):
+        """Actualiza el análisis con el texto completo del editor.
+
+        Las líneas iguales al inicio y al final se conservan; el resto se
+        aplica como una sola edición. Retorna la lista de errores.
+        """
+        new_lines = source_code.split('\n')
+        old_lines = self.lines
+        limit = min(len(old_lines), len(new_lines))
+        prefix = 0
+        while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+        if prefix == len(old_lines) == len(new_lines) and old_lines:
+            return self.errors
+        return self.apply_edit(prefix + 1, len(old_lines) - suffix, new_lines[prefix:len(new_lines) - suffix])
+
+    def apply_edit(self, first_line, last_line, new_text):
+        """Reemplaza las líneas first_line..last_line (desde 1, inclusivo) por `new_text`.
+
+        `new_text` puede ser un texto (se divide en líneas por '\\n') o una
+        lista de líneas; una lista vacía borra las líneas. Con
+        last_line = first_line - 1 las líneas nuevas se insertan antes de
+        first_line. Retorna la lista de errores.
+        """
+        new_lines = new_text.split('\n') if isinstance(new_text, str) else list(new_text)
+        start, end = first_line - 1, last_line
+        if not 0 <= start <= end <= len(self.lines):
+            raise IndexError(f"Rango de líneas inválido: {first_line}-{last_line} (el código tiene {len(self.lines)} líneas)")
+
+        metrics = self.metrics
+        with metrics.phase('relex') as phase:
+            relex_start, relex_stop, delta = self._relex(start, end, new_lines)
+            phase.counters['lines'] = phase.counters.get('lines', 0) + relex_stop - relex_start
+        with metrics.phase('reparse') as phase:
+            self._reparse(relex_start, relex_stop, delta)
+            phase.counters['statements'] = len(self._statements)
+        with metrics.phase('collect') as phase:
+            self._collect_results()
+            phase.counters['errors'] = len(self.errors)
+        return self.errors
+
+    def _relex(self, start, end, new_lines):
+        """Reemplaza el texto y vuelve a escanear las líneas afectadas.
+
+        Retorna (primera línea re-escaneada, primera línea no re-escaneada,
+        diferencia en la cantidad de líneas).
+        """
+        lines = self.lines
+        continued = self._continued
+        delta = len(new_lines) - (end - start)
+
+        # Empezar en la línea donde abre el comentario que contiene la edición
+        relex_start = start
+        if any('*/' in text for text in new_lines):
+            # Un '/*' anterior sin cierre ahora puede cerrar en las líneas nuevas
+            for index in range(start - 1, -1, -1):
+                if '/*' in lines[index]:
+                    relex_start = index
+                if '*/' in lines[index]:
+                    break
+        while 0 < relex_start < len(continued) and continued[relex_start]:
+            relex_start -= 1
+
+        lines[start:end] = new_lines
+
+        # Re-escanear hasta llegar a una línea que ya empezaba fuera de un comentario
+        templates = []
+        unit_flags = bytearray()
+        line = relex_start
+        edited_end = start + len(new_lines)
+        while line < len(lines):
+            if line >= edited_end and not continued[line - delta]:
+                break
+            unit, line = self._lex_unit(line)
+            templates.extend(unit)
+            unit_flags.append(0)
+            unit_flags.extend(b'\x01' * (len(unit) - 1))
+        relex_stop = line
+        old_stop = relex_stop - delta
+
+        for template in self._templates[relex_start:old_stop]:
+            self._keywords.subtract(template[_KEYWORDS])
+        for template in templates:
+            self._keywords.update(template[_KEYWORDS])
+
+        self._templates[relex_start:old_stop] = templates
+        continued[relex_start:old_stop] = unit_flags
+        self._counts[relex_start:old_stop] = array('I', [len(template[_KINDS]) for template in templates])
+
+        flagged = self._flagged
+        low = bisect_left(flagged, relex_start)
+        high = bisect_left(flagged, old_stop)
+        tail = flagged[high:]
+        if delta:
+            tail = [index + delta for index in tail]
+        self._flagged = flagged[:low] + [relex_start + offset for offset, template in enumerate(templates)
+                                         if template[_UNKNOWNS] or template[_BIG_VALUES]] + tail
+        return relex_start, relex_stop, delta
+
+    def _lex_unit(self, line):
+        """Escanea la línea `line` (que empieza fuera de un comentario).
+
+        Si la línea abre un comentario /* que cierra más abajo, se escanean
+        juntas todas las líneas hasta el cierre. Retorna (plantillas de las
+        líneas escaneadas, siguiente línea).
+        """
+        lines = self.lines
+        text = lines[line]
+        cached = self._line_cache.get(text)
+        if cached is None:
+            cached = self._scan_unit(text)
+            if len(self._line_cache) < _LINE_TEMPLATE_LIMIT:
+                self._line_cache[text] = cached
+        templates, reopened = cached
+        end = line + 1
+        while reopened:
+            # Buscar la línea con el siguiente '*/'
+            close = end
+            while close < len(lines) and '*/' not in lines[close]:
+                close += 1
+            if close == len(lines):
+                break
+            end = close + 1
+            templates, reopened = self._scan_unit('\n'.join(lines[line:end]))
+        return templates, end
+
+    def _scan_unit(self, text):
+        """Escanea `text` (una o más líneas completas) con TOKEN_REGEX.
+
+        Retorna (plantillas por línea, reabierto). Cada plantilla es una tupla
+        (tipos, columnas, inicios, fines, valores numéricos, desconocidos,
+        ángulos > 360, palabras clave) con desplazamientos relativos al inicio
+        de su línea. `reabierto` indica que la última línea tiene un '/*' sin
+        cierre dentro del texto, que podría cerrar en líneas posteriores.
+        """
+        templates = []
+        line_start = 0
+        reopened = False
+        kinds, columns, starts, ends, numbers, unknowns = bytearray(), array('I'), [], [], array('d'), []
+
+        def close_line():
+            big_values = tuple(value for value in numbers if abs(value) > 360)
+            keywords = []
+            for index, kind in enumerate(kinds):
+                if kind == _KEYWORD_ID:
+                    lower = self._keyword_of(text[line_start + starts[index]:line_start + ends[index]])
+                    if lower is not None:
+                        keywords.append(lower)
+            templates.append((bytes(kinds), columns, starts, ends, numbers, unknowns, big_values, tuple(keywords)))
+
+        for match in TOKEN_REGEX.finditer(text):
+            index = match.lastindex
+            if index == _NEWLINE_GROUP or index == _COMMENT_MULTI_GROUP:
+                value = match.group(index)
+                newlines = value.count('\n')
+                if not newlines:
+                    continue
+                close_line()
+                for _ in range(newlines - 1):
+                    templates.append((b'', array('I'), [], [], array('d'), [], (), ()))
+                line_start = match.start(index) + value.rfind('\n') + 1
+                kinds, columns, starts, ends, numbers, unknowns = bytearray(), array('I'), [], [], array('d'), []
+                reopened = False
+                continue
+            token = self._classify(match, line_start)
+            if token is None:
+                continue
+            type_id, token_start, token_end, column, number, _ = token
+            kinds.append(type_id)
+            columns.append(column)
+            starts.append(token_start - line_start)
+            ends.append(token_end - line_start)
+            numbers.append(number)
+            if TOKEN_TYPE_NAMES[type_id] == 'UNKNOWN':
+                unknowns.append((column, text[token_start:token_end]))
+            elif index == _ARITHMETIC_GROUP and text.startswith('/*', token_start):
+                reopened = True
+        close_line()
+        return templates, reopened
+
+    def _keyword_of(self, value):
+        """(clase, minúsculas) de un componente o comando; None para otras palabras clave"""
+        keyword = KEYWORD_LOOKUP.get(value) or KEYWORD_LOOKUP.get(value.lower())
+        if keyword is not None and keyword[0] in (KEYWORD_COMPONENT, KEYWORD_COMMAND):
+            return keyword
+        return None
+
+    def _reparse(self, relex_start, relex_stop, delta):
+        """Vuelve a parsear los elementos que tocan las líneas re-escaneadas"""
+        statements = self._statements
+
+        # Primer elemento cuyo último token está en una línea re-escaneada
+        # (el último elemento siempre se repite: pudo haber llegado al final del código)
+        low, high = 0, len(statements)
+        while low < high:
+            middle = (low + high) // 2
+            if statements[middle].last_line < relex_start:
+                low = middle + 1
+            else:
+                high = middle
+        first = min(low, len(statements) - 1) if statements else 0
+        if first > 0 and statements[first - 1].errors:
+            # Un elemento con error depende también del token que lo sigue (no consumido)
+            first -= 1
+        if first > 0:
+            previous = statements[first - 1]
+            line, index = previous.last_line, previous.last_index + 1
+        else:
+            line, index = 0, 0
+
+        # Parsear hasta volver a un punto donde empezaba un elemento anterior
+        window = _LineTokenWindow(self, line, index)
+        parser = RobotParser(window)
+        new_statements = []
+        resume = len(statements)
+        while parser.peek() is not None:
+            line, index = window.position(parser.current)
+            if line >= relex_stop:
+                resume = self._find_statement(first, line - delta, index)
+                if resume is not None:
+                    break
+                resume = len(statements)
+            new_statements.append(self._parse_statement(parser, window))
+        self._replace_statements(first, resume, new_statements)
+
+        if delta:
+            for position in range(first + len(new_statements), len(statements)):
+                statement = statements[position]
+                if statement.errors:
+                    # Los mensajes llevan el número de línea: se vuelven a generar
+                    window = _LineTokenWindow(self, statement.start_line + delta, statement.start_index)
+                    self._replace_statements(position, position + 1,
+                                             [self._parse_statement(RobotParser(window), window)])
+                    continue
+                self._shift_statement(statement, delta)
+                if statement.semantic_errors or statement.semantic_warnings:
+                    self._check_ranges(statement)
+                    self._replace_statements(position, position + 1, [statement])
+
+    def _find_statement(self, first, line, index):
+        """Índice del elemento (desde `first`) que empieza en (línea, índice), o None"""
+        statements = self._statements
+        low, high = first, len(statements)
+        while low < high:
+            middle = (low + high) // 2
+            statement = statements[middle]
+            if (statement.start_line, statement.start_index) < (line, index):
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(statements) and (statements[low].start_line, statements[low].start_index) == (line, index):
+            return low
+        return None
+
+    def _replace_statements(self, first, resume, new_statements):
+        """Reemplaza los elementos [first, resume) y sus entradas en las listas combinadas"""
+        for old in self._statements[first:resume]:
+            self._robots_used.subtract(old.robots_used)
+        for statement in new_statements:
+            self._robots_used.update(statement.robots_used)
+        for field, combined in self._combined.items():
+            counts = self._combined_counts[field]
+            offset = sum(counts[:first])
+            combined[offset:offset + sum(counts[first:resume])] = \
+                chain.from_iterable(getattr(statement, field) for statement in new_statements)
+            counts[first:resume] = array('I', [len(getattr(statement, field)) for statement in new_statements])
+        self._statements[first:resume] = new_statements
+
+    def _parse_statement(self, parser, window):
+        """Parsea un elemento en la posición actual de `parser` y guarda su resultado"""
+        counts = (len(parser.tabla_simbolos), len(parser.errors))
+        start = parser.current
+        parser.parse_statement()
+        statement = _Statement()
+        statement.start_line, statement.start_index = window.position(start)
+        statement.last_line, statement.last_index = window.position(parser.current - 1)
+        statement.tabla_simbolos = parser.tabla_simbolos[counts[0]:]
+        statement.errors = parser.errors[counts[1]:]
+        statement.robots = [simbolo for simbolo in statement.tabla_simbolos if simbolo.es_declaracion]
+        statement.robots_used = [simbolo.id for simbolo in statement.tabla_simbolos if not simbolo.es_declaracion]
+        self._check_ranges(statement)
+        return statement
+
+    def _check_ranges(self, statement):
+        """Verifica los rangos de valores de un elemento (SemanticAnalyzer._check_value_ranges)"""
+        checker = self._range_checker
+        checker.errors = []
+        checker.warnings = []
+        checker._check_value_ranges(statement)
+        statement.semantic_errors = checker.errors
+        statement.semantic_warnings = checker.warnings
+
+    def _shift_statement(self, statement, delta):
+        """Desplaza las líneas de un elemento conservado"""
+        statement.start_line += delta
+        statement.last_line += delta
+        for simbolo in statement.tabla_simbolos:
+            if simbolo.linea is not None:
+                simbolo.linea += delta
+
+    def _collect_results(self):
+        """Arma los atributos del analizador a partir de líneas y elementos"""
+        templates = self._templates
+        combined = self._combined
+
+        self._tokens = None
+        self.current_line = max(len(self.lines), 1)
+        self.current_column = len(self.lines[-1]) + 1 if self.lines else 1
+        self.components_found = {lower for (kind, lower), count in self._keywords.items()
+                                 if count > 0 and kind == KEYWORD_COMPONENT}
+        self.commands_used = {lower for (kind, lower), count in self._keywords.items()
+                              if count > 0 and kind == KEYWORD_COMMAND}
+
+        self.errors = DiagnosticList(1 if self.fail_fast else self.max_errors)
+        for line in self._flagged:
+            for column, value in templates[line][_UNKNOWNS]:
+                self.errors.add(_LEXICAL_ERROR, line + 1, column, value)
+        self.warnings = []
+
+        parser = self.parser
+        parser.errors = combined['errors'] if self._statements else ["Error: No hay código para analizar"]
+        parser.robots = {simbolo.id: [] for simbolo in combined['robots']}
+        self.syntax_valid = not parser.errors
+        self.errors.extend(parser.errors)
+        self.truncated = self.errors.dropped > 0
+
+        self.semantic_valid = False
+        self.semantic_analyzer = None
+        self.intermediate_code_generator = None
+        if not self.errors and parser.tabla_simbolos:
+            self.semantic_analyzer = self._semantic_analysis()
+            self.semantic_valid = not self.semantic_analyzer.errors
+            self.errors.extend(self.semantic_analyzer.errors)
+            self.warnings.extend(self.semantic_analyzer.warnings)
+            self._ir_stale = self.semantic_valid
+
+        for line in self._flagged:
+            for value in templates[line][_BIG_VALUES]:
+                self.warnings.append(f"Línea {line + 1}: Valor angular {value} excede 360 grados")
+
+    def _semantic_analysis(self):
+        """Análisis semántico combinando las verificaciones guardadas en cada elemento.
+
+        Las declaraciones se verifican con SemanticAnalyzer sobre la lista de
+        declaraciones; los rangos ya están verificados en cada elemento y los
+        robots no declarados solo se buscan si algún nombre usado no fue
+        declarado. Los errores quedan en el mismo orden que SemanticAnalyzer.analyze.
+        """
+        analyzer = SemanticAnalyzer()
+        view = RobotParser([])
+        view.tabla_simbolos = self._combined['robots']
+        analyzer.analyze(view)
+
+        errors = analyzer.errors + self._combined['semantic_errors']
+        undeclared = {name for name, count in self._robots_used.items()
+                      if count > 0 and name not in analyzer.declared_robots}
+        if undeclared:
+            view.tabla_simbolos = [simbolo for simbolo in self.parser.tabla_simbolos if simbolo.id in undeclared]
+            analyzer.errors = []
+            analyzer._check_undeclared_robots(view)
+            errors.extend(analyzer.errors)
+        analyzer.errors = errors
+        analyzer.warnings = list(self._combined['semantic_warnings'])
+        return analyzer
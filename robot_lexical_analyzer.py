@@ -1,5 +1,31 @@
+import os
 import re
-from robot_tokens import TOKEN_PATTERNS, ROBOT_KEYWORDS, get_token_type, LANGUAGE_INFO, VALID_COMPONENTS
+from array import array
+from threading import RLock, get_ident
+from itertools import accumulate, chain, compress, repeat
+from operator import add
+from robot_tokens import (TOKEN_PATTERNS, ROBOT_KEYWORDS, get_token_type, LANGUAGE_INFO, VALID_COMPONENTS,
+                          TOKEN_REGEX, TOKEN_GROUP_TYPES, KEYWORD_LOOKUP, KEYWORD_COMPONENT, KEYWORD_COMMAND,
+                          KEYWORD_IDS, KEYWORD_NAMES)
+from robot_token_stream import Token, TokenStream, TokenColumns, TOKEN_TYPE_NAMES, TOKEN_TYPE_IDS, NO_NUMBER
+from robot_diagnostics import DiagnosticList
+from robot_ast import RobotDecl, Assignment, Wait, Repeat, Inicio, Fin, build_program
+from robot_metrics import AnalysisMetrics
+from robot_quadruples import Cuadruplo, QuadrupleStore, OP_ASIG, OP_CALL, NO_OPERAND, FIELDS
+
+# Versión de los resultados del analizador: forma parte de la clave del caché
+# de análisis (robot_analysis_cache), así que debe cambiar cada vez que cambian
+# los tokens, diagnósticos, AST o cuádruplos que produce un mismo código
+ANALYZER_VERSION = f"{LANGUAGE_INFO['version']}.9"
+
+# Backend de generate_and_compile (.asm + .exe) en el caché de artefactos
+EXE_BACKEND_ID = 'proteus-exe'
+EXE_BACKEND_VERSION = '2'
+
+# Tabla de cuádruplos (export_quadruple_table) en el caché de artefactos: la
+# produce el analizador, así que su versión sigue a ANALYZER_VERSION
+QUAD_BACKEND_ID = 'quadruple-table'
+QUAD_BACKEND_VERSION = f"{ANALYZER_VERSION}.1"
 
 # Definir rangos válidos para cada componente robótico - SINTAXIS COMPLETA
 COMPONENT_RANGES = {
@@ -15,8 +41,74 @@ COMPONENT_RANGES = {
     'espera': {'min': 0.1, 'max': 60.0, 'description': 'tiempo de espera de 0.1 a 60 segundos'}
 }
 
+# Tipos de token que el escáner procesa pero no almacena
+_SKIPPED_TOKEN_TYPES = {'WHITESPACE', 'COMMENT_SINGLE', 'COMMENT_MULTI', 'COMMENT_HASH'}
+
+# Índices de grupo de NEWLINE y COMMENT_MULTI en TOKEN_REGEX
+_NEWLINE_GROUP = TOKEN_GROUP_TYPES.index('NEWLINE')
+_COMMENT_MULTI_GROUP = TOKEN_GROUP_TYPES.index('COMMENT_MULTI')
+
+# Identificador de tipo (TokenStream) por índice de grupo de TOKEN_REGEX
+_GROUP_TYPE_IDS = [TOKEN_TYPE_IDS.get(name) for name in TOKEN_GROUP_TYPES]
+_KEYWORD_ID = TOKEN_TYPE_IDS['KEYWORD']
+_UNKNOWN_ID = TOKEN_TYPE_IDS['UNKNOWN']
+_NUMBER_IDS = (TOKEN_TYPE_IDS['INTEGER_LITERAL'], TOKEN_TYPE_IDS['FLOAT_LITERAL'])
+
+# Máximo de plantillas de línea distintas que guarda el escáner por análisis
+_LINE_TEMPLATE_LIMIT = 8192
+
+# Forma de una línea para el escaneo por formas: los dígitos 1-9 pasan a 0.
+# Cambiar un dígito por otro no cambia los tipos, columnas ni longitudes de
+# los tokens de la línea, solo los valores numéricos
+_SHAPE_DIGITS = str.maketrans('123456789', '000000000')
+
+# Caracteres de texto que se escanean por formas en cada bloque
+_SHAPE_CHUNK = 1 << 16
+
+# 1 en los tipos de literal numérico (tabla para bytes.translate sobre `kinds`)
+_NUMBER_KINDS = bytes(1 if type_id in _NUMBER_IDS else 0 for type_id in range(256))
+_NO_NUMBER_BYTES = array('d', [NO_NUMBER]).tobytes()
+
+_IDENTIFIER_ID = TOKEN_TYPE_IDS['IDENTIFIER']
+_DOT_ID = TOKEN_TYPE_IDS['DOT']
+_ASSIGN_ID = TOKEN_TYPE_IDS['ASSIGN_OP']
+
+# Tablas de análisis de RobotParser. _STATEMENT_TABLE[tipo][palabra_clave] da
+# la producción que empieza con el token actual; _COMMAND_TABLE[palabra_clave]
+# la forma del comando que sigue a 'robot.'
+_PARSE_SKIP, _PARSE_DECLARATION, _PARSE_INSTRUCTION = range(3)
+_COMMAND_INVALID, _COMMAND_ASSIGNMENT, _COMMAND_INICIO, _COMMAND_FIN, _COMMAND_ESPERA = range(5)
+
+def _build_parse_tables():
+    """Construye _STATEMENT_TABLE y _COMMAND_TABLE"""
+    statement_table = [[_PARSE_SKIP] * len(KEYWORD_NAMES) for _ in TOKEN_TYPE_NAMES]
+    statement_table[_IDENTIFIER_ID] = [_PARSE_INSTRUCTION] * len(KEYWORD_NAMES)
+    statement_table[_KEYWORD_ID][KEYWORD_IDS['robot']] = _PARSE_DECLARATION
+    
+    command_table = [_COMMAND_INVALID] * len(KEYWORD_NAMES)
+    for component in VALID_COMPONENTS:
+        command_table[KEYWORD_IDS[component]] = _COMMAND_ASSIGNMENT
+    command_table[KEYWORD_IDS['inicio']] = _COMMAND_INICIO
+    command_table[KEYWORD_IDS['fin']] = _COMMAND_FIN
+    command_table[KEYWORD_IDS['espera']] = _COMMAND_ESPERA
+    return statement_table, command_table
+
+_STATEMENT_TABLE, _COMMAND_TABLE = _build_parse_tables()
+
+# (mínimo, máximo) de COMPONENT_RANGES para la verificación del parser
+_COMPONENT_LIMITS = {name: (info['min'], info['max']) for name, info in COMPONENT_RANGES.items()}
+# (mínimo, máximo, descripción) de COMPONENT_RANGES para SemanticAnalyzer
+_SEMANTIC_RANGES = {name: (info['min'], info['max'], info['description']) for name, info in COMPONENT_RANGES.items()}
+
+# Plantillas de los diagnósticos (se formatean al leerlos, ver DiagnosticList)
+_LEXICAL_ERROR = "Error léxico en línea {}, columna {}: Caracter no reconocido '{}'"
+_INVALID_COMMAND_ERROR = ("Error en línea {}: '{}' no es un comando válido. Comandos válidos: "
+                          + ', '.join(VALID_COMPONENTS).replace('{', '{{').replace('}', '}}'))
+
 class Simbolo:
     """Clase para representar un símbolo en la tabla de símbolos"""
+    __slots__ = ('id', 'metodo', 'parametro', 'valor', 'es_declaracion', 'linea')
+    
     def __init__(self, id, metodo, parametro, valor, es_declaracion=False, linea=None):
         self.id = id           # Identificador: r1, r2, etc.
         self.metodo = metodo   # base, hombro, codo, garra, etc. o "DECLARACION"
@@ -34,20 +126,6 @@ class Simbolo:
     def __repr__(self):
         return self.__str__()
 
-class Token:
-    """Clase para representar un token del lenguaje robótico"""
-    def __init__(self, type_, value, line, column):
-        self.type = type_
-        self.value = value
-        self.line = line
-        self.column = column
-    
-    def __str__(self):
-        return f"Token({self.type}, '{self.value}', {self.line}:{self.column})"
-    
-    def __repr__(self):
-        return self.__str__()
-
 class SyntaxError(Exception):
     """Excepción para errores sintácticos"""
     def __init__(self, message, line=None, column=None):
@@ -56,18 +134,56 @@ class SyntaxError(Exception):
         self.column = column
         super().__init__(self.message)
 
+def _symbol_node(simbolo):
+    """Nodo de robot_ast del elemento que dejó `simbolo` en la tabla de símbolos"""
+    metodo = simbolo.metodo
+    if simbolo.es_declaracion:
+        return RobotDecl(simbolo.id, simbolo.linea)
+    if metodo == 'repetir':
+        return Repeat(simbolo.id, int(simbolo.valor), simbolo.linea)
+    if metodo == 'espera':
+        return Wait(simbolo.id, simbolo.valor, simbolo.linea)
+    if metodo == 'inicio':
+        return Inicio(simbolo.id, simbolo.linea)
+    if metodo == 'fin':
+        return Fin(simbolo.id, simbolo.linea)
+    return Assignment(simbolo.id, metodo, float(simbolo.valor), simbolo.linea)
+
 class RobotParser:
-    """Parser sintáctico para el lenguaje robótico"""
+    """Parser sintáctico para el lenguaje robótico.
+
+    Es un parser LL(1) dirigido por tablas: la acción de cada paso se elige
+    indexando _STATEMENT_TABLE y _COMMAND_TABLE con el tipo numérico del token
+    y su identificador de palabra clave, leídos de las columnas del
+    TokenStream (o de TokenColumns si recibe una lista de Token). El texto
+    solo se lee para los nombres de robot y los mensajes de error.
+
+    Ante un error se recupera en modo pánico: descarta el resto de la línea
+    donde empezó el elemento y sigue en la línea siguiente. Con `max_errors`
+    el análisis se detiene al llegar a esa cantidad de errores (`truncated`
+    queda en True); `fail_fast` lo detiene en el primero.
+
+    Cada elemento válido deja un símbolo en la tabla de símbolos; `nodes`
+    (un nodo de robot_ast por símbolo), `assignments` y `comandos_espera` se
+    arman desde la tabla al pedirlos, y `program` devuelve los nodos como
+    árbol.
+    """
     
-    def __init__(self, tokens):
+    def __init__(self, tokens, max_errors=None, fail_fast=False):
         self.tokens = tokens
         self.current = 0
-        self.errors = []
+        self.errors = DiagnosticList(1 if fail_fast else max_errors)
+        self.truncated = False  # True si el análisis se detuvo por el límite de errores
         self.robots = {}  # Diccionario de robots: {nombre: [asignaciones]}
-        self.assignments = []
         self.tabla_simbolos = []  # Tabla de símbolos
         self.rutinas = {}  # Diccionario de rutinas: {nombre: Rutina}
-        self.comandos_espera = []  # Lista de comandos espera encontrados
+        columns = tokens if isinstance(tokens, TokenStream) else TokenColumns(tokens)
+        self._kinds = columns.kinds
+        self._keywords = columns.keywords
+        self._numbers = columns.numbers
+        self._lines = columns.lines
+        self._text = columns.text
+        self._length = len(tokens)
         
     def peek(self):
         """Mira el token actual sin consumirlo"""
@@ -85,6 +201,35 @@ class RobotParser:
             return token
         return None
     
+    @property
+    def program(self):
+        """Árbol sintáctico (robot_ast.Program) de los elementos parseados"""
+        return build_program(self.nodes)
+
+    @property
+    def nodes(self):
+        """Nodos de robot_ast en orden de aparición, uno por símbolo de la tabla.
+
+        No se guardan junto a los símbolos: con los nodos y un diccionario
+        por asignación, el análisis sintáctico ocupaba más memoria que los
+        tokens.
+        """
+        return [_symbol_node(simbolo) for simbolo in self.tabla_simbolos]
+
+    @property
+    def assignments(self):
+        """Asignaciones válidas como {'robot', 'component', 'value', 'line'}, armadas desde `nodes`"""
+        return [{'robot': node.robot, 'component': node.component, 'value': node.value, 'line': node.line}
+                if type(node) is Assignment else
+                {'robot': node.robot, 'component': 'repetir', 'value': float(node.count), 'line': node.line}
+                for node in self.nodes if type(node) is Assignment or type(node) is Repeat]
+
+    @property
+    def comandos_espera(self):
+        """Comandos espera como {'robot', 'tiempo', 'linea'}, armados desde `nodes`"""
+        return [{'robot': node.robot, 'tiempo': node.seconds, 'linea': node.line}
+                for node in self.nodes if type(node) is Wait]
+
     def skip_to_fin(self):
         """Salta tokens hasta encontrar 'fin' o llegar al final"""
         while self.peek() is not None:
@@ -98,26 +243,18 @@ class RobotParser:
         """Parsea el programa completo según la nueva gramática: S → PROGRAMA"""
         try:
             # Verificar que hay tokens
-            if not self.tokens:
+            if not self._length:
                 self.errors.append("Error: No hay código para analizar")
                 return False
             
             # Parsear múltiples elementos: PROGRAMA → (ROBOT_DECL | ROBOT_INSTRUCTION)* 
-            while self.peek() is not None:
-                token = self.peek()
-                
-                # Buscar declaración de robot
-                if token.type == 'KEYWORD' and token.value.lower() == 'robot':
-                    if not self.parse_robot_declaration():
-                        pass
-                # Buscar instrucciones de robot (r1.algo)
-                elif token.type == 'IDENTIFIER':
-                    if not self.parse_robot_instruction():
-                        # Si falla parsear instrucción, saltar este token
-                        self.consume()
-                else:
-                    # Saltar tokens que no son declaraciones válidas
-                    self.consume()
+            parse_statement = self.parse_statement
+            limit = self.errors.limit
+            while self.current < self._length:
+                parse_statement()
+                if limit is not None and len(self.errors) >= limit:
+                    self.truncated = self.current < self._length
+                    break
             
             return len(self.errors) == 0
             
@@ -125,121 +262,164 @@ class RobotParser:
             self.errors.append(f"Error sintáctico: {str(e)}")
             return False
     
+    def parse_statement(self):
+        """Parsea un elemento del programa a partir del token actual.
+
+        Siempre consume al menos un token. El único estado que pasa de un
+        elemento al siguiente es la posición, lo que permite re-parsear
+        elementos sueltos (ver robot_incremental).
+        """
+        current = self.current
+        action = _STATEMENT_TABLE[self._kinds[current]][self._keywords[current]]
+        
+        if action == _PARSE_DECLARATION:
+            if not self.parse_robot_declaration():
+                self._synchronize(current)
+        elif action == _PARSE_INSTRUCTION:
+            if not self.parse_robot_instruction():
+                self._synchronize(current)
+        else:
+            # Saltar tokens que no son declaraciones válidas
+            self.current = current + 1
+    
+    def _synchronize(self, start):
+        """Recuperación en modo pánico del elemento que empezó en el token `start`.
+
+        Salta los tokens que quedan en la línea de `start`. El token que
+        provocó el error no se consume al detectarlo, así que si está en una
+        línea posterior el análisis sigue desde él.
+        """
+        lines = self._lines
+        line = lines[start]
+        index = self.current
+        while index < self._length and lines[index] == line:
+            index += 1
+        self.current = index
+    
+    def _expect(self, kind):
+        """Consume el token actual si es de tipo `kind` y retorna su índice.
+
+        Si no coincide (o se llegó al final) retorna None sin consumirlo.
+        """
+        index = self.current
+        if index < self._length and self._kinds[index] == kind:
+            self.current = index + 1
+            return index
+        return None
+    
+    def _error_line(self):
+        """Línea del token actual para los mensajes de error ('EOF' al final del código)"""
+        return self._lines[self.current] if self.current < self._length else 'EOF'
+    
     def parse_robot_declaration(self):
-        """Parsea una declaración de robot: ROBOT_DECL → Robot ID"""
-        try:
-            # Primer token debe ser "Robot"
-            robot_token = self.consume()
-            if not robot_token or robot_token.type != 'KEYWORD' or robot_token.value.lower() != 'robot':
-                self.errors.append(f"Error en línea {robot_token.line if robot_token else 1}: Se esperaba 'Robot', se encontró '{robot_token.value if robot_token else 'EOF'}'")
-                return False
-            
-            # Segundo token debe ser el nombre del robot
-            name_token = self.consume()
-            if not name_token or name_token.type != 'IDENTIFIER':
-                self.errors.append(f"Error en línea {name_token.line if name_token else 1}: Se esperaba nombre del robot (identificador), se encontró '{name_token.value if name_token else 'EOF'}'")
-                return False
-            
-            current_robot = name_token.value
-            
-            # SIEMPRE agregar declaración de robot a la tabla de símbolos
-            simbolo_declaracion = Simbolo(current_robot, "DECLARACION", "-", "-", es_declaracion=True, linea=name_token.line)
-            self.tabla_simbolos.append(simbolo_declaracion)
-            
-            # Inicializar lista de asignaciones para este robot si no existe
-            if current_robot not in self.robots:
-                self.robots[current_robot] = []
-            
-            return True
-            
-        except Exception as e:
-            self.errors.append(f"Error en declaración de robot: {str(e)}")
+        """Parsea una declaración de robot: ROBOT_DECL → Robot ID
+
+        El token actual es 'Robot' (lo garantiza _STATEMENT_TABLE).
+        """
+        self.current += 1
+        
+        # Segundo token debe ser el nombre del robot
+        name = self._expect(_IDENTIFIER_ID)
+        if name is None:
+            found = self.current < self._length
+            self.errors.add("Error en línea {}: Se esperaba nombre del robot (identificador), se encontró '{}'",
+                            self._lines[self.current] if found else 1, self._text(self.current) if found else 'EOF')
             return False
+        
+        current_robot = self._text(name)
+        
+        # SIEMPRE agregar declaración de robot a la tabla de símbolos
+        simbolo_declaracion = Simbolo(current_robot, "DECLARACION", "-", "-", es_declaracion=True, linea=self._lines[name])
+        self.tabla_simbolos.append(simbolo_declaracion)
+        
+        # Inicializar lista de asignaciones para este robot si no existe
+        if current_robot not in self.robots:
+            self.robots[current_robot] = []
+        
+        return True
     
     def parse_robot_instruction(self):
-        """Parsea una instrucción de robot con la nueva sintaxis: robot.comando [= valor | valor]"""
-        try:
-            # robot_name
-            name_token = self.consume()
-            if not name_token or name_token.type != 'IDENTIFIER':
-                self.errors.append(f"Error en línea {name_token.line if name_token else 'EOF'}: Se esperaba nombre del robot")
-                return False
-            
-            robot_name = name_token.value
+        """Parsea una instrucción de robot con la nueva sintaxis: robot.comando [= valor | valor]
+
+        El token actual es el nombre del robot (lo garantiza _STATEMENT_TABLE).
+        """
+        kinds = self._kinds
+        robot_name = self._text(self.current)
+        command = self.current + 2
+        if command < self._length and kinds[command - 1] == _DOT_ID and kinds[command] == _KEYWORD_ID:
+            # Caso común: robot . comando
+            self.current = command + 1
+        else:
+            self.current += 1
             
             # .
-            dot_token = self.consume()
-            if not dot_token or dot_token.type != 'DOT':
-                self.errors.append(f"Error en línea {dot_token.line if dot_token else 'EOF'}: Se esperaba '.'")
+            if self._expect(_DOT_ID) is None:
+                self.errors.add("Error en línea {}: Se esperaba '.'", self._error_line())
                 return False
             
             # comando/componente
-            command_token = self.consume()
-            if not command_token or command_token.type != 'KEYWORD':
-                self.errors.append(f"Error en línea {command_token.line if command_token else 'EOF'}: Se esperaba comando del robot")
+            command = self._expect(_KEYWORD_ID)
+            if command is None:
+                self.errors.add("Error en línea {}: Se esperaba comando del robot", self._error_line())
                 return False
-            
-            command = command_token.value.lower()
-            
-            if command not in VALID_COMPONENTS:
-                self.errors.append(f"Error en línea {command_token.line}: '{command}' no es un comando válido. Comandos válidos: {', '.join(VALID_COMPONENTS)}")
-                return False
-            
-            # Manejar diferentes tipos de comandos
-            if command == 'inicio':
-                return self.parse_robot_inicio(robot_name, command_token.line)
-            elif command == 'fin':
-                return self.parse_robot_fin(robot_name, command_token.line)
-            elif command == 'espera':
-                return self.parse_robot_espera(robot_name, command_token.line)
-            else:
-                # Comando que requiere asignación (=)
-                return self.parse_robot_assignment(robot_name, command, command_token.line)
-            
-        except Exception as e:
-            self.errors.append(f"Error en instrucción de robot: {str(e)}")
-            return False
+        
+        keyword = self._keywords[command]
+        line = self._lines[command]
+        action = _COMMAND_TABLE[keyword]
+        
+        # Manejar diferentes tipos de comandos
+        if action == _COMMAND_ASSIGNMENT:
+            # Comando que requiere asignación (=)
+            return self.parse_robot_assignment(robot_name, KEYWORD_NAMES[keyword], line)
+        elif action == _COMMAND_ESPERA:
+            return self.parse_robot_espera(robot_name, line)
+        elif action == _COMMAND_INICIO:
+            return self.parse_robot_inicio(robot_name, line)
+        elif action == _COMMAND_FIN:
+            return self.parse_robot_fin(robot_name, line)
+        
+        self.errors.add(_INVALID_COMMAND_ERROR, line, KEYWORD_NAMES[keyword])
+        return False
+    
+    def _parse_value(self, equals_message, value_message):
+        """Parsea '= valor' y retorna el índice del literal numérico (None si hay error)"""
+        value = self.current + 1
+        if value < self._length and self._kinds[value - 1] == _ASSIGN_ID and self._kinds[value] in _NUMBER_IDS:
+            self.current = value + 1
+            return value
+        
+        # =
+        if self._expect(_ASSIGN_ID) is None:
+            self.errors.add("Error en línea {}: {}", self._error_line(), equals_message)
+            return None
+        
+        # valor
+        value = self.current
+        if value >= self._length or self._kinds[value] not in _NUMBER_IDS:
+            self.errors.add("Error en línea {}: {}", self._error_line(), value_message)
+            return None
+        self.current = value + 1
+        return value
     
     def parse_robot_assignment(self, robot_name, command, line):
         """Parsea una asignación: robot.comando = valor"""
-        try:
-            # =
-            equals_token = self.consume()
-            if not equals_token or equals_token.type != 'ASSIGN_OP':
-                self.errors.append(f"Error en línea {equals_token.line if equals_token else 'EOF'}: Se esperaba '='")
-                return False
-            
-            # valor
-            value_token = self.consume()
-            if not value_token or value_token.type not in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
-                self.errors.append(f"Error en línea {value_token.line if value_token else 'EOF'}: Se esperaba valor numérico")
-                return False
-            
-            value = float(value_token.value)
-            
-            # Validar rango de valores si existe
-            if command in COMPONENT_RANGES:
-                range_info = COMPONENT_RANGES[command]
-                if value < range_info['min'] or value > range_info['max']:
-                    self.errors.append(f"Advertencia en línea {value_token.line}: Valor {value} para '{robot_name}.{command}' fuera del rango válido [{range_info['min']}, {range_info['max']}]")
-            
-            # Guardar asignación
-            self.assignments.append({
-                'robot': robot_name,
-                'component': command,
-                'value': value,
-                'line': line
-            })
-            
-            # Agregar a la tabla de símbolos
-            simbolo = Simbolo(robot_name, command, 1, int(value) if value.is_integer() else value, linea=line)
-            self.tabla_simbolos.append(simbolo)
-            
-            return True
-            
-        except Exception as e:
-            self.errors.append(f"Error en asignación: {str(e)}")
+        value_index = self._parse_value("Se esperaba '='", "Se esperaba valor numérico")
+        if value_index is None:
             return False
+        
+        value = self._numbers[value_index]
+        
+        # Validar rango de valores si existe
+        limits = _COMPONENT_LIMITS.get(command)
+        if limits is not None and not limits[0] <= value <= limits[1]:
+            self.errors.add("Advertencia en línea {}: Valor {} para '{}.{}' fuera del rango válido [{}, {}]",
+                            self._lines[value_index], value, robot_name, command, limits[0], limits[1])
+        
+        # Agregar a la tabla de símbolos
+        simbolo = Simbolo(robot_name, command, 1, int(value) if value.is_integer() else value, linea=line)
+        self.tabla_simbolos.append(simbolo)
+        
+        return True
     
     def parse_robot_inicio(self, robot_name, line):
         """Parsea comando robot.inicio"""
@@ -257,42 +437,23 @@ class RobotParser:
     
     def parse_robot_espera(self, robot_name, line):
         """Parsea comando robot.espera = valor"""
-        try:
-            # =
-            equals_token = self.consume()
-            if not equals_token or equals_token.type != 'ASSIGN_OP':
-                self.errors.append(f"Error en línea {equals_token.line if equals_token else 'EOF'}: Se esperaba '=' después de espera")
-                return False
-            
-            # valor
-            value_token = self.consume()
-            if not value_token or value_token.type not in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
-                self.errors.append(f"Error en línea {value_token.line if value_token else 'EOF'}: Se esperaba tiempo de espera")
-                return False
-            
-            tiempo = float(value_token.value)
-            
-            # Validar rango de tiempo
-            if tiempo < 0.1 or tiempo > 60.0:
-                self.errors.append(f"Error en línea {value_token.line}: Tiempo de espera {tiempo} fuera del rango válido (0.1-60.0 segundos)")
-                return False
-            
-            # Agregar comando espera a la lista
-            self.comandos_espera.append({
-                'robot': robot_name,
-                'tiempo': tiempo,
-                'linea': line
-            })
-            
-            # Agregar a tabla de símbolos
-            simbolo_espera = Simbolo(robot_name, "espera", tiempo, tiempo, linea=line)
-            self.tabla_simbolos.append(simbolo_espera)
-            
-            return True
-            
-        except Exception as e:
-            self.errors.append(f"Error en comando espera: {str(e)}")
+        value_index = self._parse_value("Se esperaba '=' después de espera", "Se esperaba tiempo de espera")
+        if value_index is None:
+            return False
+        
+        tiempo = self._numbers[value_index]
+        
+        # Validar rango de tiempo
+        if tiempo < 0.1 or tiempo > 60.0:
+            self.errors.add("Error en línea {}: Tiempo de espera {} fuera del rango válido (0.1-60.0 segundos)",
+                            self._lines[value_index], tiempo)
             return False
+        
+        # Agregar a tabla de símbolos
+        simbolo_espera = Simbolo(robot_name, "espera", tiempo, tiempo, linea=line)
+        self.tabla_simbolos.append(simbolo_espera)
+        
+        return True
     
     def parse_routine(self):
         """Parsea una rutina: inicio NOMBRE [repetir N veces] COMANDOS fin"""
@@ -344,8 +505,8 @@ class RobotParser:
                     if self.parse_instruction_in_routine():
                         comandos.append("asignacion")
                     else:
-                        # Si falla, restaurar posición y saltar token
-                        self.current = pos_antes + 1
+                        # Si falla, continuar en la línea siguiente (sin volver a leer los tokens consumidos)
+                        self._synchronize(pos_antes)
                 elif token.type == 'KEYWORD' and token.value.lower() == 'espera':
                     if self.parse_wait_command():
                         comandos.append("espera")
@@ -394,19 +555,13 @@ class RobotParser:
                 self.errors.append(f"Error en línea {time_token.line if time_token else 1}: Se esperaba tiempo numérico")
                 return False
             
-            tiempo = float(time_token.value)
+            tiempo = time_token.number
             
             # Validar rango de tiempo
             if tiempo < 0.1 or tiempo > 60.0:
                 self.errors.append(f"Error en línea {time_token.line}: Tiempo de espera {tiempo} fuera del rango válido (0.1-60.0 segundos)")
                 return False
             
-            # Agregar comando espera a la lista
-            self.comandos_espera.append({
-                'tiempo': tiempo,
-                'linea': espera_token.line
-            })
-            
             # Agregar a tabla de símbolos como operación especial
             simbolo_espera = Simbolo("ESP", "espera", tiempo, tiempo, linea=espera_token.line)
             self.tabla_simbolos.append(simbolo_espera)
@@ -417,12 +572,94 @@ class RobotParser:
             self.errors.append(f"Error en comando espera: {str(e)}")
             return False
 
+# Etapas del análisis (ver RobotLexicalAnalyzer.load) y las que cada una
+# necesita, en el orden en que se ejecutan
+_LEXICAL, _SYNTAX, _SEMANTIC, _WARNINGS, _INTERMEDIATE = range(5)
+_STAGE_METHODS = ('_lexical_stage', '_syntax_stage', '_semantic_stage', '_warnings_stage', '_intermediate_stage')
+_STAGE_NAMES = ('lexical', 'syntax', 'semantic', 'warnings', 'intermediate')  # nombres en `metrics`
+_STAGE_REQUIRES = {
+    _LEXICAL: (_LEXICAL,),
+    _SYNTAX: (_LEXICAL, _SYNTAX),
+    _SEMANTIC: (_LEXICAL, _SYNTAX, _SEMANTIC),
+    _WARNINGS: (_LEXICAL, _SYNTAX, _SEMANTIC, _WARNINGS),
+    _INTERMEDIATE: (_LEXICAL, _SYNTAX, _SEMANTIC, _INTERMEDIATE),
+}
+
+def _no_progress(message, fraction=None):
+    """Avance por defecto de generate_and_compile: no se informa"""
+
+class _StageResult:
+    """Atributo de RobotLexicalAnalyzer producido por una etapa del análisis.
+
+    Leerlo ejecuta la etapa (y las anteriores que necesita) si está
+    pendiente; dentro de una etapa se lee y escribe el valor guardado. Las
+    etapas se ejecutan con el lock del analizador: un análisis del caché
+    compartido se puede leer desde varios hilos (la interfaz y su worker).
+    """
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, analyzer, owner=None):
+        if analyzer is None:
+            return self
+        # Las etapas se ejecutan en orden: si esta ya no está pendiente,
+        # tampoco lo están las que necesita
+        if self.stage in analyzer._pending and analyzer._running != get_ident():
+            analyzer._run_stage(self.stage)
+        return analyzer._results[self.name]
+
+    def __set__(self, analyzer, value):
+        analyzer._results[self.name] = value
+
 class RobotLexicalAnalyzer:
-    """Analizador léxico, sintáctico y semántico para lenguaje de brazo robótico"""
+    """Analizador léxico, sintáctico y semántico para lenguaje de brazo robótico.
+
+    Las etapas (léxica, sintáctica, semántica, advertencias y código
+    intermedio) se ejecutan al pedir sus resultados y cada una se ejecuta
+    una sola vez por código cargado: leer `tokens` solo escanea,
+    get_tabla_simbolos() escanea y parsea, y get_cuadruplos() ejecuta
+    además el análisis semántico y la generación de cuádruplos.
+
+    Con `max_errors` el análisis se detiene al llegar a esa cantidad de
+    errores (léxicos y sintácticos) y `truncated` queda en True; `fail_fast`
+    lo detiene en el primer error.
+
+    `metrics` (robot_metrics.AnalysisMetrics) guarda el tiempo, los bloques
+    de memoria asignados y los contadores de cada etapa ejecutada para el
+    código cargado; con `profile` además captura un perfil cProfile.
+    """
     
-    def __init__(self):
+    tokens = _StageResult(_LEXICAL)
+    current_line = _StageResult(_LEXICAL)
+    current_column = _StageResult(_LEXICAL)
+    components_found = _StageResult(_LEXICAL)
+    commands_used = _StageResult(_LEXICAL)
+    parser = _StageResult(_SYNTAX)
+    syntax_valid = _StageResult(_SYNTAX)
+    truncated = _StageResult(_SYNTAX)
+    errors = _StageResult(_SEMANTIC)
+    semantic_analyzer = _StageResult(_SEMANTIC)
+    semantic_valid = _StageResult(_SEMANTIC)
+    warnings = _StageResult(_WARNINGS)
+    intermediate_code_generator = _StageResult(_INTERMEDIATE)
+    
+    def __init__(self, max_errors=None, fail_fast=False, profile=False):
+        self._results = {}
+        self.metrics = AnalysisMetrics(profile)
+        self._pending = set()  # etapas que faltan ejecutar para el código cargado
+        self._optimized = {}  # nivel -> robot_optimizer.OptimizationResult
+        self._running = None  # hilo que está ejecutando etapas
+        self._lock = RLock()
+        self._source_code = ''
+        self.max_errors = max_errors
+        self.fail_fast = fail_fast
+        self.truncated = False
         self.tokens = []
-        self.errors = []
+        self.errors = DiagnosticList(1 if fail_fast else max_errors)
         self.warnings = []
         self.current_line = 1
         self.current_column = 1
@@ -434,120 +671,366 @@ class RobotLexicalAnalyzer:
         self.semantic_analyzer = None
         self.intermediate_code_generator = None
         
+    @property
+    def source_code(self):
+        """Código fuente cargado"""
+        return self._source_code
+    
     def analyze(self, source_code):
-        """Analiza el código fuente y genera tokens"""
+        """Analiza el código fuente y retorna (tokens, errores).
+
+        Ejecuta las etapas que producen los errores (léxica, sintáctica y
+        semántica); las advertencias y los cuádruplos quedan pendientes hasta
+        que se pidan.
+        """
+        self.load(source_code)
+        return self.tokens, self.errors
+    
+    def load(self, source_code):
+        """Carga el código fuente sin analizarlo: cada etapa se ejecuta al pedir sus resultados"""
+        self._source_code = source_code
+        self._pending = set(_STAGE_REQUIRES)
+        self._optimized = {}
+        self.metrics.reset()
+    
+    def _run_stage(self, stage):
+        """Ejecuta `stage` y las etapas pendientes que necesita, en orden"""
+        with self._lock:
+            self._running = get_ident()
+            try:
+                for required in _STAGE_REQUIRES[stage]:
+                    if required in self._pending:
+                        # Sale de pendientes al terminar: otro hilo que la lea
+                        # mientras tanto espera el lock
+                        try:
+                            with self.metrics.phase(_STAGE_NAMES[required]) as phase:
+                                getattr(self, _STAGE_METHODS[required])()
+                                phase.counters.update(self._stage_counters(required))
+                        finally:
+                            self._pending.discard(required)
+            finally:
+                self._running = None
+    
+    def _stage_counters(self, stage):
+        """Contadores de `stage` para metrics (se leen recién ejecutada la etapa)"""
+        if stage == _LEXICAL:
+            return {'tokens': len(self.tokens), 'errors': len(self.errors)}
+        if stage == _SYNTAX:
+            # Cada elemento válido deja un símbolo (y su nodo, ver RobotParser.nodes)
+            symbols = len(self.parser.tabla_simbolos)
+            return {'statements': symbols, 'symbols': symbols,
+                    'errors': len(self.errors)}
+        if stage == _SEMANTIC:
+            return {'errors': len(self.errors), 'warnings': len(self.warnings)}
+        if stage == _WARNINGS:
+            return {'warnings': len(self.warnings)}
+        generator = self.intermediate_code_generator
+        return {'quadruples': len(generator.cuadruplos) if generator else 0}
+    
+    def _lexical_stage(self):
+        """Etapa léxica: tokens, errores léxicos y componentes/comandos usados"""
         self.tokens = []
-        self.errors = []
+        self.errors = DiagnosticList(1 if self.fail_fast else self.max_errors)
+        self.truncated = False
         self.warnings = []
         self.current_line = 1
         self.current_column = 1
         self.components_found = set()
         self.commands_used = set()
         self.syntax_valid = False
+        self.semantic_valid = False
+        self.parser = None
+        self.semantic_analyzer = None
+        self.intermediate_code_generator = None
         
-        # Combinar todos los patrones en una expresión regular
-        combined_pattern = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in TOKEN_PATTERNS)
-        regex = re.compile(combined_pattern, re.IGNORECASE)
-        
-        position = 0
-        
-        while position < len(source_code):
-            match = regex.match(source_code, position)
-            
-            if match:
-                token_type = match.lastgroup
-                token_value = match.group()
-                
-                # Manejar casos especiales
-                if token_type == 'IDENTIFIER':
-                    # Verificar si es una palabra clave
-                    keyword_type = get_token_type(token_value)
-                    if keyword_type:
-                        token_type = keyword_type
-                        
-                        # Rastrear componentes y comandos encontrados
-                        if token_value.lower() in VALID_COMPONENTS:
-                            self.components_found.add(token_value.lower())
-                        elif token_value.lower() in ['girai', 'giraf', 'abre', 'cierra', 'mueve']:
-                            self.commands_used.add(token_value.lower())
-                
-                elif token_type == 'WHITESPACE':
-                    # Actualizar columna pero no crear token
-                    self.current_column += len(token_value)
-                    position = match.end()
-                    continue
-                    
-                elif token_type == 'NEWLINE':
-                    # Actualizar línea y columna
-                    self.current_line += 1
-                    self.current_column = 1
-                    position = match.end()
-                    continue
-                    
-                elif token_type == 'UNKNOWN':
-                    # Reportar error léxico
-                    self.errors.append(f"Error léxico en línea {self.current_line}, columna {self.current_column}: Caracter no reconocido '{token_value}'")
-                    # Crear token para el caracter desconocido
-                    token = Token(token_type, token_value, self.current_line, self.current_column)
-                    self.tokens.append(token)
-                    
-                    # Actualizar posición
-                    self.current_column += len(token_value)
-                    position = match.end()
-                    continue
-                
-                # Crear token (excepto para comentarios que se procesan pero no se almacenan como tokens activos)
-                if token_type not in ['COMMENT_SINGLE', 'COMMENT_MULTI', 'COMMENT_HASH']:
-                    token = Token(token_type, token_value, self.current_line, self.current_column)
-                    self.tokens.append(token)
-                
-                # Actualizar posición
-                self.current_column += len(token_value)
-                position = match.end()
-            else:
-                # No se encontró coincidencia, reportar error
-                char = source_code[position]
-                self.errors.append(f"Error léxico en línea {self.current_line}, columna {self.current_column}: Caracter no reconocido '{char}'")
-                self.current_column += 1
-                position += 1
-        
-        # Realizar análisis sintáctico
-        self.parser = RobotParser(self.tokens)
-        self.syntax_valid = self.parser.parse()
+        self._scan(self._source_code)
+    
+    def _syntax_stage(self):
+        """Etapa sintáctica: parser, tabla de símbolos y errores sintácticos"""
+        # Realizar análisis sintáctico (salvo que los errores léxicos ya llenen el límite)
+        remaining = None if self.errors.limit is None else self.errors.limit - len(self.errors)
+        self.parser = RobotParser(self.tokens, remaining)
+        if self.errors.full:
+            self.truncated = True
+        else:
+            self.syntax_valid = self.parser.parse()
+            self.truncated = self.parser.truncated
         if self.parser.errors:
             self.errors.extend(self.parser.errors)
-        
-        # Solo realizar análisis semántico y código intermedio si NO hay errores léxicos ni sintácticos
+    
+    def _semantic_stage(self):
+        """Etapa semántica: solo si NO hay errores léxicos ni sintácticos"""
         if not self.errors and self.parser and self.parser.tabla_simbolos:
-            # Análisis semántico
             self.semantic_analyzer = SemanticAnalyzer()
             self.semantic_valid = self.semantic_analyzer.analyze(self.parser)
             if self.semantic_analyzer.errors:
                 self.errors.extend(self.semantic_analyzer.errors)
             if self.semantic_analyzer.warnings:
                 self.warnings.extend(self.semantic_analyzer.warnings)
-            
-            # Generar código intermedio solo si el análisis semántico también es exitoso
-            if self.semantic_valid:
-                self.intermediate_code_generator = IntermediateCodeGenerator()
-                self.intermediate_code_generator.generar_codigo_intermedio(self.parser)
-        
-        # Generar advertencias adicionales
+    
+    def _warnings_stage(self):
+        """Etapa de advertencias adicionales"""
         self._generate_warnings()
+    
+    def _intermediate_stage(self):
+        """Etapa de código intermedio: solo si el análisis semántico fue exitoso"""
+        if self.semantic_valid:
+            self.intermediate_code_generator = IntermediateCodeGenerator()
+            self.intermediate_code_generator.generar_codigo_intermedio(self.parser)
+    
+    def _scan(self, source_code):
+        """Análisis léxico con TOKEN_REGEX precompilada; los tokens se guardan en un TokenStream.
+
+        El texto se escanea por formas (_scan_shapes) en bloques de
+        _SHAPE_CHUNK caracteres. Desde la primera línea que abre un comentario
+        /* */ o que tiene caracteres desconocidos, el resto se escanea línea
+        por línea (_scan_lines), que lleva el conteo de líneas dentro del
+        comentario y los errores léxicos.
+        """
+        self.tokens = TokenStream(source_code)
+        templates = {}
+        position = 0
+        length = len(source_code)
+        while position < length:
+            end = source_code.find('\n', position + _SHAPE_CHUNK)
+            if end == -1:
+                end = length
+            stopped = self._scan_shapes(source_code, position, end, templates)
+            if stopped < end:
+                self._scan_lines(source_code, stopped)
+                return
+            if end < length:
+                self.current_line += 1
+            position = end + 1
+        self.current_column = length - source_code.rfind('\n')
+    
+    def _scan_shapes(self, source_code, position, end, templates):
+        """Escanea las líneas de source_code[position:end] por formas.
+
+        Cada forma distinta (la línea con los dígitos cambiados a 0) se
+        escanea una sola vez con _scan_line; los arreglos del TokenStream se
+        arman uniendo las plantillas de las formas, y solo los valores de los
+        literales numéricos se convierten línea por línea. Se detiene en la
+        primera línea con '/*' o con caracteres desconocidos y retorna su
+        posición (`end` si escaneó todo el bloque) con `current_line` en esa
+        línea; si no, `current_line` queda en la última línea del bloque.
+        """
+        shapes = source_code[position:end].translate(_SHAPE_DIGITS).split('\n')
+        complete = True
+        for shape in dict.fromkeys(shapes):
+            if shape in templates:
+                continue
+            template = None
+            if '/*' not in shape:
+                line_kinds, line_columns, line_starts, line_ends, _, line_keywords, unknowns = \
+                    self._scan_line(shape, 0, len(shape))
+                if not unknowns:
+                    template = (line_kinds, line_columns.tobytes(), array('I', line_starts).tobytes(),
+                                array('I', map(int.__sub__, line_ends, line_starts)).tobytes(),
+                                line_keywords, len(line_kinds))
+            templates[shape] = template
+            if template is None:
+                stop = shapes.index(shape)
+                shapes = shapes[:stop]
+                end = position + sum(map(len, shapes)) + stop
+                complete = False
+                break
         
-        return self.tokens, self.errors
+        stream = self.tokens
+        used = list(map(templates.__getitem__, shapes))
+        counts = [template[5] for template in used]
+        kinds = b''.join([template[0] for template in used])
+        stream.kinds.frombytes(kinds)
+        stream.columns.frombytes(b''.join([template[1] for template in used]))
+        stream.keywords.frombytes(b''.join([template[4] for template in used]))
+        line = self.current_line
+        stream.lines.extend(chain.from_iterable(map(repeat, range(line, line + len(shapes)), counts)))
+        
+        # Desplazamientos: inicio de cada línea más el desplazamiento del token en su plantilla
+        offsets = array('I')
+        offsets.frombytes(b''.join([template[2] for template in used]))
+        lengths = array('I')
+        lengths.frombytes(b''.join([template[3] for template in used]))
+        line_starts = accumulate(map((1).__add__, map(len, shapes)), initial=position)
+        starts = array('I', map(add, chain.from_iterable(map(repeat, line_starts, counts)), offsets))
+        ends = array('I', map(add, starts, lengths))
+        stream.starts.extend(starts)
+        stream.ends.extend(ends)
+        
+        # Valores numéricos: NaN salvo en los literales, que se convierten del texto real
+        numbers = array('d')
+        numbers.frombytes(_NO_NUMBER_BYTES * len(kinds))
+        indices = list(compress(range(len(kinds)), kinds.translate(_NUMBER_KINDS)))
+        texts = map(source_code.__getitem__, map(slice, map(starts.__getitem__, indices), map(ends.__getitem__, indices)))
+        for index, value in zip(indices, map(float, texts)):
+            numbers[index] = value
+        stream.numbers.extend(numbers)
+        
+        self.current_line = line + len(shapes) - 1 if complete else line + len(shapes)
+        return end
+    
+    def _scan_lines(self, source_code, position=0):
+        """Escanea línea por línea desde `position`, el inicio de la línea `current_line`.
+
+        Cada línea distinta se escanea una sola vez y su plantilla de tokens
+        se reutiliza en las líneas idénticas. Las líneas que abren un
+        comentario /* */ se escanean directamente sobre el texto completo, ya
+        que el comentario puede continuar en las siguientes. Si los errores
+        léxicos llenan el límite de errores, el escaneo se detiene en esa línea.
+        """
+        stream = self.tokens
+        kinds = stream.kinds
+        starts = stream.starts
+        ends = stream.ends
+        lines = stream.lines
+        columns = stream.columns
+        numbers = stream.numbers
+        keywords = stream.keywords
+        errors = self.errors
+        finditer = TOKEN_REGEX.finditer
+        classify = self._classify
+        templates = {}
+        line = self.current_line
+        line_start = position
+        length = len(source_code)
+        
+        while position < length:
+            end = source_code.find('\n', position)
+            if end == -1:
+                end = length
+            text = source_code[position:end]
+            
+            if '/*' in text:
+                # Posible comentario multilínea: escanear hasta el siguiente salto de línea real
+                position = length
+                for match in finditer(source_code, line_start):
+                    if match.lastindex == _NEWLINE_GROUP:
+                        line += 1
+                        line_start = position = match.end()
+                        break
+                    if match.lastindex == _COMMENT_MULTI_GROUP:
+                        # Los saltos de línea dentro del comentario también cuentan
+                        comment = match.group(_COMMENT_MULTI_GROUP)
+                        newlines = comment.count('\n')
+                        if newlines:
+                            line += newlines
+                            line_start = match.start(_COMMENT_MULTI_GROUP) + comment.rfind('\n') + 1
+                        continue
+                    token = classify(match, line_start)
+                    if token is not None:
+                        type_id, start, token_end, column, number, keyword = token
+                        if type_id == _UNKNOWN_ID:
+                            errors.add(_LEXICAL_ERROR, line, column, source_code[start:token_end])
+                        stream.append(type_id, start, token_end, line, column, number, keyword)
+                if errors.full:
+                    self.truncated = position < length
+                    break
+                continue
+            
+            template = templates.get(text)
+            if template is None:
+                template = self._scan_line(source_code, position, end)
+                if len(templates) < _LINE_TEMPLATE_LIMIT:
+                    templates[text] = template
+            
+            line_kinds, line_columns, line_starts, line_ends, line_numbers, line_keywords, unknowns = template
+            for column, value in unknowns:
+                errors.add(_LEXICAL_ERROR, line, column, value)
+            kinds.frombytes(line_kinds)
+            shift = position.__add__
+            starts.extend(map(shift, line_starts))
+            ends.extend(map(shift, line_ends))
+            lines.extend(repeat(line, len(line_kinds)))
+            columns.extend(line_columns)
+            numbers.extend(line_numbers)
+            keywords.frombytes(line_keywords)
+            
+            if end < length:
+                line += 1
+                line_start = end + 1
+            position = end + 1
+            if unknowns and errors.full:
+                self.truncated = position < length
+                break
+        
+        self.current_line = line
+        self.current_column = length - line_start + 1
+    
+    def _scan_line(self, source_code, start, end):
+        """Escanea una línea sin comentarios multilínea y retorna su plantilla de tokens.
+
+        La plantilla guarda tipos, columnas, desplazamientos relativos al inicio
+        de la línea, valores numéricos, palabras clave y los caracteres
+        desconocidos encontrados.
+        """
+        line_kinds = bytearray()
+        line_columns = array('I')
+        line_starts = []
+        line_ends = []
+        line_numbers = array('d')
+        line_keywords = bytearray()
+        unknowns = []
+        for match in TOKEN_REGEX.finditer(source_code, start, end):
+            token = self._classify(match, start)
+            if token is not None:
+                type_id, token_start, token_end, column, number, keyword = token
+                line_kinds.append(type_id)
+                line_columns.append(column)
+                line_starts.append(token_start - start)
+                line_ends.append(token_end - start)
+                line_numbers.append(number)
+                line_keywords.append(keyword)
+                if type_id == _UNKNOWN_ID:
+                    unknowns.append((column, source_code[token_start:token_end]))
+        return bytes(line_kinds), line_columns, line_starts, line_ends, line_numbers, bytes(line_keywords), unknowns
+    
+    def _classify(self, match, line_start):
+        """Clasifica un match de TOKEN_REGEX (None para espacios y comentarios).
+
+        Retorna (tipo, inicio, fin, columna, valor_numérico, palabra_clave) y
+        registra los componentes y comandos encontrados.
+        """
+        index = match.lastindex
+        type_id = _GROUP_TYPE_IDS[index]
+        if TOKEN_GROUP_TYPES[index] in _SKIPPED_TOKEN_TYPES:
+            return None
+        
+        start, end = match.span(index)
+        number = NO_NUMBER
+        keyword_id = 0
+        
+        if type_id in _NUMBER_IDS:
+            number = float(match.group(index))
+        elif TOKEN_GROUP_TYPES[index] == 'IDENTIFIER':
+            # Verificar si es una palabra clave
+            token_value = match.group(index)
+            keyword = KEYWORD_LOOKUP.get(token_value)
+            if keyword is None:
+                keyword = KEYWORD_LOOKUP.get(token_value.lower())
+            if keyword is not None:
+                type_id = _KEYWORD_ID
+                # Rastrear componentes y comandos encontrados
+                kind, lower = keyword
+                keyword_id = KEYWORD_IDS[lower]
+                if kind == KEYWORD_COMPONENT:
+                    self.components_found.add(lower)
+                elif kind == KEYWORD_COMMAND:
+                    self.commands_used.add(lower)
+        
+        return type_id, start, end, start - line_start + 1, number, keyword_id
     
     def _generate_warnings(self):
         """Genera advertencias sobre el código analizado"""
-        # Advertencias para valores numéricos muy grandes
-        for token in self.tokens:
-            if token.type in ['INTEGER_LITERAL', 'FLOAT_LITERAL']:
-                value = float(token.value)
-                if abs(value) > 360:
-                    self.warnings.append(f"Línea {token.line}: Valor angular {value} excede 360 grados")
+        # Advertencias para valores numéricos muy grandes (NaN en tokens no numéricos)
+        lines = self.tokens.lines
+        large = [index for index, value in enumerate(self.tokens.numbers) if value > 360 or value < -360]
+        for index in large:
+            self.warnings.append(f"Línea {lines[index]}: Valor angular {self.tokens.numbers[index]} excede 360 grados")
     
     def get_token_statistics(self):
         """Genera estadísticas de los tokens encontrados"""
+        if isinstance(self.tokens, TokenStream):
+            return self.tokens.type_counts()
         stats = {}
         for token in self.tokens:
             if token.type in stats:
@@ -562,14 +1045,40 @@ class RobotLexicalAnalyzer:
             return self.parser.tabla_simbolos
         return []
     
-    def get_cuadruplos(self):
-        """Obtiene los cuádruplos generados"""
+    def get_program(self):
+        """Obtiene el árbol sintáctico (robot_ast.Program) del último análisis"""
+        if self.parser:
+            return self.parser.program
+        return build_program([])
+    
+    def get_cuadruplos(self, level=0):
+        """Obtiene los cuádruplos generados (optimizados con -O`level` si `level` > 0)"""
+        if level:
+            return self.optimize(level).cuadruplos
         if self.intermediate_code_generator:
             return self.intermediate_code_generator.cuadruplos
         return []
     
-    def get_formatted_output(self):
-        """Genera salida formateada de los tokens y análisis"""
+    def optimize(self, level=1):
+        """Cuádruplos optimizados con -O`level` (robot_optimizer.OptimizationResult).
+
+        Se optimiza una sola vez por nivel y código cargado; el tiempo queda
+        en la etapa 'optimize' de `metrics` y las estadísticas de cada pasada
+        en el resultado.
+        """
+        cuadruplos = self.get_cuadruplos()
+        with self._lock:
+            result = self._optimized.get(level)
+            if result is None:
+                from robot_optimizer import optimize
+                with self.metrics.phase('optimize') as phase:
+                    result = self._optimized[level] = optimize(cuadruplos, level)
+                    phase.counters['removed'] = phase.counters.get('removed', 0) + \
+                        len(cuadruplos) - len(result.cuadruplos)
+            return result
+    
+    def get_formatted_output(self, level=0):
+        """Genera salida formateada de los tokens y análisis (cuádruplos con -O`level`)"""
         output = []
         
         # Información del lenguaje
@@ -609,6 +1118,8 @@ class RobotLexicalAnalyzer:
             output.append("=== ERRORES ===")
             for error in self.errors:
                 output.append(f"❌ {error}")
+            if self.truncated:
+                output.append(f"⛔ Análisis detenido al alcanzar el máximo de {len(self.errors)} errores")
             output.append("")
         
         # Advertencias
@@ -684,7 +1195,7 @@ class RobotLexicalAnalyzer:
             
             # Tabla de Cuádruplos (SOLO SI NO HAY ERRORES)
             if self.intermediate_code_generator and self.intermediate_code_generator.cuadruplos:
-                output.append(self.intermediate_code_generator.get_formatted_table())
+                output.append(self.intermediate_code_generator.get_formatted_table(self.get_cuadruplos(level)))
             
             # Tokens encontrados (SOLO SI NO HAY ERRORES)
             if self.tokens:
@@ -779,8 +1290,12 @@ class RobotLexicalAnalyzer:
         }
         return descriptions.get(token.type, 'Token no clasificado')
     
-    def generate_assembly_code(self, program_name="robot_program"):
-        """Genera código ensamblador optimizado para Proteus"""
+    def generate_assembly_code(self, program_name="robot_program", level=0):
+        """Genera código ensamblador optimizado para Proteus.
+
+        Si el generador de Proteus falla, AssemblyGenerator traduce los
+        cuádruplos optimizados con -O`level`.
+        """
         try:
             # Usar el nuevo generador optimizado para Proteus - VERSIÓN CORREGIDA
             from proteus_assembly_generator_fixed import ProteusAssemblyGeneratorFixed
@@ -818,7 +1333,7 @@ class RobotLexicalAnalyzer:
                     asm_code = generator.generate_complete_program(program_name)
                     return asm_code, None
                 else:
-                    asm_code = generator.generate_assembly(self.intermediate_code_generator.cuadruplos, program_name)
+                    asm_code = generator.generate_assembly(self.get_cuadruplos(level), program_name)
                     return asm_code, None
                     
             except Exception as fallback_error:
@@ -836,25 +1351,72 @@ class RobotLexicalAnalyzer:
         except Exception as e:
             return False, f"Error al compilar: {str(e)}"
     
-    def generate_and_compile(self, program_name="robot_program"):
-        """Proceso completo: genera ensamblador y compila a ejecutable"""
+    def generate_and_compile(self, program_name="robot_program", progress=None, level=0):
+        """Proceso completo: genera ensamblador y compila a ejecutable.
+
+        `progress(mensaje, fracción)` se llama al comenzar cada paso (la
+        interfaz lo usa para mostrar el avance del trabajo en segundo plano);
+        `level` es el nivel de optimización de los cuádruplos (ver
+        generate_assembly_code).
+        """
+        progress = progress or _no_progress
         # Solo rechazar si hay errores críticos
         if self.errors and any("Error crítico" in str(error) for error in self.errors):
             return False, "No se puede generar código con errores críticos en el análisis"
         
+        # Un programa ya compilado sale del caché de artefactos (.asm y .exe)
+        progress("Buscando en el caché de artefactos...", 0.05)
+        from robot_artifact_cache import shared_artifact_cache as artifacts
+        tasm_dir = os.path.join(os.getcwd(), "DOSBox2", "Tasm")
+        outputs = [(os.path.join(tasm_dir, f"{program_name}.{ext}"),
+                    artifacts.key(self.source_code, EXE_BACKEND_ID, EXE_BACKEND_VERSION,
+                                  {'program_name': program_name, 'artifact': ext, 'level': level}))
+                   for ext in ('asm', 'exe')]
+        cached = [artifacts.get(key) for _, key in outputs]
+        if all(data is not None for data in cached):
+            os.makedirs(tasm_dir, exist_ok=True)
+            for (path, _), data in zip(outputs, cached):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            return True, f"Ejecutable {program_name}.exe generado exitosamente en DOSBox2/Tasm/ (caché de artefactos)"
+        
         # Generar código ensamblador (funciona con o sin cuádruplos)
-        asm_code, error = self.generate_assembly_code(program_name)
+        progress("Generando código ensamblador...", 0.15)
+        asm_code, error = self.generate_assembly_code(program_name, level)
         if error:
             return False, error
         
         # Compilar a ejecutable
+        progress("Compilando con DOSBox + TASM...", 0.3)
         success, message = self.compile_to_executable(asm_code, program_name)
         
         if success:
+            progress("Guardando artefactos...", 0.95)
+            for path, key in outputs:
+                artifacts.store_file(key, path)
             return True, f"Ejecutable {program_name}.exe generado exitosamente en DOSBox2/Tasm/"
         else:
             return False, f"Error en la compilación: {message}"
     
+    def export_quadruple_table(self, path, level=0):
+        """Escribe en `path` la tabla de cuádruplos optimizados con -O`level`.
+
+        Sale del caché de artefactos si el mismo código ya se exportó con el
+        mismo nivel.
+        """
+        from robot_artifact_cache import shared_artifact_cache as artifacts
+        from robot_optimizer import OPTIMIZER_VERSION
+        key = artifacts.key(self.source_code, QUAD_BACKEND_ID, QUAD_BACKEND_VERSION,
+                            {'level': level, 'optimizer': OPTIMIZER_VERSION if level else None})
+        
+        def build():
+            generator = self.intermediate_code_generator or IntermediateCodeGenerator()
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(generator.get_formatted_table(self.get_cuadruplos(level)))
+            return True
+        
+        artifacts.export(key, path, build)
+    
     def generate_and_compile_for_proteus(self, program_name="robot_program"):
         """Proceso completo optimizado específicamente para Proteus"""
         try:
@@ -877,8 +1439,9 @@ class RobotLexicalAnalyzer:
         except Exception as e:
             return False, f"Error en generación para Proteus: {str(e)}"
     
-    def generate_and_compile_dos_real(self, program_name="robot_program"):
-        """Genera ejecutable DOS REAL para 8086 - Compatible con Proteus"""
+    def generate_and_compile_dos_real(self, program_name="robot_program", progress=None):
+        """Genera ejecutable DOS REAL para 8086 - Compatible con Proteus (ver generate_and_compile)"""
+        progress = progress or _no_progress
         try:
             # Usar el generador DOS real
             from dos_real_generator import DOSRealExecutableGenerator
@@ -886,9 +1449,11 @@ class RobotLexicalAnalyzer:
             generator = DOSRealExecutableGenerator()
             
             # Generar código ASM DOS real
+            progress("Generando código ASM DOS real...", 0.1)
             asm_code = generator.generate_real_dos_asm(program_name)
             
             # Compilar a ejecutable DOS real
+            progress("Compilando con DOSBox + TASM...", 0.3)
             success, message = generator.compile_to_real_dos_exe(asm_code, program_name)
             
             if success:
@@ -908,101 +1473,139 @@ class SemanticError(Exception):
         super().__init__(self.message)
 
 class SemanticAnalyzer:
-    """Analizador semántico para validar las reglas del lenguaje robótico"""
+    """Analizador semántico para validar las reglas del lenguaje robótico.
+
+    analyze() recorre la tabla de símbolos una sola vez y aplica en esa
+    pasada todas las verificaciones (declaraciones duplicadas, rangos de
+    valores y robots no declarados). Los valores ya son numéricos, así que
+    solo se convierten con float() los que no están dentro del rango.
+
+    Los índices de la tabla quedan disponibles para las fases siguientes y
+    se arman (en una sola pasada más) la primera vez que se piden:
+
+    - declared_robots: {robot: línea de su primera declaración}
+    - robot_assignments: {robot: {componente: [líneas]}}
+    - component_symbols: {componente: [Simbolo]}
+    - line_symbols: {línea: [Simbolo]}
+    """
     
     def __init__(self):
         self.errors = []
         self.warnings = []
         self.declared_robots = {}  # {nombre_robot: línea_declaración}
-        self.robot_assignments = {}  # {nombre_robot: {componente: [líneas_asignación]}}
+        self._tabla_simbolos = []
+        self._indexes = None
     
     def analyze(self, parser):
         """Realiza el análisis semántico basado en los resultados del parser sintáctico"""
-        self.errors = []
+        tabla_simbolos = self._tabla_simbolos = parser.tabla_simbolos
+        self._indexes = None
+        declared = self.declared_robots = {}
+        duplicate_errors = []
+        range_errors = []
         self.warnings = []
-        self.declared_robots = {}
-        self.robot_assignments = {}
-        
-        # 1. Verificar declaraciones de robots y asignaciones
-        self._check_robot_declarations(parser)
-        
-        # 2. Verificar unicidad de declaraciones
-        self._check_declaration_uniqueness(parser)
+        pending = []  # símbolos que usan un robot antes de su declaración
+        ranges = _SEMANTIC_RANGES
         
-        # 3. Verificar unicidad de asignaciones
-        self._check_assignment_uniqueness(parser)
-        
-        # 4. Verificar rangos de valores
-        self._check_value_ranges(parser)
-        
-        # 5. Verificar robots no declarados
-        self._check_undeclared_robots(parser)
+        for simbolo in tabla_simbolos:
+            robot_name = simbolo.id
+            
+            # 1. Declaraciones y su unicidad
+            if simbolo.es_declaracion:
+                if robot_name in declared:
+                    linea = simbolo.linea if simbolo.linea else "desconocida"
+                    duplicate_errors.append(f"Error semántico en línea {linea}: Robot '{robot_name}' ya fue declarado previamente en línea {declared[robot_name]}")
+                else:
+                    declared[robot_name] = simbolo.linea if simbolo.linea else "desconocida"
+                continue
+            
+            # 2. Rangos de valores (el caso común es un número dentro del rango)
+            limits = ranges.get(simbolo.metodo)
+            if limits is not None:
+                value = simbolo.valor
+                if type(value) is str or not limits[0] < value < limits[1]:
+                    self._check_value(simbolo, limits, range_errors)
+            
+            # 3. Robots usados antes de declararse (se confirman al final)
+            if robot_name not in declared:
+                pending.append(simbolo)
         
+        self.errors = duplicate_errors + range_errors
+        self._report_undeclared(pending)
         return len(self.errors) == 0
     
-    def _check_robot_declarations(self, parser):
-        """Verifica las declaraciones de robots en la tabla de símbolos"""
-        for simbolo in parser.tabla_simbolos:
-            if simbolo.es_declaracion:
-                robot_name = simbolo.id
-                if robot_name not in self.declared_robots:
-                    self.declared_robots[robot_name] = 'declarado'
-                    self.robot_assignments[robot_name] = {}
-    
-    def _check_declaration_uniqueness(self, parser):
-        """Verifica que no haya declaraciones duplicadas de robots"""
-        robot_declarations = {}
-        
-        for i, simbolo in enumerate(parser.tabla_simbolos):
-            if simbolo.es_declaracion:
-                robot_name = simbolo.id
-                if robot_name in robot_declarations:
-                    # Encontrada declaración duplicada
-                    linea_anterior = robot_declarations[robot_name]
-                    linea_actual = simbolo.linea if simbolo.linea else "desconocida"
-                    self.errors.append(f"Error semántico en línea {linea_actual}: Robot '{robot_name}' ya fue declarado previamente en línea {linea_anterior}")
+    @property
+    def robot_assignments(self):
+        """{robot: {componente: [líneas]}} de los robots declarados y usados"""
+        return self._get_indexes()[0]
+    
+    @property
+    def component_symbols(self):
+        """{componente: [Simbolo]} en orden de aparición"""
+        return self._get_indexes()[1]
+    
+    @property
+    def line_symbols(self):
+        """{línea: [Simbolo]} de la tabla de símbolos"""
+        return self._get_indexes()[2]
+    
+    def _get_indexes(self):
+        """Arma los índices por robot, por componente y por línea (una vez por análisis)"""
+        if self._indexes is None:
+            robot_assignments = {name: {} for name in self.declared_robots}
+            component_symbols = {}
+            line_symbols = {}
+            for simbolo in self._tabla_simbolos:
+                linea = simbolo.linea
+                at_line = line_symbols.get(linea)
+                if at_line is None:
+                    line_symbols[linea] = [simbolo]
                 else:
-                    robot_declarations[robot_name] = simbolo.linea if simbolo.linea else "desconocida"
+                    at_line.append(simbolo)
+                if simbolo.es_declaracion:
+                    continue
+                components = robot_assignments.get(simbolo.id)
+                if components is None:
+                    components = robot_assignments[simbolo.id] = {}
+                components.setdefault(simbolo.metodo, []).append(linea)
+                component_symbols.setdefault(simbolo.metodo, []).append(simbolo)
+            self._indexes = (robot_assignments, component_symbols, line_symbols)
+        return self._indexes
     
-    def _check_assignment_uniqueness(self, parser):
-        """Verifica que no haya asignaciones duplicadas para el mismo componente (solo fuera de rutinas)"""
-        # En el contexto de rutinas robóticas, es válido tener múltiples asignaciones
-        # al mismo componente en diferentes momentos de la secuencia.
-        # Esta validación se omite para permitir secuencias de movimiento complejas.
-        pass
+    def _check_value(self, simbolo, limits, errors):
+        """Verifica el valor de un símbolo contra (mínimo, máximo, descripción) de su componente"""
+        min_val, max_val, description = limits
+        linea = simbolo.linea if simbolo.linea else "desconocida"
+        try:
+            numeric_value = float(simbolo.valor)
+        except ValueError:
+            errors.append(f"Error semántico en línea {linea}: Valor '{simbolo.valor}' para '{simbolo.id}.{simbolo.metodo}' no es un número válido")
+            return
+        if numeric_value < min_val or numeric_value > max_val:
+            errors.append(f"Error semántico en línea {linea}: Valor {numeric_value} para '{simbolo.id}.{simbolo.metodo}' fuera del rango válido [{min_val}, {max_val}] - {description}")
+        elif numeric_value == min_val or numeric_value == max_val:
+            self.warnings.append(f"Advertencia en línea {linea}: Valor {numeric_value} para '{simbolo.id}.{simbolo.metodo}' está en el límite del rango válido")
+    
+    def _report_undeclared(self, simbolos):
+        """Agrega el error de cada símbolo cuyo robot no fue declarado (salvo 'ESP', inicio y fin)"""
+        declared = self.declared_robots
+        for simbolo in simbolos:
+            if simbolo.id not in declared and simbolo.id != 'ESP' and simbolo.metodo not in ('inicio', 'fin'):
+                linea = simbolo.linea if simbolo.linea else "desconocida"
+                self.errors.append(f"Error semántico en línea {linea}: Robot '{simbolo.id}' usado sin haber sido declarado")
     
     def _check_value_ranges(self, parser):
         """Verifica que los valores asignados estén dentro de los rangos válidos"""
+        ranges = _SEMANTIC_RANGES
         for simbolo in parser.tabla_simbolos:
             if not simbolo.es_declaracion:
-                component = simbolo.metodo
-                value = simbolo.valor
-                robot_name = simbolo.id
-                linea = simbolo.linea if simbolo.linea else "desconocida"
-                
-                if component in COMPONENT_RANGES:
-                    range_info = COMPONENT_RANGES[component]
-                    min_val = range_info['min']
-                    max_val = range_info['max']
-                    
-                    try:
-                        numeric_value = float(value)
-                        if numeric_value < min_val or numeric_value > max_val:
-                            self.errors.append(f"Error semántico en línea {linea}: Valor {numeric_value} para '{robot_name}.{component}' fuera del rango válido [{min_val}, {max_val}] - {range_info['description']}")
-                        elif numeric_value == min_val or numeric_value == max_val:
-                            self.warnings.append(f"Advertencia en línea {linea}: Valor {numeric_value} para '{robot_name}.{component}' está en el límite del rango válido")
-                    except ValueError:
-                        self.errors.append(f"Error semántico en línea {linea}: Valor '{value}' para '{robot_name}.{component}' no es un número válido")
+                limits = ranges.get(simbolo.metodo)
+                if limits is not None:
+                    self._check_value(simbolo, limits, self.errors)
     
     def _check_undeclared_robots(self, parser):
         """Verifica que todos los robots usados en asignaciones hayan sido declarados"""
-        for simbolo in parser.tabla_simbolos:
-            # Excluir comandos especiales y símbolos de declaración
-            if not simbolo.es_declaracion and simbolo.id not in ['ESP'] and simbolo.metodo not in ['inicio', 'fin']:
-                robot_name = simbolo.id
-                linea = simbolo.linea if simbolo.linea else "desconocida"
-                if robot_name not in self.declared_robots:
-                    self.errors.append(f"Error semántico en línea {linea}: Robot '{robot_name}' usado sin haber sido declarado")
+        self._report_undeclared([simbolo for simbolo in parser.tabla_simbolos if not simbolo.es_declaracion])
 
 class Rutina:
     """Clase para representar una rutina en el código robótico"""
@@ -1015,24 +1618,11 @@ class Rutina:
     def __str__(self):
         return f"Rutina({self.nombre}, {len(self.comandos)} comandos, repetir {self.repeticiones} veces)"
 
-class Cuadruplo:
-    """Clase para representar un cuádruplo de código intermedio"""
-    def __init__(self, numero, operacion, arg1, arg2, resultado, descripcion):
-        self.numero = numero
-        self.operacion = operacion
-        self.arg1 = arg1 if arg1 is not None else "-"
-        self.arg2 = arg2 if arg2 is not None else "-"
-        self.resultado = resultado if resultado is not None else "-"
-        self.descripcion = descripcion
-    
-    def __str__(self):
-        return f"| {self.numero:<3} | {self.operacion:<15} | {self.arg1:<8} | {self.arg2:<8} | {self.resultado:<10} | {self.descripcion} |"
-
 class IntermediateCodeGenerator:
     """Generador de código intermedio (cuádruplos) para el lenguaje robótico"""
     
     def __init__(self):
-        self.cuadruplos = []
+        self.cuadruplos = QuadrupleStore()
         self.contador_cuadruplos = 0
         self.contador_etiquetas = 0
         self.contador_temporales = 0
@@ -1055,20 +1645,51 @@ class IntermediateCodeGenerator:
         return f"CX{self.contador_loops}"
     
     def agregar_cuadruplo(self, operacion, arg1=None, arg2=None, resultado=None, descripcion=""):
-        """Agrega un nuevo cuádruplo a la lista"""
-        cuadruplo = Cuadruplo(self.contador_cuadruplos, operacion, arg1, arg2, resultado, descripcion)
-        self.cuadruplos.append(cuadruplo)
-        self.contador_cuadruplos += 1
-        return cuadruplo
+        """Agrega un nuevo cuádruplo y retorna su número"""
+        numero = self.cuadruplos.append(operacion, arg1, arg2, resultado, descripcion)
+        self.contador_cuadruplos = numero + 1
+        return numero
+    
+    def _agregar_movimiento(self, simbolo, cache, patrones):
+        """Agrega ASIG + CALL de una asignación a componente (o de una espera).
+
+        Las celdas del par de cuádruplos de cada (componente, valor, robot)
+        se resuelven una sola vez: en un programa largo se repiten en miles de
+        sentencias. Se guardan seguidas en `patrones` y `cache` lleva de
+        (componente, robot, tipo del valor) a {valor: posición en `patrones`},
+        así cada valor distinto no agrega tuplas propias.
+        """
+        store = self.cuadruplos
+        metodo, valor = simbolo.metodo, simbolo.valor
+        grupo = (metodo, simbolo.id, valor.__class__)
+        posiciones = cache.get(grupo)
+        if posiciones is None:
+            posiciones = cache[grupo] = {}
+        # 0.0 y -0.0 son iguales pero se muestran distinto (ver operand_key)
+        clave = valor if valor else repr(valor)
+        inicio = posiciones.get(clave)
+        if inicio is None:
+            if metodo == "espera":
+                asig, call = f"espera = {valor}", f"Espera {valor} segundos"
+            else:
+                asig, call = f"{metodo} = {valor}", f"Mueve {metodo} a {valor}°"
+            valor_id, metodo_id = store.operand(valor), store.operand(metodo)
+            inicio = posiciones[clave] = len(patrones)
+            patrones.extend((OP_ASIG, valor_id, NO_OPERAND, metodo_id, store.text(asig),
+                             OP_CALL, metodo_id, valor_id, store.operand(simbolo.id), store.text(call)))
+        store.extend_cells(patrones[inicio:inicio + 2 * FIELDS])
+        self.contador_cuadruplos += 2
     
     def generar_codigo_intermedio(self, parser):
         """Genera código intermedio basado en la tabla de símbolos del parser"""
-        self.cuadruplos = []
+        self.cuadruplos = QuadrupleStore()
         self.contador_cuadruplos = 0
         self.contador_etiquetas = 0
         self.contador_temporales = 0
         self.contador_loops = 0
         self.pila_etiquetas = []
+        movimientos = {}  # (componente, robot, tipo del valor) -> {valor: posición en patrones}
+        patrones = array('I')  # celdas del par ASIG + CALL de cada movimiento distinto
         
         if not parser or not parser.tabla_simbolos:
             return self.cuadruplos
@@ -1140,20 +1761,24 @@ class IntermediateCodeGenerator:
                     self.agregar_cuadruplo("FIN", None, None, "BLOQUE_FIN", "Fin del bloque")
                 
             elif simbolo.metodo == "espera":
-                # Comando de espera
-                self.agregar_cuadruplo("ASIG", simbolo.valor, None, "espera", f"espera = {simbolo.valor}")
-                self.agregar_cuadruplo("CALL", "espera", simbolo.valor, simbolo.id, f"Espera {simbolo.valor} segundos")
+                # Comando de espera: ASIG espera + CALL espera
+                self._agregar_movimiento(simbolo, movimientos, patrones)
                 
             elif simbolo.metodo in VALID_COMPONENTS and simbolo.metodo not in ["repetir", "inicio", "fin", "espera"]:
-                # Asignación a componente robótico
-                self.agregar_cuadruplo("ASIG", simbolo.valor, None, simbolo.metodo, f"{simbolo.metodo} = {simbolo.valor}")
-                self.agregar_cuadruplo("CALL", simbolo.metodo, simbolo.valor, simbolo.id, f"Mueve {simbolo.metodo} a {simbolo.valor}°")
+                # Asignación a componente robótico: ASIG componente + CALL componente
+                self._agregar_movimiento(simbolo, movimientos, patrones)
         
         return self.cuadruplos
     
-    def get_formatted_table(self):
-        """Retorna la tabla de cuádruplos formateada como string"""
-        if not self.cuadruplos:
+    def get_formatted_table(self, cuadruplos=None):
+        """Retorna la tabla de cuádruplos formateada como string.
+
+        `cuadruplos` (por ejemplo, los de RobotLexicalAnalyzer.optimize)
+        reemplaza a los generados.
+        """
+        if cuadruplos is None:
+            cuadruplos = self.cuadruplos
+        if not cuadruplos:
             return "No se generaron cuádruplos."
         
         output = []
@@ -1162,11 +1787,10 @@ class IntermediateCodeGenerator:
         output.append("| #   | OPERACION       | ARG1     | ARG2     | RESULTADO  | DESCRIPCION")
         output.append("|-----|-----------------|----------|----------|------------|" + "-" * 50)
         
-        for cuadruplo in self.cuadruplos:
-            output.append(str(cuadruplo))
+        output.extend(cuadruplos.formatted_rows())
         
         output.append("")
-        output.append(f"Total de cuádruplos generados: {len(self.cuadruplos)}")
+        output.append(f"Total de cuádruplos generados: {len(cuadruplos)}")
         output.append("")
         
         # Información adicional sobre el código intermedio
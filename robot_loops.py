@@ -0,0 +1,97 @@
+# Repeticiones como ciclos para los backends
+#
+# loop_structure() resuelve a qué sentencias se aplica cada 'repetir' y
+# retorna el cuerpo del programa con los bloques aplanados y un Loop por
+# cada repetición, de modo que los backends emitan un ciclo real (FOR de
+# RAPID, DEC/JNZ de 8086) en lugar de copiar el cuerpo N veces:
+#
+#   - un bloque inicio/fin se repite con su propio 'repetir' (el último de
+#     su cuerpo, ver Block.repeat) o, si no tiene, con el último 'repetir'
+#     del mismo robot que lo precede en el mismo nivel;
+#   - el último 'repetir' de un nivel que no toma ningún bloque repite las
+#     sentencias que lo siguen hasta el final de ese nivel.
+#
+# Una cantidad de 1 o menos no forma ciclo. LoopPolicy decide qué ciclos
+# conviene desenrollar: los de cuerpo corto cuyo código desenrollado entra en
+# el presupuesto de tamaño del backend.
+from robot_ast import Node, Block, Repeat
+
+class Loop(Node):
+    """Cuerpo que se ejecuta `count` veces ('robot.repetir = count' de la línea `line`)"""
+    __slots__ = ('robot', 'count', 'body')
+    _fields = ('robot', 'count', 'body', 'line')
+
+    def __init__(self, robot, count, line, body=None):
+        self.robot = robot
+        self.count = count
+        self.line = line
+        self.body = [] if body is None else body
+
+def _loop(repeat, body):
+    """Loop de `repeat` sobre `body`, o el propio body si no hace falta ciclo"""
+    if not body:
+        return []
+    if repeat is None or repeat.count <= 1:
+        return body
+    return [Loop(repeat.robot, repeat.count, repeat.line, body)]
+
+def _structure(body, robot):
+    items = []
+    pending = {}  # robot -> (Repeat, posición en items) todavía sin bloque
+    for node in body:
+        kind = type(node)
+        if kind is Repeat:
+            if robot is None or node.robot == robot:
+                pending[node.robot] = (node, len(items))
+        elif kind is Block:
+            inner = _structure([n for n in node.body if type(n) is not Repeat], robot)
+            repeat = None
+            if any(type(n) is Repeat for n in node.body):
+                repeat = Repeat(node.robot, node.repeat, node.line)
+            elif node.robot in pending:
+                repeat = pending.pop(node.robot)[0]
+            items.extend(_loop(repeat, inner))
+        elif robot is None or node.robot == robot:
+            items.append(node)
+    if pending:
+        repeat, start = max(pending.values(), key=lambda entry: entry[1])
+        items[start:] = _loop(repeat, items[start:])
+    return items
+
+def loop_structure(program, robot=None):
+    """Elementos del programa en orden con los bloques aplanados y las repeticiones como Loop.
+
+    Los Repeat no aparecen en el resultado. Con `robot` solo se incluyen los
+    elementos de ese robot.
+    """
+    return _structure(program.body, robot)
+
+def unrolled(items):
+    """Los elementos de `items` en el orden en que se ejecutan (ciclos expandidos)"""
+    for item in items:
+        if type(item) is Loop:
+            for _ in range(item.count):
+                yield from unrolled(item.body)
+        else:
+            yield item
+
+class LoopPolicy:
+    """Decide si un ciclo se desenrolla según un presupuesto de tamaño de código.
+
+    `budget` está en las unidades del backend (instrucciones, bytes...): un
+    ciclo se desenrolla si su cuerpo por la cantidad de repeticiones entra en
+    el presupuesto; con 0 nunca se desenrolla.
+    """
+    __slots__ = ('budget',)
+
+    def __init__(self, budget):
+        if budget < 0:
+            raise ValueError(f"Presupuesto de desenrollado inválido: {budget}")
+        self.budget = budget
+
+    def unroll(self, body_size, count):
+        """True si conviene copiar el cuerpo `count` veces en lugar de emitir un ciclo"""
+        return body_size * count <= self.budget
+
+    def __repr__(self):
+        return f"LoopPolicy({self.budget})"
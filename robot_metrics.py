@@ -0,0 +1,135 @@
+# Métricas por etapa del análisis y de los backends
+#
+# Cada etapa registra su tiempo de reloj, la cantidad de veces que se
+# ejecutó, los bloques de memoria netos que dejó asignados
+# (sys.getallocatedblocks) y contadores propios: tokens, sentencias,
+# cuádruplos, errores, etc. Con profile=True además se captura un perfil
+# cProfile de las etapas, que se puede consultar con stats() o guardar como
+# archivo pstats con dump_stats(). cProfile y pstats se importan solo al
+# perfilar (pstats carga dataclasses e inspect, que retrasan el arranque).
+import contextlib
+import sys
+import time
+
+def _new_profiler():
+    import cProfile
+    return cProfile.Profile()
+
+class PhaseMetrics:
+    """Mediciones acumuladas de una etapa"""
+    __slots__ = ('name', 'calls', 'seconds', 'allocated_blocks', 'counters')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.seconds = 0.0
+        self.allocated_blocks = 0
+        self.counters = {}
+
+    def as_dict(self):
+        return {'calls': self.calls, 'seconds': self.seconds,
+                'allocated_blocks': self.allocated_blocks, 'counters': dict(self.counters)}
+
+    def __repr__(self):
+        return f"PhaseMetrics({self.name!r}, {self.seconds * 1000:.2f} ms, {self.counters})"
+
+class AnalysisMetrics:
+    """Métricas de las etapas de un análisis, en el orden en que se ejecutaron.
+
+        with metrics.phase('lexical') as phase:
+            ...
+            phase.counters['tokens'] = len(tokens)
+
+    Con `profile` las etapas se ejecutan bajo cProfile (las etapas no se
+    anidan, así que un solo perfil las cubre a todas).
+    """
+
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.phases = {}
+        self.profiler = _new_profiler() if profile else None
+
+    def reset(self):
+        """Descarta las mediciones (y el perfil) anteriores"""
+        self.phases = {}
+        if self.profile:
+            self.profiler = _new_profiler()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Mide el bloque como una ejecución de la etapa `name`"""
+        phase = self.phases.get(name)
+        if phase is None:
+            phase = self.phases[name] = PhaseMetrics(name)
+        profiler = self.profiler
+        blocks = sys.getallocatedblocks()
+        if profiler is not None:
+            profiler.enable()
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.seconds += time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            phase.allocated_blocks += sys.getallocatedblocks() - blocks
+            phase.calls += 1
+
+    def __getitem__(self, name):
+        return self.phases[name]
+
+    def __contains__(self, name):
+        return name in self.phases
+
+    def __iter__(self):
+        return iter(self.phases.values())
+
+    @property
+    def total_seconds(self):
+        """Tiempo total de todas las etapas"""
+        return sum(phase.seconds for phase in self.phases.values())
+
+    def as_dict(self):
+        """Mediciones como dict serializable: etapa -> {calls, seconds, allocated_blocks, counters}"""
+        return {name: phase.as_dict() for name, phase in self.phases.items()}
+
+    def format_table(self):
+        """Tabla de texto con las mediciones de cada etapa"""
+        return format_metrics_table(self.as_dict())
+
+    def stats(self, sort='cumulative'):
+        """pstats.Stats del perfil capturado (None si no se pidió profile)"""
+        if self.profiler is None:
+            return None
+        import pstats
+        return pstats.Stats(self.profiler).sort_stats(sort)
+
+    def dump_stats(self, path):
+        """Guarda el perfil capturado como archivo pstats"""
+        if self.profiler is None:
+            raise ValueError("Las métricas no se crearon con profile=True")
+        self.profiler.dump_stats(path)
+
+def merge_metrics(metrics_list):
+    """Suma mediciones de varios análisis (dicts de AnalysisMetrics.as_dict())"""
+    merged = {}
+    for metrics in metrics_list:
+        for name, phase in metrics.items():
+            total = merged.setdefault(name, {'calls': 0, 'seconds': 0.0, 'allocated_blocks': 0, 'counters': {}})
+            total['calls'] += phase['calls']
+            total['seconds'] += phase['seconds']
+            total['allocated_blocks'] += phase['allocated_blocks']
+            for counter, value in phase['counters'].items():
+                total['counters'][counter] = total['counters'].get(counter, 0) + value
+    return merged
+
+def format_metrics_table(metrics):
+    """Tabla de texto de un dict etapa -> mediciones (ver AnalysisMetrics.as_dict)"""
+    total = sum(phase['seconds'] for phase in metrics.values()) or 1.0
+    width = max([14] + [len(name) for name in metrics])
+    lines = [f"{'etapa':<{width}} {'veces':>7} {'tiempo':>12} {'%':>6} {'bloques':>10}  contadores"]
+    for name, phase in metrics.items():
+        counters = ', '.join(f"{counter}={value:,}" for counter, value in phase['counters'].items())
+        lines.append(f"{name:<{width}} {phase['calls']:>7,} {phase['seconds'] * 1000:>9.2f} ms "
+                     f"{phase['seconds'] * 100 / total:>5.1f}% {phase['allocated_blocks']:>10,}  {counters}")
+    return '\n'.join(lines)
@@ -0,0 +1,172 @@
+# Plan de movimiento: representación intermedia de los backends
+#
+# motion_plan() convierte los elementos de loop_structure() (asignaciones,
+# esperas y Loop) en segmentos pose a pose. Cada Segment lleva la pose
+# completa de destino de todos los ejes, la velocidad, la zona y la espera al
+# llegar, de modo que las asignaciones entre dos esperas se ejecutan como un
+# solo movimiento coordinado en lugar de una parada por eje:
+#
+#   r1.base = 90          Segment(base, hombro, codo -> [90, 45, 30, ...],
+#   r1.hombro = 45   ==>          dwell=1)
+#   r1.codo = 30
+#   r1.espera = 1
+#
+# Un segmento se cierra con una espera (las esperas seguidas se suman), al
+# asignar otra vez un eje del segmento (el robot tiene que pasar por ese
+# valor), al cambiar la velocidad o la zona con movimientos pendientes, al
+# empezar o terminar un ciclo y al final del programa. Los Loop se conservan
+# con sus segmentos como cuerpo; robot_loops.unrolled() los expande.
+#
+# Con `level` el plan aplica las pasadas de robot_optimizer que cambian los
+# movimientos que emiten los backends:
+#
+#   -O1  quita las asignaciones de un eje al valor que ya tiene (movimientos
+#        sin efecto); el valor de un eje se conoce desde que el programa lo
+#        asigna hasta la entrada o la salida de un ciclo
+#   -O2  además, volver a asignar un eje no cierra el segmento: el eje va
+#        directo al último valor (movimientos pisados antes de una espera) y
+#        si ese valor es el de partida el eje no se mueve
+from robot_ast import Node, Assignment, Wait
+from robot_loops import Loop
+
+# Ejes del brazo, en el orden de las articulaciones del controlador
+AXES = ('base', 'hombro', 'codo', 'muneca', 'inclinacion', 'garra')
+
+class Segment(Node):
+    """Movimiento coordinado de la pose `start` a `pose` (dicts eje -> valor).
+
+    `moved` son los ejes asignados en el segmento, en el orden del programa
+    (vacío si el segmento es solo una espera); `dwell` son los segundos de
+    espera al llegar. Dentro de un ciclo, `start` es la pose de la primera
+    vuelta. `line` y `end_line` son la primera y la última línea plegadas.
+    """
+    __slots__ = ('robot', 'start', 'pose', 'moved', 'speed', 'zone', 'dwell', 'end_line')
+    _fields = ('robot', 'start', 'pose', 'moved', 'speed', 'zone', 'dwell', 'line', 'end_line')
+
+    def __init__(self, robot, start, pose, moved, speed, zone, dwell, line, end_line=None):
+        self.robot = robot
+        self.start = start
+        self.pose = pose
+        self.moved = moved
+        self.speed = speed
+        self.zone = zone
+        self.dwell = dwell
+        self.line = line
+        self.end_line = line if end_line is None else end_line
+
+    @property
+    def targets(self):
+        """Valores de destino de los ejes asignados en el segmento"""
+        return {axis: self.pose[axis] for axis in self.moved}
+
+class _Planner:
+    """Estado del plan mientras se recorren los elementos (pose, velocidad, zona y segmento abierto)"""
+    __slots__ = ('axes', 'pose', 'speed', 'zone', 'level', 'known', 'start_known', 'start', 'moved', 'robot',
+                 'line', 'end_line')
+
+    def __init__(self, pose, speed, zone, level=0):
+        self.axes = frozenset(pose)
+        self.pose = pose
+        self.speed = speed
+        self.zone = zone
+        self.level = level
+        self.known = set()  # ejes con valor conocido (-O1)
+        self.moved = []
+
+    def _close(self, segments, dwell=0):
+        """Agrega el segmento abierto (con la espera `dwell`) a `segments`.
+
+        Retorna False si no había segmento abierto o si con -O2 ninguno de
+        sus ejes termina en otro valor que el de partida.
+        """
+        if not self.moved:
+            return False
+        moved = self.moved
+        self.moved = []
+        if self.level >= 2:
+            moved = [axis for axis in moved if axis not in self.start_known or self.pose[axis] != self.start[axis]]
+            if not moved:
+                return False
+        segments.append(Segment(self.robot, self.start, dict(self.pose), tuple(moved),
+                                self.speed, self.zone, dwell, self.line, self.end_line))
+        return True
+
+    def _wait(self, segments, node):
+        """Espera sin movimiento: se suma a la espera de la parada anterior si la hay"""
+        if segments and type(segments[-1]) is Segment:
+            # Esperas seguidas: una sola parada más larga
+            segments[-1].dwell += node.seconds
+            segments[-1].end_line = node.line
+        else:
+            segments.append(Segment(node.robot, dict(self.pose), dict(self.pose), (), self.speed,
+                                    self.zone, node.seconds, node.line))
+
+    def plan(self, items):
+        segments = []
+        for node in items:
+            kind = type(node)
+            if kind is Assignment:
+                component = node.component
+                if component in self.axes:
+                    if (self.level and component not in self.moved and component in self.known
+                            and self.pose[component] == node.value):
+                        continue
+                    if component in self.moved and self.level < 2:
+                        self._close(segments)
+                    if not self.moved:
+                        self.start, self.robot, self.line = dict(self.pose), node.robot, node.line
+                        self.start_known = frozenset(self.known)
+                    self.pose[component] = node.value
+                    if component not in self.moved:
+                        self.moved.append(component)
+                    self.known.add(component)
+                    self.end_line = node.line
+                elif component == 'velocidad' or component == 'precision':
+                    attribute = 'speed' if component == 'velocidad' else 'zone'
+                    if node.value != getattr(self, attribute):
+                        self._close(segments)
+                        setattr(self, attribute, node.value)
+            elif kind is Wait:
+                if self.moved:
+                    self.end_line = node.line
+                if not self._close(segments, node.seconds):
+                    self._wait(segments, node)
+            elif kind is Loop:
+                self._close(segments)
+                # Cada vuelta después de la primera parte de la pose en que termina la anterior
+                self.known.clear()
+                body = self.plan(node.body)
+                self.known.clear()
+                if body:
+                    segments.append(Loop(node.robot, node.count, node.line, body))
+        self._close(segments)
+        return segments
+
+def motion_plan(items, speed, zone=None, initial=None, axes=AXES, level=0):
+    """Segmentos (y Loop de segmentos) de los elementos de loop_structure().
+
+    `speed` y `zone` son la velocidad y la zona iniciales del backend;
+    `initial` es la pose inicial (por defecto todos los ejes de `axes` en 0)
+    y `level` el nivel de optimización (-O0 a -O2). Los valores se conservan
+    como están en el programa: cada backend los convierte a sus unidades.
+    """
+    pose = dict.fromkeys(axes, 0.0) if initial is None else dict(initial)
+    return _Planner(pose, speed, zone, level).plan(items)
+
+def final_pose(plan, initial):
+    """Pose al terminar de ejecutar `plan` desde la pose `initial`"""
+    pose = dict(initial)
+    for item in plan:
+        if type(item) is Loop:
+            pose = final_pose(item.body, pose)
+        else:
+            pose.update(item.targets)
+    return pose
+
+def segments(plan):
+    """Segmentos de `plan` en orden de ejecución, con el cuerpo de cada ciclo una sola vez"""
+    for item in plan:
+        if type(item) is Loop:
+            yield from segments(item.body)
+        else:
+            yield item
@@ -0,0 +1,390 @@
+# Optimización de los cuádruplos de código intermedio
+#
+# optimize(cuadruplos, nivel) aplica una secuencia de pasadas sobre un
+# QuadrupleStore y retorna un store nuevo (el original no se modifica):
+#
+#   -O0  sin pasadas
+#   -O1  propagación de copias, movimientos sin efecto, esperas seguidas
+#        y saltos encadenados (no cambian ninguna posición del robot)
+#   -O2  además movimientos pisados antes de una espera (el eje recibe el
+#        último valor directamente, sin pasar por los intermedios); se
+#        aplica antes que la de movimientos sin efecto, que así ve los
+#        valores que quedan
+#
+# Cada pasada es una función pasada(filas, store, contadores) -> filas. Las
+# filas son tuplas (código, arg1, arg2, resultado, descripción) de índices
+# de los pools de `store` (ver QuadrupleStore.records); la pasada agrega al
+# store los operandos y descripciones nuevos que necesite y anota en
+# `contadores` lo que hizo. register_pass() agrega pasadas nuevas.
+#
+# Un movimiento es un CALL componente valor robot, precedido por el ASIG
+# valor -> componente que genera IntermediateCodeGenerator; las pasadas
+# agregan o quitan el par completo. Las etiquetas y los saltos separan los
+# bloques en los que se sigue el estado de cada eje.
+#
+# Los backends .com y .mod no leen los cuádruplos sino el plan de movimiento:
+# robot_motion.motion_plan(..., level) aplica allí las mismas reglas de
+# movimientos sin efecto (-O1) y pisados (-O2) con el nivel de `lexic build -O`.
+from robot_metrics import AnalysisMetrics, format_metrics_table
+from robot_quadruples import (QuadrupleStore, OP_ASIG, OP_CALL, OP_COMPARAR, OP_SALTO_CONDICIONAL,
+                              OP_SALTO_INCONDICIONAL, OP_DECREMENTO, OP_DECLARAR_ETIQUETA, OP_FIN)
+
+OPTIMIZATION_LEVELS = (0, 1, 2)
+
+# Versión de las pasadas: forma parte de la clave de los artefactos generados
+# con cuádruplos optimizados, así que debe cambiar cada vez que cambia lo que
+# produce optimize() para un mismo programa
+OPTIMIZER_VERSION = '1'
+
+# Componente de las esperas y componente que modifica los movimientos siguientes
+WAIT_COMPONENT = 'espera'
+SPEED_COMPONENT = 'velocidad'
+
+# Pasos de ejecución máximos de execution_profile (un ciclo de un programa
+# real tiene unos pocos miles)
+MAX_PROFILE_STEPS = 1_000_000
+
+_LABELS = (OP_DECLARAR_ETIQUETA, OP_FIN)
+_JUMPS = (OP_SALTO_CONDICIONAL, OP_SALTO_INCONDICIONAL)
+_BARRIERS = _LABELS + _JUMPS
+
+class OptimizationPass:
+    """Pasada registrada: se aplica desde el nivel `level`"""
+    __slots__ = ('name', 'level', 'function', 'description')
+
+    def __init__(self, name, level, function, description=""):
+        self.name = name
+        self.level = level
+        self.function = function
+        self.description = description
+
+    def __repr__(self):
+        return f"OptimizationPass({self.name!r}, -O{self.level})"
+
+# Pasadas registradas, en orden de aplicación
+PASSES = {}
+
+def register_pass(name, level, description=""):
+    """Decorador que registra una pasada (se aplica después de las ya registradas)"""
+    if level not in OPTIMIZATION_LEVELS or level == 0:
+        raise ValueError(f"Nivel de optimización inválido para {name}: {level}")
+
+    def decorator(function):
+        PASSES[name] = OptimizationPass(name, level, function, description)
+        return function
+    return decorator
+
+def passes_for_level(level):
+    """Pasadas que se aplican con -O`level`, en orden"""
+    if level not in OPTIMIZATION_LEVELS:
+        raise ValueError(f"Nivel de optimización inválido: {level} (opciones: 0, 1, 2)")
+    return [optimization_pass for optimization_pass in PASSES.values() if optimization_pass.level <= level]
+
+def _is_pair(asig, call):
+    """True si `asig` es el ASIG valor -> componente del movimiento `call`"""
+    return (asig is not None and asig[0] == OP_ASIG and asig[3] == call[1] and asig[1] == call[2])
+
+def _unit_start(out, call):
+    """Posición en `out` donde empieza el movimiento `call` que se va a agregar"""
+    return len(out) - 1 if out and _is_pair(out[-1], call) else len(out)
+
+def _is_number(value):
+    return value.__class__ in (int, float)
+
+@register_pass('copy_propagation', 1, "Reemplaza variables por su valor constante y quita asignaciones sin uso")
+def propagate_copies(records, store, counters):
+    operands = store.operands
+    components = {record[1] for record in records if record[0] == OP_CALL}
+    constants = {}
+    propagated = 0
+    out = []
+    for record in records:
+        opcode, arg1, arg2, result, description = record
+        if opcode in _LABELS or opcode == OP_SALTO_INCONDICIONAL:
+            constants.clear()
+        elif opcode == OP_ASIG:
+            if arg1 in constants:
+                arg1 = constants[arg1]
+                propagated += 1
+            if result not in components:
+                if _is_number(operands[arg1]):
+                    constants[result] = arg1
+                else:
+                    constants.pop(result, None)
+        elif opcode == OP_COMPARAR:
+            if arg1 in constants or arg2 in constants:
+                propagated += (arg1 in constants) + (arg2 in constants)
+                arg1, arg2 = constants.get(arg1, arg1), constants.get(arg2, arg2)
+            constants.pop(result, None)
+        elif opcode == OP_SALTO_CONDICIONAL:
+            if arg1 in constants:
+                arg1 = constants[arg1]
+                propagated += 1
+        elif opcode == OP_DECREMENTO:
+            constants.pop(result, None)
+        elif opcode == OP_CALL and arg2 in constants:
+            arg2 = constants[arg2]
+            propagated += 1
+        out.append((opcode, arg1, arg2, result, description))
+
+    # Asignaciones cuya variable no se lee (las de los movimientos se quedan)
+    read = set()
+    for opcode, arg1, arg2, _, _ in out:
+        if opcode == OP_COMPARAR:
+            read.add(arg1)
+            read.add(arg2)
+        elif opcode in (OP_ASIG, OP_SALTO_CONDICIONAL, OP_DECREMENTO):
+            read.add(arg1)
+        elif opcode == OP_CALL:
+            read.add(arg2)
+    records = [record for record in out
+               if record[0] != OP_ASIG or record[3] in read or record[3] in components]
+    counters['propagated'] = propagated
+    return records
+
+@register_pass('dead_moves', 2, "Quita los movimientos que otro del mismo eje pisa antes de una espera")
+def remove_dead_moves(records, store, counters):
+    wait = store.operand(WAIT_COMPONENT)
+    speed = store.operand(SPEED_COMPONENT)
+    pending = {}  # (robot, componente) -> posiciones en `out` del último movimiento
+    moves = 0
+    out = []
+    for record in records:
+        opcode, component, _, robot, _ = record
+        if opcode in _BARRIERS or (opcode == OP_CALL and component == wait):
+            pending.clear()
+        elif opcode == OP_CALL:
+            key = (robot, component)
+            previous = pending.get(key)
+            if previous is not None:
+                for index in previous:
+                    out[index] = None
+                moves += 1
+            if component != speed:
+                # Este movimiento usa la velocidad vigente: ya no se puede quitar
+                pending.pop((robot, speed), None)
+            pending[key] = range(_unit_start(out, record), len(out) + 1)
+        out.append(record)
+    counters['moves'] = moves
+    return [record for record in out if record is not None]
+
+@register_pass('noop_moves', 1, "Quita los movimientos a la posición en la que ya está el eje")
+def remove_noop_moves(records, store, counters):
+    operands = store.operands
+    wait = store.operand(WAIT_COMPONENT)
+    state = {}  # (robot, componente) -> último valor
+    moves = 0
+    out = []
+    for record in records:
+        opcode = record[0]
+        if opcode in _BARRIERS:
+            state.clear()
+        elif opcode == OP_CALL and record[1] != wait:
+            key = (record[3], record[1])
+            value = operands[record[2]]
+            if key in state and state[key] == value:
+                if _unit_start(out, record) < len(out):
+                    out.pop()
+                moves += 1
+                continue
+            state[key] = value
+        out.append(record)
+    counters['moves'] = moves
+    return out
+
+@register_pass('merge_waits', 1, "Suma las esperas seguidas de un mismo robot")
+def merge_waits(records, store, counters):
+    operands = store.operands
+    wait = store.operand(WAIT_COMPONENT)
+    merged = 0
+    out = []
+    last = None  # (inicio en `out`, robot, valor, con ASIG) de la espera que termina `out`
+    for record in records:
+        opcode, component, value, robot, _ = record
+        if opcode != OP_CALL or component != wait:
+            out.append(record)
+            continue
+        start = _unit_start(out, record)
+        seconds = operands[value]
+        if (last is not None and start == last[0] + 1 + last[3] and last[1] == robot
+                and _is_number(seconds) and _is_number(last[2])):
+            total = last[2] + seconds
+            total = round(total, 6) if isinstance(total, float) else total
+            with_asig = last[3] or start < len(out)
+            del out[last[0]:]
+            start = len(out)
+            total_id = store.operand(total)
+            if with_asig:
+                out.append((OP_ASIG, total_id, 0, wait, store.text(f"espera = {total}")))
+            out.append((OP_CALL, wait, total_id, robot, store.text(f"Espera {total} segundos")))
+            last = (start, robot, total, with_asig)
+            merged += 1
+            continue
+        out.append(record)
+        last = (start, robot, seconds, start < len(out) - 1)
+    counters['waits'] = merged
+    return out
+
+@register_pass('jump_threading', 1, "Salta directo al destino final y quita los saltos a la instrucción siguiente")
+def thread_jumps(records, store, counters):
+    labels = {}
+    repeated = set()  # BLOQUE_INICIO / BLOQUE_FIN se declaran varias veces
+    for index, (opcode, _, _, label, _) in enumerate(records):
+        if opcode in _LABELS:
+            if label in labels:
+                repeated.add(label)
+            labels[label] = index
+    size = len(records)
+
+    def final_target(label):
+        seen = set()
+        while label in labels and label not in repeated and label not in seen:
+            seen.add(label)
+            index = labels[label] + 1
+            while index < size and records[index][0] in _LABELS:
+                index += 1
+            if index == size or records[index][0] != OP_SALTO_INCONDICIONAL:
+                break
+            label = records[index][3]
+        return label
+
+    threaded = removed = 0
+    out = []
+    for index, record in enumerate(records):
+        opcode = record[0]
+        if opcode in _JUMPS:
+            target = final_target(record[3])
+            if target != record[3]:
+                record = record[:3] + (target,) + record[4:]
+                threaded += 1
+            following = index + 1
+            while following < size and records[following][0] in _LABELS and records[following][3] != target:
+                following += 1
+            if following < size and records[following][0] in _LABELS and target not in repeated:
+                removed += 1
+                continue
+        out.append(record)
+    counters['threaded'] = threaded
+    counters['jumps'] = removed
+    return out
+
+def execution_profile(store, max_steps=MAX_PROFILE_STEPS):
+    """Lo que hace el robot en un ciclo del programa, ejecutando los cuádruplos.
+
+    Retorna {'quadruples', 'moves', 'waits', 'executed_moves', 'wait_seconds'}:
+    los tres primeros cuentan cuádruplos del programa y los dos últimos lo
+    ejecutado (con las repeticiones de los ciclos). Si la ejecución supera
+    `max_steps` pasos los dos últimos son None.
+    """
+    operands = store.operands
+    records = store.records()
+    wait = store._operand_ids.get(WAIT_COMPONENT)
+    moves = waits = 0
+    for opcode, component, _, _, _ in records:
+        if opcode == OP_CALL:
+            if component == wait:
+                waits += 1
+            else:
+                moves += 1
+    profile = {'quadruples': len(records), 'moves': moves, 'waits': waits,
+               'executed_moves': None, 'wait_seconds': None}
+
+    labels = {label: index for index, (opcode, _, _, label, _) in enumerate(records) if opcode in _LABELS}
+    variables = {}
+
+    def value(index):
+        operand = operands[index]
+        if operand.__class__ is not str:
+            return operand
+        if operand in variables:
+            return variables[operand]
+        try:
+            return int(operand)
+        except ValueError:
+            return operand
+
+    executed = 0
+    seconds = 0.0
+    position = steps = 0
+    size = len(records)
+    while position < size:
+        steps += 1
+        if steps > max_steps:
+            return profile
+        opcode, arg1, arg2, result, _ = records[position]
+        position += 1
+        if opcode == OP_CALL:
+            if arg1 == wait:
+                seconds += value(arg2) if _is_number(value(arg2)) else 0
+            else:
+                executed += 1
+        elif opcode == OP_ASIG:
+            variables[operands[result]] = value(arg1)
+        elif opcode == OP_COMPARAR:
+            variables[operands[result]] = value(arg1) == value(arg2)
+        elif opcode == OP_DECREMENTO:
+            variables[operands[result]] = value(arg1) - 1
+        elif opcode == OP_SALTO_INCONDICIONAL or (opcode == OP_SALTO_CONDICIONAL and value(arg1) is True):
+            position = labels.get(result, size)
+    profile['executed_moves'] = executed
+    profile['wait_seconds'] = round(seconds, 6)
+    return profile
+
+class OptimizationResult:
+    """Resultado de optimize(): cuádruplos optimizados y estadísticas por pasada.
+
+    `metrics` (AnalysisMetrics) tiene una etapa por pasada aplicada con su
+    tiempo y sus contadores: 'removed' (cuádruplos quitados) y los propios
+    de la pasada. `before` y `after` son los execution_profile() del código
+    original y del optimizado.
+    """
+
+    def __init__(self, level, cuadruplos, metrics, before, after):
+        self.level = level
+        self.cuadruplos = cuadruplos
+        self.metrics = metrics
+        self.before = before
+        self.after = after
+
+    def as_dict(self):
+        """Resultado sin los cuádruplos, como dict serializable"""
+        return {'level': self.level, 'passes': self.metrics.as_dict(),
+                'before': dict(self.before), 'after': dict(self.after)}
+
+    def format_report(self):
+        """Texto con las estadísticas de cada pasada y el programa antes y después"""
+        return format_optimization_report(self.as_dict())
+
+def format_optimization_report(report):
+    """Texto de un dict de OptimizationResult.as_dict() (o de varios sumados)"""
+    lines = [f"Optimización -O{report['level']}"]
+    if report['passes']:
+        lines.append(format_metrics_table(report['passes']))
+    before, after = report['before'], report['after']
+    labels = (('quadruples', "cuádruplos"), ('moves', "movimientos"), ('waits', "esperas"),
+              ('executed_moves', "movimientos ejecutados"), ('wait_seconds', "segundos de espera"))
+    for key, label in labels:
+        if before.get(key) is not None and after.get(key) is not None:
+            lines.append(f"  {label:<24} {before[key]:>10,} → {after[key]:,}")
+    return '\n'.join(lines)
+
+def optimize(cuadruplos, level=1, passes=None):
+    """Optimiza `cuadruplos` (QuadrupleStore o lista de Cuadruplo) con -O`level`.
+
+    `passes` (lista de OptimizationPass) reemplaza a las pasadas del nivel.
+    Retorna un OptimizationResult.
+    """
+    if not isinstance(cuadruplos, QuadrupleStore):
+        cuadruplos = QuadrupleStore.from_quadruples(cuadruplos)
+    passes = passes_for_level(level) if passes is None else passes
+    metrics = AnalysisMetrics()
+    store = cuadruplos.empty_copy()
+    records = cuadruplos.records()
+    for optimization_pass in passes:
+        with metrics.phase(optimization_pass.name) as phase:
+            count = len(records)
+            records = optimization_pass.function(records, store, phase.counters)
+            phase.counters['removed'] = count - len(records)
+    for record in records:
+        store.append_ids(*record)
+    return OptimizationResult(level, store, metrics, execution_profile(cuadruplos), execution_profile(store))
@@ -0,0 +1,248 @@
+# Almacenamiento compacto de los cuádruplos de código intermedio
+from array import array
+
+# Operaciones del código intermedio por código numérico (el orden es el
+# índice de las tablas de despacho, ver dispatch_table)
+OPCODE_NAMES = ['DECLARAR', 'ASIG', 'CALL', 'COMPARAR', 'SALTO_CONDICIONAL',
+                'SALTO_INCONDICIONAL', 'DECREMENTO', 'DECLARAR_ETIQUETA', 'FIN']
+OPCODE_IDS = {name: index for index, name in enumerate(OPCODE_NAMES)}
+(OP_DECLARAR, OP_ASIG, OP_CALL, OP_COMPARAR, OP_SALTO_CONDICIONAL,
+ OP_SALTO_INCONDICIONAL, OP_DECREMENTO, OP_DECLARAR_ETIQUETA, OP_FIN) = range(len(OPCODE_NAMES))
+
+# Operando vacío: ocupa el índice 0 del pool y se muestra como "-"
+NO_OPERAND = 0
+
+def opcode_id(name):
+    """Código numérico de la operación `name` (las desconocidas se registran al final)"""
+    index = OPCODE_IDS.get(name)
+    if index is None:
+        index = OPCODE_IDS[name] = len(OPCODE_NAMES)
+        if index > 255:
+            raise ValueError(f"Demasiadas operaciones de código intermedio: {name}")
+        OPCODE_NAMES.append(name)
+    return index
+
+def dispatch_table(handlers, default=None):
+    """Tabla de despacho indexada por código de operación.
+
+    `handlers` asocia nombres de operación con funciones handler(arg1, arg2,
+    resultado); las operaciones sin handler quedan con `default`.
+    """
+    table = [default] * len(OPCODE_NAMES)
+    for name, handler in handlers.items():
+        index = opcode_id(name)
+        if index >= len(table):
+            table.extend([default] * (index + 1 - len(table)))
+        table[index] = handler
+    return table
+
+def operand_key(value):
+    """Clave con la que se interna un operando en el pool"""
+    cls = value.__class__
+    if cls is str:
+        return value
+    # 45 y 45.0 (o 0.0 y -0.0) son iguales pero se muestran distinto
+    return (cls, value) if value else (cls, repr(value))
+
+class Cuadruplo:
+    """Clase para representar un cuádruplo de código intermedio"""
+    __slots__ = ('numero', 'operacion', 'arg1', 'arg2', 'resultado', 'descripcion')
+
+    def __init__(self, numero, operacion, arg1, arg2, resultado, descripcion):
+        self.numero = numero
+        self.operacion = operacion
+        self.arg1 = arg1 if arg1 is not None else "-"
+        self.arg2 = arg2 if arg2 is not None else "-"
+        self.resultado = resultado if resultado is not None else "-"
+        self.descripcion = descripcion
+
+    def __str__(self):
+        return f"| {self.numero:<3} | {self.operacion:<15} | {self.arg1:<8} | {self.arg2:<8} | {self.resultado:<10} | {self.descripcion} |"
+
+# Campos de cada fila de QuadrupleStore.cells
+_OPCODE, _ARG1, _ARG2, _RESULT, _DESCRIPTION = range(5)
+FIELDS = 5
+
+class QuadrupleStore:
+    """Secuencia de cuádruplos almacenada en un arreglo empaquetado.
+
+    Cada cuádruplo ocupa FIELDS posiciones seguidas de `cells`: código de
+    operación (ver OPCODE_NAMES), arg1, arg2, resultado y descripción. Los
+    operandos son índices del pool `operands` (nombres, números, etiquetas y
+    temporales, cada valor distinto una sola vez; el 0 es el operando vacío
+    "-") y la descripción es un índice del pool `texts`. El número de un
+    cuádruplo es su posición. Las columnas opcodes, arg1, arg2, results y
+    descriptions son copias de cada campo.
+
+    Los backends recorren los cuádruplos con dispatch() o rows(). Para el
+    código que todavía espera objetos Cuadruplo, la secuencia se puede
+    indexar, recortar e iterar; cada acceso construye el Cuadruplo
+    equivalente.
+    """
+    __slots__ = ('cells', 'operands', 'texts', '_operand_ids', '_text_ids')
+
+    def __init__(self):
+        self.cells = array('I')
+        self.operands = ["-"]
+        self.texts = []
+        self._operand_ids = {"-": NO_OPERAND}
+        self._text_ids = {}
+
+    def operand(self, value):
+        """Índice de `value` en el pool de operandos (None es el operando vacío)"""
+        if value is None:
+            return NO_OPERAND
+        key = operand_key(value)
+        index = self._operand_ids.get(key)
+        if index is None:
+            index = self._operand_ids[key] = len(self.operands)
+            self.operands.append(value)
+        return index
+
+    def text(self, description):
+        """Índice de `description` en el pool de descripciones"""
+        index = self._text_ids.get(description)
+        if index is None:
+            index = self._text_ids[description] = len(self.texts)
+            self.texts.append(description)
+        return index
+
+    def append(self, operacion, arg1=None, arg2=None, resultado=None, descripcion=""):
+        """Agrega un cuádruplo y retorna su número"""
+        return self.append_ids(opcode_id(operacion), self.operand(arg1), self.operand(arg2),
+                               self.operand(resultado), self.text(descripcion))
+
+    def append_ids(self, opcode, arg1, arg2, result, description):
+        """Agrega un cuádruplo con código de operación e índices de pool ya resueltos"""
+        self.cells.extend((opcode, arg1, arg2, result, description))
+        return len(self.cells) // FIELDS - 1
+
+    def extend_cells(self, cells):
+        """Agrega filas ya resueltas (FIELDS valores por cuádruplo, p. ej. una tupla guardada)"""
+        self.cells.extend(cells)
+
+    @property
+    def opcodes(self):
+        return self.cells[_OPCODE::FIELDS]
+
+    @property
+    def arg1(self):
+        return self.cells[_ARG1::FIELDS]
+
+    @property
+    def arg2(self):
+        return self.cells[_ARG2::FIELDS]
+
+    @property
+    def results(self):
+        return self.cells[_RESULT::FIELDS]
+
+    @property
+    def descriptions(self):
+        return self.cells[_DESCRIPTION::FIELDS]
+
+    def operation(self, index):
+        """Nombre de la operación del cuádruplo `index`"""
+        return OPCODE_NAMES[self.cells[index * FIELDS]]
+
+    def quadruple(self, index):
+        """Construye el objeto Cuadruplo equivalente al cuádruplo `index`"""
+        opcode, arg1, arg2, result, description = self.cells[index * FIELDS:(index + 1) * FIELDS]
+        operands = self.operands
+        return Cuadruplo(index, OPCODE_NAMES[opcode], operands[arg1], operands[arg2],
+                         operands[result], self.texts[description])
+
+    def _fields(self):
+        """Iterador de las filas como tuplas (código, arg1, arg2, resultado, descripción)"""
+        cells = iter(self.cells)
+        return zip(cells, cells, cells, cells, cells)
+
+    def records(self):
+        """Lista de las filas como tuplas (código, arg1, arg2, resultado, descripción) de índices"""
+        return list(self._fields())
+
+    def empty_copy(self):
+        """Store vacío con una copia de los pools: acepta las filas de records() tal cual"""
+        store = QuadrupleStore()
+        store.operands = list(self.operands)
+        store.texts = list(self.texts)
+        store._operand_ids = dict(self._operand_ids)
+        store._text_ids = dict(self._text_ids)
+        return store
+
+    @classmethod
+    def from_quadruples(cls, quadruples):
+        """Store con los cuádruplos de una secuencia de objetos Cuadruplo"""
+        store = cls()
+        for cuadruplo in quadruples:
+            store.append(cuadruplo.operacion, cuadruplo.arg1, cuadruplo.arg2, cuadruplo.resultado,
+                         cuadruplo.descripcion)
+        return store
+
+    def rows(self):
+        """Iterador de (código de operación, arg1, arg2, resultado) con los valores de los operandos"""
+        operands = self.operands
+        for opcode, arg1, arg2, result, _ in self._fields():
+            yield opcode, operands[arg1], operands[arg2], operands[result]
+
+    def dispatch(self, table):
+        """Llama table[código](arg1, arg2, resultado) por cada cuádruplo, en orden.
+
+        Los códigos sin entrada en la tabla (o con None) se saltean.
+        """
+        operands = self.operands
+        size = len(table)
+        for opcode, arg1, arg2, result, _ in self._fields():
+            handler = table[opcode] if opcode < size else None
+            if handler is not None:
+                handler(operands[arg1], operands[arg2], operands[result])
+
+    def opcode_counts(self):
+        """Cantidad de cuádruplos por nombre de operación"""
+        counts = [0] * len(OPCODE_NAMES)
+        for opcode in self.cells[_OPCODE::FIELDS]:
+            counts[opcode] += 1
+        return {OPCODE_NAMES[opcode]: count for opcode, count in enumerate(counts) if count}
+
+    def formatted_rows(self):
+        """Filas de la tabla de cuádruplos, iguales a str(Cuadruplo)"""
+        # Cada operando y operación se rellena una sola vez, no en cada fila
+        names = [f"{name:<15}" for name in OPCODE_NAMES]
+        args = [f"{operand:<8}" for operand in self.operands]
+        results = [f"{operand:<10}" for operand in self.operands]
+        texts = self.texts
+        for index, (opcode, arg1, arg2, result, description) in enumerate(self._fields()):
+            yield f"| {index:<3} | {names[opcode]} | {args[arg1]} | {args[arg2]} | {results[result]} | {texts[description]} |"
+
+    def __len__(self):
+        return len(self.cells) // FIELDS
+
+    def __bool__(self):
+        return len(self.cells) > 0
+
+    def __getitem__(self, index):
+        count = len(self.cells) // FIELDS
+        if isinstance(index, slice):
+            return [self.quadruple(i) for i in range(*index.indices(count))]
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("índice de cuádruplo fuera de rango")
+        return self.quadruple(index)
+
+    def __iter__(self):
+        """Iterador de compatibilidad que produce objetos Cuadruplo"""
+        for index in range(len(self.cells) // FIELDS):
+            yield self.quadruple(index)
+
+    def __eq__(self, other):
+        if isinstance(other, QuadrupleStore):
+            return list(self.formatted_rows()) == list(other.formatted_rows())
+        if isinstance(other, list):
+            return len(self) == len(other) and all(str(a) == str(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"QuadrupleStore({len(self)} cuádruplos)"
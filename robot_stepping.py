@@ -0,0 +1,90 @@
+# Pasos de los motores paso a paso para los backends 8086
+#
+# StepModel convierte ángulos en pasos para un motor (pasos por vuelta,
+# reducción y paso completo o medio paso) y da la tabla de fases de sus
+# bobinas; todos los backends 8086 (.COM dinámico, ASM dinámico y Proteus)
+# cuentan los pasos con DEFAULT_STEP_MODELS salvo que reciban otros modelos.
+#
+# interleaved_ticks() reparte los pasos de varios motores en ticks con
+# interpolación de Bresenham: el motor con más pasos avanza en cada tick y
+# los demás distribuyen sus pasos a lo largo del mismo ciclo, de modo que
+# todos arrancan y llegan juntos. Un movimiento de tres ejes dura lo que su
+# eje más largo en lugar de la suma de los tres.
+#
+#   pasos {'base': 4, 'hombro': 2, 'codo': 1}
+#   tick 1: base, hombro    tick 2: base, codo
+#   tick 3: base, hombro    tick 4: base
+#
+# interleaved_ticks() es el modelo de referencia del reparto: el .COM no lo
+# llama, sino que hace la misma cuenta en ejecución con un error de
+# Bresenham por motor, y las pruebas comparan los pasos emitidos contra él.
+
+def interleaved_ticks(steps):
+    """Motores que avanzan en cada tick (listas en el orden de `steps`).
+
+    `steps` es motor -> cantidad de pasos. Hay tantos ticks como pasos tiene
+    el motor más largo y cada motor avanza exactamente su cantidad de pasos;
+    los motores sin pasos no aparecen.
+    """
+    major = max(steps.values(), default=0)
+    # El error arranca en la mitad: los pasos de los motores cortos quedan
+    # centrados en lugar de acumularse al final
+    error = dict.fromkeys(steps, major // 2)
+    for _ in range(major):
+        tick = []
+        for motor, count in steps.items():
+            error[motor] += count
+            if error[motor] >= major:
+                error[motor] -= major
+                tick.append(motor)
+        yield tick
+
+# Fases de las bobinas (bits 0-3 del puerto del 8255) en el sentido de avance
+FULL_STEP_PHASES = (0x09, 0x0C, 0x06, 0x03)
+HALF_STEP_PHASES = (0x09, 0x08, 0x0C, 0x04, 0x06, 0x02, 0x03, 0x01)
+
+class StepModel:
+    """Pasos de un motor: `steps_per_revolution` del motor, `gear_ratio`
+    vueltas del motor por vuelta del eje y `half_step` para medio paso
+    (el doble de pasos por vuelta)"""
+    __slots__ = ('steps_per_revolution', 'gear_ratio', 'half_step')
+
+    def __init__(self, steps_per_revolution=200, gear_ratio=1, half_step=False):
+        if steps_per_revolution <= 0 or gear_ratio <= 0:
+            raise ValueError(f"Modelo de pasos inválido: {steps_per_revolution} pasos por vuelta, "
+                             f"reducción {gear_ratio}")
+        self.steps_per_revolution = steps_per_revolution
+        self.gear_ratio = gear_ratio
+        self.half_step = half_step
+
+    @property
+    def steps_per_degree(self):
+        """Pasos por grado del eje"""
+        return self.steps_per_revolution * self.gear_ratio * (2 if self.half_step else 1) / 360
+
+    @property
+    def phases(self):
+        """Fases de las bobinas en el sentido de avance"""
+        return HALF_STEP_PHASES if self.half_step else FULL_STEP_PHASES
+
+    def position(self, degrees):
+        """Paso absoluto más cercano al ángulo `degrees` (desde 0°)"""
+        return round(degrees * self.steps_per_degree)
+
+    def steps(self, start, end):
+        """Pasos con signo para ir de `start` a `end` grados.
+
+        Se cuentan entre posiciones absolutas: una secuencia de movimientos
+        no acumula error de redondeo.
+        """
+        return self.position(end) - self.position(start)
+
+    def __repr__(self):
+        return f"StepModel({self.steps_per_revolution}, {self.gear_ratio}, half_step={self.half_step})"
+
+# Motores de los backends 8086: 200 pasos por vuelta (1,8° por paso) sin reducción
+DEFAULT_STEP_MODELS = {
+    'base': StepModel(),
+    'hombro': StepModel(),
+    'codo': StepModel(),
+}
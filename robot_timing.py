@@ -0,0 +1,90 @@
+# Demoras calibradas del código 8086 generado
+#
+# El .COM tiene una sola subrutina DELAY que recibe una cuenta de 32 bits en
+# DX:AX y gira un LOOP sobre sí mismo esa cantidad de veces (CX se conserva):
+#
+#   DELAY:  PUSH CX              alto:   OR   DX, DX
+#           MOV  CX, AX                  JZ   fin
+#           JCXZ alto                    DEC  DX
+#   bajo:   LOOP bajo                    JMP  bajo       ; CX = 0: 65536 vueltas
+#                                fin:    POP  CX
+#                                        RET
+#
+# DelayTiming convierte segundos en cuentas con la tabla de ciclos del
+# procesador (CYCLE_TABLES) y su reloj, descontando lo que cuestan la
+# llamada (MOV AX, MOV DX, CALL) y la subrutina. La demora obtenida queda a
+# menos de `tolerance` segundos de la pedida siempre que la pedida no sea
+# menor que la mínima (`seconds(1)`); los ciclos de las instrucciones que
+# rodean a la demora (pasos, OUT) no se cuentan.
+
+# Ciclos de reloj por instrucción según las hojas de datos de Intel. El 8088
+# tarda 4 ciclos más por cada palabra que mueve por su bus de 8 bits (pila
+# en CALL, RET, PUSH y POP); la cola de instrucciones no se modela.
+CYCLE_TABLES = {
+    '8086': {
+        'mov_reg_imm': 4, 'mov_reg_reg': 2, 'call': 19, 'ret': 16, 'push': 11, 'pop': 8,
+        'jcxz': 6, 'jcxz_taken': 18, 'loop': 5, 'loop_taken': 17, 'or_reg': 3,
+        'jcc': 4, 'jcc_taken': 16, 'dec_reg': 2, 'jmp_short': 15,
+    },
+    '8088': {
+        'mov_reg_imm': 4, 'mov_reg_reg': 2, 'call': 23, 'ret': 20, 'push': 15, 'pop': 12,
+        'jcxz': 6, 'jcxz_taken': 18, 'loop': 5, 'loop_taken': 17, 'or_reg': 3,
+        'jcc': 4, 'jcc_taken': 16, 'dec_reg': 2, 'jmp_short': 15,
+    },
+}
+
+# Reloj supuesto por los generadores (el mismo de las demoras anteriores)
+DEFAULT_CLOCK_HZ = 3_000_000
+
+# Cuenta máxima de DX:AX
+MAX_DELAY_COUNT = 0xFFFFFFFF
+
+class DelayTiming:
+    """Ciclos de la subrutina DELAY en un `cpu` de CYCLE_TABLES a `clock_hz` Hz"""
+    __slots__ = ('cpu', 'clock_hz', 'cycles')
+
+    def __init__(self, cpu='8086', clock_hz=DEFAULT_CLOCK_HZ):
+        if cpu not in CYCLE_TABLES:
+            raise ValueError(f"Procesador desconocido: {cpu} (se conocen {', '.join(CYCLE_TABLES)})")
+        if clock_hz <= 0:
+            raise ValueError(f"Reloj inválido: {clock_hz} Hz")
+        self.cpu = cpu
+        self.clock_hz = clock_hz
+        self.cycles = CYCLE_TABLES[cpu]
+
+    def cycles_for(self, count):
+        """Ciclos de reloj de una demora de `count` vueltas, con la llamada"""
+        c = self.cycles
+        high, low = divmod(count, 0x10000)
+        total = 2 * c['mov_reg_imm'] + c['call'] + c['push'] + c['mov_reg_reg']
+        if low:
+            total += c['jcxz'] + (low - 1) * c['loop_taken'] + c['loop']
+        else:
+            total += c['jcxz_taken']
+        # Cada palabra alta: una vuelta más del LOOP con CX = 0
+        chunk = c['or_reg'] + c['jcc'] + c['dec_reg'] + c['jmp_short'] + 0xFFFF * c['loop_taken'] + c['loop']
+        total += high * chunk
+        return total + c['or_reg'] + c['jcc_taken'] + c['pop'] + c['ret']
+
+    def seconds(self, count):
+        """Segundos que dura una demora de `count` vueltas"""
+        return self.cycles_for(count) / self.clock_hz
+
+    def count(self, seconds):
+        """Cuenta para DX:AX cuya demora más se acerca a `seconds`"""
+        target = seconds * self.clock_hz
+        # Costo medio de una vuelta, con la parte de la palabra alta
+        per_count = (self.cycles_for(0x20000) - self.cycles_for(0x10000)) / 0x10000
+        estimate = int((target - self.cycles_for(1)) / per_count) + 1
+        candidates = [n for n in range(estimate - 2, estimate + 3) if 1 <= n <= MAX_DELAY_COUNT]
+        if not candidates:
+            return 1 if estimate < 1 else MAX_DELAY_COUNT
+        return min(candidates, key=lambda n: abs(self.cycles_for(n) - target))
+
+    @property
+    def tolerance(self):
+        """Error máximo en segundos de count(): dos vueltas del LOOP"""
+        return 2 * self.cycles['loop_taken'] / self.clock_hz
+
+    def __repr__(self):
+        return f"DelayTiming({self.cpu!r}, {self.clock_hz})"
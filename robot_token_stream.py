@@ -0,0 +1,175 @@
+# Flujo compacto de tokens para el Lenguaje de Brazo Robótico
+from array import array
+from sys import intern
+
+from robot_tokens import TOKEN_PATTERNS, KEYWORD_IDS
+
+# Tipos de token por identificador numérico (KEYWORD no tiene patrón propio:
+# el escáner lo asigna a los identificadores que son palabras clave)
+TOKEN_TYPE_NAMES = ['KEYWORD'] + [name for name, _ in TOKEN_PATTERNS]
+TOKEN_TYPE_IDS = {name: index for index, name in enumerate(TOKEN_TYPE_NAMES)}
+
+# Tipos cuyo texto se interna: los nombres de robot y componentes se repiten
+# en cada sentencia y terminan guardados en la tabla de símbolos
+_INTERNED_KINDS = frozenset((TOKEN_TYPE_IDS['KEYWORD'], TOKEN_TYPE_IDS['IDENTIFIER']))
+
+# Valor de `numbers` para los tokens que no son literales numéricos
+NO_NUMBER = float('nan')
+
+class Token:
+    """Clase para representar un token del lenguaje robótico"""
+    __slots__ = ('type', 'value', 'line', 'column', 'number')
+    
+    def __init__(self, type_, value, line, column, number=None):
+        self.type = type_
+        self.value = value
+        self.line = line
+        self.column = column
+        self.number = number   # Valor numérico ya convertido (solo literales numéricos)
+    
+    def __str__(self):
+        return f"Token({self.type}, '{self.value}', {self.line}:{self.column})"
+    
+    def __repr__(self):
+        return self.__str__()
+
+class TokenStream:
+    """Secuencia de tokens almacenada en arreglos empaquetados.
+
+    Cada token ocupa una posición en los arreglos `kinds` (identificador de
+    tipo), `starts`/`ends` (desplazamientos en `source`), `lines`, `columns`,
+    `numbers` (valor ya convertido de los literales numéricos, NaN en el
+    resto) y `keywords` (identificador de KEYWORD_IDS, 0 si no es palabra
+    clave). El texto de un token no se copia: se obtiene de `source` cuando
+    se pide con text().
+
+    Para el código que todavía espera objetos Token, la secuencia se puede
+    indexar, recortar e iterar; cada acceso construye el Token equivalente.
+    """
+    __slots__ = ('source', 'kinds', 'starts', 'ends', 'lines', 'columns', 'numbers', 'keywords',
+                 '_cached_index', '_cached_token')
+
+    def __init__(self, source=''):
+        self.source = source
+        self.kinds = array('B')
+        self.starts = array('I')
+        self.ends = array('I')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.numbers = array('d')
+        self.keywords = array('B')
+        self._cached_index = -1
+        self._cached_token = None
+
+    def append(self, type_id, start, end, line, column, number=NO_NUMBER, keyword=0):
+        """Agrega un token al final de la secuencia"""
+        self.kinds.append(type_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.lines.append(line)
+        self.columns.append(column)
+        self.numbers.append(number)
+        self.keywords.append(keyword)
+
+    def type(self, index):
+        """Nombre del tipo del token `index`"""
+        return TOKEN_TYPE_NAMES[self.kinds[index]]
+
+    def text(self, index):
+        """Texto del token `index`, tomado de la fuente"""
+        text = self.source[self.starts[index]:self.ends[index]]
+        return intern(text) if self.kinds[index] in _INTERNED_KINDS else text
+
+    def number(self, index):
+        """Valor numérico del token `index` (None si no es un literal numérico)"""
+        number = self.numbers[index]
+        return None if number != number else number
+
+    def token(self, index):
+        """Construye el objeto Token equivalente al token `index`"""
+        return Token(TOKEN_TYPE_NAMES[self.kinds[index]], self.text(index),
+                     self.lines[index], self.columns[index], self.number(index))
+
+    def type_counts(self):
+        """Cantidad de tokens por nombre de tipo"""
+        counts = [0] * len(TOKEN_TYPE_NAMES)
+        for kind in self.kinds:
+            counts[kind] += 1
+        return {TOKEN_TYPE_NAMES[kind]: count for kind, count in enumerate(counts) if count}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def __bool__(self):
+        return len(self.kinds) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.token(i) for i in range(*index.indices(len(self.kinds)))]
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("índice de token fuera de rango")
+        # El parser consulta el mismo token varias veces seguidas (peek/consume)
+        if index != self._cached_index:
+            self._cached_token = self.token(index)
+            self._cached_index = index
+        return self._cached_token
+
+    def __iter__(self):
+        """Iterador de compatibilidad que produce objetos Token"""
+        for index in range(len(self.kinds)):
+            yield self.token(index)
+
+    def __repr__(self):
+        return f"TokenStream({len(self.kinds)} tokens)"
+
+class TokenColumns:
+    """Vista por columnas de una secuencia de objetos Token.
+
+    Expone `kinds`, `keywords`, `numbers`, `lines` y text() igual que
+    TokenStream, de modo que RobotParser puede leer una lista de Token (o la
+    ventana perezosa de robot_incremental). Cada columna convierte el Token
+    al consultarlo.
+    """
+    __slots__ = ('tokens', 'kinds', 'keywords', 'numbers', 'lines')
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.kinds = _TokenColumn(tokens, _kind_of)
+        self.keywords = _TokenColumn(tokens, _keyword_of)
+        self.numbers = _TokenColumn(tokens, _number_of)
+        self.lines = _TokenColumn(tokens, _line_of)
+
+    def text(self, index):
+        """Texto del token `index`"""
+        return self.tokens[index].value
+
+    def __len__(self):
+        return len(self.tokens)
+
+class _TokenColumn:
+    """Un campo de cada Token de una secuencia, indexable como un arreglo"""
+    __slots__ = ('tokens', 'field')
+
+    def __init__(self, tokens, field):
+        self.tokens = tokens
+        self.field = field
+
+    def __getitem__(self, index):
+        return self.field(self.tokens[index])
+
+    def __len__(self):
+        return len(self.tokens)
+
+def _kind_of(token):
+    return TOKEN_TYPE_IDS[token.type]
+
+def _keyword_of(token):
+    return KEYWORD_IDS.get(token.value.lower(), 0) if token.type == 'KEYWORD' else 0
+
+def _number_of(token):
+    return NO_NUMBER if token.number is None else token.number
+
+def _line_of(token):
+    return token.line
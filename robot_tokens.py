@@ -1,5 +1,6 @@
 # Definición de tokens para Lenguaje de Brazo Robótico
 import re
+from sys import intern
 
 # Palabras clave del lenguaje robótico
 ROBOT_KEYWORDS = {
@@ -119,3 +120,72 @@ LANGUAGE_INFO = {
         'fin - Marcar fin de secuencia'
     ]
 }
+
+# Comandos de movimiento de la sintaxis antigua (se rastrean en commands_used)
+MOVEMENT_COMMANDS = {'girai', 'giraf', 'abre', 'cierra', 'mueve'}
+
+# Clases de palabra clave para la tabla de clasificación
+KEYWORD_PLAIN = 1
+KEYWORD_COMPONENT = 2
+KEYWORD_COMMAND = 3
+
+def _build_keyword_lookup():
+    """Construye la tabla {texto: (clase, forma_minuscula)} para identificadores.
+
+    Se indexa por la forma en minúsculas y además por las variantes de
+    mayúsculas más frecuentes, de modo que el caso común se resuelve con una
+    sola consulta al diccionario sin llamar a .lower().
+    """
+    lookup = {}
+    for keyword in ROBOT_KEYWORDS:
+        lower = keyword.lower()
+        if lower in VALID_COMPONENTS:
+            kind = KEYWORD_COMPONENT
+        elif lower in MOVEMENT_COMMANDS:
+            kind = KEYWORD_COMMAND
+        else:
+            kind = KEYWORD_PLAIN
+        for variant in (keyword, lower, lower.upper(), lower.capitalize()):
+            lookup[variant] = (kind, lower)
+    return lookup
+
+# Tabla precalculada de palabras clave (ver get_token_type)
+KEYWORD_LOOKUP = _build_keyword_lookup()
+
+# Identificador numérico de cada palabra clave (forma en minúsculas) que el
+# escáner guarda junto a los tokens KEYWORD; 0 indica que no es palabra clave
+KEYWORD_NAMES = [''] + sorted({intern(keyword.lower()) for keyword in ROBOT_KEYWORDS})
+KEYWORD_IDS = {name: index for index, name in enumerate(KEYWORD_NAMES) if index}
+
+# Orden de prueba de los patrones en TOKEN_REGEX. Solo cambia el orden entre
+# patrones que nunca compiten por el mismo primer caracter, por lo que produce
+# exactamente los mismos tokens que TOKEN_PATTERNS; los más frecuentes van primero.
+SCAN_ORDER = [
+    'BOOLEAN_LITERAL', 'IDENTIFIER', 'NEWLINE', 'DOT',
+    'COMPARISON_OP', 'ASSIGN_OP',
+    'FLOAT_LITERAL', 'INTEGER_LITERAL',
+    'COMMENT_MULTI', 'COMMENT_SINGLE', 'COMMENT_HASH',
+    'ARITHMETIC_OP', 'LOGICAL_OP',
+    'LBRACE', 'RBRACE', 'LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
+    'SEMICOLON', 'COMMA', 'COLON',
+    'WHITESPACE', 'UNKNOWN'
+]
+
+def _build_token_regex():
+    """Compila la expresión regular combinada del escáner.
+
+    El prefijo [ \\t]* absorbe los espacios antes de cada token, así que los
+    espacios no generan un match propio (la columna se obtiene con match.start
+    del grupo). WHITESPACE solo coincide con espacios al final del texto.
+    """
+    patterns = dict(TOKEN_PATTERNS)
+    alternatives = '|'.join(f'(?P<{name}>{patterns[name]})' for name in SCAN_ORDER)
+    return re.compile(f'[ \\t]*(?:{alternatives})', re.IGNORECASE)
+
+# Expresión regular combinada, compilada una sola vez al importar el módulo
+TOKEN_REGEX = _build_token_regex()
+
+# Tipo de token por índice de grupo (match.lastindex) de TOKEN_REGEX
+TOKEN_GROUP_TYPES = [None] * (TOKEN_REGEX.groups + 1)
+for _name, _index in TOKEN_REGEX.groupindex.items():
+    TOKEN_GROUP_TYPES[_index] = _name
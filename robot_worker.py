@@ -0,0 +1,190 @@
+# Ejecución en segundo plano de los análisis y compilaciones de la interfaz
+#
+# Los trabajos corren en un ThreadPoolExecutor y sus eventos (avance,
+# resultado, error o cancelación) se dejan en una cola que el hilo de Tk
+# vacía con root.after: los callbacks siempre se llaman en el hilo de la
+# interfaz, así que pueden tocar widgets, y el trabajo nunca los toca.
+#
+# Cada trabajo puede tener una clave; enviar otro con la misma clave cancela
+# el anterior, que ya no entrega eventos. Un trabajo cancelado se detiene la
+# próxima vez que informa su avance (job.progress lanza JobCancelled); un
+# proceso externo que ya está corriendo (DOSBox) termina solo, pero su
+# resultado se descarta.
+import itertools
+import queue
+import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Cada cuánto la interfaz revisa la cola de eventos
+POLL_INTERVAL_MS = 50
+
+# Tipos de evento de la cola
+_PROGRESS, _DONE, _ERROR, _CANCELLED = range(4)
+
+class JobCancelled(Exception):
+    """El trabajo fue cancelado (lo lanzan Job.progress y Job.check_cancelled)"""
+
+class Job:
+    """Trabajo enviado a BackgroundWorker.
+
+    La función del trabajo recibe el Job como primer argumento y lo usa para
+    informar su avance: job.progress("Compilando...", 0.4).
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, worker, name, key, on_done, on_error, on_progress, on_cancel):
+        self.id = next(self._ids)
+        self.name = name
+        self.key = key
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.message = ''      # último avance informado
+        self.fraction = None   # 0.0 a 1.0 (None si la etapa no tiene avance medible)
+        self.finished = False  # ya se entregó su resultado (en el hilo de la interfaz)
+        self._worker = worker
+        self._cancelled = threading.Event()
+        self._future = None
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Cancela el trabajo: sus eventos pendientes se descartan"""
+        self._cancelled.set()
+
+    def check_cancelled(self):
+        """Lanza JobCancelled si el trabajo fue cancelado"""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.name)
+
+    def progress(self, message, fraction=None):
+        """Informa el avance del trabajo (se llama desde el hilo del trabajo)"""
+        self.check_cancelled()
+        self._worker._events.put((self, _PROGRESS, (message, fraction)))
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.name!r})"
+
+class BackgroundWorker:
+    """Ejecuta trabajos fuera del hilo de la interfaz y entrega sus eventos con poll().
+
+    Con un solo hilo (por defecto) los trabajos se ejecutan de a uno y en
+    orden, así nunca usan a la vez el mismo análisis del caché.
+    """
+
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lexic-worker')
+        self._events = queue.Queue()
+        self._keyed = {}    # clave -> último trabajo enviado con esa clave
+        self._jobs = set()  # trabajos cuyo resultado no se entregó
+        self._root = None
+        self._after_id = None
+        self._interval = POLL_INTERVAL_MS
+
+    def submit(self, function, *args, name=None, key=None, on_done=None, on_error=None,
+               on_progress=None, on_cancel=None):
+        """Ejecuta function(job, *args) en segundo plano y retorna el Job.
+
+        on_done(resultado), on_error(excepción), on_progress(mensaje, fracción)
+        y on_cancel() se llaman en el hilo que ejecuta poll().
+        """
+        job = Job(self, name or getattr(function, '__name__', 'trabajo'), key,
+                  on_done, on_error, on_progress, on_cancel)
+        if key is not None:
+            previous = self._keyed.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._keyed[key] = job
+        self._jobs.add(job)
+        job._future = self._executor.submit(self._run, job, function, args)
+        return job
+
+    def _run(self, job, function, args):
+        try:
+            job.check_cancelled()
+            result = function(job, *args)
+        except JobCancelled:
+            self._events.put((job, _CANCELLED, None))
+        except Exception as e:
+            self._events.put((job, _ERROR, e))
+        else:
+            self._events.put((job, _DONE, result))
+
+    def poll(self):
+        """Entrega los eventos pendientes en el hilo que llama; retorna cuántos había"""
+        count = 0
+        while True:
+            try:
+                job, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            if kind == _PROGRESS:
+                job.message, job.fraction = payload
+                if not job.cancelled and job.on_progress:
+                    job.on_progress(*payload)
+                continue
+            self._finish(job)
+            if job.cancelled or kind == _CANCELLED:
+                if job.on_cancel:
+                    job.on_cancel()
+            elif kind == _ERROR:
+                if job.on_error:
+                    job.on_error(payload)
+                else:
+                    traceback.print_exception(type(payload), payload, payload.__traceback__)
+            elif job.on_done:
+                job.on_done(payload)
+
+    def _finish(self, job):
+        job.finished = True
+        self._jobs.discard(job)
+        if job.key is not None and self._keyed.get(job.key) is job:
+            del self._keyed[job.key]
+
+    @property
+    def busy(self):
+        """True si hay trabajos sin terminar"""
+        return bool(self._jobs)
+
+    def running(self, key):
+        """Trabajo en curso con la clave `key` (None si no hay)"""
+        return self._keyed.get(key)
+
+    def cancel(self, key=None):
+        """Cancela el trabajo con la clave `key`, o todos si no se indica"""
+        jobs = list(self._jobs) if key is None else [self._keyed[key]] if key in self._keyed else []
+        for job in jobs:
+            job.cancel()
+
+    def wait(self, timeout=None):
+        """Espera a que terminen los trabajos enviados y entrega sus eventos"""
+        wait([job._future for job in list(self._jobs)], timeout)
+        return self.poll()
+
+    def attach(self, root, interval_ms=POLL_INTERVAL_MS):
+        """Revisa la cola cada `interval_ms` con root.after (en el hilo de Tk)"""
+        self._root = root
+        self._interval = interval_ms
+        self._after_id = root.after(interval_ms, self._tick)
+
+    def _tick(self):
+        # Se reprograma antes de entregar: un callback con error no detiene la revisión
+        self._after_id = self._root.after(self._interval, self._tick)
+        self.poll()
+
+    def shutdown(self, wait=False):
+        """Cancela los trabajos pendientes y detiene los hilos"""
+        self.cancel()
+        if self._root is not None and self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+        self._executor.shutdown(wait=wait, cancel_futures=True)
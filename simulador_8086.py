@@ -0,0 +1,138 @@
+# Simulador del subconjunto de 8086 que emite el generador .COM dinámico
+#
+# Lo usan las pruebas del .COM (test_ciclos, test_pasos_intercalados y
+# test_demoras) para ejecutar el programa generado sin DOS ni hardware:
+#
+#   salidas, demoras = ejecutar_com(codigo)
+#
+# `salidas` son las escrituras a puertos como (demora acumulada, puerto,
+# valor), donde la demora acumulada es la suma de las cuentas DX:AX de las
+# llamadas a DELAY anteriores; `demoras` tiene (cuenta, ciclos) de cada
+# llamada. Por defecto las llamadas a DELAY se saltean (una espera de
+# segundos son millones de vueltas del LOOP); con llamar_demoras=True se
+# ejecuta la subrutina.
+#
+# Con una tabla de ciclos (robot_timing.CYCLE_TABLES) se suman los ciclos de
+# cada instrucción que tiene entrada en la tabla; los de cada llamada a
+# DELAY van desde el MOV AX / MOV DX que la preceden hasta su RET. Sin tabla
+# los ciclos quedan en None.
+
+# Programa cargado en 100h, como un .COM
+ORIGEN = 0x100
+
+# Instrucciones ejecutadas como máximo: un programa que no llega antes al
+# INT 21h se da por colgado
+MAX_PASOS = 1_000_000
+
+def _rel16(valor):
+    return valor - 0x10000 if valor > 0x7FFF else valor
+
+def ejecutar_com(codigo, tabla=None, llamar_demoras=False, max_pasos=MAX_PASOS):
+    """Ejecuta `codigo` hasta el INT 21h de salida y retorna (salidas, demoras)"""
+    memoria = bytearray(ORIGEN) + bytearray(codigo) + bytearray(4)
+    ip, ax, bx, cx, dx, si = ORIGEN, 0, 0, 0, 0, 0
+    zf = cf = False
+    pila, salidas, demoras = [], [], []
+    demora = ciclos = 0
+    en_curso = None  # (cuenta, ciclos al empezar) de la llamada a DELAY que se está ejecutando
+    for _ in range(max_pasos):
+        op = memoria[ip]
+        imm16 = memoria[ip + 1] | memoria[ip + 2] << 8
+        rel8 = memoria[ip + 1] - 256 if memoria[ip + 1] > 127 else memoria[ip + 1]
+        costo = None
+        if op == 0xB8:      # MOV AX, imm16
+            ax, ip, costo = imm16, ip + 3, 'mov_reg_imm'
+        elif op == 0xBA:    # MOV DX, imm16
+            dx, ip, costo = imm16, ip + 3, 'mov_reg_imm'
+        elif op == 0xBB:    # MOV BX, imm16
+            bx, ip, costo = imm16, ip + 3, 'mov_reg_imm'
+        elif op == 0xB9:    # MOV CX, imm16
+            cx, ip, costo = imm16, ip + 3, 'mov_reg_imm'
+        elif op == 0xBE:    # MOV SI, imm16
+            si, ip, costo = imm16, ip + 3, 'mov_reg_imm'
+        elif op == 0xB0:    # MOV AL, imm8
+            ax, ip = ax & 0xFF00 | memoria[ip + 1], ip + 2
+        elif op == 0x8B:    # MOV CX, AX
+            cx, ip, costo = ax, ip + 2, 'mov_reg_reg'
+        elif op == 0xA0:    # MOV AL, [dir]
+            ax, ip = ax & 0xFF00 | memoria[imm16], ip + 3
+        elif op == 0xA2:    # MOV [dir], AL
+            memoria[imm16], ip = ax & 0xFF, ip + 3
+        elif op == 0xFE:    # INC AL / DEC AL
+            al = (ax + (1 if memoria[ip + 1] == 0xC0 else -1)) & 0xFF
+            ax, ip = ax & 0xFF00 | al, ip + 2
+        elif op == 0x24:    # AND AL, imm8
+            ax, ip = ax & (0xFF00 | memoria[ip + 1]), ip + 2
+        elif op == 0xD7:    # XLAT
+            ax, ip = ax & 0xFF00 | memoria[bx + (ax & 0xFF)], ip + 1
+        elif op == 0xEE:    # OUT DX, AL
+            salidas.append((demora, dx, ax & 0xFF))
+            ip += 1
+        elif op in (0xC7, 0x81):    # MOV / ADD / CMP / SUB WORD [dir], imm16
+            direccion = memoria[ip + 2] | memoria[ip + 3] << 8
+            valor = memoria[ip + 4] | memoria[ip + 5] << 8
+            actual = memoria[direccion] | memoria[direccion + 1] << 8
+            operacion = 'mov' if op == 0xC7 else {0x06: 'add', 0x3E: 'cmp', 0x2E: 'sub'}[memoria[ip + 1]]
+            if operacion == 'cmp':
+                cf = actual < valor
+            else:
+                actual = {'mov': valor, 'add': actual + valor, 'sub': actual - valor}[operacion] & 0xFFFF
+                memoria[direccion:direccion + 2] = bytes([actual & 0xFF, actual >> 8])
+            ip += 6
+        elif op == 0x0B:    # OR DX, DX
+            zf, ip, costo = dx == 0, ip + 2, 'or_reg'
+        elif op == 0x49:    # DEC CX
+            cx = (cx - 1) & 0xFFFF
+            zf, ip, costo = cx == 0, ip + 1, 'dec_reg'
+        elif op == 0x4A:    # DEC DX
+            dx = (dx - 1) & 0xFFFF
+            zf, ip, costo = dx == 0, ip + 1, 'dec_reg'
+        elif op == 0x4E:    # DEC SI
+            si = (si - 1) & 0xFFFF
+            zf, ip, costo = si == 0, ip + 1, 'dec_reg'
+        elif op == 0x51:    # PUSH CX
+            pila.append(cx)
+            ip, costo = ip + 1, 'push'
+        elif op == 0x59:    # POP CX
+            cx, ip, costo = pila.pop(), ip + 1, 'pop'
+        elif op == 0x56:    # PUSH SI
+            pila.append(si)
+            ip, costo = ip + 1, 'push'
+        elif op == 0x5E:    # POP SI
+            si, ip, costo = pila.pop(), ip + 1, 'pop'
+        elif op == 0xEB:    # JMP SHORT
+            ip, costo = ip + 2 + rel8, 'jmp_short'
+        elif op == 0xE9:    # JMP NEAR
+            ip += 3 + _rel16(imm16)
+        elif op in (0x74, 0x75, 0x72, 0x73):    # JZ / JNZ / JB / JAE
+            tomado = zf == (op == 0x74) if op in (0x74, 0x75) else cf == (op == 0x72)
+            ip, costo = (ip + 2 + rel8, 'jcc_taken') if tomado else (ip + 2, 'jcc')
+        elif op == 0xE2:    # LOOP
+            cx = (cx - 1) & 0xFFFF
+            ip, costo = (ip + 2 + rel8, 'loop_taken') if cx else (ip + 2, 'loop')
+        elif op == 0xE3:    # JCXZ
+            ip, costo = (ip + 2 + rel8, 'jcxz_taken') if cx == 0 else (ip + 2, 'jcxz')
+        elif op == 0xE8:    # CALL DELAY
+            cuenta = dx << 16 | ax
+            demora += cuenta
+            if llamar_demoras:
+                pila.append(ip + 3)
+                # Los ciclos de la llamada incluyen el MOV AX y el MOV DX anteriores
+                en_curso = (cuenta, ciclos - 2 * tabla['mov_reg_imm'] if tabla else None)
+                ip, costo = ip + 3 + _rel16(imm16), 'call'
+            else:
+                demoras.append((cuenta, None))
+                ip += 3
+        elif op == 0xC3:    # RET
+            ip, costo = pila.pop(), 'ret'
+        elif op == 0xCD:    # INT 21h: salida a DOS
+            return salidas, demoras
+        else:
+            raise AssertionError(f"Instrucción no simulada {op:#04x} en {ip - ORIGEN}")
+        if tabla and costo in tabla:
+            ciclos += tabla[costo]
+        if op == 0xC3 and en_curso is not None:
+            cuenta, inicio = en_curso
+            demoras.append((cuenta, None if inicio is None else ciclos - inicio))
+            en_curso = None
+    raise AssertionError("El programa no terminó")
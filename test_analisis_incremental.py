@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que la sesión de análisis incremental
+produce el mismo resultado que un análisis completo después de cada edición
+"""
+
+import random
+import time
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_incremental import IncrementalAnalyzer
+from benchmark_lexer import generate_program
+
+FRAGMENTOS = [
+    "Robot r1", "Robot r2", "r1.base = 45", "r1.hombro = -30.5", "r2.codo = 20",
+    "r1.garra = 900", "r1.espera = 1.5", "r3.base = 10", "r1.base = 180", "r1.base = 400",
+    "/* abre", "cierra */ r1.base = 3", "/* x */ r1.codo = 1", "*/", "/*", "// c */", "# nota /*",
+    "r1.base =", "90 @", "", "r1 .", "codo = 2", "Robot", "r1.espera = 100", "r1.girai = 4",
+]
+
+def resultado(analyzer):
+    """Resumen comparable del análisis"""
+    return {
+        'tokens': [(t.type, t.value, t.line, t.column) for t in analyzer.tokens],
+        'errors': list(analyzer.errors),
+        'warnings': list(analyzer.warnings),
+        'simbolos': [(str(s), s.linea) for s in analyzer.get_tabla_simbolos()],
+        'asignaciones': list(analyzer.parser.assignments),
+        'esperas': list(analyzer.parser.comandos_espera),
+        'robots': list(analyzer.parser.robots),
+        'componentes': sorted(analyzer.components_found),
+        'comandos': sorted(analyzer.commands_used),
+        'sintaxis': analyzer.syntax_valid,
+        'cuadruplos': [str(c) for c in analyzer.get_cuadruplos()] if analyzer.semantic_valid else None,
+    }
+
+def analisis_completo(code):
+    """Resultado de un RobotLexicalAnalyzer nuevo"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(code)
+    return resultado(analyzer)
+
+def test_ediciones_aleatorias():
+    """Ediciones aleatorias (con comentarios /* */ que abren y cierran) contra el análisis completo"""
+    print("=== PRUEBA: EDICIONES ALEATORIAS ===")
+    rnd = random.Random(2024)
+    ediciones = 0
+    for _ in range(60):
+        lines = [rnd.choice(FRAGMENTOS) for _ in range(rnd.randint(0, 20))]
+        session = IncrementalAnalyzer()
+        session.analyze("\n".join(lines))
+        for _ in range(6):
+            start = rnd.randint(0, len(lines))
+            end = rnd.randint(start, min(len(lines), start + 3))
+            nuevas = [rnd.choice(FRAGMENTOS) for _ in range(rnd.randint(0, 3))]
+            lines[start:end] = nuevas
+            session.apply_edit(start + 1, end, nuevas)
+            assert resultado(session) == analisis_completo("\n".join(lines))
+            ediciones += 1
+    print(f"✅ {ediciones} ediciones idénticas al análisis completo")
+
+def test_texto_del_editor():
+    """update() recibe el texto completo y detecta las líneas cambiadas"""
+    print("\n=== PRUEBA: TEXTO COMPLETO DEL EDITOR ===")
+    session = IncrementalAnalyzer()
+    code = "Robot r1\nr1.base = 45\nr1.codo = 20"
+    session.analyze(code)
+    assert not session.errors and session.semantic_valid
+
+    errors = session.update("Robot r1\nr1.base = @\nr1.codo = 20")
+    assert errors == ["Error léxico en línea 2, columna 11: Caracter no reconocido '@'",
+                      "Error en línea 2: Se esperaba valor numérico"]
+
+    session.update("Robot r1\n\n\nr1.base = 45\nr1.codo = 20")
+    assert not session.errors
+    assert [s.linea for s in session.get_tabla_simbolos()] == [1, 4, 5]
+    assert len(session.get_cuadruplos()) == 5
+    print(f"✅ Diagnósticos actualizados: {errors}")
+
+def test_rango_invalido():
+    """Las líneas fuera del código se rechazan"""
+    print("\n=== PRUEBA: RANGO DE LÍNEAS INVÁLIDO ===")
+    session = IncrementalAnalyzer()
+    session.analyze("Robot r1")
+    try:
+        session.apply_edit(3, 3, "r1.base = 1")
+        assert False, "se esperaba IndexError"
+    except IndexError as e:
+        print(f"✅ {e}")
+
+def test_programa_grande():
+    """Editar una línea de un programa de 50k líneas toma milisegundos"""
+    print("\n=== PRUEBA: EDICIÓN EN UN PROGRAMA DE 50000 LÍNEAS ===")
+    code = generate_program(50000)
+    session = IncrementalAnalyzer()
+    start = time.perf_counter()
+    session.analyze(code)
+    carga = time.perf_counter() - start
+
+    start = time.perf_counter()
+    session.apply_edit(25000, 25000, "r1.base = 46")
+    edicion = time.perf_counter() - start
+
+    start = time.perf_counter()
+    session.apply_edit(25000, 24999, "r1.codo = 5")
+    insercion = time.perf_counter() - start
+
+    assert not session.errors
+    assert edicion < 0.25 and insercion < 0.5
+    print(f"✅ Carga: {carga:.2f} s, edición: {edicion * 1000:.1f} ms, inserción: {insercion * 1000:.1f} ms")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ANÁLISIS INCREMENTAL")
+    print("=" * 60)
+    test_ediciones_aleatorias()
+    test_texto_del_editor()
+    test_rango_invalido()
+    test_programa_grande()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el arranque rápido de la interfaz: main.py
+no importa los backends al cargarse y cada generador .mod se crea la
+primera vez que se usa
+"""
+
+import sys
+import subprocess
+
+import main as interfaz
+import benchmark_startup
+
+def test_sin_backends_al_importar():
+    """Importar main.py no carga generadores, caché de artefactos ni pstats"""
+    print("=== PRUEBA: IMPORTS AL ARRANCAR ===")
+    script = ("import sys, main\n"
+              f"cargados = sorted(set(sys.modules) & set({benchmark_startup.LAZY_MODULES!r}))\n"
+              "assert not cargados, cargados\n")
+    resultado = subprocess.run([sys.executable, '-c', script], cwd=benchmark_startup._ROOT,
+                               capture_output=True, text=True)
+    assert resultado.returncode == 0, resultado.stderr
+    print("✅ Ningún backend importado")
+
+def test_generadores_perezosos():
+    """Los generadores se crean al primer uso y después se reutilizan"""
+    print("\n=== PRUEBA: GENERADORES AL PRIMER USO ===")
+    gui = interfaz.LexicalAnalyzerGUI.__new__(interfaz.LexicalAnalyzerGUI)
+    assert 'safe_generator' not in vars(gui)
+    generador = gui.safe_generator
+    assert type(generador).__name__ == 'RoboDKSafeGenerator'
+    assert gui.safe_generator is generador and vars(gui)['safe_generator'] is generador
+    assert gui.mod_generator is not gui.sequential_generator
+    assert type(gui.coordinated_generator).__name__ == 'RoboDKCoordinatedGenerator'
+    print("✅ Un generador por acción, creado al usarla")
+
+def test_parse_importtime():
+    """Lectura de la salida de -X importtime"""
+    print("\n=== PRUEBA: SALIDA DE -X IMPORTTIME ===")
+    salida = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   robot_tokens\n"
+              "import time:      1300 |       1420 | main\n")
+    assert benchmark_startup.parse_importtime(salida) == [('robot_tokens', 120, 120, 1), ('main', 1300, 1420, 0)]
+    print("✅ Módulos, tiempos y profundidad")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ARRANQUE DE LA INTERFAZ")
+    print("=" * 60)
+    test_sin_backends_al_importar()
+    test_generadores_perezosos()
+    test_parse_importtime()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el árbol sintáctico (robot_ast) que produce
+el parser y que los generadores leen el programa desde él
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_incremental import IncrementalAnalyzer
+from robot_ast import RobotDecl, Assignment, Wait, Repeat, Block, Program, build_program
+from robodk_sequential_generator import RoboDKSequentialGenerator
+from robodk_safe_generator import RoboDKSafeGenerator
+from robodk_coordinated_generator import RoboDKCoordinatedGenerator
+from create_dynamic_motor_com_v2 import parse_robot_syntax_complete, extract_motor_values_enhanced
+
+CODIGO = """Robot r1
+r1.velocidad = 2.0      // velocidad decimal
+r1.base = -60           # ángulo negativo
+r1.inicio
+  r1.repetir = 3
+  r1.codo = 45.5
+  r1.espera = 1.5
+r1.fin
+r1.garra = 20
+Robot r2
+r2.base = 10"""
+
+def test_arbol():
+    """Declaraciones, asignaciones, esperas y bloques con repeticiones"""
+    print("=== PRUEBA: ÁRBOL SINTÁCTICO ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(CODIGO)
+    program = analyzer.get_program()
+    assert program == Program(
+        robots=[RobotDecl('r1', 1), RobotDecl('r2', 10)],
+        body=[RobotDecl('r1', 1),
+              Assignment('r1', 'velocidad', 2.0, 2),
+              Assignment('r1', 'base', -60.0, 3),
+              Block('r1', 4, [Repeat('r1', 3, 5), Assignment('r1', 'codo', 45.5, 6), Wait('r1', 1.5, 7)], 8),
+              Assignment('r1', 'garra', 20.0, 9),
+              RobotDecl('r2', 10),
+              Assignment('r2', 'base', 10.0, 11)])
+    assert program.robot_name == 'r1' and program.body[3].repeat == 3 and program.repeat == 1
+    assert [node.line for node in program.walk('r1')] == [1, 2, 3, 5, 6, 7, 9]
+    assert build_program([]) == Program()
+    print(f"✅ {len(list(program.walk()))} elementos, bloque con {program.body[3].repeat} repeticiones")
+
+def test_sesion_incremental():
+    """La sesión del editor produce el mismo árbol tras editar líneas"""
+    print("\n=== PRUEBA: ÁRBOL EN LA SESIÓN INCREMENTAL ===")
+    session = IncrementalAnalyzer()
+    session.analyze("Robot r1\nr1.base = 5\n" + CODIGO)
+    session.analyze(CODIGO)
+    completo = RobotLexicalAnalyzer()
+    completo.analyze(CODIGO)
+    assert session.get_program() == completo.get_program()
+    print("✅ Árbol idéntico al análisis completo")
+
+def test_generadores():
+    """Los generadores .mod y .COM toman los mismos valores del árbol"""
+    print("\n=== PRUEBA: GENERADORES DESDE EL ÁRBOL ===")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        try:
+            secuencial = RoboDKSequentialGenerator()
+            assert secuencial.generate_mod_file(CODIGO, "seq.mod")[0]
+            seguro = RoboDKSafeGenerator()
+            assert seguro.generate_mod_file(CODIGO, "safe.mod")[0]
+            coordinado = RoboDKCoordinatedGenerator()
+            assert coordinado.generate_mod_file(CODIGO, "coord.mod")[0]
+        finally:
+            os.chdir(cwd)
+        valores = parse_robot_syntax_complete(CODIGO)
+        sesion = IncrementalAnalyzer()
+        sesion.analyze(CODIGO)
+        assert extract_motor_values_enhanced(sesion) == valores
+
+    movimientos = [m['to'] for m in secuencial.movement_sequence if m['type'] == 'move']
+    assert movimientos == [{'base': -60.0}, {'codo': 45.5}, {'garra': 20.0}]
+    assert {'type': 'wait', 'time': 1.5} in secuencial.movement_sequence
+    # El generador seguro no repite el bloque: base y codo llegan juntos antes de la espera
+    assert [m['to'] for m in seguro.movement_sequence if m['type'] == 'move'] == \
+           [{'base': -60.0, 'codo': 45}, {'garra': 20.0}]
+    assert [p['wait_time'] for p in coordinado.sequence_positions] == [1.5]
+    # La repetición del bloque es un comando con su cuerpo, no un ciclo de todo el programa
+    assert valores == {'movimientos': [{'tipo': 'pose', 'valor': {'base': -60}, 'velocidad': 2.0, 'espera': 0},
+                                       {'tipo': 'repetir', 'valor': 3,
+                                        'movimientos': [{'tipo': 'pose', 'valor': {'codo': 45.5},
+                                                         'velocidad': 2.0, 'espera': 1.5}]},
+                                       {'tipo': 'pose', 'valor': {'base': 10}, 'velocidad': 2.0, 'espera': 0}],
+                       'repeticiones': 1}
+    print(f"✅ {len(secuencial.movement_sequence)} pasos secuenciales, {len(valores['movimientos'])} comandos .COM")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ÁRBOL SINTÁCTICO")
+    print("=" * 60)
+    test_arbol()
+    test_sesion_incremental()
+    test_generadores()
+
+if __name__ == "__main__":
+    main()
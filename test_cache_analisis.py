@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el caché de análisis compartido: aciertos por
+hash del código, descarte LRU, clave por versión del analizador y que los
+generadores de un mismo programa lo analizan una sola vez
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+from unittest import mock
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, ANALYZER_VERSION
+from robot_analysis_cache import AnalysisCache, shared_cache
+from robodk_sequential_generator import RoboDKSequentialGenerator
+from robodk_safe_generator import RoboDKSafeGenerator
+from robodk_coordinated_generator import RoboDKCoordinatedGenerator
+from create_dynamic_motor_com_v2 import parse_robot_syntax_complete
+
+CODIGO = "Robot r1\nr1.velocidad = 2\nr1.base = 45\nr1.espera = 1\nr1.codo = 30"
+
+def test_aciertos_y_opciones():
+    """El mismo código devuelve el mismo análisis; otras opciones no"""
+    print("=== PRUEBA: ACIERTOS DEL CACHÉ ===")
+    cache = AnalysisCache(maxsize=4)
+    analisis = cache.analyze(CODIGO)
+    assert cache.analyze(CODIGO) is analisis and cache.stats()['hits'] == 1
+    assert cache.analyze(CODIGO + "\n") is not analisis
+    limitado = cache.analyze(CODIGO, max_errors=5)
+    assert limitado is not analisis and limitado.max_errors == 5
+    assert CODIGO in cache and len(cache) == 3
+
+    referencia = RobotLexicalAnalyzer()
+    referencia.analyze(CODIGO)
+    assert list(analisis.errors) == list(referencia.errors)
+    assert analisis.get_program() == referencia.get_program()
+    print(f"✅ {cache.stats()}")
+
+def test_descarte_lru():
+    """Con el caché lleno se descarta el análisis usado hace más tiempo"""
+    print("\n=== PRUEBA: DESCARTE LRU ===")
+    cache = AnalysisCache(maxsize=2)
+    a = cache.analyze("Robot a")
+    cache.analyze("Robot b")
+    assert cache.analyze("Robot a") is a
+    cache.analyze("Robot c")
+    assert "Robot a" in cache and "Robot b" not in cache and len(cache) == 2
+
+    cache.maxsize = 1
+    assert len(cache) == 1 and "Robot c" in cache
+    cache.maxsize = 0
+    assert len(cache) == 0 and cache.analyze("Robot a") is not cache.analyze("Robot a")
+    print(f"✅ {cache.stats()}")
+
+def test_version():
+    """Los análisis de otra versión del analizador no se reutilizan"""
+    print("\n=== PRUEBA: VERSIÓN DEL ANALIZADOR ===")
+    cache = AnalysisCache()
+    assert cache.key(CODIGO)[1] == ANALYZER_VERSION
+    anterior = cache.analyze(CODIGO)
+    cache.version = ANALYZER_VERSION + ".x"
+    assert cache.analyze(CODIGO) is not anterior and cache.misses == 2
+    print(f"✅ Versión {ANALYZER_VERSION}")
+
+def test_generadores_comparten_analisis():
+    """Exportar el mismo programa con todos los generadores lo analiza una vez"""
+    print("\n=== PRUEBA: GENERADORES CON EL CACHÉ COMPARTIDO ===")
+    shared_cache.clear()
+    cwd = os.getcwd()
+    with mock.patch.object(RobotLexicalAnalyzer, '_scan', autospec=True,
+                           side_effect=RobotLexicalAnalyzer._scan) as scan:
+        with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+            os.chdir(tmp)
+            try:
+                shared_cache.analyze(CODIGO).get_formatted_output()
+                assert RoboDKSequentialGenerator().generate_mod_file(CODIGO, "seq.mod")[0]
+                assert RoboDKSafeGenerator().generate_mod_file(CODIGO, "safe.mod")[0]
+                assert RoboDKCoordinatedGenerator().generate_mod_file(CODIGO, "coord.mod")[0]
+                assert parse_robot_syntax_complete(CODIGO)['movimientos']
+            finally:
+                os.chdir(cwd)
+    assert scan.call_count == 1
+    assert shared_cache.stats()['misses'] == 1 and shared_cache.stats()['hits'] == 4
+    print(f"✅ {scan.call_count} análisis para 5 acciones")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL CACHÉ DE ANÁLISIS")
+    print("=" * 60)
+    test_aciertos_y_opciones()
+    test_descarte_lru()
+    test_version()
+    test_generadores_comparten_analisis()
+
+if __name__ == "__main__":
+    main()
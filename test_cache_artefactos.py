@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el caché persistente de artefactos: claves
+por código, backend, versión y opciones, aciertos que solo escriben el
+archivo de salida, descarte por tamaño, uso desde los backends .mod y .COM y
+versión del backend .exe atada a la salida de ProteusAssemblyGeneratorFixed
+"""
+
+import io
+import os
+import time
+import hashlib
+import tempfile
+import contextlib
+from unittest import mock
+
+from robot_artifact_cache import ArtifactCache, shared_artifact_cache
+from robot_analysis_cache import shared_cache
+from robot_lexical_analyzer import RobotLexicalAnalyzer, EXE_BACKEND_ID, EXE_BACKEND_VERSION
+from robodk_sequential_generator import RoboDKSequentialGenerator
+import create_dynamic_motor_com_v2
+
+CODIGO = "Robot r1\nr1.velocidad = 2\nr1.base = 45\nr1.espera = 1\nr1.codo = 30"
+
+# SHA-256 del .asm de ProteusAssemblyGeneratorFixed para PROTEUS (sin la
+# línea "; Generado:") en cada EXE_BACKEND_VERSION. Si la salida cambia hay
+# que subir la versión y agregar aquí su huella.
+PROTEUS = "Robot r1\nr1.velocidad = 2\nr1.base = 45\nr1.hombro = -30\nr1.espera = 1\nr1.codo = 30"
+HUELLAS_PROTEUS = {
+    '1': '1b57233a2e98e8abde46a01e288146cf08b4d4f8e7c0d47b61d9381cad524d5d',
+    '2': '594df849c7f674fdbaddf898543167b48f84f6f130b062cc0990eab6e7cf5f68',
+}
+
+def test_claves():
+    """La clave cambia con el código, el backend, la versión y las opciones"""
+    print("=== PRUEBA: CLAVES DE LOS ARTEFACTOS ===")
+    cache = ArtifactCache(directory="no-se-usa")
+    clave = cache.key(CODIGO, 'dynamic-asm', '1', {'program_name': 'a'})
+    assert clave == cache.key(CODIGO.encode('utf-8'), 'dynamic-asm', '1', {'program_name': 'a'})
+    otras = {cache.key(CODIGO + " ", 'dynamic-asm', '1', {'program_name': 'a'}),
+             cache.key(CODIGO, 'robodk-safe', '1', {'program_name': 'a'}),
+             cache.key(CODIGO, 'dynamic-asm', '2', {'program_name': 'a'}),
+             cache.key(CODIGO, 'dynamic-asm', '1', {'program_name': 'b'})}
+    assert clave not in otras and len(otras) == 4
+    print(f"✅ {clave[:16]}...")
+
+def test_exportar_y_descartar():
+    """Un acierto solo copia los bytes; los menos usados se descartan por tamaño"""
+    print("\n=== PRUEBA: EXPORTAR Y DESCARTAR ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ArtifactCache(directory=os.path.join(tmp, "cache"), max_bytes=250)
+        salida = os.path.join(tmp, "prog.com")
+        construidos = []
+
+        def build(datos):
+            def escribir():
+                construidos.append(datos)
+                with open(salida, 'wb') as f:
+                    f.write(datos)
+                return True
+            return escribir
+
+        claves = [cache.key(f"programa {i}", 'dynamic-motor-com', '3') for i in range(3)]
+        assert cache.export(claves[0], salida, build(b"\xb0\x80" * 50)) == (True, False)
+        os.remove(salida)
+        assert cache.export(claves[0], salida, build(b"otro")) == (True, True)
+        with open(salida, 'rb') as f:
+            assert f.read() == b"\xb0\x80" * 50
+        assert len(construidos) == 1 and cache.hits == 1
+
+        antiguo = time.time() - 60
+        os.utime(cache._path(claves[0]), (antiguo, antiguo))
+        cache.put(claves[1], b"1" * 100)
+        cache.put(claves[2], b"2" * 100)
+        assert cache.get(claves[0]) is None and cache.get(claves[2]) == b"2" * 100
+        assert cache.total_size() == 200
+
+        desactivado = ArtifactCache(directory="off")
+        assert not desactivado.enabled
+        assert desactivado.export(claves[2], salida, build(b"nuevo")) == (True, False)
+        assert construidos[-1] == b"nuevo"
+    print(f"✅ {cache.stats()['hits']} aciertos, {len(construidos)} artefactos generados")
+
+def test_backends():
+    """Los backends .mod y .COM no vuelven a generar un programa sin cambios"""
+    print("\n=== PRUEBA: BACKENDS CON EL CACHÉ DE ARTEFACTOS ===")
+    cwd = os.getcwd()
+    directorio = shared_artifact_cache.directory
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        shared_artifact_cache.directory = os.path.join(tmp, "cache")
+        os.chdir(tmp)
+        try:
+            generador = RoboDKSequentialGenerator()
+            with mock.patch.object(RoboDKSequentialGenerator, '_build_mod_content', autospec=True,
+                                   side_effect=RoboDKSequentialGenerator._build_mod_content) as render:
+                assert generador.generate_mod_file(CODIGO, "a.mod")[0]
+                assert generador.generate_mod_file(CODIGO, "b.mod")[0]
+            with open("a.mod", 'rb') as a, open("b.mod", 'rb') as b:
+                assert a.read() == b.read()
+            assert render.call_count == 1 and len(generador.movement_sequence) == 3
+
+            analisis = shared_cache.analyze(CODIGO)
+            with mock.patch.object(create_dynamic_motor_com_v2, 'generate_dynamic_machine_code',
+                                   side_effect=create_dynamic_motor_com_v2.generate_dynamic_machine_code) as gen:
+                assert create_dynamic_motor_com_v2.create_dynamic_com_from_analyzer(analisis)
+                primero = open(os.path.join("DOSBox2", "Tasm", "motor_user.com"), 'rb').read()
+                assert create_dynamic_motor_com_v2.create_dynamic_com_from_analyzer(analisis)
+                segundo = open(os.path.join("DOSBox2", "Tasm", "motor_user.com"), 'rb').read()
+            assert gen.call_count == 1 and primero == segundo
+        finally:
+            os.chdir(cwd)
+            shared_artifact_cache.directory = directorio
+    print(f"✅ .mod renderizado {render.call_count} vez, .COM generado {gen.call_count} vez ({len(primero)} bytes)")
+
+def test_version_exe():
+    """La clave del .exe cambia cada vez que cambia el .asm de Proteus"""
+    print("\n=== PRUEBA: VERSIÓN DEL BACKEND .EXE ===")
+    analizador = RobotLexicalAnalyzer()
+    analizador.analyze(PROTEUS)
+    with contextlib.redirect_stdout(io.StringIO()):
+        asm, error = analizador.generate_assembly_code("prueba")
+    assert error is None
+    asm = "".join(linea for linea in asm.splitlines(True) if not linea.startswith("; Generado:"))
+    huella = hashlib.sha256(asm.encode('utf-8')).hexdigest()
+    assert HUELLAS_PROTEUS.get(EXE_BACKEND_VERSION) == huella, \
+        f"La salida de Proteus cambió ({huella}): subir EXE_BACKEND_VERSION"
+    assert len(set(HUELLAS_PROTEUS.values())) == len(HUELLAS_PROTEUS)
+    cache = ArtifactCache(directory="no-se-usa")
+    claves = {cache.key(PROTEUS, EXE_BACKEND_ID, version, {'program_name': 'prueba', 'artifact': 'exe'})
+              for version in HUELLAS_PROTEUS}
+    assert len(claves) == len(HUELLAS_PROTEUS)
+    print(f"✅ Versión {EXE_BACKEND_VERSION}: {huella[:16]}...")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL CACHÉ DE ARTEFACTOS")
+    print("=" * 60)
+    test_claves()
+    test_exportar_y_descartar()
+    test_backends()
+    test_version_exe()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que las repeticiones se generan como ciclos:
+a qué sentencias se aplica cada 'repetir' (robot_loops), la política de
+desenrollado, los FOR del .mod secuencial y los ciclos contados del .COM
+"""
+
+import os
+import io
+import tempfile
+import contextlib
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_ast import Assignment, Wait
+from robot_loops import Loop, LoopPolicy, loop_structure, unrolled
+from robodk_sequential_generator import RoboDKSequentialGenerator
+from create_dynamic_motor_com_v2 import generate_dynamic_machine_code, motor_values_from_program
+from simulador_8086 import ejecutar_com
+
+# Tomar y dejar una pieza 100 veces
+PICK_AND_PLACE = """Robot r1
+r1.codo = 30
+r1.repetir = 100
+r1.inicio
+  r1.velocidad = 50
+  r1.base = 90
+  r1.hombro = 45
+  r1.espera = 1
+  r1.hombro = 0
+  r1.base = 0
+r1.fin
+r1.codo = 0"""
+
+def _programa(codigo):
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(codigo)
+    assert not analyzer.errors, analyzer.errors
+    return analyzer.get_program()
+
+def _resumen(items):
+    """Estructura legible: ('loop', veces, [...]) o componente/espera"""
+    resumen = []
+    for item in items:
+        if isinstance(item, Loop):
+            resumen.append(('loop', item.count, _resumen(item.body)))
+        elif isinstance(item, Assignment):
+            resumen.append(item.component)
+        elif isinstance(item, Wait):
+            resumen.append('espera')
+    return resumen
+
+def test_estructura():
+    """Cada 'repetir' se aplica a su bloque o, sin bloque, al resto del nivel"""
+    print("=== PRUEBA: ESTRUCTURA DE LOS CICLOS ===")
+    # 'repetir' antes del bloque
+    estructura = loop_structure(_programa(PICK_AND_PLACE), 'r1')
+    assert _resumen(estructura) == ['codo', ('loop', 100, ['velocidad', 'base', 'hombro', 'espera', 'hombro', 'base']),
+                                    'codo']
+    # 'repetir' dentro del bloque; otro robot no se incluye
+    programa = _programa("Robot r1\nr1.base = 1\nr1.inicio\nr1.repetir = 3\nr1.codo = 2\nr1.fin\n"
+                         "Robot r2\nr2.base = 5\nr1.garra = 4")
+    assert _resumen(loop_structure(programa, 'r1')) == ['base', ('loop', 3, ['codo']), 'garra']
+    assert _resumen(loop_structure(programa)) == ['base', ('loop', 3, ['codo']), 'base', 'garra']
+    # Sin bloque: el último 'repetir' repite el resto; cantidades de 1 o menos no forman ciclo
+    programa = _programa("Robot r1\nr1.repetir = 5\nr1.base = 1\nr1.repetir = 2\nr1.codo = 2\nr1.espera = 1\n"
+                         "r1.inicio\nr1.repetir = 1\nr1.garra = 3\nr1.fin")
+    assert _resumen(loop_structure(programa)) == ['base', ('loop', 2, ['codo', 'espera', 'garra'])]
+    # Ciclos anidados
+    programa = _programa("Robot r1\nr1.repetir = 2\nr1.inicio\nr1.base = 1\nr1.inicio\nr1.repetir = 3\n"
+                         "r1.codo = 2\nr1.fin\nr1.fin")
+    estructura = loop_structure(programa)
+    assert _resumen(estructura) == [('loop', 2, ['base', ('loop', 3, ['codo'])])]
+    assert [n.component for n in unrolled(estructura) if isinstance(n, Assignment)] == \
+        ['base', 'codo', 'codo', 'codo'] * 2
+    print("✅ Bloques, repeticiones sin bloque y ciclos anidados")
+
+def test_politica():
+    """Se desenrolla solo lo que entra en el presupuesto"""
+    print("\n=== PRUEBA: POLÍTICA DE DESENROLLADO ===")
+    politica = LoopPolicy(12)
+    assert politica.unroll(4, 3) and not politica.unroll(4, 4) and not LoopPolicy(0).unroll(1, 2)
+    try:
+        LoopPolicy(-1)
+        raise AssertionError("presupuesto negativo aceptado")
+    except ValueError:
+        pass
+    print("✅ Presupuesto respetado")
+
+def _generar_mod(codigo, politica=None):
+    generador = RoboDKSequentialGenerator(loop_policy=politica)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        try:
+            assert generador.generate_mod_file(codigo, "programa.mod")[0]
+            with open("programa.mod", encoding='utf-8') as f:
+                return generador, f.read()
+        finally:
+            os.chdir(cwd)
+
+def test_mod_con_for():
+    """100 repeticiones no agrandan el .mod 100 veces"""
+    print("\n=== PRUEBA: FOR EN EL .MOD ===")
+    generador, contenido = _generar_mod(PICK_AND_PLACE)
+    _, una_vez = _generar_mod(PICK_AND_PLACE.replace("r1.repetir = 100", "r1.repetir = 1"))
+    assert len(contenido) < len(una_vez) + 300
+    # codo, inicio del ciclo, base y hombro juntos, espera, regreso de los dos, fin del ciclo, codo
+    assert len(generador.movement_sequence) == 7
+    assert "FOR i1 FROM 1 TO 100 DO" in contenido and contenido.count("ENDFOR") == 1
+    assert contenido.count("MoveAbsJ") == 4 and "Total de pasos ejecutados: 302" in contenido
+
+    # Un cuerpo corto se copia; con presupuesto 0 siempre es un ciclo
+    corto = "Robot r1\nr1.repetir = 2\nr1.inicio\nr1.base = 10\nr1.fin"
+    generador, contenido = _generar_mod(corto)
+    assert "FOR" not in contenido and "REPETICIÓN 2 de 2" in contenido and contenido.count("MoveAbsJ") == 2
+    _, contenido = _generar_mod(corto, LoopPolicy(0))
+    assert "FOR i1 FROM 1 TO 2 DO" in contenido and contenido.count("MoveAbsJ") == 1
+    print(f"✅ .mod de {len(contenido)} caracteres con FOR")
+
+def test_mod_primera_vuelta():
+    """La primera vuelta que parte de otra pose queda fuera del FOR"""
+    print("\n=== PRUEBA: PRIMERA VUELTA EN EL .MOD ===")
+    codigo = ("Robot r1\nr1.codo = 30\nr1.repetir = 3\nr1.inicio\nr1.base = 90\nr1.espera = 1\n"
+              "r1.codo = 0\nr1.espera = 1\nr1.fin")
+    for politica in (LoopPolicy(0), LoopPolicy(10 ** 9)):
+        _, contenido = _generar_mod(codigo, politica)
+        poses = [linea.split("[[")[1].split("]")[0] for linea in contenido.splitlines() if "MoveAbsJ" in linea]
+        # La primera vuelta entra con el codo en 30; las otras dos lo dejan en 0
+        assert poses[:3] == ["0.0,0.0,-30.0,0.0,0.0,0.0", "90.0,0.0,-30.0,0.0,0.0,0.0", "90.0,0.0,0.0,0.0,0.0,0.0"]
+        assert set(poses[3:]) == {"90.0,0.0,0.0,0.0,0.0,0.0"} and "Total de pasos ejecutados: 13" in contenido
+    assert "FOR i1 FROM 1 TO 2 DO" in _generar_mod(codigo, LoopPolicy(0))[1] and len(poses) == 7
+    print("✅ El FOR repite las poses de la segunda vuelta")
+
+def _escrituras(codigo):
+    """Escrituras a puertos (puerto, valor) del .COM simulado, sin ejecutar las demoras"""
+    salidas, _ = ejecutar_com(codigo)
+    return [(puerto, valor) for _, puerto, valor in salidas]
+
+def test_com_con_ciclos():
+    """El .COM repite el bloque con un ciclo contado y hace lo mismo que desenrollado"""
+    print("\n=== PRUEBA: CICLOS EN EL .COM ===")
+    with contextlib.redirect_stdout(io.StringIO()):
+        valores = motor_values_from_program(_programa(PICK_AND_PLACE))
+        ciclo = bytes(generate_dynamic_machine_code(valores, LoopPolicy(0)))
+        desenrollado = bytes(generate_dynamic_machine_code(valores, LoopPolicy(10 ** 9)))
+        dos_vueltas = bytes(generate_dynamic_machine_code(
+            motor_values_from_program(_programa(PICK_AND_PLACE.replace("r1.repetir = 100", "r1.repetir = 2"))),
+            LoopPolicy(0)))
+    assert valores['movimientos'][1]['tipo'] == 'repetir' and valores['repeticiones'] == 1
+    # El tamaño del ciclo no depende de la cantidad de vueltas
+    assert len(ciclo) == len(dos_vueltas) < len(desenrollado) // 40
+    assert _escrituras(ciclo) == _escrituras(desenrollado)
+
+    # Un programa que es solo una repetición usa el ciclo principal
+    with contextlib.redirect_stdout(io.StringIO()):
+        solo = motor_values_from_program(_programa("Robot r1\nr1.repetir = 4\nr1.inicio\nr1.base = 90\nr1.base = 0\nr1.fin"))
+        codigo = bytes(generate_dynamic_machine_code(solo))
+        plano = bytes(generate_dynamic_machine_code({'movimientos': solo['movimientos'][0]['movimientos'],
+                                                     'repeticiones': 4}))
+    assert codigo == plano
+    # 4 vueltas de ida y regreso de la base (50 pasos cada una)
+    assert sum(1 for puerto, _ in _escrituras(codigo) if puerto == 0) == 4 * 100 + 2
+
+    # Un cuerpo que no vuelve a la pose inicial solo mueve la base en la primera vuelta
+    with contextlib.redirect_stdout(io.StringIO()):
+        abierto = motor_values_from_program(_programa("Robot r1\nr1.repetir = 5\nr1.inicio\nr1.base = 90\n"
+                                                      "r1.espera = 0.1\nr1.fin"))
+        codigo = bytes(generate_dynamic_machine_code(abierto, LoopPolicy(0)))
+    assert codigo[codigo.index(0xBE) + 1] == 1 and 0x56 in codigo  # ciclo anidado, no el principal
+    assert sum(1 for puerto, _ in _escrituras(codigo) if puerto == 0) == 1 + 50 + 1
+    print(f"✅ {len(ciclo)} bytes con ciclo contra {len(desenrollado)} desenrollado")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE CICLOS EN LOS BACKENDS")
+    print("=" * 60)
+    test_estructura()
+    test_politica()
+    test_mod_con_for()
+    test_mod_primera_vuelta()
+    test_com_con_ciclos()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el compilador por lotes `python -m lexic build`:
+artefactos generados, códigos de salida, ejecución en paralelo y que no
+importa tkinter
+"""
+
+import io
+import os
+import sys
+import subprocess
+import tempfile
+import contextlib
+
+import lexic
+
+PROGRAMAS = {
+    "brazo.robot": "Robot r1\nr1.velocidad = 2\nr1.base = 45\nr1.espera = 1\nr1.codo = 30",
+    "sub/pinza.robot": "Robot r2\nr2.garra = 10\nr2.espera = 0.5\nr2.base = -20",
+    "sub/rango.robot": "Robot r3\nr3.base = 400",
+}
+
+def _crear_programas(tmp, extra=None):
+    programas = dict(PROGRAMAS, **(extra or {}))
+    for nombre, codigo in programas.items():
+        ruta = os.path.join(tmp, "src", nombre)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            f.write(codigo)
+    return os.path.join(tmp, "src")
+
+def _compilar(*args):
+    salida = io.StringIO()
+    with contextlib.redirect_stdout(salida):
+        codigo = lexic.main(['build', *args, '--no-cache'])
+    return codigo, salida.getvalue()
+
+def test_compilar_directorio():
+    """Compila todos los .robot de un directorio y genera cada artefacto"""
+    print("=== PRUEBA: COMPILAR UN DIRECTORIO ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = _crear_programas(tmp)
+        out = os.path.join(tmp, "out")
+        codigo, salida = _compilar(src, '--target', 'asm,com,mod', '-j', '1', '-o', out)
+        assert codigo == 0, salida
+        assert sorted(os.listdir(out)) == sorted(f"{n}.{ext}" for n in ("brazo", "pinza", "rango")
+                                                 for ext in ("asm", "com", "mod"))
+        assert "1 advertencias" in salida and "3 compilados, 0 con errores" in salida
+
+        codigo, _ = _compilar(os.path.join(src, "brazo.robot"), '--target', 'com', '-o', os.path.join(tmp, "solo"))
+        assert codigo == 0 and os.listdir(os.path.join(tmp, "solo")) == ["brazo.com"]
+    print("✅ 3 programas, 9 artefactos")
+
+def test_codigos_de_salida():
+    """1 si algún programa tiene errores, 2 si los argumentos son inválidos"""
+    print("\n=== PRUEBA: CÓDIGOS DE SALIDA ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = _crear_programas(tmp, {"malo.robot": "Robot r1\nr1.base = @"})
+        codigo, salida = _compilar(src, '-j', '1', '-o', os.path.join(tmp, "out"))
+        assert codigo == 1 and "❌" in salida and "Caracter no reconocido '@'" in salida
+        assert not os.path.exists(os.path.join(tmp, "out", "malo.asm"))
+
+        # Las líneas en blanco al principio cuentan: el error se informa en la línea del archivo
+        src = _crear_programas(tmp, {"malo.robot": "\n\n\nRobot r1\nr1.base = 10\nr1.codo = @"})
+        codigo, salida = _compilar(os.path.join(src, "malo.robot"), '-o', os.path.join(tmp, "out"))
+        assert codigo == 1 and "línea 6, columna 11" in salida, salida
+
+        assert _compilar(os.path.join(tmp, "no_existe.robot"))[0] == 2
+        with contextlib.redirect_stderr(io.StringIO()):
+            try:
+                lexic.main(['build', src, '--target', 'exe'])
+                assert False, "--target exe debería ser inválido"
+            except SystemExit as e:
+                assert e.code == 2
+    print("✅ 0 / 1 / 2 según el resultado")
+
+def test_paralelo():
+    """Con -j 2 se generan los mismos artefactos que con un solo proceso"""
+    print("\n=== PRUEBA: POOL DE PROCESOS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = _crear_programas(tmp)
+        uno, dos = os.path.join(tmp, "uno"), os.path.join(tmp, "dos")
+        assert _compilar(src, '-t', 'com', '-j', '1', '-o', uno)[0] == 0
+        codigo, salida = _compilar(src, '-t', 'com', '-j', '2', '-o', dos)
+        assert codigo == 0 and salida.count("✅") == 3
+        for nombre in os.listdir(uno):
+            with open(os.path.join(uno, nombre), 'rb') as a, open(os.path.join(dos, nombre), 'rb') as b:
+                assert a.read() == b.read()
+    print("✅ Artefactos idénticos con 1 y 2 procesos")
+
+def test_sin_tkinter():
+    """La línea de comandos no importa tkinter"""
+    print("\n=== PRUEBA: SIN TKINTER ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = _crear_programas(tmp)
+        script = ("import sys, runpy; sys.argv = ['lexic', 'build', sys.argv[1], '-j', '1', '-o', sys.argv[2], '--no-cache']\n"
+                  "try:\n    runpy.run_module('lexic', run_name='__main__')\n"
+                  "except SystemExit as e:\n    assert e.code == 0, e.code\n"
+                  "assert 'tkinter' not in sys.modules\n")
+        resultado = subprocess.run([sys.executable, '-c', script, src, os.path.join(tmp, "out")],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True)
+        assert resultado.returncode == 0, resultado.stderr
+    print("✅ tkinter no se importa")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL COMPILADOR POR LOTES")
+    print("=" * 60)
+    test_compilar_directorio()
+    test_codigos_de_salida()
+    test_paralelo()
+    test_sin_tkinter()
+
+if __name__ == "__main__":
+    main()
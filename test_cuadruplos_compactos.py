@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el QuadrupleStore del código intermedio:
+códigos de operación en un arreglo, operandos internados, tablas de despacho
+y compatibilidad con el código que espera objetos Cuadruplo
+"""
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, IntermediateCodeGenerator
+from robot_quadruples import (QuadrupleStore, Cuadruplo, OPCODE_NAMES, OP_ASIG, OP_CALL,
+                              NO_OPERAND, FIELDS, dispatch_table, opcode_id)
+from assembly_generator import AssemblyGenerator
+
+CODIGO = """Robot r1
+r1.velocidad = 50
+r1.repetir = 3
+r1.inicio
+r1.base = 45
+r1.codo = 45
+r1.espera = 0.5
+r1.base = 45
+r1.fin
+Robot r2
+r2.base = 45"""
+
+def _generar(codigo=CODIGO):
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(codigo)
+    return analyzer.get_cuadruplos()
+
+def test_acceso_compatible():
+    """Indexado, recorte e iteración producen objetos Cuadruplo"""
+    print("=== PRUEBA: ACCESO COMPATIBLE CON Cuadruplo ===")
+    cuadruplos = _generar()
+    assert isinstance(cuadruplos, QuadrupleStore)
+    assert isinstance(cuadruplos[0], Cuadruplo)
+    primero = cuadruplos[0]
+    assert (primero.numero, primero.operacion, primero.arg1, primero.arg2, primero.resultado) == \
+        (0, 'DECLARAR', 'robot', '-', 'r1')
+    assert cuadruplos[-1].operacion == 'CALL' and cuadruplos[-1].resultado == 'r2'
+    assert [c.operacion for c in cuadruplos[1:3]] == ['ASIG', 'CALL']
+    assert [c.numero for c in cuadruplos] == list(range(len(cuadruplos)))
+    assert list(cuadruplos.formatted_rows()) == [str(c) for c in cuadruplos]
+    assert cuadruplos == [cuadruplos.quadruple(i) for i in range(len(cuadruplos))]
+    assert cuadruplos.opcode_counts()['CALL'] == 6
+    print(f"✅ {len(cuadruplos)} cuádruplos accesibles como Cuadruplo")
+
+def test_operandos_internados():
+    """Cada operando y descripción distintos se guardan una sola vez"""
+    print("\n=== PRUEBA: OPERANDOS INTERNADOS ===")
+    cuadruplos = _generar()
+    assert len(cuadruplos.operands) == len(set(map(repr, cuadruplos.operands)))
+    assert cuadruplos.operands[NO_OPERAND] == "-"
+    assert len(cuadruplos.texts) < len(cuadruplos)
+
+    # 45 y 45.0 (o 0.0 y -0.0) son iguales pero se muestran distinto: son operandos distintos
+    store = QuadrupleStore()
+    assert store.operand(45) != store.operand(45.0) and store.operand(0.0) != store.operand(-0.0)
+    store.append('CALL', 'base', 45.0, 'r1', "Mueve base a 45.0°")
+    assert "| 45.0     |" in next(store.formatted_rows())
+    store = QuadrupleStore()
+    assert store.operand('base') == store.operand('base') and store.operand(None) == NO_OPERAND
+    numero = store.append('ASIG', 45, None, 'base', 'base = 45')
+    assert numero == 0 and len(store.cells) == FIELDS and str(store[0]) == str(Cuadruplo(0, 'ASIG', 45, None, 'base', 'base = 45'))
+    print(f"✅ {len(cuadruplos.operands)} operandos y {len(cuadruplos.texts)} descripciones para {len(cuadruplos)} cuádruplos")
+
+def test_despacho():
+    """dispatch() llama al manejador de cada código de operación, en orden"""
+    print("\n=== PRUEBA: TABLAS DE DESPACHO ===")
+    cuadruplos = _generar()
+    llamadas = []
+    tabla = dispatch_table({'CALL': lambda arg1, arg2, resultado: llamadas.append((arg1, arg2, resultado))})
+    assert len(tabla) == len(OPCODE_NAMES) and tabla[OP_CALL] is not None and tabla[OP_ASIG] is None
+    cuadruplos.dispatch(tabla)
+    assert llamadas == [(c.arg1, c.arg2, c.resultado) for c in cuadruplos if c.operacion == 'CALL']
+    assert [op for op, *_ in cuadruplos.rows()] == list(cuadruplos.opcodes)
+
+    # Las operaciones desconocidas se registran con un código nuevo
+    store = QuadrupleStore()
+    store.append('OPERACION_PRUEBA', 1, 2, 3, "prueba")
+    assert store[0].operacion == 'OPERACION_PRUEBA' and store.opcodes[0] == opcode_id('OPERACION_PRUEBA')
+    store.dispatch(tabla)  # tabla creada antes del registro: se saltea
+    print(f"✅ {len(llamadas)} CALL despachados")
+
+class _Generador(AssemblyGenerator):
+    """AssemblyGenerator sin verificar DOSBox/TASM (solo genera el texto)"""
+
+    # AssemblyGenerator no define los puertos de los componentes
+    ports = {'base': '0378H', 'codo': '0379H', 'velocidad': '037AH', 'espera': '037BH'}
+
+    def verify_system_files(self):
+        pass
+
+def test_ensamblador_con_despacho():
+    """AssemblyGenerator produce lo mismo desde el store que desde objetos Cuadruplo"""
+    print("\n=== PRUEBA: ENSAMBLADOR DESDE EL STORE ===")
+    cuadruplos = _generar()
+    generador = _Generador()
+    generador.generate_assembly(cuadruplos, "prueba")
+    desde_store = (list(generador.code_lines), list(generador.data_lines))
+    generador.generate_assembly(list(cuadruplos), "prueba")
+    assert desde_store == (generador.code_lines, generador.data_lines)
+    codigo = "\n".join(desde_store[0])
+    assert "MOV CX1, 3" in codigo and "JMP L1" in codigo
+    print(f"✅ {len(desde_store[0])} líneas de código iguales")
+
+def test_programa_grande():
+    """Un programa de 20k sentencias ocupa 4 bytes por campo de cada cuádruplo"""
+    print("\n=== PRUEBA: PROGRAMA GRANDE ===")
+    codigo = "\n".join(["Robot r1"] + [f"r1.base = {i % 90}\nr1.espera = 0.5" for i in range(10_000)])
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.load(codigo)
+    cuadruplos = analyzer.get_cuadruplos()
+    assert len(cuadruplos) == 1 + 4 * 10_000
+    assert len(cuadruplos.cells) * cuadruplos.cells.itemsize == FIELDS * 4 * len(cuadruplos)
+    assert len(cuadruplos.operands) < 100 and len(cuadruplos.texts) < 200
+    generador = IntermediateCodeGenerator()
+    generador.generar_codigo_intermedio(analyzer.parser)
+    assert generador.cuadruplos == cuadruplos and generador.contador_cuadruplos == len(cuadruplos)
+    print(f"✅ {len(cuadruplos)} cuádruplos en {len(cuadruplos.cells) * 4 // 1024} KB")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL QUADRUPLESTORE COMPACTO")
+    print("=" * 60)
+    test_acceso_compatible()
+    test_operandos_internados()
+    test_despacho()
+    test_ensamblador_con_despacho()
+    test_programa_grande()
+
+if __name__ == "__main__":
+    main()
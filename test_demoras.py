@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar las demoras del .COM: la subrutina DELAY
+compartida, su modelo de ciclos (robot_timing) y que las esperas largas no
+agrandan el programa
+"""
+
+import io
+import contextlib
+
+from robot_timing import DelayTiming, CYCLE_TABLES
+from create_dynamic_motor_com_v2 import generate_dynamic_machine_code
+from simulador_8086 import ejecutar_com
+
+def test_modelo():
+    """La cuenta elegida queda dentro de la tolerancia para 8086 y 8088 a cualquier reloj"""
+    print("=== PRUEBA: MODELO DE CICLOS ===")
+    for timing in (DelayTiming(), DelayTiming('8088'), DelayTiming('8086', 4_770_000)):
+        for segundos in (timing.seconds(1), 0.0005, 0.02, 0.3, 1, 22.4, 1000):
+            cuenta = timing.count(segundos)
+            assert abs(timing.seconds(cuenta) - segundos) <= timing.tolerance, (timing, segundos)
+        assert timing.count(0) == 1
+    # Mismo reloj: el 8088 tarda más con la misma cuenta; el doble de reloj, la mitad de tiempo
+    assert DelayTiming('8088').seconds(1000) > DelayTiming('8086').seconds(1000)
+    assert DelayTiming('8086', 6_000_000).seconds(5000) * 2 == DelayTiming('8086', 3_000_000).seconds(5000)
+    for invalido in ({'cpu': '80286'}, {'clock_hz': 0}):
+        try:
+            DelayTiming(**invalido)
+            raise AssertionError(f"modelo inválido aceptado: {invalido}")
+        except ValueError:
+            pass
+    print(f"✅ Tolerancia de {DelayTiming().tolerance * 1e6:.1f} µs a 3 MHz")
+
+def _esperas(*segundos, timing=None):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return bytes(generate_dynamic_machine_code(
+            {'movimientos': [{'tipo': 'pose', 'valor': {}, 'velocidad': 1.0, 'espera': s} for s in segundos],
+             'repeticiones': 1}, timing=timing))
+
+def test_subrutina():
+    """La subrutina emitida tarda exactamente los ciclos del modelo"""
+    print("\n=== PRUEBA: SUBRUTINA DELAY ===")
+    for cpu in CYCLE_TABLES:
+        timing = DelayTiming(cpu)
+        # 0,1 s de arranque, una espera corta y una de más de 65536 vueltas
+        _, demoras = ejecutar_com(_esperas(0.01, 0.5, timing=timing), CYCLE_TABLES[cpu], llamar_demoras=True,
+                                  max_pasos=5_000_000)
+        assert [cuenta for cuenta, _ in demoras] == [timing.count(s) for s in (0.1, 0.01, 0.5)]
+        assert demoras[-1][0] > 0x10000
+        for cuenta, ciclos in demoras:
+            assert ciclos == timing.cycles_for(cuenta), (cpu, cuenta, ciclos)
+    print("✅ Ciclos simulados iguales a los del modelo en 8086 y 8088")
+
+def test_tamano():
+    """Cada espera cuesta una llamada de 9 bytes, dure lo que dure"""
+    print("\n=== PRUEBA: TAMAÑO DE LAS ESPERAS ===")
+    corta, larga = _esperas(1), _esperas(1000)
+    assert len(corta) == len(larga) < 128
+    assert len(_esperas(1, 1000)) == len(corta) + 9
+    print(f"✅ {len(larga)} bytes con una espera de 1000 s")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE DEMORAS CALIBRADAS")
+    print("=" * 60)
+    test_modelo()
+    test_subrutina()
+    test_tamano()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar los diagnósticos en vivo del editor:
+posición de cada mensaje, el trabajo que aplica la edición a la sesión
+incremental, la latencia por edición en un archivo de 10k líneas y la espera
+entre ediciones que descarta los resultados viejos
+"""
+
+import statistics
+
+import main as interfaz
+from robot_worker import BackgroundWorker
+from robot_incremental import IncrementalAnalyzer
+from robot_diagnostics import diagnostic_location
+from benchmark_suite import generate_synthetic_program
+
+CODIGO = "Robot r1\nr1.velocidad = 50\nr1.base = 45\nr1.espera = 1\nr1.codo = 30"
+
+def _diagnosticos(session, codigo):
+    """Ejecuta live_diagnostics_job en un worker y retorna su resultado"""
+    worker = BackgroundWorker()
+    resultados = []
+    worker.submit(interfaz.live_diagnostics_job, session, codigo, on_done=resultados.append)
+    worker.wait(30)
+    worker.shutdown()
+    return resultados[0]
+
+def test_posicion_de_los_mensajes():
+    """diagnostic_location lee la línea y, si está, la columna del mensaje"""
+    print("=== PRUEBA: POSICIÓN DE LOS DIAGNÓSTICOS ===")
+    assert diagnostic_location("Error léxico en línea 2, columna 12: Caracter no reconocido '@'") == (2, 12)
+    assert diagnostic_location("Error en línea 7: Se esperaba '.'") == (7, None)
+    assert diagnostic_location("Línea 3: Valor angular 400 excede 360 grados") == (3, None)
+    assert diagnostic_location(
+        "Error semántico en línea 9: Robot 'r1' ya fue declarado previamente en línea 1") == (9, None)
+    assert diagnostic_location("Error: No hay código para analizar") is None
+    print("✅ Posiciones correctas")
+
+def test_diagnosticos_de_una_edicion():
+    """El trabajo retorna errores y advertencias con su posición y severidad"""
+    print("\n=== PRUEBA: DIAGNÓSTICOS DE UNA EDICIÓN ===")
+    session = IncrementalAnalyzer()
+    diagnosticos, ms = _diagnosticos(session, CODIGO)
+    assert diagnosticos == [] and ms >= 0
+
+    diagnosticos, _ = _diagnosticos(session, CODIGO.replace("r1.base = 45", "r1.base = 4@5"))
+    assert diagnosticos[0][:3] == (3, 12, 'error'), diagnosticos
+
+    diagnosticos, _ = _diagnosticos(session, CODIGO.replace("r1.base = 45", "r1.base = 999"))
+    assert {(linea, severidad) for linea, _, severidad, _ in diagnosticos} == {(3, 'warning')}, diagnosticos
+
+    # Las líneas en blanco del principio no se recortan: la línea coincide con el editor
+    diagnosticos, _ = _diagnosticos(session, "\n\n" + CODIGO.replace("r1.codo = 30", "r1.codo 30"))
+    assert {linea for linea, *_ in diagnosticos} == {7}, diagnosticos
+
+    codigo = "\n".join(["Robot r1"] + ["r1.base = 4@5"] * (interfaz.LIVE_MAX_DIAGNOSTICS + 50))
+    diagnosticos, _ = _diagnosticos(session, codigo)
+    assert len(diagnosticos) == interfaz.LIVE_MAX_DIAGNOSTICS
+    print("✅ Errores y advertencias ubicados")
+
+def test_latencia_en_10k_lineas():
+    """Una edición de una línea en un archivo de 10k líneas queda dentro del presupuesto"""
+    print("\n=== PRUEBA: LATENCIA EN 10K LÍNEAS ===")
+    lineas = generate_synthetic_program(10_000).split('\n')
+    session = IncrementalAnalyzer()
+    _, completo = _diagnosticos(session, '\n'.join(lineas))
+
+    worker = BackgroundWorker()
+    tiempos = []
+    for i in range(30):
+        editadas = list(lineas)
+        editadas[200 + i * 300] += " @" if i % 5 == 0 else " "
+        worker.submit(interfaz.live_diagnostics_job, session, '\n'.join(editadas),
+                      on_done=lambda resultado: tiempos.append(resultado[1]))
+        worker.wait(30)
+    worker.shutdown()
+    mediana = statistics.median(tiempos)
+    print(f"   Análisis completo: {completo:.1f} ms; edición: mediana {mediana:.1f} ms, máximo {max(tiempos):.1f} ms")
+    assert mediana < interfaz.LIVE_BUDGET_MS
+    print("✅ Ediciones dentro del presupuesto")
+
+class _Root:
+    """Reemplazo de tk.Tk que registra los after() pendientes"""
+
+    def __init__(self):
+        self.pending = {}
+        self.ids = 0
+
+    def after(self, ms, callback):
+        self.ids += 1
+        self.pending[self.ids] = (ms, callback)
+        return self.ids
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+class _Editor:
+    """Reemplazo de LineNumberText sin ventana"""
+
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self.diagnostics = None
+
+    def get(self, start, end=None):
+        return self.codigo
+
+    def set_diagnostics(self, diagnostics):
+        self.diagnostics = diagnostics
+
+def test_espera_entre_ediciones():
+    """Cada edición reinicia la espera; solo se muestra el análisis del texto más reciente"""
+    print("\n=== PRUEBA: ESPERA ENTRE EDICIONES ===")
+    gui = interfaz.LexicalAnalyzerGUI.__new__(interfaz.LexicalAnalyzerGUI)
+    gui.root = _Root()
+    gui.live_session = IncrementalAnalyzer()
+    gui.live_worker = BackgroundWorker()
+    gui.live_debounce = interfaz.LIVE_DEBOUNCE_MS
+    gui._live_after = None
+    gui.code_editor = _Editor(CODIGO)
+    estados = []
+    gui.update_status = estados.append
+
+    gui.schedule_live_diagnostics()
+    gui.schedule_live_diagnostics()
+    assert len(gui.root.pending) == 1  # la segunda edición reinició la espera
+    (ms, callback), = gui.root.pending.values()
+    assert ms == interfaz.LIVE_DEBOUNCE_MS
+    gui.root.pending.clear()
+    callback()
+    gui.live_worker.wait(10)
+    assert gui.code_editor.diagnostics == [] and estados[-1].startswith("✅")
+
+    # Un análisis que se envía mientras otro está pendiente descarta al anterior
+    gui.code_editor.codigo = CODIGO.replace("r1.base = 45", "r1.base = 4@5")
+    gui.run_live_diagnostics()
+    primero = gui.live_worker.running('diagnostics')
+    gui.code_editor.codigo = CODIGO.replace("r1.codo = 30", "r1.codo = 3@0")
+    gui.schedule_live_diagnostics()  # editar cancela el análisis en curso
+    assert primero.cancelled
+    gui.run_live_diagnostics()
+    gui.live_worker.wait(10)
+    assert [d[0] for d in gui.code_editor.diagnostics] == [5]
+    assert estados[-1].startswith("🔴 1 errores")
+
+    # Si un análisis se pasa del presupuesto se espera más entre análisis
+    gui._show_live_diagnostics(([], 400.0))
+    assert gui.live_debounce == interfaz.LIVE_DEBOUNCE_MS + 800
+    gui._show_live_diagnostics(([], 5000.0))
+    assert gui.live_debounce == interfaz.LIVE_MAX_DEBOUNCE_MS
+    gui._show_live_diagnostics(([], 3.0))
+    assert gui.live_debounce == interfaz.LIVE_DEBOUNCE_MS
+    gui.live_worker.shutdown()
+    print("✅ Resultados viejos descartados y espera ajustada")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE DIAGNÓSTICOS EN VIVO")
+    print("=" * 60)
+    test_posicion_de_los_mensajes()
+    test_diagnosticos_de_una_edicion()
+    test_latencia_en_10k_lineas()
+    test_espera_entre_ediciones()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el emisor de código 8086 (robot_emitter):
+etiquetas con referencias hacia adelante, relajación de saltos cortos y
+cercanos, copias de fragmentos, listado y mapa de símbolos
+"""
+
+import io
+import contextlib
+
+from robot_emitter import Emitter
+from create_dynamic_motor_com_v2 import emit_dynamic_program
+
+def test_saltos():
+    """Los saltos quedan cortos mientras alcanzan y pasan a rel16 cuando no"""
+    print("=== PRUEBA: RELAJACIÓN DE SALTOS ===")
+    programa = Emitter(origin=0x100)
+    inicio, fin = programa.label('inicio'), programa.label('fin')
+    programa.bind(inicio)
+    programa.jump('jz', fin, "JZ fin")            # hacia adelante, corto
+    programa.emit([0x90] * 10, "NOP x10")
+    programa.bind(fin)
+    programa.jump('loop', inicio, "LOOP inicio")  # hacia atrás, corto
+    assert programa.assemble() == bytes([0x74, 0x0A] + [0x90] * 10 + [0xE2, 0xF2])
+
+    # Un cuerpo de 200 bytes: cada tipo de salto toma su forma cercana
+    for tipo, cercano in (('jmp', [0xE9]), ('jnz', [0x74, 0x03, 0xE9]), ('loop', [0x49, 0x74, 0x03, 0xE9]),
+                          ('jcxz', [0xE3, 0x02, 0xEB, 0x03, 0xE9])):
+        programa = Emitter()
+        inicio = programa.label('inicio')
+        programa.bind(inicio)
+        programa.emit([0x90] * 200)
+        programa.jump(tipo, inicio)
+        codigo = programa.assemble()
+        rel = -(len(codigo))
+        assert codigo[200:] == bytes(cercano + [rel & 0xFF, (rel >> 8) & 0xFF]), tipo
+
+    # En cadena: el segundo salto crece y deja fuera de alcance al primero, que lo saltea
+    programa = Emitter()
+    a, b = programa.label('a'), programa.label('b')
+    programa.jump('jmp', a)
+    programa.jump('jmp', b)
+    programa.emit([0x90] * 125)
+    programa.bind(a)
+    programa.emit([0x90] * 3)
+    programa.bind(b)
+    codigo = programa.assemble()
+    assert codigo[0] == codigo[3] == 0xE9 and len(codigo) == 3 + 3 + 125 + 3
+    assert codigo[1:3] == bytes([128, 0]) and codigo[4:6] == bytes([128, 0])
+
+    for invalido in (lambda p: p.jump('jmp', p.label('suelta')), lambda p: p.jump('ja', p.label('x'))):
+        try:
+            programa = Emitter()
+            invalido(programa)
+            programa.assemble()
+            raise AssertionError("programa inválido ensamblado")
+        except ValueError:
+            pass
+    print("✅ rel8 cuando alcanza, rel16 cuando no, también en cadena")
+
+def test_fragmentos():
+    """Un fragmento se mueve detrás de una cabecera y sus copias tienen etiquetas propias"""
+    print("\n=== PRUEBA: FRAGMENTOS ===")
+    programa = Emitter()
+    marca = programa.mark()
+    vuelta = programa.label('vuelta')
+    programa.bind(vuelta)
+    programa.emit([0x90])
+    programa.jump('loop', vuelta, "LOOP vuelta")
+    cuerpo = programa.take(marca)
+    assert programa.size() == 0 and cuerpo.size() == 3
+    programa.emit([0xB9, 0x02, 0x00], "MOV CX, 2")
+    programa.extend(cuerpo)
+    programa.extend(programa.copy(cuerpo))
+    codigo = programa.assemble()
+    assert codigo == bytes([0xB9, 0x02, 0x00, 0x90, 0xE2, 0xFD, 0x90, 0xE2, 0xFD])
+    assert programa.symbol_map() == {'vuelta': 3, 'vuelta2': 6}
+    assert "0004  E2 FD" in programa.listing() and "      vuelta2:" in programa.listing()
+    print("✅ Fragmentos movidos y copiados")
+
+def test_com_grande():
+    """El ciclo principal de un .COM con un cuerpo de más de 127 bytes salta con rel16"""
+    print("\n=== PRUEBA: CICLO PRINCIPAL GRANDE ===")
+    poses = [{'tipo': 'pose', 'valor': {'base': 10 * i, 'hombro': 5 * i, 'codo': 3 * i}, 'velocidad': 0.5,
+              'espera': 0.1} for i in (1, 2, 3, 0)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        programa = emit_dynamic_program({'movimientos': poses, 'repeticiones': 3})
+        codigo = programa.assemble()
+    simbolos = programa.symbol_map()
+    vuelta = simbolos['vuelta'] - 0x100
+    assert codigo[vuelta - 3:vuelta] == bytes([0xBE, 3, 0])
+    # DEC SI / JZ +3 / JMP vuelta
+    fin = codigo.index(bytes([0x4E, 0x74, 0x03, 0xE9]))
+    rel = codigo[fin + 4] | codigo[fin + 5] << 8
+    assert fin - vuelta > 127 and (fin + 6 + rel - 0x10000) == vuelta
+    assert 'delay' in simbolos and simbolos['fases_base'] > simbolos['delay']
+    print(f"✅ {len(codigo)} bytes, cuerpo de {fin - vuelta} bytes")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL EMISOR 8086")
+    print("=" * 60)
+    test_saltos()
+    test_fragmentos()
+    test_com_grande()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que el escáner precompilado produce
+exactamente los mismos tokens que el bucle léxico original
+"""
+
+import glob
+import os
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from benchmark_lexer import legacy_scan, generate_program
+
+def tokens_de(analyzer_tokens):
+    """Convierte tokens a tuplas comparables"""
+    return [(t.type, t.value, t.line, t.column) for t in analyzer_tokens]
+
+def comparar(code):
+    """Compara el escáner actual contra la réplica del bucle original"""
+    legacy_tokens, legacy_errors = legacy_scan(code)
+    analyzer = RobotLexicalAnalyzer()
+    analyzer._scan(code)
+    assert tokens_de(analyzer.tokens) == tokens_de(legacy_tokens)
+    assert analyzer.errors == legacy_errors
+    return analyzer
+
+def test_archivos_robot():
+    """Prueba con todos los archivos .robot del proyecto"""
+    print("=== PRUEBA: ARCHIVOS .robot DEL PROYECTO ===")
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    for path in sorted(glob.glob(os.path.join(base_dir, "*.robot"))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            code = f.read()
+        analyzer = comparar(code)
+        print(f"✅ {os.path.basename(path)}: {len(analyzer.tokens)} tokens idénticos")
+
+def test_casos_limite():
+    """Prueba mayúsculas, comentarios multilínea, caracteres desconocidos y espacios finales"""
+    print("\n=== PRUEBA: CASOS LÍMITE ===")
+    casos = [
+        "",
+        "Robot R1\nR1.BASE = 10\nr1.Hombro=-5.5 /* multi\nline */ r1.codo = 3\n# c\n// d",
+        "VERDADERO verdaderox y o no && || ! != == <= >= < >",
+        "Robot r1\nr1.base = 90 & 45\nr1.hombro = @30   \n",
+        "Robot r1\r\nr1.base = 1\r\n",
+        "12.5.3 -3 - 3 1e5 {}()[];,: / * %  \t",
+        "a /* sin cierre\nr1.base = 1\n/* x */ /* y\n*/ r1.codo = 2\n/**/",
+        "r1.base = 90\nr1.base = 90\nr1.base = 90 # repetida",
+    ]
+    for code in casos:
+        comparar(code)
+    print(f"✅ {len(casos)} casos límite idénticos al bucle original")
+
+def test_valores_numericos():
+    """Verifica que los literales numéricos se convierten una sola vez en el escáner"""
+    print("\n=== PRUEBA: LITERALES NUMÉRICOS ===")
+    analyzer = RobotLexicalAnalyzer()
+    tokens, errors = analyzer.analyze("Robot r1\nr1.base = -45\nr1.espera = 1.5")
+    numeros = [(t.value, t.number) for t in tokens if t.number is not None]
+    assert numeros == [('-45', -45.0), ('1.5', 1.5)]
+    assert analyzer.components_found == {'base', 'espera'}
+    print(f"✅ Literales convertidos: {numeros}")
+
+def test_lineas_en_comentario_multilinea():
+    """Los saltos de línea dentro de /* */ avanzan la línea de los tokens siguientes"""
+    print("\n=== PRUEBA: LÍNEAS DESPUÉS DE UN COMENTARIO MULTILÍNEA ===")
+    analyzer = comparar("Robot r1 /* uno\ndos\n  tres */ r1.base = 5 @\nr1.codo = 3")
+    posiciones = [(t.value, t.line, t.column) for t in analyzer.tokens]
+    assert posiciones[2] == ('r1', 3, 11)
+    assert posiciones[-1] == ('3', 4, 11)
+    assert analyzer.errors == ["Error léxico en línea 3, columna 23: Caracter no reconocido '@'"]
+    print(f"✅ Posiciones: {posiciones}")
+
+def test_programa_generado():
+    """Prueba con un programa sintético grande"""
+    print("\n=== PRUEBA: PROGRAMA GENERADO ===")
+    analyzer = comparar(generate_program(5000))
+    print(f"✅ {len(analyzer.tokens)} tokens idénticos en 5000 líneas")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ESCÁNER LÉXICO PRECOMPILADO")
+    print("=" * 60)
+    test_archivos_robot()
+    test_casos_limite()
+    test_valores_numericos()
+    test_lineas_en_comentario_multilinea()
+    test_programa_generado()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que RobotLexicalAnalyzer ejecuta cada etapa
+del análisis solo cuando se piden sus resultados, y una sola vez
+"""
+
+from robot_lexical_analyzer import (RobotLexicalAnalyzer, _LEXICAL, _SYNTAX, _SEMANTIC,
+                                    _WARNINGS, _INTERMEDIATE)
+
+CODIGO = "Robot r1\nr1.base = 400\nr1.codo = 10\nr1.espera = 1"
+VALIDO = "Robot r1\nr1.base = 45\nr1.codo = 10\nr1.espera = 1"
+
+def test_etapas_bajo_demanda():
+    """Cada acceso ejecuta solo las etapas que necesita"""
+    print("=== PRUEBA: ETAPAS BAJO DEMANDA ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.load(VALIDO)
+    assert analyzer._pending == {_LEXICAL, _SYNTAX, _SEMANTIC, _WARNINGS, _INTERMEDIATE}
+
+    assert len(analyzer.tokens) == 17
+    assert analyzer._pending == {_SYNTAX, _SEMANTIC, _WARNINGS, _INTERMEDIATE}
+
+    assert len(analyzer.get_tabla_simbolos()) == 4
+    assert analyzer._pending == {_SEMANTIC, _WARNINGS, _INTERMEDIATE}
+
+    tokens, errors = analyzer.analyze(VALIDO)
+    assert not errors and analyzer._pending == {_WARNINGS, _INTERMEDIATE}
+
+    cuadruplos = analyzer.get_cuadruplos()
+    assert cuadruplos and analyzer.get_cuadruplos() is cuadruplos
+    assert analyzer._pending == {_WARNINGS}
+    assert analyzer.warnings == [] and not analyzer._pending
+    print(f"✅ {len(tokens)} tokens, {len(cuadruplos)} cuádruplos")
+
+def test_mismos_resultados():
+    """Los resultados no dependen del orden en que se piden"""
+    print("\n=== PRUEBA: MISMOS RESULTADOS EN CUALQUIER ORDEN ===")
+    for code in (CODIGO, VALIDO, "", "Robot\n@"):
+        completo = RobotLexicalAnalyzer()
+        completo.analyze(code)
+        referencia = (list(completo.errors), completo.warnings, completo.syntax_valid,
+                      completo.semantic_valid, [str(c) for c in completo.get_cuadruplos()])
+
+        diferido = RobotLexicalAnalyzer()
+        diferido.load(code)
+        cuadruplos = [str(c) for c in diferido.get_cuadruplos()]
+        assert (list(diferido.errors), diferido.warnings, diferido.syntax_valid,
+                diferido.semantic_valid, cuadruplos) == referencia, code
+    print("✅ 4 programas con los mismos resultados")
+
+def test_nuevo_codigo():
+    """Cargar otro código descarta los resultados del anterior"""
+    print("\n=== PRUEBA: NUEVO CÓDIGO ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(VALIDO)
+    assert analyzer.get_cuadruplos()
+    analyzer.analyze(CODIGO)
+    assert analyzer.errors and analyzer.semantic_analyzer is None
+    assert analyzer.get_cuadruplos() == []
+    assert analyzer.warnings == ["Línea 2: Valor angular 400.0 excede 360 grados"]
+    print(f"✅ Errores: {list(analyzer.errors)}")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE ETAPAS DIFERIDAS")
+    print("=" * 60)
+    test_etapas_bajo_demanda()
+    test_mismos_resultados()
+    test_nuevo_codigo()
+
+if __name__ == "__main__":
+    main()
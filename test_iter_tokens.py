@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que el escáner por bloques (iter_tokens)
+produce los mismos tokens que RobotLexicalAnalyzer con memoria acotada
+"""
+
+import io
+import os
+import tempfile
+import tracemalloc
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_file_lexer import iter_tokens
+from benchmark_lexer import generate_program
+
+CODIGO = """Robot r1
+r1.base = 45 /* comentario
+de varias
+líneas */ r1.codo = 20
+r1.hombro = -30.5 // fin
+/* otro */r1.garra = @
+r1.espera = 1.5"""
+
+class SinSeek(io.StringIO):
+    """Archivo que no permite seek(), como una tubería"""
+    def seekable(self):
+        return False
+
+def esperado(code):
+    """Tokens del analizador completo"""
+    analyzer = RobotLexicalAnalyzer()
+    analyzer._scan(code)
+    return [(t.type, t.value, t.line, t.column, t.number) for t in analyzer.tokens]
+
+def obtenido(fileobj, chunk_size):
+    """Tokens del escáner por bloques"""
+    return [(t.type, t.value, t.line, t.column, t.number) for t in iter_tokens(fileobj, chunk_size)]
+
+def test_bloques_pequenos():
+    """Comentarios y literales partidos entre bloques de cualquier tamaño"""
+    print("=== PRUEBA: BLOQUES PEQUEÑOS ===")
+    casos = [CODIGO, CODIGO + "\n", "r1.base = 1 */\n/* sin cierre\nr1.codo = 2 /",
+             "/* a *\n/ b */ r1.base = 3", "/*/ x */", "Robot r1\r\nr1.base = 9\r\n", ""]
+    for code in casos:
+        referencia = esperado(code)
+        for chunk_size in (1, 2, 3, 7, 64):
+            assert obtenido(io.StringIO(code), chunk_size) == referencia, (code, chunk_size)
+            assert obtenido(SinSeek(code), chunk_size) == referencia, (code, chunk_size)
+    print(f"✅ {len(casos)} programas idénticos al análisis completo")
+
+def test_lineas_en_comentario():
+    """Las líneas dentro de /* */ se cuentan aunque el comentario cruce bloques"""
+    print("\n=== PRUEBA: LÍNEAS DENTRO DE COMENTARIOS ===")
+    tokens = list(iter_tokens(io.StringIO(CODIGO), 4))
+    codo = next(t for t in tokens if t.value == 'codo')
+    assert (codo.line, codo.column) == (4, 14)
+    assert tokens[-1].line == 7
+    print(f"✅ 'codo' en línea {codo.line}, columna {codo.column}")
+
+def test_archivo_grande():
+    """Un archivo de 100000 líneas se escanea sin cargarlo en memoria"""
+    print("\n=== PRUEBA: ARCHIVO DE 100000 LÍNEAS ===")
+    with tempfile.NamedTemporaryFile('w', suffix='.robot', encoding='utf-8', delete=False) as file:
+        file.write(generate_program(100000))
+        path = file.name
+    try:
+        tracemalloc.start()
+        cantidad = sum(1 for _ in iter_tokens(path))
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+    assert cantidad > 300000
+    assert pico < 2_000_000
+    print(f"✅ {cantidad} tokens con {pico / 1e6:.2f} MB de pico")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ESCÁNER POR BLOQUES")
+    print("=" * 60)
+    test_bloques_pequenos()
+    test_lineas_en_comentario()
+    test_archivo_grande()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar las métricas por etapa (analyzer.metrics):
+tiempos y contadores de cada etapa, perfil cProfile opcional, métricas de la
+sesión incremental y la opción --profile de `python -m lexic build`
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+
+import lexic
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_incremental import IncrementalAnalyzer
+from robot_metrics import AnalysisMetrics, merge_metrics, format_metrics_table
+
+CODIGO = """Robot r1
+r1.velocidad = 50
+r1.inicio
+r1.repetir = 3
+r1.base = 45
+r1.espera = 1
+r1.fin"""
+
+def test_etapas_del_analizador():
+    """Cada etapa ejecutada queda registrada una vez con sus contadores"""
+    print("=== PRUEBA: MÉTRICAS DEL ANALIZADOR ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.load(CODIGO)
+    assert list(analyzer.metrics.phases) == []
+
+    analyzer.get_tabla_simbolos()
+    assert list(analyzer.metrics.phases) == ['lexical', 'syntax']
+    analyzer.get_cuadruplos()
+    analyzer.get_cuadruplos()
+    assert list(analyzer.metrics.phases) == ['lexical', 'syntax', 'semantic', 'intermediate']
+    assert all(phase.calls == 1 and phase.seconds >= 0 for phase in analyzer.metrics)
+
+    assert analyzer.metrics['lexical'].counters['tokens'] == len(analyzer.tokens)
+    assert analyzer.metrics['syntax'].counters['statements'] == len(analyzer.parser.nodes)
+    assert analyzer.metrics['intermediate'].counters['quadruples'] == len(analyzer.get_cuadruplos()) > 0
+    assert analyzer.metrics.stats() is None
+
+    analyzer.load("Robot r2")
+    assert list(analyzer.metrics.phases) == []
+    print(analyzer.metrics.format_table() or "(sin etapas tras load)")
+    print("✅ Etapas y contadores correctos")
+
+def test_perfil():
+    """Con profile=True las etapas se capturan con cProfile"""
+    print("\n=== PRUEBA: PERFIL CPROFILE ===")
+    analyzer = RobotLexicalAnalyzer(profile=True)
+    analyzer.analyze(CODIGO)
+    funciones = {name for _, _, name in analyzer.metrics.stats().stats}
+    assert '_scan' in funciones and '_syntax_stage' in funciones
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "analisis.pstats")
+        analyzer.metrics.dump_stats(ruta)
+        assert os.path.getsize(ruta) > 0
+    try:
+        AnalysisMetrics().dump_stats("no.pstats")
+        assert False, "dump_stats sin perfil debería fallar"
+    except ValueError:
+        pass
+    print("✅ Perfil capturado y guardado")
+
+def test_sesion_incremental():
+    """La sesión incremental acumula relex/reparse/collect por edición"""
+    print("\n=== PRUEBA: MÉTRICAS DE LA SESIÓN INCREMENTAL ===")
+    session = IncrementalAnalyzer()
+    session.update(CODIGO)
+    session.update(CODIGO.replace("r1.base = 45", "r1.base = 50"))
+    assert session.metrics['relex'].calls == 2 and session.metrics['collect'].calls == 2
+    assert session.metrics['reparse'].counters['statements'] > 0
+    session.get_cuadruplos()
+    assert session.metrics['intermediate'].counters['quadruples'] > 0
+    print(session.metrics.format_table())
+    print("✅ Ediciones registradas")
+
+def test_combinar():
+    """merge_metrics suma tiempos, ejecuciones y contadores de varios análisis"""
+    print("\n=== PRUEBA: COMBINAR MÉTRICAS ===")
+    medidas = []
+    for codigo in (CODIGO, "Robot r2\nr2.base = 10"):
+        analyzer = RobotLexicalAnalyzer()
+        analyzer.analyze(codigo)
+        medidas.append(analyzer.metrics.as_dict())
+    total = merge_metrics(medidas)
+    assert total['lexical']['calls'] == 2
+    assert total['lexical']['counters']['tokens'] == sum(m['lexical']['counters']['tokens'] for m in medidas)
+    assert 'lexical' in format_metrics_table(total)
+    print("✅ Métricas combinadas")
+
+def test_cli_profile():
+    """--profile guarda el perfil combinado y muestra la tabla de etapas"""
+    print("\n=== PRUEBA: LEXIC BUILD --PROFILE ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        for nombre, codigo in (("a.robot", CODIGO), ("b.robot", "Robot r2\nr2.garra = 10\nr2.espera = 0.5")):
+            with open(os.path.join(tmp, nombre), 'w', encoding='utf-8') as f:
+                f.write(codigo)
+        perfil = os.path.join(tmp, "build.pstats")
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            codigo = lexic.main(['build', tmp, '-j', '1', '-o', os.path.join(tmp, "out"),
+                                 '--no-cache', '--profile', perfil])
+        texto = salida.getvalue()
+        assert codigo == 0, texto
+        assert os.path.getsize(perfil) > 0
+        for etapa in ('lexical', 'syntax', 'semantic', 'asm', 'com', 'mod'):
+            assert f"\n{etapa} " in texto, etapa
+        assert "_build_file" in texto
+        assert [n for n in os.listdir(tmp) if n.endswith('.pstats')] == ["build.pstats"]
+    print("✅ Perfil y tabla de etapas generados")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE MÉTRICAS POR ETAPA")
+    print("=" * 60)
+    test_etapas_del_analizador()
+    test_perfil()
+    test_sesion_incremental()
+    test_combinar()
+    test_cli_profile()
+
+if __name__ == "__main__":
+    main()
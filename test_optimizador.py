@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el optimizador de cuádruplos
+(robot_optimizer): cada pasada, los niveles -O0 a -O2, que el programa
+optimizado deja el robot en la misma posición, los consumidores de los
+cuádruplos optimizados, los .com y .mod generados con -O2 y el resumen de
+`lexic build -O`
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+
+import lexic
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_artifact_cache import shared_artifact_cache
+from robot_quadruples import QuadrupleStore, Cuadruplo
+from robot_optimizer import (PASSES, OptimizationPass, optimize, passes_for_level, execution_profile,
+                             register_pass)
+from simulador_8086 import ejecutar_com
+
+CODIGO = """Robot r1
+r1.velocidad = 50
+r1.velocidad = 50
+r1.repetir = 3
+r1.inicio
+r1.base = 10
+r1.base = 45
+r1.codo = 45
+r1.espera = 0.5
+r1.espera = 1
+r1.base = 45
+r1.fin
+r1.espera = 2
+Robot r2
+r2.repetir = 4
+r2.base = 45"""
+
+# Un movimiento pisado antes de la espera (base = 90) y uno sin efecto (codo = 45)
+MOVIMIENTOS = """Robot r1
+r1.base = 90
+r1.base = 30
+r1.codo = 45
+r1.espera = 1
+r1.codo = 45
+r1.espera = 1
+r1.hombro = 20
+r1.espera = 1"""
+
+def _cuadruplos(codigo=CODIGO):
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(codigo)
+    assert not analyzer.errors, analyzer.errors
+    return analyzer
+
+def _movimientos(cuadruplos):
+    return [(c.resultado, c.arg1, c.arg2) for c in cuadruplos if c.operacion == 'CALL']
+
+def _posiciones(cuadruplos):
+    """Último valor de cada (robot, componente) al terminar el programa"""
+    return {(robot, componente): valor for robot, componente, valor in _movimientos(cuadruplos)
+            if componente != 'espera'}
+
+def test_pasadas():
+    """Cada pasada quita lo que le corresponde y lo informa en sus contadores"""
+    print("=== PRUEBA: PASADAS DEL OPTIMIZADOR ===")
+    cuadruplos = _cuadruplos().get_cuadruplos()
+    assert list(PASSES) == ['copy_propagation', 'dead_moves', 'noop_moves', 'merge_waits', 'jump_threading']
+    contadores = {}
+    for nombre in PASSES:
+        resultado = optimize(cuadruplos, passes=[PASSES[nombre]])
+        contadores[nombre] = resultado.metrics[nombre].counters
+
+    # El contador del robot sin ciclo (CX2) no se lee
+    assert contadores['copy_propagation']['removed'] == 1
+    # base = 10 queda pisada por base = 45 antes de la espera y la primera
+    # velocidad = 50 por la segunda, sin movimientos en el medio
+    assert contadores['dead_moves'] == {'moves': 2, 'removed': 4}
+    # velocidad = 50 repetida y base = 45 después de la espera
+    assert contadores['noop_moves'] == {'moves': 2, 'removed': 4}
+    resultado = optimize(cuadruplos, passes=[PASSES['merge_waits']])
+    assert contadores['merge_waits'] == {'waits': 1, 'removed': 2}
+    assert ('r1', 'espera', 1.5) in _movimientos(resultado.cuadruplos)
+    assert "Espera 1.5 segundos" in resultado.cuadruplos.texts
+    print("✅ Contadores por pasada correctos")
+
+def test_saltos():
+    """Los saltos a un salto van directo al destino; los saltos a la siguiente instrucción se quitan"""
+    print("\n=== PRUEBA: SALTOS ENCADENADOS ===")
+    cuadruplos = QuadrupleStore.from_quadruples([
+        Cuadruplo(0, 'SALTO_INCONDICIONAL', None, None, 'L1', ""),
+        Cuadruplo(1, 'DECLARAR_ETIQUETA', None, None, 'L2', ""),
+        Cuadruplo(2, 'CALL', 'base', 10, 'r1', ""),
+        Cuadruplo(3, 'DECLARAR_ETIQUETA', None, None, 'L1', ""),
+        Cuadruplo(4, 'SALTO_INCONDICIONAL', None, None, 'L3', ""),
+        Cuadruplo(5, 'CALL', 'codo', 20, 'r1', ""),
+        Cuadruplo(6, 'SALTO_INCONDICIONAL', None, None, 'L3', ""),
+        Cuadruplo(7, 'FIN', None, None, 'L3', ""),
+    ])
+    resultado = optimize(cuadruplos, passes=[PASSES['jump_threading']])
+    saltos = [(c.numero, c.resultado) for c in resultado.cuadruplos if c.operacion == 'SALTO_INCONDICIONAL']
+    assert saltos == [(0, 'L3'), (4, 'L3')]
+    assert resultado.metrics['jump_threading'].counters == {'threaded': 1, 'jumps': 1, 'removed': 1}
+    assert execution_profile(resultado.cuadruplos)['executed_moves'] == 0
+    print("✅ 1 salto redirigido y 1 salto quitado")
+
+def test_niveles():
+    """-O0 no cambia nada; -O1 y -O2 dejan el robot en la misma posición con menos movimientos"""
+    print("\n=== PRUEBA: NIVELES -O0 A -O2 ===")
+    analyzer = _cuadruplos()
+    original = analyzer.get_cuadruplos()
+    assert passes_for_level(0) == [] and optimize(original, 0).cuadruplos == original
+    assert [p.name for p in passes_for_level(1)] == ['copy_propagation', 'noop_moves', 'merge_waits',
+                                                     'jump_threading']
+
+    o1, o2 = analyzer.optimize(1), analyzer.optimize(2)
+    assert analyzer.optimize(2) is o2 and analyzer.metrics['optimize'].calls == 2
+    assert len(original) == 30 and len(o1.cuadruplos) == 23 and len(o2.cuadruplos) == 21
+    for resultado in (o1, o2):
+        assert _posiciones(resultado.cuadruplos) == _posiciones(original)
+        assert resultado.after['wait_seconds'] == resultado.before['wait_seconds'] == 6.5
+    assert (o1.before['executed_moves'], o1.after['executed_moves'], o2.after['executed_moves']) == (15, 11, 8)
+    assert "movimientos ejecutados" in o2.format_report() and "dead_moves" in o2.format_report()
+
+    # La optimización no modifica los cuádruplos del análisis
+    assert analyzer.get_cuadruplos() is original and len(original) == 30
+
+    # Un análisis nuevo descarta las optimizaciones anteriores
+    analyzer.load("Robot r1\nr1.base = 10\nr1.base = 10")
+    assert len(analyzer.optimize(1).cuadruplos) == 3
+    try:
+        optimize(original, 3)
+        raise AssertionError("nivel 3 aceptado")
+    except ValueError:
+        pass
+    print(f"✅ {len(original)} → {len(o1.cuadruplos)} (-O1) → {len(o2.cuadruplos)} (-O2) cuádruplos")
+
+def test_pasada_registrada():
+    """Una pasada registrada se aplica en su nivel, después de las existentes"""
+    print("\n=== PRUEBA: PASADAS REGISTRADAS ===")
+    visitas = []
+
+    @register_pass('prueba', 2)
+    def contar(filas, store, contadores):
+        visitas.append(len(filas))
+        contadores['filas'] = len(filas)
+        return filas
+
+    try:
+        assert passes_for_level(2)[-1].name == 'prueba' and 'prueba' not in [p.name for p in passes_for_level(1)]
+        resultado = optimize(_cuadruplos().get_cuadruplos(), 2)
+        assert visitas == [len(resultado.cuadruplos)]
+        assert resultado.metrics['prueba'].counters == {'filas': visitas[0], 'removed': 0}
+        assert isinstance(PASSES['prueba'], OptimizationPass)
+    finally:
+        del PASSES['prueba']
+    print("✅ Pasada aplicada con -O2")
+
+def test_consumidores():
+    """La tabla de cuádruplos y su artefacto usan los cuádruplos del nivel pedido"""
+    print("\n=== PRUEBA: CONSUMIDORES DE LOS CUÁDRUPLOS OPTIMIZADOS ===")
+    analyzer = _cuadruplos()
+    assert analyzer.get_cuadruplos(2) is analyzer.optimize(2).cuadruplos
+    assert analyzer.get_cuadruplos(0) is analyzer.get_cuadruplos()
+    assert "Total de cuádruplos generados: 30" in analyzer.get_formatted_output()
+    assert "Total de cuádruplos generados: 21" in analyzer.get_formatted_output(2)
+
+    directorio, activado = shared_artifact_cache.directory, shared_artifact_cache.enabled
+    with tempfile.TemporaryDirectory() as tmp:
+        shared_artifact_cache.directory = os.path.join(tmp, "cache")
+        shared_artifact_cache.enabled = True
+        try:
+            aciertos = shared_artifact_cache.hits
+            tablas = {}
+            for nivel in (0, 2, 0):
+                ruta = os.path.join(tmp, f"O{nivel}.cuad")
+                analyzer.export_quadruple_table(ruta, nivel)
+                with open(ruta, encoding='utf-8') as f:
+                    tablas.setdefault(nivel, set()).add(f.read())
+            # Cada nivel tiene su propia clave en el caché de artefactos
+            assert len(tablas[0]) == 1 and tablas[0] != tablas[2]
+            assert "Total de cuádruplos generados: 21" in tablas[2].pop()
+            assert shared_artifact_cache.hits == aciertos + 1
+        finally:
+            shared_artifact_cache.directory, shared_artifact_cache.enabled = directorio, activado
+    print("✅ Tabla y artefacto .cuad con -O2")
+
+def test_backends():
+    """Con -O1 y -O2 el .com y el .mod secuencial emiten menos movimientos y llegan a la misma pose"""
+    print("\n=== PRUEBA: .COM Y .MOD OPTIMIZADOS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(os.path.join(tmp, "p.robot"), 'w', encoding='utf-8') as f:
+            f.write(MOVIMIENTOS)
+        mod, pasos = {}, {}
+        for nivel in (0, 1, 2):
+            salida = os.path.join(tmp, f"O{nivel}")
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert lexic.main(['build', tmp, f'-O{nivel}', '-t', 'com,mod', '-j', '1', '--no-cache',
+                                   '-o', salida]) == 0
+            with open(os.path.join(salida, "p.mod"), encoding='utf-8') as f:
+                mod[nivel] = [linea.strip() for linea in f if linea.strip().startswith(("MoveAbsJ", "WaitTime"))]
+            with open(os.path.join(salida, "p.com"), 'rb') as f:
+                salidas, _ = ejecutar_com(f.read())
+            pasos[nivel] = [(puerto, valor) for _, puerto, valor in salidas if puerto in (0, 2, 4) and valor]
+    movimientos = {nivel: [linea for linea in lineas if linea.startswith("MoveAbsJ")] for nivel, lineas in mod.items()}
+    # -O1 quita la parada de codo = 45 (y suma sus esperas); -O2 además lleva la base directo a 30
+    assert [len(movimientos[nivel]) for nivel in (0, 1, 2)] == [4, 3, 2]
+    assert movimientos[0][-1] == movimientos[1][-1] == movimientos[2][-1]
+    assert mod[2].count("WaitTime 2.0;") == 1 and mod[0].count("WaitTime 1.0;") == 3
+    # Base 0 -> 90 -> 30 son 50 + 33 pasos; 0 -> 30 son 17
+    assert len(pasos[0]) == len(pasos[1]) == 50 + 33 + 25 + 11
+    assert len(pasos[2]) == 17 + 25 + 11
+    print(f"✅ MoveAbsJ: {len(movimientos[0])} → {len(movimientos[2])}, pasos del .COM: {len(pasos[0])} → {len(pasos[2])}")
+
+def test_cli():
+    """lexic build -O2 muestra las estadísticas sumadas de todos los programas"""
+    print("\n=== PRUEBA: lexic build -O2 ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        for nombre in ("a.robot", "b.robot"):
+            with open(os.path.join(tmp, nombre), 'w', encoding='utf-8') as f:
+                f.write(CODIGO)
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            codigo = lexic.main(['build', tmp, '-O2', '-t', 'asm', '-j', '1', '--no-cache',
+                                 '-o', os.path.join(tmp, "out")])
+        texto = salida.getvalue()
+        assert codigo == 0, texto
+        assert "OPTIMIZACIÓN (suma de 2 programas)" in texto and "Optimización -O2" in texto
+        assert "cuádruplos                       60 → 42" in texto, texto
+
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            lexic.main(['build', tmp, '-t', 'asm', '-j', '1', '--no-cache', '-o', os.path.join(tmp, "out")])
+        assert "OPTIMIZACIÓN" not in salida.getvalue()
+
+        # El artefacto .cuad tiene los cuádruplos del nivel pedido
+        for nivel, total in (('-O0', 30), ('-O2', 21)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                assert lexic.main(['build', tmp, nivel, '-t', 'cuad', '-j', '1', '--no-cache',
+                                   '-o', os.path.join(tmp, nivel)]) == 0
+            with open(os.path.join(tmp, nivel, "a.cuad"), encoding='utf-8') as f:
+                assert f"Total de cuádruplos generados: {total}" in f.read()
+    print("✅ Resumen de la optimización al final de la compilación")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL OPTIMIZADOR DE CUÁDRUPLOS")
+    print("=" * 60)
+    test_pasadas()
+    test_saltos()
+    test_niveles()
+    test_pasada_registrada()
+    test_consumidores()
+    test_backends()
+    test_cli()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que el parser dirigido por tablas produce
+la misma salida que el parser original, con TokenStream y con listas de Token
+"""
+
+import random
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, RobotParser
+from benchmark_parser import LegacyParser, parser_result
+
+FRAGMENTOS = [
+    "Robot r1", "Robot", "robot R2", "ROBOT 5", "r1.base = 45", "r1.BASE = 45.5", "r1.hombro = -300",
+    "r1.espera = 1.5", "r1.espera = 0", "r1.espera 3", "r1.inicio", "r2.Fin", "r1.girai = 4",
+    "r1.codo =", "r1 .", "r1.", "r1 codo", "r1.repetir = 7", "= 3", "45", "@", "r1.garra = @",
+    "r1.precision = 11", "mueve r1", "r1.velocidad = 10.0", "",
+]
+
+def resultado(parser_class, tokens):
+    """Salida del parser y tokens consumidos por elemento"""
+    parser = parser_class(tokens)
+    posiciones = []
+    while parser.current < len(tokens):
+        parser.parse_statement()
+        posiciones.append(parser.current)
+    return parser_result(parser), posiciones
+
+def test_fragmentos_aleatorios():
+    """Programas aleatorios: igual al parser original si no hay errores sintácticos.
+
+    Con errores la salida difiere a propósito: el parser original salta un
+    token por vez y el actual se recupera en la línea siguiente.
+    """
+    print("=== PRUEBA: PROGRAMAS ALEATORIOS ===")
+    rnd = random.Random(7)
+    validos = 0
+    for _ in range(500):
+        code = "\n".join(rnd.choice(FRAGMENTOS) for _ in range(rnd.randint(1, 12)))
+        analyzer = RobotLexicalAnalyzer()
+        analyzer._scan(code)
+        obtenido = resultado(RobotParser, analyzer.tokens)
+        assert resultado(RobotParser, list(analyzer.tokens)) == obtenido, code
+        original = resultado(LegacyParser, analyzer.tokens)
+        if not original[0][0]:
+            assert obtenido == original, code
+            validos += 1
+    print(f"✅ 500 programas (con TokenStream y con listas de Token); {validos} sin errores idénticos al parser original")
+
+def test_parse_completo():
+    """parse() reporta los mismos errores y la tabla de símbolos esperada"""
+    print("\n=== PRUEBA: PROGRAMA COMPLETO ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze("Robot r1\nr1.base = 45\nr1.espera = 2\nr1.bogus = 3\nr1.codo = x")
+    assert analyzer.parser.errors == ["Error en línea 4: Se esperaba comando del robot",
+                                      "Error en línea 5: Se esperaba valor numérico"]
+    assert [(s.id, s.metodo, s.valor) for s in analyzer.get_tabla_simbolos()] == \
+           [('r1', 'DECLARACION', '-'), ('r1', 'base', 45), ('r1', 'espera', 2.0)]
+    assert analyzer.parser.assignments == [{'robot': 'r1', 'component': 'base', 'value': 45.0, 'line': 2}]
+
+    vacio = RobotParser([])
+    assert not vacio.parse()
+    assert vacio.errors == ["Error: No hay código para analizar"]
+    print(f"✅ Errores: {analyzer.parser.errors}")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL PARSER DIRIGIDO POR TABLAS")
+    print("=" * 60)
+    test_fragmentos_aleatorios()
+    test_parse_completo()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el movimiento simultáneo de los motores en el
+.COM: el reparto de pasos de robot_stepping, que una pose de tres ejes dura lo
+mismo que la de un solo eje y que los pasos son proporcionales al ángulo
+"""
+
+import io
+import contextlib
+
+from robot_stepping import interleaved_ticks, StepModel, HALF_STEP_PHASES
+from create_dynamic_motor_com_v2 import generate_dynamic_machine_code, parse_robot_syntax_complete
+from simulador_8086 import ejecutar_com
+
+PUERTOS = {0x00: 'base', 0x02: 'hombro', 0x04: 'codo'}
+
+def test_reparto():
+    """Cada motor da exactamente sus pasos y todos terminan en el último tick"""
+    print("=== PRUEBA: REPARTO DE PASOS (BRESENHAM) ===")
+    ticks = list(interleaved_ticks({'base': 4, 'hombro': 2, 'codo': 1}))
+    assert ticks == [['base', 'hombro'], ['base', 'codo'], ['base', 'hombro'], ['base']]
+    for pasos in ({'a': 7, 'b': 3, 'c': 5}, {'a': 1, 'b': 1}, {'a': 200, 'b': 13, 'c': 0}):
+        ticks = list(interleaved_ticks(pasos))
+        assert len(ticks) == max(pasos.values())
+        assert {motor: sum(motor in tick for tick in ticks) for motor in pasos} == pasos
+        # Los pasos de cada motor quedan repartidos: nunca dos seguidos más de lo necesario
+        for motor, cantidad in pasos.items():
+            indices = [i for i, tick in enumerate(ticks) if motor in tick]
+            if len(indices) > 1:
+                huecos = {b - a for a, b in zip(indices, indices[1:])}
+                assert max(huecos) - min(huecos) <= 1, (motor, huecos)
+    assert list(interleaved_ticks({})) == [] and list(interleaved_ticks({'a': 0})) == []
+    print("✅ Pasos exactos y repartidos")
+
+def _ejecutar(codigo):
+    """Escrituras a los motores del .COM simulado como (demora acumulada, motor, valor)"""
+    salidas, _ = ejecutar_com(codigo)
+    return [(demora, PUERTOS[puerto], valor) for demora, puerto, valor in salidas if puerto in PUERTOS]
+
+def _generar(movimientos, repeticiones=1, **opciones):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return bytes(generate_dynamic_machine_code({'movimientos': movimientos, 'repeticiones': repeticiones},
+                                                   **opciones))
+
+def _pose(destino, velocidad=1.0):
+    codigo = _generar([{'tipo': 'pose', 'valor': destino, 'velocidad': velocidad, 'espera': 0}])
+    # Sin las escrituras de inicio y apagado (valor 0)
+    return codigo, [salida for salida in _ejecutar(codigo) if salida[2]]
+
+def _fases(salidas, motor):
+    return [valor for _, m, valor in salidas if m == motor]
+
+def test_pose_simultanea():
+    """Los tres motores avanzan en los ticks del más largo: la pose dura lo que un eje"""
+    print("\n=== PRUEBA: POSE DE TRES EJES EN EL .COM ===")
+    _, un_eje = _pose({'base': 90})
+    codigo, tres_ejes = _pose({'base': 90, 'hombro': 45, 'codo': 30})
+    # 200 pasos por vuelta: 50, 25 y 17 pasos
+    assert len(un_eje) == 50 and len(_fases(tres_ejes, 'hombro')) == 25 and len(_fases(tres_ejes, 'codo')) == 17
+    # Mismos instantes que el movimiento de un solo motor, repartidos como interleaved_ticks
+    instantes = [demora for demora, _, _ in un_eje]
+    esperados = list(interleaved_ticks({'base': 50, 'hombro': 25, 'codo': 17}))
+    assert [(demora, motor) for demora, motor, _ in tres_ejes] == \
+        [(instante, motor) for instante, tick in zip(instantes, esperados) for motor in tick]
+    assert _fases(tres_ejes, 'base')[:5] == [0x0C, 0x06, 0x03, 0x09, 0x0C]
+
+    # Regreso: cada motor con la secuencia inversa hasta la fase de partida
+    codigo = _generar([{'tipo': 'pose', 'valor': {'base': 90, 'codo': 30}, 'velocidad': 1.0, 'espera': 0},
+                       {'tipo': 'pose', 'valor': {'base': 0, 'codo': 0}, 'velocidad': 1.0, 'espera': 0}])
+    salidas = [salida for salida in _ejecutar(codigo) if salida[2]]
+    regreso = salidas[50 + 17:]
+    assert _fases(regreso, 'codo')[-4:] == [0x03, 0x06, 0x0C, 0x09]
+    assert regreso[-1][0] - regreso[0][0] == instantes[-1] - instantes[0]
+    # El ciclo principal repite la ida y la vuelta
+    repetido = [salida for salida in _ejecutar(_generar([{'tipo': 'pose', 'valor': {'base': 90, 'codo': 30},
+                                                          'velocidad': 1.0, 'espera': 0},
+                                                         {'tipo': 'pose', 'valor': {'base': 0, 'codo': 0},
+                                                          'velocidad': 1.0, 'espera': 0}], 3)) if salida[2]]
+    assert [(motor, valor) for _, motor, valor in repetido] == 3 * [(motor, valor) for _, motor, valor in salidas]
+    print(f"✅ {len(tres_ejes)} pasos en {len(set(d for d, _, _ in tres_ejes))} ticks con {len(codigo)} bytes")
+
+def test_pasos_proporcionales():
+    """Los pasos siguen al ángulo y al modelo del motor; el código no crece con el ángulo"""
+    print("\n=== PRUEBA: PASOS PROPORCIONALES AL ÁNGULO ===")
+    corto, salidas = _pose({'base': 9}, 0.1)
+    largo, _ = _pose({'base': 270}, 0.1)
+    assert len(salidas) == 5 and len(corto) == len(largo)
+    # Medio paso con reducción 3:1 en el hombro: 1200 fases por vuelta del eje
+    codigo = _generar([{'tipo': 'pose', 'valor': {'hombro': 90}, 'velocidad': 1.0, 'espera': 0}],
+                      step_models={'hombro': StepModel(200, 3, half_step=True)})
+    fases = [valor for valor in _fases(_ejecutar(codigo), 'hombro') if valor]
+    assert len(fases) == 300 and fases[:8] == list(HALF_STEP_PHASES[1:]) + [HALF_STEP_PHASES[0]]
+    # Sin error acumulado: diez movimientos de 1° dan los mismos pasos que uno de 10°
+    codigo = _generar([{'tipo': 'pose', 'valor': {'codo': g}, 'velocidad': 0.1, 'espera': 0} for g in range(1, 11)])
+    assert len(_fases(_ejecutar(codigo), 'codo')) - 2 == StepModel().steps(0, 10) == 6
+    # Los grados del programa no se truncan: 2,7° son 1,5 pasos y se redondean a 2
+    with contextlib.redirect_stdout(io.StringIO()):
+        valores = parse_robot_syntax_complete("Robot r1\nr1.base = 2.7")
+    assert valores['movimientos'][0]['valor'] == {'base': 2.7}
+    assert len([salida for salida in _ejecutar(_generar(valores['movimientos'])) if salida[2]]) == 2
+    print(f"✅ {len(corto)} bytes para 9° y para 270°")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE PASOS INTERCALADOS")
+    print("=" * 60)
+    test_reparto()
+    test_pose_simultanea()
+    test_pasos_proporcionales()
+
+if __name__ == "__main__":
+    main()
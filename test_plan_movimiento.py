@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el plan de movimiento (robot_motion): las
+asignaciones entre esperas se pliegan en un solo movimiento coordinado, los
+niveles -O1 y -O2 del plan y los generadores .mod, .COM y ASM leen el mismo
+plan
+"""
+
+import io
+import os
+import tempfile
+import contextlib
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_loops import Loop, loop_structure
+from robot_motion import Segment, motion_plan, final_pose, segments
+from robodk_sequential_generator import RoboDKSequentialGenerator
+from robodk_safe_generator import RoboDKSafeGenerator
+from create_dynamic_motor_com_v2 import motor_values_from_program
+from create_dynamic_asm_generator import DynamicASMGenerator
+
+# Tres poses de tres ejes cada una
+PICK_AND_PLACE = """Robot r1
+r1.velocidad = 50
+r1.base = 45
+r1.hombro = 60
+r1.codo = 30
+r1.espera = 1
+r1.codo = 10
+r1.garra = 20
+r1.hombro = 70
+r1.espera = 0.5
+r1.base = 120
+r1.hombro = 40
+r1.codo = 35
+r1.espera = 1"""
+
+def _programa(codigo):
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(codigo)
+    assert not analyzer.errors, analyzer.errors
+    return analyzer
+
+def _plan(codigo, **opciones):
+    return motion_plan(loop_structure(_programa(codigo).get_program()), 50, 5, **opciones)
+
+def test_plegado():
+    """Las asignaciones entre esperas forman un segmento con la pose completa"""
+    print("=== PRUEBA: SEGMENTOS COORDINADOS ===")
+    plan = _plan(PICK_AND_PLACE)
+    assert [(s.moved, s.dwell) for s in plan] == [(('base', 'hombro', 'codo'), 1.0),
+                                                  (('codo', 'garra', 'hombro'), 0.5),
+                                                  (('base', 'hombro', 'codo'), 1.0)]
+    assert plan[1].start == plan[0].pose and plan[1].targets == {'codo': 10.0, 'garra': 20.0, 'hombro': 70.0}
+    assert plan[1].pose == {'base': 45.0, 'hombro': 70.0, 'codo': 10.0, 'muneca': 0.0, 'inclinacion': 0.0,
+                            'garra': 20.0}
+    assert (plan[0].line, plan[0].end_line) == (3, 6)
+    print(f"✅ {sum(len(s.moved) for s in plan)} asignaciones en {len(plan)} movimientos")
+
+def test_cortes():
+    """Un eje repetido, un cambio de velocidad o un ciclo cierran el segmento"""
+    print("\n=== PRUEBA: CORTES DE SEGMENTO ===")
+    plan = _plan("Robot r1\nr1.espera = 1\nr1.espera = 2\nr1.base = 10\nr1.codo = 5\nr1.base = 20\n"
+                 "r1.velocidad = 50\nr1.hombro = 5\nr1.velocidad = 80\nr1.espera = 1\nr1.espera = 0.5\n"
+                 "r1.precision = 1\nr1.garra = 3")
+    assert plan == [
+        Segment('r1', plan[0].start, plan[0].pose, (), 50, 5, 3.0, 2, 3),
+        Segment('r1', plan[1].start, plan[1].pose, ('base', 'codo'), 50, 5, 0, 4, 5),
+        Segment('r1', plan[2].start, plan[2].pose, ('base', 'hombro'), 50, 5, 1.5, 6, 11),
+        Segment('r1', plan[3].start, plan[3].pose, ('garra',), 80, 1.0, 0, 13, 13),
+    ]
+    # La espera después del cambio de velocidad se suma al segmento anterior (sin movimientos en el medio)
+    assert plan[2].speed == 50 and plan[2].dwell == 1.5
+    plan = _plan("Robot r1\nr1.velocidad = 80\nr1.espera = 1\nr1.espera = 0.5")
+    assert [(s.moved, s.speed, s.dwell) for s in plan] == [((), 80.0, 1.5)]
+
+    # Cada ciclo empieza y termina con sus propios segmentos
+    plan = _plan("Robot r1\nr1.base = 10\nr1.repetir = 3\nr1.inicio\nr1.codo = 5\nr1.hombro = 2\nr1.fin\nr1.garra = 1")
+    assert [type(item) for item in plan] == [Segment, Loop, Segment]
+    assert [s.moved for s in plan[1].body] == [('codo', 'hombro')] and plan[1].count == 3
+    assert [s.moved for s in segments(plan)] == [('base',), ('codo', 'hombro'), ('garra',)]
+    assert final_pose(plan, plan[0].start) == {'base': 10.0, 'hombro': 2.0, 'codo': 5.0, 'muneca': 0.0,
+                                               'inclinacion': 0.0, 'garra': 1.0}
+    # Solo los ejes pedidos
+    plan = _plan("Robot r1\nr1.base = 10\nr1.garra = 3\nr1.codo = 5", axes=('base', 'codo'))
+    assert [s.targets for s in plan] == [{'base': 10.0, 'codo': 5.0}]
+    print("✅ Cortes por eje repetido, velocidad, precisión y ciclos")
+
+def test_niveles():
+    """-O1 quita los ejes que ya están en su valor; -O2 no corta el segmento al repetir un eje"""
+    print("\n=== PRUEBA: PLAN OPTIMIZADO ===")
+    codigo = ("Robot r1\nr1.base = 10\nr1.codo = 5\nr1.base = 20\nr1.espera = 1\nr1.codo = 5\nr1.espera = 1\n"
+              "r1.hombro = 3\nr1.hombro = 0\nr1.espera = 1")
+    assert [(s.moved, s.dwell) for s in _plan(codigo)] == [(('base', 'codo'), 0), (('base',), 1.0),
+                                                          (('codo',), 1.0), (('hombro',), 0),
+                                                          (('hombro',), 1.0)]
+    # codo = 5 ya está en 5: su espera se suma a la parada anterior
+    assert [(s.moved, s.dwell) for s in _plan(codigo, level=1)] == [(('base', 'codo'), 0), (('base',), 2.0),
+                                                                   (('hombro',), 0), (('hombro',), 1.0)]
+    # La base va directo a 20 y el hombro vuelve al valor de partida (0 no es conocido: se mueve)
+    plan = _plan(codigo, level=2)
+    assert [(s.moved, s.dwell) for s in plan] == [(('base', 'codo'), 2.0), (('hombro',), 1.0)]
+    assert plan[0].targets == {'base': 20.0, 'codo': 5.0} and plan[1].targets == {'hombro': 0.0}
+    plan = _plan("Robot r1\nr1.hombro = 0\nr1.espera = 1\nr1.hombro = 3\nr1.hombro = 0\nr1.espera = 1",
+                 level=2)
+    assert [(s.moved, s.dwell) for s in plan] == [(('hombro',), 2.0)]
+
+    # Dentro de un ciclo el valor de la primera vuelta no vale para las siguientes
+    codigo = "Robot r1\nr1.codo = 30\nr1.repetir = 3\nr1.inicio\nr1.codo = 30\nr1.espera = 1\nr1.codo = 0\nr1.fin"
+    for nivel in (0, 1, 2):
+        plan = _plan(codigo, level=nivel)
+        assert [s.moved for s in plan[1].body] == [('codo',), ('codo',)], nivel
+    print("✅ Movimientos sin efecto y pisados fuera del plan")
+
+def _generar(generador, codigo):
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        os.chdir(tmp)
+        try:
+            assert generador.generate_mod_file(codigo, "programa.mod")[0]
+            with open("programa.mod", encoding='utf-8') as f:
+                return f.read()
+        finally:
+            os.chdir(cwd)
+
+def test_generadores_mod():
+    """Una parada por pose en los .mod secuencial y seguro"""
+    print("\n=== PRUEBA: .MOD CON MOVIMIENTOS COORDINADOS ===")
+    contenido = _generar(RoboDKSequentialGenerator(), PICK_AND_PLACE)
+    assert contenido.count("MoveAbsJ") == 3 and contenido.count("WaitTime") == 3
+    assert "Mover base de 0.0° a 45.0°, hombro de 0.0° a 60.0°, codo de 0.0° a 30.0°" in contenido
+    assert "MoveAbsJ [[45.0,60.0,-30.0,0.0,0.0,0.0]" in contenido
+    assert "Total de pasos ejecutados: 6" in contenido
+
+    generador = RoboDKSafeGenerator()
+    contenido = _generar(generador, PICK_AND_PLACE.replace("r1.hombro = 60", "r1.hombro = 130"))
+    assert contenido.count("MoveAbsJ") == 3 + 2  # más la posición inicial y final seguras
+    assert "hombro de 0.0° a 100.0° (limitado desde 130.0°)" in contenido
+    assert "Movimientos limitados por seguridad: 1" in generador.get_safety_report()
+    print("✅ 9 asignaciones en 3 MoveAbsJ")
+
+def test_com_y_asm():
+    """El .COM recibe una pose por segmento y el ASM la pose final del plan"""
+    print("\n=== PRUEBA: .COM Y ASM DESDE EL PLAN ===")
+    analyzer = _programa(PICK_AND_PLACE)
+    with contextlib.redirect_stdout(io.StringIO()):
+        valores = motor_values_from_program(analyzer.get_program())
+        asm = DynamicASMGenerator().extract_motor_values(analyzer)
+    assert valores['movimientos'] == [
+        {'tipo': 'pose', 'valor': {'base': 45, 'hombro': 60, 'codo': 30}, 'velocidad': 50.0, 'espera': 1.0},
+        {'tipo': 'pose', 'valor': {'codo': 10, 'hombro': 70}, 'velocidad': 50.0, 'espera': 0.5},
+        {'tipo': 'pose', 'valor': {'base': 120, 'hombro': 40, 'codo': 35}, 'velocidad': 50.0, 'espera': 1.0},
+    ]
+    assert asm == {'base': 120.0, 'hombro': 40.0, 'codo': 35.0, 'velocidad': 50.0, 'espera': 1.0}
+    print(f"✅ {len(valores['movimientos'])} poses .COM")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL PLAN DE MOVIMIENTO")
+    print("=" * 60)
+    test_plegado()
+    test_cortes()
+    test_niveles()
+    test_generadores_mod()
+    test_com_y_asm()
+
+if __name__ == "__main__":
+    main()
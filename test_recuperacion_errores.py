@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar la recuperación de errores del parser
+(modo pánico por líneas), el límite de errores, el modo de falla rápida y
+el formato diferido de los diagnósticos
+"""
+
+import random
+import time
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_incremental import IncrementalAnalyzer
+from robot_diagnostics import DiagnosticList
+
+def test_recuperacion_por_linea():
+    """Un error descarta el resto de su línea y el análisis sigue en la siguiente"""
+    print("=== PRUEBA: RECUPERACIÓN EN LA LÍNEA SIGUIENTE ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze("Robot r1\nr1.base 5 r1.codo = 3\nr1.codo = 4\n~x\nRobot r2")
+    assert analyzer.errors == ["Error léxico en línea 4, columna 1: Caracter no reconocido '~'",
+                               "Error en línea 2: Se esperaba '='",
+                               "Error en línea 5: Se esperaba '.'"]
+    assert [(s.id, s.metodo) for s in analyzer.get_tabla_simbolos()] == \
+           [('r1', 'DECLARACION'), ('r1', 'codo'), ('r2', 'DECLARACION')]
+    print(f"✅ Errores: {list(analyzer.errors)}")
+
+def test_limite_de_errores():
+    """max_errors detiene el análisis; fail_fast lo detiene en el primer error"""
+    print("\n=== PRUEBA: LÍMITE DE ERRORES Y FALLA RÁPIDA ===")
+    code = "Robot r1\n" + "r1.base = @\n" * 1000
+    completo = RobotLexicalAnalyzer()
+    completo.analyze(code)
+    assert len(completo.errors) == 2000 and not completo.truncated
+
+    limitado = RobotLexicalAnalyzer(max_errors=10)
+    limitado.analyze(code)
+    assert limitado.errors == completo.errors[:10]
+    assert limitado.truncated and not limitado.syntax_valid
+    assert "⛔ Análisis detenido al alcanzar el máximo de 10 errores" in limitado.get_formatted_output()
+
+    rapido = RobotLexicalAnalyzer(fail_fast=True)
+    rapido.analyze("Robot r1\nr1.base 5\nr1.codo = 3\nr1.hombro 2")
+    assert rapido.errors == ["Error en línea 2: Se esperaba '='"] and rapido.truncated
+
+    session = IncrementalAnalyzer(max_errors=3)
+    session.analyze(code)
+    assert session.errors == completo.errors[:3] and session.truncated
+    print(f"✅ {len(limitado.errors)} de {len(completo.errors)} errores con max_errors=10")
+
+def test_formato_diferido():
+    """Los mensajes se formatean al leerlos y se comportan como una lista de str"""
+    print("\n=== PRUEBA: FORMATO DIFERIDO ===")
+    errores = DiagnosticList(limit=2)
+    errores.add("Error en línea {}: {}", 3, "Se esperaba '.'")
+    errores.append("Error: No hay código para analizar")
+    assert not errores.add("Error en línea {}", 9)
+    assert errores.full and errores.dropped == 1
+    assert type(errores._items[0]) is tuple
+    assert errores == ["Error en línea 3: Se esperaba '.'", "Error: No hay código para analizar"]
+    assert "\n".join(errores).startswith("Error en línea 3")
+    assert errores[-1:] == ["Error: No hay código para analizar"]
+    print(f"✅ {errores}")
+
+def test_basura_en_tiempo_lineal():
+    """Un texto sin sentido se analiza en tiempo lineal y se detiene con el límite"""
+    print("\n=== PRUEBA: TEXTO SIN SENTIDO ===")
+    rnd = random.Random(3)
+    alfabeto = "r1.base= 45 Robot\n#(){}-*/!&"
+    tiempos = []
+    for size in (100_000, 400_000):
+        texto = "".join(rnd.choice(alfabeto) for _ in range(size))
+        analyzer = RobotLexicalAnalyzer()
+        start = time.perf_counter()
+        analyzer.analyze(texto)
+        tiempos.append(time.perf_counter() - start)
+    assert tiempos[1] < tiempos[0] * 8
+
+    analyzer = RobotLexicalAnalyzer(max_errors=100)
+    analyzer.analyze(texto + "@" * 1_000_000)
+    assert len(analyzer.errors) == 100 and analyzer.truncated
+    print(f"✅ 100k caracteres: {tiempos[0]:.2f} s, 400k caracteres: {tiempos[1]:.2f} s")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE RECUPERACIÓN DE ERRORES")
+    print("=" * 60)
+    test_recuperacion_por_linea()
+    test_limite_de_errores()
+    test_formato_diferido()
+    test_basura_en_tiempo_lineal()
+
+if __name__ == "__main__":
+    main()
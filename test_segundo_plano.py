@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar la ejecución en segundo plano de la interfaz
+(robot_worker): entrega de eventos en el hilo que llama a poll(), avance por
+etapas, cancelación de trabajos viejos, errores, análisis compartidos entre
+hilos y las acciones de main.py sin bloquear el hilo de la interfaz
+"""
+
+import threading
+
+import main as interfaz
+from robot_worker import BackgroundWorker, JobCancelled
+from robot_analysis_cache import AnalysisCache
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_incremental import IncrementalAnalyzer
+
+CODIGO = "Robot r1\nr1.velocidad = 50\nr1.base = 45\nr1.espera = 1\nr1.codo = 30"
+
+def test_eventos_en_el_hilo_de_poll():
+    """Avance y resultado se entregan recién en poll(), en el hilo que la llama"""
+    print("=== PRUEBA: EVENTOS EN EL HILO DE LA INTERFAZ ===")
+    worker = BackgroundWorker()
+    eventos = []
+
+    def trabajo(job, n):
+        for i in range(n):
+            job.progress(f"paso {i}", (i + 1) / n)
+        return threading.get_ident()
+
+    job = worker.submit(trabajo, 3, on_progress=lambda m, f: eventos.append((m, threading.get_ident())),
+                        on_done=lambda hilo: eventos.append(('fin', hilo)))
+    job._future.result()
+    assert eventos == [] and worker.busy
+    worker.wait()
+    yo = threading.get_ident()
+    assert [m for m, _ in eventos[:3]] == ["paso 0", "paso 1", "paso 2"]
+    assert all(hilo == yo for _, hilo in eventos[:3])
+    assert eventos[3][0] == 'fin' and eventos[3][1] != yo  # el trabajo corrió en otro hilo
+    assert job.finished and job.fraction == 1.0 and not worker.busy
+    worker.shutdown()
+    print("✅ Callbacks en el hilo de poll(), trabajo en el worker")
+
+def test_cancelar_trabajo_viejo():
+    """Un trabajo nuevo con la misma clave cancela al anterior y descarta su resultado"""
+    print("\n=== PRUEBA: CANCELACIÓN DE TRABAJOS VIEJOS ===")
+    worker = BackgroundWorker()
+    liberar = threading.Event()
+    resultados, cancelados = [], []
+
+    def lento(job, valor):
+        liberar.wait(5)
+        job.progress("después de esperar")  # ya cancelado: lanza JobCancelled
+        return valor
+
+    def rapido(job, valor):
+        return valor
+
+    viejo = worker.submit(lento, 'viejo', key='analysis', on_done=resultados.append,
+                          on_cancel=lambda: cancelados.append('viejo'))
+    nuevo = worker.submit(rapido, 'nuevo', key='analysis', on_done=resultados.append)
+    assert viejo.cancelled and not nuevo.cancelled and worker.running('analysis') is nuevo
+    liberar.set()
+    worker.wait(5)
+    assert resultados == ['nuevo'] and cancelados == ['viejo']
+    assert worker.running('analysis') is None
+
+    # Un resultado que llega después de cancelar también se descarta
+    job = worker.submit(rapido, 'tarde', on_done=resultados.append, on_cancel=lambda: cancelados.append('tarde'))
+    job._future.result()
+    job.cancel()
+    worker.poll()
+    assert resultados == ['nuevo'] and cancelados == ['viejo', 'tarde']
+    worker.shutdown()
+    print("✅ Resultados de trabajos cancelados descartados")
+
+def test_errores():
+    """Las excepciones del trabajo llegan a on_error"""
+    print("\n=== PRUEBA: ERRORES ===")
+    worker = BackgroundWorker()
+    errores = []
+
+    def falla(job):
+        raise ValueError("sin DOSBox")
+
+    worker.submit(falla, on_error=errores.append)
+    worker.wait(5)
+    assert len(errores) == 1 and isinstance(errores[0], ValueError)
+    assert issubclass(JobCancelled, Exception)
+    worker.shutdown()
+    print("✅ on_error recibe la excepción")
+
+def test_analisis_compartido_entre_hilos():
+    """Un análisis del caché leído desde varios hilos ejecuta cada etapa una sola vez"""
+    print("\n=== PRUEBA: ANÁLISIS COMPARTIDO ENTRE HILOS ===")
+    codigo = "\n".join(["Robot r1"] + [f"r1.base = {i % 90}" for i in range(3000)])
+    referencia = RobotLexicalAnalyzer()
+    referencia.load(codigo)
+    esperado = [str(c) for c in referencia.get_cuadruplos()]
+
+    for _ in range(5):
+        analyzer = RobotLexicalAnalyzer()
+        analyzer.load(codigo)
+        salidas = []
+        hilos = [threading.Thread(target=lambda: salidas.append([str(c) for c in analyzer.get_cuadruplos()]))
+                 for _ in range(4)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        assert len(salidas) == 4 and all(salida == esperado for salida in salidas)
+        assert all(phase.calls == 1 for phase in analyzer.metrics)
+    print("✅ Mismos cuádruplos en todos los hilos, cada etapa ejecutada una vez")
+
+def test_avance_de_la_compilacion():
+    """compile_executable_job informa cada paso de generate_and_compile"""
+    print("\n=== PRUEBA: AVANCE DE LA COMPILACIÓN ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(CODIGO + "\nr1.garra = 17")
+    compilados = []
+    analyzer.compile_to_executable = lambda asm, nombre: compilados.append(nombre) or (False, "DOSBox no disponible")
+    worker = BackgroundWorker()
+    pasos, resultados = [], []
+    worker.submit(interfaz.compile_executable_job, analyzer, "prueba_avance", ".",
+                  on_progress=lambda m, f: pasos.append((m, f)), on_done=resultados.append)
+    worker.wait(30)
+    assert compilados == ["prueba_avance"]
+    assert [m for m, _ in pasos] == ["Buscando en el caché de artefactos...", "Generando código ensamblador...",
+                                     "Compilando con DOSBox + TASM..."]
+    assert [f for _, f in pasos] == sorted(f for _, f in pasos)
+    assert resultados[0]['success'] is False and resultados[0]['message'].endswith("DOSBox no disponible")
+    worker.shutdown()
+    print("✅ Pasos informados en orden")
+
+class _Editor:
+    def __init__(self, codigo):
+        self.codigo = codigo
+
+    def get(self, start, end=None):
+        # Como Tk: 'end' incluye el salto de línea final y 'end-1c' no
+        return self.codigo if end == 'end-1c' else self.codigo + "\n"
+
+def test_analizar_desde_la_interfaz():
+    """analyze_code analiza en la sesión incremental del editor y muestra el resultado al entregarlo"""
+    print("\n=== PRUEBA: ANALIZAR CÓDIGO SIN BLOQUEAR ===")
+    gui = interfaz.LexicalAnalyzerGUI.__new__(interfaz.LexicalAnalyzerGUI)
+    gui.worker = BackgroundWorker()
+    gui.live_worker = BackgroundWorker()
+    gui.live_session = IncrementalAnalyzer()
+    gui.analysis_cache = AnalysisCache()
+    gui.analyzer = None
+    gui.code_editor = _Editor(CODIGO)
+    estados, salidas = [], []
+    gui.update_status = estados.append
+    gui.update_output = lambda texto, tag="info": salidas.append((texto, tag))
+
+    gui.analyze_code()
+    assert salidas == []  # el análisis no corre en el hilo de la interfaz
+    gui.live_worker.wait(5)
+    assert len(salidas) == 1 and salidas[0][1] == "success" and "ANALIZADOR" in salidas[0][0]
+    assert "🔍 Análisis incremental..." in estados and estados[-1] == "Análisis completado: 22 tokens"
+    # La salida es la misma que la de un análisis completo
+    completo = RobotLexicalAnalyzer()
+    completo.analyze(CODIGO)
+    assert salidas[0][0] == completo.get_formatted_output()
+    # Los generadores siguen usando el caché compartido, que 'Analizar' no toca
+    assert gui.analyzer is None and gui.analysis_cache.misses == 0
+
+    # Editar una línea y volver a analizar solo re-escanea esa línea
+    relex = gui.live_session.metrics['relex']
+    lineas = relex.counters['lines']
+    gui.code_editor = _Editor(CODIGO.replace("r1.base = 45", "r1.base = 90"))
+    gui.analyze_code()
+    gui.live_worker.wait(5)
+    assert relex.counters['lines'] == lineas + 1 and "90" in salidas[-1][0]
+
+    # Un análisis nuevo cancela el que está en curso
+    gui.code_editor = _Editor(CODIGO + "\nr1.codo = 10")
+    gui.analyze_code()
+    primero = gui.live_worker.running('analysis')
+    gui.code_editor = _Editor(CODIGO + "\nr1.codo = 20")
+    gui.analyze_code()
+    gui.live_worker.wait(5)
+    assert primero.cancelled and len(salidas) == 3
+    assert gui.live_session.source_code.endswith("r1.codo = 20")
+    gui.worker.shutdown()
+    gui.live_worker.shutdown()
+    print("✅ Resultado entregado por poll(), solo la línea editada se reanalizó")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE EJECUCIÓN EN SEGUNDO PLANO")
+    print("=" * 60)
+    test_eventos_en_el_hilo_de_poll()
+    test_cancelar_trabajo_viejo()
+    test_errores()
+    test_analisis_compartido_entre_hilos()
+    test_avance_de_la_compilacion()
+    test_analizar_desde_la_interfaz()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar que el análisis semántico de una sola pasada
+produce los mismos diagnósticos que el analizador original y expone los
+índices de la tabla de símbolos
+"""
+
+import random
+
+from robot_lexical_analyzer import RobotParser, SemanticAnalyzer
+from benchmark_parser import scan
+from benchmark_semantic import LegacySemanticAnalyzer, semantic_result, run_benchmark
+
+FRAGMENTOS = [
+    "Robot r1", "Robot r2", "Robot r1", "r1.base = 45", "r2.base = 180", "r1.hombro = -90",
+    "r1.codo = 500", "r3.garra = 10", "r3.inicio", "r3.fin", "r1.espera = 60", "r1.espera = 0.05",
+    "r2.velocidad = 25", "r1.repetir = 101", "r1.precision = 10", "r4.espera = 2", "r1.base = x",
+]
+
+def test_mismos_diagnosticos():
+    """Programas aleatorios: mismos errores y advertencias que el analizador original"""
+    print("=== PRUEBA: MISMOS DIAGNÓSTICOS ===")
+    rnd = random.Random(11)
+    for _ in range(300):
+        code = "\n".join(rnd.choice(FRAGMENTOS) for _ in range(rnd.randint(1, 15)))
+        parser = RobotParser(scan(code))
+        parser.parse()
+        original = LegacySemanticAnalyzer()
+        original.analyze(parser)
+        actual = SemanticAnalyzer()
+        assert actual.analyze(parser) == (not original.errors)
+        assert semantic_result(actual) == semantic_result(original), code
+    print("✅ 300 programas con los mismos diagnósticos")
+
+def test_indices():
+    """Índices por robot, por componente y por línea"""
+    print("\n=== PRUEBA: ÍNDICES DE LA TABLA DE SÍMBOLOS ===")
+    parser = RobotParser(scan("Robot r1\nr1.base = 45\nr1.base = 90 r1.codo = 10\nRobot r2\nr3.garra = 5"))
+    parser.parse()
+    analyzer = SemanticAnalyzer()
+    analyzer.analyze(parser)
+    assert analyzer.declared_robots == {'r1': 1, 'r2': 4}
+    assert analyzer.robot_assignments == {'r1': {'base': [2, 3], 'codo': [3]}, 'r2': {}, 'r3': {'garra': [5]}}
+    assert [s.valor for s in analyzer.component_symbols['base']] == [45, 90]
+    assert [s.metodo for s in analyzer.line_symbols[3]] == ['base', 'codo']
+    assert analyzer.errors == ["Error semántico en línea 5: Robot 'r3' usado sin haber sido declarado"]
+    print(f"✅ {len(analyzer.line_symbols)} líneas indexadas")
+
+def test_costo_relativo():
+    """El análisis semántico cuesta menos del 10% del léxico + sintáctico"""
+    print("\n=== PRUEBA: COSTO DEL ANÁLISIS SEMÁNTICO ===")
+    result = run_benchmark(50_000, repeat=3)
+    assert result['fused_fraction'] < 0.10
+    print(f"✅ {result['fused_fraction']:.1%} del tiempo léxico + sintáctico")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL ANÁLISIS SEMÁNTICO INDEXADO")
+    print("=" * 60)
+    test_mismos_diagnosticos()
+    test_indices()
+    test_costo_relativo()
+
+if __name__ == "__main__":
+    main()
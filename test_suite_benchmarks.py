@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar la suite de benchmarks: el generador de
+programas sintéticos, la medición de cada etapa y la comparación contra
+una línea base JSON
+"""
+
+import os
+import tempfile
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer
+from robot_ast import Block, Repeat, Wait
+from benchmark_suite import (generate_synthetic_program, parse_size, run_suite, compare,
+                             save_results, load_results, PHASES)
+
+def test_programa_sintetico():
+    """El programa tiene el tamaño pedido, varios robots y bloques anidados, y es válido"""
+    print("=== PRUEBA: PROGRAMA SINTÉTICO ===")
+    for statements in (1_000, 5_000):
+        code = generate_synthetic_program(statements, robots=3, seed=7)
+        assert len(code.split('\n')) == statements
+        assert code == generate_synthetic_program(statements, robots=3, seed=7)
+
+        analyzer = RobotLexicalAnalyzer()
+        analyzer.analyze(code)
+        assert analyzer.syntax_valid and not [e for e in analyzer.errors if e.startswith("Error")]
+        program = analyzer.get_program()
+        assert [robot.name for robot in program.robots] == ['r1', 'r2', 'r3']
+        blocks = [node for node in program.body if type(node) is Block]
+        assert blocks and all(block.end_line for block in blocks)
+        assert any(type(node) is Block for block in blocks for node in block.body)
+        nodes = list(program.walk())
+        assert any(type(node) is Repeat for node in nodes) and any(type(node) is Wait for node in nodes)
+    assert parse_size("10k") == 10_000 and parse_size("1M") == 1_000_000 and parse_size("250") == 250
+    print(f"✅ {len(blocks)} bloques de nivel superior en {statements} sentencias")
+
+def test_suite_y_linea_base():
+    """Cada etapa se mide y la comparación detecta regresiones"""
+    print("\n=== PRUEBA: MEDICIÓN Y LÍNEA BASE ===")
+    results = run_suite([1_000], repeat=1)
+    etapas = results['sizes']['1000']
+    assert list(etapas) == list(PHASES)
+    assert all(r['seconds'] > 0 and r['peak_bytes'] is not None for r in etapas.values())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "baseline.json")
+        save_results(results, path)
+        baseline = load_results(path)
+    assert not any(row[5] for row in compare(results, baseline))
+
+    baseline['sizes']['1000']['parser']['seconds'] = etapas['parser']['seconds'] / 2
+    rows = compare(results, baseline, threshold=1.5)
+    assert [(row[1], row[5]) for row in rows if row[5]] == [('parser', True)]
+    print(f"✅ {len(etapas)} etapas medidas")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DE LA SUITE DE BENCHMARKS")
+    print("=" * 60)
+    test_programa_sintetico()
+    test_suite_y_linea_base()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Script de prueba para verificar el TokenStream compacto del analizador léxico
+y su compatibilidad con el código que espera objetos Token
+"""
+
+from robot_lexical_analyzer import RobotLexicalAnalyzer, Simbolo, Cuadruplo
+from robot_token_stream import Token, TokenStream, TOKEN_TYPE_IDS
+
+CODIGO = """Robot r1
+r1.base = 45
+r1.hombro = -30.5 // comentario
+r1.garra = @"""
+
+def test_acceso_compatible():
+    """Indexado, recorte e iteración producen objetos Token"""
+    print("=== PRUEBA: ACCESO COMPATIBLE CON Token ===")
+    analyzer = RobotLexicalAnalyzer()
+    tokens, errors = analyzer.analyze(CODIGO)
+    assert isinstance(tokens, TokenStream)
+    assert isinstance(tokens[0], Token)
+    assert (tokens[0].type, tokens[0].value, tokens[0].line, tokens[0].column) == ('KEYWORD', 'Robot', 1, 1)
+    assert tokens[-1].type == 'UNKNOWN' and tokens[-1].value == '@'
+    assert [t.value for t in tokens[2:5]] == ['r1', '.', 'base']
+    assert [t.value for t in tokens] == [tokens.text(i) for i in range(len(tokens))]
+    assert len(list(tokens)) == len(tokens) == 17
+    print(f"✅ {len(tokens)} tokens accesibles como Token: {tokens[:3]}")
+
+def test_texto_perezoso():
+    """El texto y los números se obtienen de la fuente y de los arreglos"""
+    print("\n=== PRUEBA: TEXTO Y NÚMEROS DESDE LOS ARREGLOS ===")
+    analyzer = RobotLexicalAnalyzer()
+    analyzer.analyze(CODIGO)
+    tokens = analyzer.tokens
+    assert tokens.source is not None
+    indice = [t.value for t in tokens].index('-30.5')
+    assert tokens.type(indice) == 'FLOAT_LITERAL'
+    assert tokens.number(indice) == -30.5
+    assert tokens.number(0) is None
+    assert tokens.kinds[indice] == TOKEN_TYPE_IDS['FLOAT_LITERAL']
+    assert tokens.source[tokens.starts[indice]:tokens.ends[indice]] == '-30.5'
+    assert tokens.type_counts()['KEYWORD'] == 4
+    print(f"✅ Tipos contados: {tokens.type_counts()}")
+
+def test_errores_de_rango():
+    """Los índices fuera de rango se comportan como en una lista"""
+    print("\n=== PRUEBA: ÍNDICES FUERA DE RANGO ===")
+    stream = TokenStream("r1")
+    stream.append(TOKEN_TYPE_IDS['IDENTIFIER'], 0, 2, 1, 1)
+    assert stream[0].value == 'r1' and stream[0].number is None
+    try:
+        stream[1]
+        assert False, "se esperaba IndexError"
+    except IndexError:
+        pass
+    assert not TokenStream()
+    print("✅ IndexError en índices fuera de rango")
+
+def test_objetos_compactos():
+    """Simbolo y Cuadruplo no reservan __dict__ por instancia"""
+    print("\n=== PRUEBA: SIMBOLO Y CUADRUPLO CON __slots__ ===")
+    simbolo = Simbolo('r1', 'base', 1, 45, linea=2)
+    cuadruplo = Cuadruplo(0, 'ASIG', 45, None, 'base', 'base = 45')
+    assert not hasattr(simbolo, '__dict__')
+    assert not hasattr(cuadruplo, '__dict__')
+    assert cuadruplo.arg2 == '-'
+    print(f"✅ {simbolo}")
+
+def main():
+    """Función principal"""
+    print("PRUEBAS DEL TOKENSTREAM COMPACTO")
+    print("=" * 60)
+    test_acceso_compatible()
+    test_texto_perezoso()
+    test_errores_de_rango()
+    test_objetos_compactos()
+
+if __name__ == "__main__":
+    main()